@@ -2292,6 +2292,737 @@ func (x *VerifySignatureResponse) GetError() string {
 	return ""
 }
 
+// A date window of a multi-window metrics request
+type MetricsWindow struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Name          string                 `protobuf:"bytes,1,opt,name=name,proto3" json:"name,omitempty"`                             // Caller's label (e.g. "1M", "YTD"), echoed in the results
+	StartDate     int64                  `protobuf:"varint,2,opt,name=start_date,json=startDate,proto3" json:"start_date,omitempty"` // Unix timestamp (milliseconds), optional
+	EndDate       int64                  `protobuf:"varint,3,opt,name=end_date,json=endDate,proto3" json:"end_date,omitempty"`       // Unix timestamp (milliseconds), optional
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *MetricsWindow) Reset() {
+	*x = MetricsWindow{}
+	mi := &file_api_proto_enclave_proto_msgTypes[23]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *MetricsWindow) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*MetricsWindow) ProtoMessage() {}
+
+func (x *MetricsWindow) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[23]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use MetricsWindow.ProtoReflect.Descriptor instead.
+func (*MetricsWindow) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{23}
+}
+
+func (x *MetricsWindow) GetName() string {
+	if x != nil {
+		return x.Name
+	}
+	return ""
+}
+
+func (x *MetricsWindow) GetStartDate() int64 {
+	if x != nil {
+		return x.StartDate
+	}
+	return 0
+}
+
+func (x *MetricsWindow) GetEndDate() int64 {
+	if x != nil {
+		return x.EndDate
+	}
+	return 0
+}
+
+// Request for performance metrics over several windows
+type PerformanceMetricsWindowsRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	UserUid       string                 `protobuf:"bytes,1,opt,name=user_uid,json=userUid,proto3" json:"user_uid,omitempty"`
+	Windows       []*MetricsWindow       `protobuf:"bytes,2,rep,name=windows,proto3" json:"windows,omitempty"`
+	Exchanges     []string               `protobuf:"bytes,3,rep,name=exchanges,proto3" json:"exchanges,omitempty"` // Optional per-exchange splits, computed in addition to the whole portfolio
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *PerformanceMetricsWindowsRequest) Reset() {
+	*x = PerformanceMetricsWindowsRequest{}
+	mi := &file_api_proto_enclave_proto_msgTypes[24]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *PerformanceMetricsWindowsRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*PerformanceMetricsWindowsRequest) ProtoMessage() {}
+
+func (x *PerformanceMetricsWindowsRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[24]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use PerformanceMetricsWindowsRequest.ProtoReflect.Descriptor instead.
+func (*PerformanceMetricsWindowsRequest) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{24}
+}
+
+func (x *PerformanceMetricsWindowsRequest) GetUserUid() string {
+	if x != nil {
+		return x.UserUid
+	}
+	return ""
+}
+
+func (x *PerformanceMetricsWindowsRequest) GetWindows() []*MetricsWindow {
+	if x != nil {
+		return x.Windows
+	}
+	return nil
+}
+
+func (x *PerformanceMetricsWindowsRequest) GetExchanges() []string {
+	if x != nil {
+		return x.Exchanges
+	}
+	return nil
+}
+
+// Metrics of one window and exchange split
+type WindowPerformanceMetrics struct {
+	state         protoimpl.MessageState      `protogen:"open.v1"`
+	Window        string                      `protobuf:"bytes,1,opt,name=window,proto3" json:"window,omitempty"`     // MetricsWindow.name
+	Exchange      string                      `protobuf:"bytes,2,opt,name=exchange,proto3" json:"exchange,omitempty"` // Empty for the whole portfolio
+	Metrics       *PerformanceMetricsResponse `protobuf:"bytes,3,opt,name=metrics,proto3" json:"metrics,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *WindowPerformanceMetrics) Reset() {
+	*x = WindowPerformanceMetrics{}
+	mi := &file_api_proto_enclave_proto_msgTypes[25]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *WindowPerformanceMetrics) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*WindowPerformanceMetrics) ProtoMessage() {}
+
+func (x *WindowPerformanceMetrics) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[25]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use WindowPerformanceMetrics.ProtoReflect.Descriptor instead.
+func (*WindowPerformanceMetrics) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{25}
+}
+
+func (x *WindowPerformanceMetrics) GetWindow() string {
+	if x != nil {
+		return x.Window
+	}
+	return ""
+}
+
+func (x *WindowPerformanceMetrics) GetExchange() string {
+	if x != nil {
+		return x.Exchange
+	}
+	return ""
+}
+
+func (x *WindowPerformanceMetrics) GetMetrics() *PerformanceMetricsResponse {
+	if x != nil {
+		return x.Metrics
+	}
+	return nil
+}
+
+// Response with metrics for every window and split
+type PerformanceMetricsWindowsResponse struct {
+	state         protoimpl.MessageState      `protogen:"open.v1"`
+	Results       []*WindowPerformanceMetrics `protobuf:"bytes,1,rep,name=results,proto3" json:"results,omitempty"` // Whole portfolio first, then each split; windows in request order
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *PerformanceMetricsWindowsResponse) Reset() {
+	*x = PerformanceMetricsWindowsResponse{}
+	mi := &file_api_proto_enclave_proto_msgTypes[26]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *PerformanceMetricsWindowsResponse) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*PerformanceMetricsWindowsResponse) ProtoMessage() {}
+
+func (x *PerformanceMetricsWindowsResponse) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[26]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use PerformanceMetricsWindowsResponse.ProtoReflect.Descriptor instead.
+func (*PerformanceMetricsWindowsResponse) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{26}
+}
+
+func (x *PerformanceMetricsWindowsResponse) GetResults() []*WindowPerformanceMetrics {
+	if x != nil {
+		return x.Results
+	}
+	return nil
+}
+
+// Request for the performance metrics of several users
+type BulkPerformanceMetricsRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	UserUids      []string               `protobuf:"bytes,1,rep,name=user_uids,json=userUids,proto3" json:"user_uids,omitempty"`
+	Exchange      string                 `protobuf:"bytes,2,opt,name=exchange,proto3" json:"exchange,omitempty"`                     // Optional - filter every user by exchange
+	StartDate     int64                  `protobuf:"varint,3,opt,name=start_date,json=startDate,proto3" json:"start_date,omitempty"` // Unix timestamp (milliseconds), optional
+	EndDate       int64                  `protobuf:"varint,4,opt,name=end_date,json=endDate,proto3" json:"end_date,omitempty"`       // Unix timestamp (milliseconds), optional
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *BulkPerformanceMetricsRequest) Reset() {
+	*x = BulkPerformanceMetricsRequest{}
+	mi := &file_api_proto_enclave_proto_msgTypes[27]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *BulkPerformanceMetricsRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*BulkPerformanceMetricsRequest) ProtoMessage() {}
+
+func (x *BulkPerformanceMetricsRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[27]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use BulkPerformanceMetricsRequest.ProtoReflect.Descriptor instead.
+func (*BulkPerformanceMetricsRequest) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{27}
+}
+
+func (x *BulkPerformanceMetricsRequest) GetUserUids() []string {
+	if x != nil {
+		return x.UserUids
+	}
+	return nil
+}
+
+func (x *BulkPerformanceMetricsRequest) GetExchange() string {
+	if x != nil {
+		return x.Exchange
+	}
+	return ""
+}
+
+func (x *BulkPerformanceMetricsRequest) GetStartDate() int64 {
+	if x != nil {
+		return x.StartDate
+	}
+	return 0
+}
+
+func (x *BulkPerformanceMetricsRequest) GetEndDate() int64 {
+	if x != nil {
+		return x.EndDate
+	}
+	return 0
+}
+
+// Performance metrics of one user of a bulk request
+type UserPerformanceMetrics struct {
+	state         protoimpl.MessageState      `protogen:"open.v1"`
+	UserUid       string                      `protobuf:"bytes,1,opt,name=user_uid,json=userUid,proto3" json:"user_uid,omitempty"`
+	Metrics       *PerformanceMetricsResponse `protobuf:"bytes,2,opt,name=metrics,proto3" json:"metrics,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *UserPerformanceMetrics) Reset() {
+	*x = UserPerformanceMetrics{}
+	mi := &file_api_proto_enclave_proto_msgTypes[28]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *UserPerformanceMetrics) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*UserPerformanceMetrics) ProtoMessage() {}
+
+func (x *UserPerformanceMetrics) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[28]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use UserPerformanceMetrics.ProtoReflect.Descriptor instead.
+func (*UserPerformanceMetrics) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{28}
+}
+
+func (x *UserPerformanceMetrics) GetUserUid() string {
+	if x != nil {
+		return x.UserUid
+	}
+	return ""
+}
+
+func (x *UserPerformanceMetrics) GetMetrics() *PerformanceMetricsResponse {
+	if x != nil {
+		return x.Metrics
+	}
+	return nil
+}
+
+// Request for a streamed snapshot time series
+type SnapshotTimeSeriesStreamRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	UserUid       string                 `protobuf:"bytes,1,opt,name=user_uid,json=userUid,proto3" json:"user_uid,omitempty"`
+	Exchange      string                 `protobuf:"bytes,2,opt,name=exchange,proto3" json:"exchange,omitempty"`                     // Optional
+	StartDate     int64                  `protobuf:"varint,3,opt,name=start_date,json=startDate,proto3" json:"start_date,omitempty"` // Unix timestamp (milliseconds), optional
+	EndDate       int64                  `protobuf:"varint,4,opt,name=end_date,json=endDate,proto3" json:"end_date,omitempty"`       // Unix timestamp (milliseconds), optional
+	Columnar      bool                   `protobuf:"varint,5,opt,name=columnar,proto3" json:"columnar,omitempty"`                    // Send pages as SnapshotColumns instead of DailySnapshot rows
+	PageSize      int32                  `protobuf:"varint,6,opt,name=page_size,json=pageSize,proto3" json:"page_size,omitempty"`    // Snapshots per page, optional
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *SnapshotTimeSeriesStreamRequest) Reset() {
+	*x = SnapshotTimeSeriesStreamRequest{}
+	mi := &file_api_proto_enclave_proto_msgTypes[29]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *SnapshotTimeSeriesStreamRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*SnapshotTimeSeriesStreamRequest) ProtoMessage() {}
+
+func (x *SnapshotTimeSeriesStreamRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[29]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use SnapshotTimeSeriesStreamRequest.ProtoReflect.Descriptor instead.
+func (*SnapshotTimeSeriesStreamRequest) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{29}
+}
+
+func (x *SnapshotTimeSeriesStreamRequest) GetUserUid() string {
+	if x != nil {
+		return x.UserUid
+	}
+	return ""
+}
+
+func (x *SnapshotTimeSeriesStreamRequest) GetExchange() string {
+	if x != nil {
+		return x.Exchange
+	}
+	return ""
+}
+
+func (x *SnapshotTimeSeriesStreamRequest) GetStartDate() int64 {
+	if x != nil {
+		return x.StartDate
+	}
+	return 0
+}
+
+func (x *SnapshotTimeSeriesStreamRequest) GetEndDate() int64 {
+	if x != nil {
+		return x.EndDate
+	}
+	return 0
+}
+
+func (x *SnapshotTimeSeriesStreamRequest) GetColumnar() bool {
+	if x != nil {
+		return x.Columnar
+	}
+	return false
+}
+
+func (x *SnapshotTimeSeriesStreamRequest) GetPageSize() int32 {
+	if x != nil {
+		return x.PageSize
+	}
+	return 0
+}
+
+// One page of a streamed snapshot time series: snapshots or columns is set
+type SnapshotTimeSeriesChunk struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Snapshots     []*DailySnapshot       `protobuf:"bytes,1,rep,name=snapshots,proto3" json:"snapshots,omitempty"`
+	Columns       *SnapshotColumns       `protobuf:"bytes,2,opt,name=columns,proto3" json:"columns,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *SnapshotTimeSeriesChunk) Reset() {
+	*x = SnapshotTimeSeriesChunk{}
+	mi := &file_api_proto_enclave_proto_msgTypes[30]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *SnapshotTimeSeriesChunk) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*SnapshotTimeSeriesChunk) ProtoMessage() {}
+
+func (x *SnapshotTimeSeriesChunk) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[30]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use SnapshotTimeSeriesChunk.ProtoReflect.Descriptor instead.
+func (*SnapshotTimeSeriesChunk) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{30}
+}
+
+func (x *SnapshotTimeSeriesChunk) GetSnapshots() []*DailySnapshot {
+	if x != nil {
+		return x.Snapshots
+	}
+	return nil
+}
+
+func (x *SnapshotTimeSeriesChunk) GetColumns() *SnapshotColumns {
+	if x != nil {
+		return x.Columns
+	}
+	return nil
+}
+
+// Snapshots in columnar form: entry i of every column belongs to snapshot i
+type SnapshotColumns struct {
+	state           protoimpl.MessageState `protogen:"open.v1"`
+	Exchanges       []string               `protobuf:"bytes,1,rep,name=exchanges,proto3" json:"exchanges,omitempty"`                                      // Distinct exchanges of the page
+	ExchangeIndex   []uint32               `protobuf:"varint,2,rep,packed,name=exchange_index,json=exchangeIndex,proto3" json:"exchange_index,omitempty"` // Index into exchanges
+	Timestamp       []int64                `protobuf:"varint,3,rep,packed,name=timestamp,proto3" json:"timestamp,omitempty"`                              // Unix timestamp (milliseconds)
+	TotalEquity     []float64              `protobuf:"fixed64,4,rep,packed,name=total_equity,json=totalEquity,proto3" json:"total_equity,omitempty"`
+	RealizedBalance []float64              `protobuf:"fixed64,5,rep,packed,name=realized_balance,json=realizedBalance,proto3" json:"realized_balance,omitempty"`
+	UnrealizedPnl   []float64              `protobuf:"fixed64,6,rep,packed,name=unrealized_pnl,json=unrealizedPnl,proto3" json:"unrealized_pnl,omitempty"`
+	Deposits        []float64              `protobuf:"fixed64,7,rep,packed,name=deposits,proto3" json:"deposits,omitempty"`
+	Withdrawals     []float64              `protobuf:"fixed64,8,rep,packed,name=withdrawals,proto3" json:"withdrawals,omitempty"`
+	Markets         []*MarketColumns       `protobuf:"bytes,9,rep,name=markets,proto3" json:"markets,omitempty"` // Markets with data on any snapshot of the page
+	unknownFields   protoimpl.UnknownFields
+	sizeCache       protoimpl.SizeCache
+}
+
+func (x *SnapshotColumns) Reset() {
+	*x = SnapshotColumns{}
+	mi := &file_api_proto_enclave_proto_msgTypes[31]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *SnapshotColumns) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*SnapshotColumns) ProtoMessage() {}
+
+func (x *SnapshotColumns) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[31]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use SnapshotColumns.ProtoReflect.Descriptor instead.
+func (*SnapshotColumns) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{31}
+}
+
+func (x *SnapshotColumns) GetExchanges() []string {
+	if x != nil {
+		return x.Exchanges
+	}
+	return nil
+}
+
+func (x *SnapshotColumns) GetExchangeIndex() []uint32 {
+	if x != nil {
+		return x.ExchangeIndex
+	}
+	return nil
+}
+
+func (x *SnapshotColumns) GetTimestamp() []int64 {
+	if x != nil {
+		return x.Timestamp
+	}
+	return nil
+}
+
+func (x *SnapshotColumns) GetTotalEquity() []float64 {
+	if x != nil {
+		return x.TotalEquity
+	}
+	return nil
+}
+
+func (x *SnapshotColumns) GetRealizedBalance() []float64 {
+	if x != nil {
+		return x.RealizedBalance
+	}
+	return nil
+}
+
+func (x *SnapshotColumns) GetUnrealizedPnl() []float64 {
+	if x != nil {
+		return x.UnrealizedPnl
+	}
+	return nil
+}
+
+func (x *SnapshotColumns) GetDeposits() []float64 {
+	if x != nil {
+		return x.Deposits
+	}
+	return nil
+}
+
+func (x *SnapshotColumns) GetWithdrawals() []float64 {
+	if x != nil {
+		return x.Withdrawals
+	}
+	return nil
+}
+
+func (x *SnapshotColumns) GetMarkets() []*MarketColumns {
+	if x != nil {
+		return x.Markets
+	}
+	return nil
+}
+
+// One market of the snapshots' breakdowns in columnar form, aligned with
+// the SnapshotColumns entries
+type MarketColumns struct {
+	state           protoimpl.MessageState `protogen:"open.v1"`
+	Market          string                 `protobuf:"bytes,1,opt,name=market,proto3" json:"market,omitempty"`           // "global", "spot", "swap", "options", "stocks", "futures", "cfd", "forex" or "commodities"
+	Present         []bool                 `protobuf:"varint,2,rep,packed,name=present,proto3" json:"present,omitempty"` // False where the snapshot has no data for the market (other columns are 0)
+	Equity          []float64              `protobuf:"fixed64,3,rep,packed,name=equity,proto3" json:"equity,omitempty"`
+	AvailableMargin []float64              `protobuf:"fixed64,4,rep,packed,name=available_margin,json=availableMargin,proto3" json:"available_margin,omitempty"`
+	Volume          []float64              `protobuf:"fixed64,5,rep,packed,name=volume,proto3" json:"volume,omitempty"`
+	Trades          []int32                `protobuf:"varint,6,rep,packed,name=trades,proto3" json:"trades,omitempty"`
+	TradingFees     []float64              `protobuf:"fixed64,7,rep,packed,name=trading_fees,json=tradingFees,proto3" json:"trading_fees,omitempty"`
+	FundingFees     []float64              `protobuf:"fixed64,8,rep,packed,name=funding_fees,json=fundingFees,proto3" json:"funding_fees,omitempty"`
+	LongTrades      []int32                `protobuf:"varint,9,rep,packed,name=long_trades,json=longTrades,proto3" json:"long_trades,omitempty"`
+	ShortTrades     []int32                `protobuf:"varint,10,rep,packed,name=short_trades,json=shortTrades,proto3" json:"short_trades,omitempty"`
+	LongVolume      []float64              `protobuf:"fixed64,11,rep,packed,name=long_volume,json=longVolume,proto3" json:"long_volume,omitempty"`
+	ShortVolume     []float64              `protobuf:"fixed64,12,rep,packed,name=short_volume,json=shortVolume,proto3" json:"short_volume,omitempty"`
+	unknownFields   protoimpl.UnknownFields
+	sizeCache       protoimpl.SizeCache
+}
+
+func (x *MarketColumns) Reset() {
+	*x = MarketColumns{}
+	mi := &file_api_proto_enclave_proto_msgTypes[32]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *MarketColumns) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*MarketColumns) ProtoMessage() {}
+
+func (x *MarketColumns) ProtoReflect() protoreflect.Message {
+	mi := &file_api_proto_enclave_proto_msgTypes[32]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use MarketColumns.ProtoReflect.Descriptor instead.
+func (*MarketColumns) Descriptor() ([]byte, []int) {
+	return file_api_proto_enclave_proto_rawDescGZIP(), []int{32}
+}
+
+func (x *MarketColumns) GetMarket() string {
+	if x != nil {
+		return x.Market
+	}
+	return ""
+}
+
+func (x *MarketColumns) GetPresent() []bool {
+	if x != nil {
+		return x.Present
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetEquity() []float64 {
+	if x != nil {
+		return x.Equity
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetAvailableMargin() []float64 {
+	if x != nil {
+		return x.AvailableMargin
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetVolume() []float64 {
+	if x != nil {
+		return x.Volume
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetTrades() []int32 {
+	if x != nil {
+		return x.Trades
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetTradingFees() []float64 {
+	if x != nil {
+		return x.TradingFees
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetFundingFees() []float64 {
+	if x != nil {
+		return x.FundingFees
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetLongTrades() []int32 {
+	if x != nil {
+		return x.LongTrades
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetShortTrades() []int32 {
+	if x != nil {
+		return x.ShortTrades
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetLongVolume() []float64 {
+	if x != nil {
+		return x.LongVolume
+	}
+	return nil
+}
+
+func (x *MarketColumns) GetShortVolume() []float64 {
+	if x != nil {
+		return x.ShortVolume
+	}
+	return nil
+}
+
 type SyncJobResponse_Snapshot struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Balance       float64                `protobuf:"fixed64,1,opt,name=balance,proto3" json:"balance,omitempty"`
@@ -2303,7 +3034,7 @@ type SyncJobResponse_Snapshot struct {
 
 func (x *SyncJobResponse_Snapshot) Reset() {
 	*x = SyncJobResponse_Snapshot{}
-	mi := &file_api_proto_enclave_proto_msgTypes[23]
+	mi := &file_api_proto_enclave_proto_msgTypes[33]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -2315,7 +3046,7 @@ func (x *SyncJobResponse_Snapshot) String() string {
 func (*SyncJobResponse_Snapshot) ProtoMessage() {}
 
 func (x *SyncJobResponse_Snapshot) ProtoReflect() protoreflect.Message {
-	mi := &file_api_proto_enclave_proto_msgTypes[23]
+	mi := &file_api_proto_enclave_proto_msgTypes[33]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -2582,7 +3313,68 @@ const file_api_proto_enclave_proto_rawDesc = "" +
 	"public_key\x18\x03 \x01(\tR\tpublicKey\"E\n" +
 	"\x17VerifySignatureResponse\x12\x14\n" +
 	"\x05valid\x18\x01 \x01(\bR\x05valid\x12\x14\n" +
-	"\x05error\x18\x02 \x01(\tR\x05error2\xd2\x05\n" +
+	"\x05error\x18\x02 \x01(\tR\x05error\"]\n" +
+	"\rMetricsWindow\x12\x12\n" +
+	"\x04name\x18\x01 \x01(\tR\x04name\x12\x1d\n" +
+	"\n" +
+	"start_date\x18\x02 \x01(\x03R\tstartDate\x12\x19\n" +
+	"\bend_date\x18\x03 \x01(\x03R\aendDate\"\x8d\x01\n" +
+	" PerformanceMetricsWindowsRequest\x12\x19\n" +
+	"\buser_uid\x18\x01 \x01(\tR\auserUid\x120\n" +
+	"\awindows\x18\x02 \x03(\v2\x16.enclave.MetricsWindowR\awindows\x12\x1c\n" +
+	"\texchanges\x18\x03 \x03(\tR\texchanges\"\x8d\x01\n" +
+	"\x18WindowPerformanceMetrics\x12\x16\n" +
+	"\x06window\x18\x01 \x01(\tR\x06window\x12\x1a\n" +
+	"\bexchange\x18\x02 \x01(\tR\bexchange\x12=\n" +
+	"\ametrics\x18\x03 \x01(\v2#.enclave.PerformanceMetricsResponseR\ametrics\"`\n" +
+	"!PerformanceMetricsWindowsResponse\x12;\n" +
+	"\aresults\x18\x01 \x03(\v2!.enclave.WindowPerformanceMetricsR\aresults\"\x92\x01\n" +
+	"\x1dBulkPerformanceMetricsRequest\x12\x1b\n" +
+	"\tuser_uids\x18\x01 \x03(\tR\buserUids\x12\x1a\n" +
+	"\bexchange\x18\x02 \x01(\tR\bexchange\x12\x1d\n" +
+	"\n" +
+	"start_date\x18\x03 \x01(\x03R\tstartDate\x12\x19\n" +
+	"\bend_date\x18\x04 \x01(\x03R\aendDate\"r\n" +
+	"\x16UserPerformanceMetrics\x12\x19\n" +
+	"\buser_uid\x18\x01 \x01(\tR\auserUid\x12=\n" +
+	"\ametrics\x18\x02 \x01(\v2#.enclave.PerformanceMetricsResponseR\ametrics\"\xcb\x01\n" +
+	"\x1fSnapshotTimeSeriesStreamRequest\x12\x19\n" +
+	"\buser_uid\x18\x01 \x01(\tR\auserUid\x12\x1a\n" +
+	"\bexchange\x18\x02 \x01(\tR\bexchange\x12\x1d\n" +
+	"\n" +
+	"start_date\x18\x03 \x01(\x03R\tstartDate\x12\x19\n" +
+	"\bend_date\x18\x04 \x01(\x03R\aendDate\x12\x1a\n" +
+	"\bcolumnar\x18\x05 \x01(\bR\bcolumnar\x12\x1b\n" +
+	"\tpage_size\x18\x06 \x01(\x05R\bpageSize\"\x83\x01\n" +
+	"\x17SnapshotTimeSeriesChunk\x124\n" +
+	"\tsnapshots\x18\x01 \x03(\v2\x16.enclave.DailySnapshotR\tsnapshots\x122\n" +
+	"\acolumns\x18\x02 \x01(\v2\x18.enclave.SnapshotColumnsR\acolumns\"\xd9\x02\n" +
+	"\x0fSnapshotColumns\x12\x1c\n" +
+	"\texchanges\x18\x01 \x03(\tR\texchanges\x12%\n" +
+	"\x0eexchange_index\x18\x02 \x03(\rR\rexchangeIndex\x12\x1c\n" +
+	"\ttimestamp\x18\x03 \x03(\x03R\ttimestamp\x12!\n" +
+	"\ftotal_equity\x18\x04 \x03(\x01R\vtotalEquity\x12)\n" +
+	"\x10realized_balance\x18\x05 \x03(\x01R\x0frealizedBalance\x12%\n" +
+	"\x0eunrealized_pnl\x18\x06 \x03(\x01R\runrealizedPnl\x12\x1a\n" +
+	"\bdeposits\x18\a \x03(\x01R\bdeposits\x12 \n" +
+	"\vwithdrawals\x18\b \x03(\x01R\vwithdrawals\x120\n" +
+	"\amarkets\x18\t \x03(\v2\x16.enclave.MarketColumnsR\amarkets\"\x82\x03\n" +
+	"\rMarketColumns\x12\x16\n" +
+	"\x06market\x18\x01 \x01(\tR\x06market\x12\x18\n" +
+	"\apresent\x18\x02 \x03(\bR\apresent\x12\x16\n" +
+	"\x06equity\x18\x03 \x03(\x01R\x06equity\x12)\n" +
+	"\x10available_margin\x18\x04 \x03(\x01R\x0favailableMargin\x12\x16\n" +
+	"\x06volume\x18\x05 \x03(\x01R\x06volume\x12\x16\n" +
+	"\x06trades\x18\x06 \x03(\x05R\x06trades\x12!\n" +
+	"\ftrading_fees\x18\a \x03(\x01R\vtradingFees\x12!\n" +
+	"\ffunding_fees\x18\b \x03(\x01R\vfundingFees\x12\x1f\n" +
+	"\vlong_trades\x18\t \x03(\x05R\n" +
+	"longTrades\x12!\n" +
+	"\fshort_trades\x18\n" +
+	" \x03(\x05R\vshortTrades\x12\x1f\n" +
+	"\vlong_volume\x18\v \x03(\x01R\n" +
+	"longVolume\x12!\n" +
+	"\fshort_volume\x18\f \x03(\x01R\vshortVolume2\x9b\b\n" +
 	"\x0eEnclaveService\x12C\n" +
 	"\x0eProcessSyncJob\x12\x17.enclave.SyncJobRequest\x1a\x18.enclave.SyncJobResponse\x12]\n" +
 	"\x14GetAggregatedMetrics\x12!.enclave.AggregatedMetricsRequest\x1a\".enclave.AggregatedMetricsResponse\x12`\n" +
@@ -2591,7 +3383,10 @@ const file_api_proto_enclave_proto_rawDesc = "" +
 	"\x15GetPerformanceMetrics\x12\".enclave.PerformanceMetricsRequest\x1a#.enclave.PerformanceMetricsResponse\x12H\n" +
 	"\vHealthCheck\x12\x1b.enclave.HealthCheckRequest\x1a\x1c.enclave.HealthCheckResponse\x12M\n" +
 	"\x14GenerateSignedReport\x12\x16.enclave.ReportRequest\x1a\x1d.enclave.SignedReportResponse\x12Z\n" +
-	"\x15VerifyReportSignature\x12\x1f.enclave.VerifySignatureRequest\x1a .enclave.VerifySignatureResponseB*Z(github.com/trackrecord/enclave/api/protob\x06proto3"
+	"\x15VerifyReportSignature\x12\x1f.enclave.VerifySignatureRequest\x1a .enclave.VerifySignatureResponse\x12u\n" +
+	"\x1cGetPerformanceMetricsWindows\x12).enclave.PerformanceMetricsWindowsRequest\x1a*.enclave.PerformanceMetricsWindowsResponse\x12f\n" +
+	"\x19GetBulkPerformanceMetrics\x12&.enclave.BulkPerformanceMetricsRequest\x1a\x1f.enclave.UserPerformanceMetrics0\x01\x12h\n" +
+	"\x18StreamSnapshotTimeSeries\x12(.enclave.SnapshotTimeSeriesStreamRequest\x1a .enclave.SnapshotTimeSeriesChunk0\x01B*Z(github.com/trackrecord/enclave/api/protob\x06proto3"
 
 var (
 	file_api_proto_enclave_proto_rawDescOnce sync.Once
@@ -2606,38 +3401,48 @@ func file_api_proto_enclave_proto_rawDescGZIP() []byte {
 }
 
 var file_api_proto_enclave_proto_enumTypes = make([]protoimpl.EnumInfo, 2)
-var file_api_proto_enclave_proto_msgTypes = make([]protoimpl.MessageInfo, 24)
+var file_api_proto_enclave_proto_msgTypes = make([]protoimpl.MessageInfo, 34)
 var file_api_proto_enclave_proto_goTypes = []any{
-	(SyncJobRequest_SyncType)(0),         // 0: enclave.SyncJobRequest.SyncType
-	(HealthCheckResponse_Status)(0),      // 1: enclave.HealthCheckResponse.Status
-	(*SyncJobRequest)(nil),               // 2: enclave.SyncJobRequest
-	(*SyncJobResponse)(nil),              // 3: enclave.SyncJobResponse
-	(*AggregatedMetricsRequest)(nil),     // 4: enclave.AggregatedMetricsRequest
-	(*AggregatedMetricsResponse)(nil),    // 5: enclave.AggregatedMetricsResponse
-	(*SnapshotTimeSeriesRequest)(nil),    // 6: enclave.SnapshotTimeSeriesRequest
-	(*SnapshotTimeSeriesResponse)(nil),   // 7: enclave.SnapshotTimeSeriesResponse
-	(*DailySnapshot)(nil),                // 8: enclave.DailySnapshot
-	(*MarketBreakdown)(nil),              // 9: enclave.MarketBreakdown
-	(*MarketMetrics)(nil),                // 10: enclave.MarketMetrics
-	(*CreateUserConnectionRequest)(nil),  // 11: enclave.CreateUserConnectionRequest
-	(*CreateUserConnectionResponse)(nil), // 12: enclave.CreateUserConnectionResponse
-	(*HealthCheckRequest)(nil),           // 13: enclave.HealthCheckRequest
-	(*HealthCheckResponse)(nil),          // 14: enclave.HealthCheckResponse
-	(*PerformanceMetricsRequest)(nil),    // 15: enclave.PerformanceMetricsRequest
-	(*PerformanceMetricsResponse)(nil),   // 16: enclave.PerformanceMetricsResponse
-	(*ReportRequest)(nil),                // 17: enclave.ReportRequest
-	(*SignedReportResponse)(nil),         // 18: enclave.SignedReportResponse
-	(*ExchangeInfo)(nil),                 // 19: enclave.ExchangeInfo
-	(*DailyReturnData)(nil),              // 20: enclave.DailyReturnData
-	(*MonthlyReturnData)(nil),            // 21: enclave.MonthlyReturnData
-	(*DrawdownPeriodData)(nil),           // 22: enclave.DrawdownPeriodData
-	(*VerifySignatureRequest)(nil),       // 23: enclave.VerifySignatureRequest
-	(*VerifySignatureResponse)(nil),      // 24: enclave.VerifySignatureResponse
-	(*SyncJobResponse_Snapshot)(nil),     // 25: enclave.SyncJobResponse.Snapshot
+	(SyncJobRequest_SyncType)(0),              // 0: enclave.SyncJobRequest.SyncType
+	(HealthCheckResponse_Status)(0),           // 1: enclave.HealthCheckResponse.Status
+	(*SyncJobRequest)(nil),                    // 2: enclave.SyncJobRequest
+	(*SyncJobResponse)(nil),                   // 3: enclave.SyncJobResponse
+	(*AggregatedMetricsRequest)(nil),          // 4: enclave.AggregatedMetricsRequest
+	(*AggregatedMetricsResponse)(nil),         // 5: enclave.AggregatedMetricsResponse
+	(*SnapshotTimeSeriesRequest)(nil),         // 6: enclave.SnapshotTimeSeriesRequest
+	(*SnapshotTimeSeriesResponse)(nil),        // 7: enclave.SnapshotTimeSeriesResponse
+	(*DailySnapshot)(nil),                     // 8: enclave.DailySnapshot
+	(*MarketBreakdown)(nil),                   // 9: enclave.MarketBreakdown
+	(*MarketMetrics)(nil),                     // 10: enclave.MarketMetrics
+	(*CreateUserConnectionRequest)(nil),       // 11: enclave.CreateUserConnectionRequest
+	(*CreateUserConnectionResponse)(nil),      // 12: enclave.CreateUserConnectionResponse
+	(*HealthCheckRequest)(nil),                // 13: enclave.HealthCheckRequest
+	(*HealthCheckResponse)(nil),               // 14: enclave.HealthCheckResponse
+	(*PerformanceMetricsRequest)(nil),         // 15: enclave.PerformanceMetricsRequest
+	(*PerformanceMetricsResponse)(nil),        // 16: enclave.PerformanceMetricsResponse
+	(*ReportRequest)(nil),                     // 17: enclave.ReportRequest
+	(*SignedReportResponse)(nil),              // 18: enclave.SignedReportResponse
+	(*ExchangeInfo)(nil),                      // 19: enclave.ExchangeInfo
+	(*DailyReturnData)(nil),                   // 20: enclave.DailyReturnData
+	(*MonthlyReturnData)(nil),                 // 21: enclave.MonthlyReturnData
+	(*DrawdownPeriodData)(nil),                // 22: enclave.DrawdownPeriodData
+	(*VerifySignatureRequest)(nil),            // 23: enclave.VerifySignatureRequest
+	(*VerifySignatureResponse)(nil),           // 24: enclave.VerifySignatureResponse
+	(*MetricsWindow)(nil),                     // 25: enclave.MetricsWindow
+	(*PerformanceMetricsWindowsRequest)(nil),  // 26: enclave.PerformanceMetricsWindowsRequest
+	(*WindowPerformanceMetrics)(nil),          // 27: enclave.WindowPerformanceMetrics
+	(*PerformanceMetricsWindowsResponse)(nil), // 28: enclave.PerformanceMetricsWindowsResponse
+	(*BulkPerformanceMetricsRequest)(nil),     // 29: enclave.BulkPerformanceMetricsRequest
+	(*UserPerformanceMetrics)(nil),            // 30: enclave.UserPerformanceMetrics
+	(*SnapshotTimeSeriesStreamRequest)(nil),   // 31: enclave.SnapshotTimeSeriesStreamRequest
+	(*SnapshotTimeSeriesChunk)(nil),           // 32: enclave.SnapshotTimeSeriesChunk
+	(*SnapshotColumns)(nil),                   // 33: enclave.SnapshotColumns
+	(*MarketColumns)(nil),                     // 34: enclave.MarketColumns
+	(*SyncJobResponse_Snapshot)(nil),          // 35: enclave.SyncJobResponse.Snapshot
 }
 var file_api_proto_enclave_proto_depIdxs = []int32{
 	0,  // 0: enclave.SyncJobRequest.type:type_name -> enclave.SyncJobRequest.SyncType
-	25, // 1: enclave.SyncJobResponse.latest_snapshot:type_name -> enclave.SyncJobResponse.Snapshot
+	35, // 1: enclave.SyncJobResponse.latest_snapshot:type_name -> enclave.SyncJobResponse.Snapshot
 	8,  // 2: enclave.SnapshotTimeSeriesResponse.snapshots:type_name -> enclave.DailySnapshot
 	9,  // 3: enclave.DailySnapshot.breakdown:type_name -> enclave.MarketBreakdown
 	10, // 4: enclave.MarketBreakdown.global:type_name -> enclave.MarketMetrics
@@ -2654,27 +3459,40 @@ var file_api_proto_enclave_proto_depIdxs = []int32{
 	20, // 15: enclave.SignedReportResponse.daily_returns:type_name -> enclave.DailyReturnData
 	21, // 16: enclave.SignedReportResponse.monthly_returns:type_name -> enclave.MonthlyReturnData
 	19, // 17: enclave.SignedReportResponse.exchange_details:type_name -> enclave.ExchangeInfo
-	2,  // 18: enclave.EnclaveService.ProcessSyncJob:input_type -> enclave.SyncJobRequest
-	4,  // 19: enclave.EnclaveService.GetAggregatedMetrics:input_type -> enclave.AggregatedMetricsRequest
-	6,  // 20: enclave.EnclaveService.GetSnapshotTimeSeries:input_type -> enclave.SnapshotTimeSeriesRequest
-	11, // 21: enclave.EnclaveService.CreateUserConnection:input_type -> enclave.CreateUserConnectionRequest
-	15, // 22: enclave.EnclaveService.GetPerformanceMetrics:input_type -> enclave.PerformanceMetricsRequest
-	13, // 23: enclave.EnclaveService.HealthCheck:input_type -> enclave.HealthCheckRequest
-	17, // 24: enclave.EnclaveService.GenerateSignedReport:input_type -> enclave.ReportRequest
-	23, // 25: enclave.EnclaveService.VerifyReportSignature:input_type -> enclave.VerifySignatureRequest
-	3,  // 26: enclave.EnclaveService.ProcessSyncJob:output_type -> enclave.SyncJobResponse
-	5,  // 27: enclave.EnclaveService.GetAggregatedMetrics:output_type -> enclave.AggregatedMetricsResponse
-	7,  // 28: enclave.EnclaveService.GetSnapshotTimeSeries:output_type -> enclave.SnapshotTimeSeriesResponse
-	12, // 29: enclave.EnclaveService.CreateUserConnection:output_type -> enclave.CreateUserConnectionResponse
-	16, // 30: enclave.EnclaveService.GetPerformanceMetrics:output_type -> enclave.PerformanceMetricsResponse
-	14, // 31: enclave.EnclaveService.HealthCheck:output_type -> enclave.HealthCheckResponse
-	18, // 32: enclave.EnclaveService.GenerateSignedReport:output_type -> enclave.SignedReportResponse
-	24, // 33: enclave.EnclaveService.VerifyReportSignature:output_type -> enclave.VerifySignatureResponse
-	26, // [26:34] is the sub-list for method output_type
-	18, // [18:26] is the sub-list for method input_type
-	18, // [18:18] is the sub-list for extension type_name
-	18, // [18:18] is the sub-list for extension extendee
-	0,  // [0:18] is the sub-list for field type_name
+	25, // 18: enclave.PerformanceMetricsWindowsRequest.windows:type_name -> enclave.MetricsWindow
+	16, // 19: enclave.WindowPerformanceMetrics.metrics:type_name -> enclave.PerformanceMetricsResponse
+	27, // 20: enclave.PerformanceMetricsWindowsResponse.results:type_name -> enclave.WindowPerformanceMetrics
+	16, // 21: enclave.UserPerformanceMetrics.metrics:type_name -> enclave.PerformanceMetricsResponse
+	8,  // 22: enclave.SnapshotTimeSeriesChunk.snapshots:type_name -> enclave.DailySnapshot
+	33, // 23: enclave.SnapshotTimeSeriesChunk.columns:type_name -> enclave.SnapshotColumns
+	34, // 24: enclave.SnapshotColumns.markets:type_name -> enclave.MarketColumns
+	2,  // 25: enclave.EnclaveService.ProcessSyncJob:input_type -> enclave.SyncJobRequest
+	4,  // 26: enclave.EnclaveService.GetAggregatedMetrics:input_type -> enclave.AggregatedMetricsRequest
+	6,  // 27: enclave.EnclaveService.GetSnapshotTimeSeries:input_type -> enclave.SnapshotTimeSeriesRequest
+	11, // 28: enclave.EnclaveService.CreateUserConnection:input_type -> enclave.CreateUserConnectionRequest
+	15, // 29: enclave.EnclaveService.GetPerformanceMetrics:input_type -> enclave.PerformanceMetricsRequest
+	13, // 30: enclave.EnclaveService.HealthCheck:input_type -> enclave.HealthCheckRequest
+	17, // 31: enclave.EnclaveService.GenerateSignedReport:input_type -> enclave.ReportRequest
+	23, // 32: enclave.EnclaveService.VerifyReportSignature:input_type -> enclave.VerifySignatureRequest
+	26, // 33: enclave.EnclaveService.GetPerformanceMetricsWindows:input_type -> enclave.PerformanceMetricsWindowsRequest
+	29, // 34: enclave.EnclaveService.GetBulkPerformanceMetrics:input_type -> enclave.BulkPerformanceMetricsRequest
+	31, // 35: enclave.EnclaveService.StreamSnapshotTimeSeries:input_type -> enclave.SnapshotTimeSeriesStreamRequest
+	3,  // 36: enclave.EnclaveService.ProcessSyncJob:output_type -> enclave.SyncJobResponse
+	5,  // 37: enclave.EnclaveService.GetAggregatedMetrics:output_type -> enclave.AggregatedMetricsResponse
+	7,  // 38: enclave.EnclaveService.GetSnapshotTimeSeries:output_type -> enclave.SnapshotTimeSeriesResponse
+	12, // 39: enclave.EnclaveService.CreateUserConnection:output_type -> enclave.CreateUserConnectionResponse
+	16, // 40: enclave.EnclaveService.GetPerformanceMetrics:output_type -> enclave.PerformanceMetricsResponse
+	14, // 41: enclave.EnclaveService.HealthCheck:output_type -> enclave.HealthCheckResponse
+	18, // 42: enclave.EnclaveService.GenerateSignedReport:output_type -> enclave.SignedReportResponse
+	24, // 43: enclave.EnclaveService.VerifyReportSignature:output_type -> enclave.VerifySignatureResponse
+	28, // 44: enclave.EnclaveService.GetPerformanceMetricsWindows:output_type -> enclave.PerformanceMetricsWindowsResponse
+	30, // 45: enclave.EnclaveService.GetBulkPerformanceMetrics:output_type -> enclave.UserPerformanceMetrics
+	32, // 46: enclave.EnclaveService.StreamSnapshotTimeSeries:output_type -> enclave.SnapshotTimeSeriesChunk
+	36, // [36:47] is the sub-list for method output_type
+	25, // [25:36] is the sub-list for method input_type
+	25, // [25:25] is the sub-list for extension type_name
+	25, // [25:25] is the sub-list for extension extendee
+	0,  // [0:25] is the sub-list for field type_name
 }
 
 func init() { file_api_proto_enclave_proto_init() }
@@ -2688,7 +3506,7 @@ func file_api_proto_enclave_proto_init() {
 			GoPackagePath: reflect.TypeOf(x{}).PkgPath(),
 			RawDescriptor: unsafe.Slice(unsafe.StringData(file_api_proto_enclave_proto_rawDesc), len(file_api_proto_enclave_proto_rawDesc)),
 			NumEnums:      2,
-			NumMessages:   24,
+			NumMessages:   34,
 			NumExtensions: 0,
 			NumServices:   1,
 		},
@@ -19,14 +19,17 @@ import (
 const _ = grpc.SupportPackageIsVersion9
 
 const (
-	EnclaveService_ProcessSyncJob_FullMethodName        = "/enclave.EnclaveService/ProcessSyncJob"
-	EnclaveService_GetAggregatedMetrics_FullMethodName  = "/enclave.EnclaveService/GetAggregatedMetrics"
-	EnclaveService_GetSnapshotTimeSeries_FullMethodName = "/enclave.EnclaveService/GetSnapshotTimeSeries"
-	EnclaveService_CreateUserConnection_FullMethodName  = "/enclave.EnclaveService/CreateUserConnection"
-	EnclaveService_GetPerformanceMetrics_FullMethodName = "/enclave.EnclaveService/GetPerformanceMetrics"
-	EnclaveService_HealthCheck_FullMethodName           = "/enclave.EnclaveService/HealthCheck"
-	EnclaveService_GenerateSignedReport_FullMethodName  = "/enclave.EnclaveService/GenerateSignedReport"
-	EnclaveService_VerifyReportSignature_FullMethodName = "/enclave.EnclaveService/VerifyReportSignature"
+	EnclaveService_ProcessSyncJob_FullMethodName               = "/enclave.EnclaveService/ProcessSyncJob"
+	EnclaveService_GetAggregatedMetrics_FullMethodName         = "/enclave.EnclaveService/GetAggregatedMetrics"
+	EnclaveService_GetSnapshotTimeSeries_FullMethodName        = "/enclave.EnclaveService/GetSnapshotTimeSeries"
+	EnclaveService_CreateUserConnection_FullMethodName         = "/enclave.EnclaveService/CreateUserConnection"
+	EnclaveService_GetPerformanceMetrics_FullMethodName        = "/enclave.EnclaveService/GetPerformanceMetrics"
+	EnclaveService_HealthCheck_FullMethodName                  = "/enclave.EnclaveService/HealthCheck"
+	EnclaveService_GenerateSignedReport_FullMethodName         = "/enclave.EnclaveService/GenerateSignedReport"
+	EnclaveService_VerifyReportSignature_FullMethodName        = "/enclave.EnclaveService/VerifyReportSignature"
+	EnclaveService_GetPerformanceMetricsWindows_FullMethodName = "/enclave.EnclaveService/GetPerformanceMetricsWindows"
+	EnclaveService_GetBulkPerformanceMetrics_FullMethodName    = "/enclave.EnclaveService/GetBulkPerformanceMetrics"
+	EnclaveService_StreamSnapshotTimeSeries_FullMethodName     = "/enclave.EnclaveService/StreamSnapshotTimeSeries"
 )
 
 // EnclaveServiceClient is the client API for EnclaveService service.
@@ -52,6 +55,14 @@ type EnclaveServiceClient interface {
 	GenerateSignedReport(ctx context.Context, in *ReportRequest, opts ...grpc.CallOption) (*SignedReportResponse, error)
 	// Verify a report signature
 	VerifyReportSignature(ctx context.Context, in *VerifySignatureRequest, opts ...grpc.CallOption) (*VerifySignatureResponse, error)
+	// Get performance metrics for several date windows, optionally split per
+	// exchange, from one snapshot fetch
+	GetPerformanceMetricsWindows(ctx context.Context, in *PerformanceMetricsWindowsRequest, opts ...grpc.CallOption) (*PerformanceMetricsWindowsResponse, error)
+	// Get performance metrics of many users over one window (rankings),
+	// streamed per user as they are computed
+	GetBulkPerformanceMetrics(ctx context.Context, in *BulkPerformanceMetricsRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[UserPerformanceMetrics], error)
+	// Get snapshot time series as a stream of pages, as rows or columns
+	StreamSnapshotTimeSeries(ctx context.Context, in *SnapshotTimeSeriesStreamRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[SnapshotTimeSeriesChunk], error)
 }
 
 type enclaveServiceClient struct {
@@ -142,6 +153,54 @@ func (c *enclaveServiceClient) VerifyReportSignature(ctx context.Context, in *Ve
 	return out, nil
 }
 
+func (c *enclaveServiceClient) GetPerformanceMetricsWindows(ctx context.Context, in *PerformanceMetricsWindowsRequest, opts ...grpc.CallOption) (*PerformanceMetricsWindowsResponse, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(PerformanceMetricsWindowsResponse)
+	err := c.cc.Invoke(ctx, EnclaveService_GetPerformanceMetricsWindows_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
+func (c *enclaveServiceClient) GetBulkPerformanceMetrics(ctx context.Context, in *BulkPerformanceMetricsRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[UserPerformanceMetrics], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &EnclaveService_ServiceDesc.Streams[0], EnclaveService_GetBulkPerformanceMetrics_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[BulkPerformanceMetricsRequest, UserPerformanceMetrics]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type EnclaveService_GetBulkPerformanceMetricsClient = grpc.ServerStreamingClient[UserPerformanceMetrics]
+
+func (c *enclaveServiceClient) StreamSnapshotTimeSeries(ctx context.Context, in *SnapshotTimeSeriesStreamRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[SnapshotTimeSeriesChunk], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &EnclaveService_ServiceDesc.Streams[1], EnclaveService_StreamSnapshotTimeSeries_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[SnapshotTimeSeriesStreamRequest, SnapshotTimeSeriesChunk]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type EnclaveService_StreamSnapshotTimeSeriesClient = grpc.ServerStreamingClient[SnapshotTimeSeriesChunk]
+
 // EnclaveServiceServer is the server API for EnclaveService service.
 // All implementations must embed UnimplementedEnclaveServiceServer
 // for forward compatibility.
@@ -165,6 +224,14 @@ type EnclaveServiceServer interface {
 	GenerateSignedReport(context.Context, *ReportRequest) (*SignedReportResponse, error)
 	// Verify a report signature
 	VerifyReportSignature(context.Context, *VerifySignatureRequest) (*VerifySignatureResponse, error)
+	// Get performance metrics for several date windows, optionally split per
+	// exchange, from one snapshot fetch
+	GetPerformanceMetricsWindows(context.Context, *PerformanceMetricsWindowsRequest) (*PerformanceMetricsWindowsResponse, error)
+	// Get performance metrics of many users over one window (rankings),
+	// streamed per user as they are computed
+	GetBulkPerformanceMetrics(*BulkPerformanceMetricsRequest, grpc.ServerStreamingServer[UserPerformanceMetrics]) error
+	// Get snapshot time series as a stream of pages, as rows or columns
+	StreamSnapshotTimeSeries(*SnapshotTimeSeriesStreamRequest, grpc.ServerStreamingServer[SnapshotTimeSeriesChunk]) error
 	mustEmbedUnimplementedEnclaveServiceServer()
 }
 
@@ -199,6 +266,15 @@ func (UnimplementedEnclaveServiceServer) GenerateSignedReport(context.Context, *
 func (UnimplementedEnclaveServiceServer) VerifyReportSignature(context.Context, *VerifySignatureRequest) (*VerifySignatureResponse, error) {
 	return nil, status.Errorf(codes.Unimplemented, "method VerifyReportSignature not implemented")
 }
+func (UnimplementedEnclaveServiceServer) GetPerformanceMetricsWindows(context.Context, *PerformanceMetricsWindowsRequest) (*PerformanceMetricsWindowsResponse, error) {
+	return nil, status.Errorf(codes.Unimplemented, "method GetPerformanceMetricsWindows not implemented")
+}
+func (UnimplementedEnclaveServiceServer) GetBulkPerformanceMetrics(*BulkPerformanceMetricsRequest, grpc.ServerStreamingServer[UserPerformanceMetrics]) error {
+	return status.Errorf(codes.Unimplemented, "method GetBulkPerformanceMetrics not implemented")
+}
+func (UnimplementedEnclaveServiceServer) StreamSnapshotTimeSeries(*SnapshotTimeSeriesStreamRequest, grpc.ServerStreamingServer[SnapshotTimeSeriesChunk]) error {
+	return status.Errorf(codes.Unimplemented, "method StreamSnapshotTimeSeries not implemented")
+}
 func (UnimplementedEnclaveServiceServer) mustEmbedUnimplementedEnclaveServiceServer() {}
 func (UnimplementedEnclaveServiceServer) testEmbeddedByValue()                        {}
 
@@ -364,6 +440,46 @@ func _EnclaveService_VerifyReportSignature_Handler(srv interface{}, ctx context.
 	return interceptor(ctx, in, info, handler)
 }
 
+func _EnclaveService_GetPerformanceMetricsWindows_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(PerformanceMetricsWindowsRequest)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(EnclaveServiceServer).GetPerformanceMetricsWindows(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: EnclaveService_GetPerformanceMetricsWindows_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(EnclaveServiceServer).GetPerformanceMetricsWindows(ctx, req.(*PerformanceMetricsWindowsRequest))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
+func _EnclaveService_GetBulkPerformanceMetrics_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(BulkPerformanceMetricsRequest)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(EnclaveServiceServer).GetBulkPerformanceMetrics(m, &grpc.GenericServerStream[BulkPerformanceMetricsRequest, UserPerformanceMetrics]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type EnclaveService_GetBulkPerformanceMetricsServer = grpc.ServerStreamingServer[UserPerformanceMetrics]
+
+func _EnclaveService_StreamSnapshotTimeSeries_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(SnapshotTimeSeriesStreamRequest)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(EnclaveServiceServer).StreamSnapshotTimeSeries(m, &grpc.GenericServerStream[SnapshotTimeSeriesStreamRequest, SnapshotTimeSeriesChunk]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type EnclaveService_StreamSnapshotTimeSeriesServer = grpc.ServerStreamingServer[SnapshotTimeSeriesChunk]
+
 // EnclaveService_ServiceDesc is the grpc.ServiceDesc for EnclaveService service.
 // It's only intended for direct use with grpc.RegisterService,
 // and not to be introspected or modified (even as a copy)
@@ -403,7 +519,22 @@ var EnclaveService_ServiceDesc = grpc.ServiceDesc{
 			MethodName: "VerifyReportSignature",
 			Handler:    _EnclaveService_VerifyReportSignature_Handler,
 		},
+		{
+			MethodName: "GetPerformanceMetricsWindows",
+			Handler:    _EnclaveService_GetPerformanceMetricsWindows_Handler,
+		},
+	},
+	Streams: []grpc.StreamDesc{
+		{
+			StreamName:    "GetBulkPerformanceMetrics",
+			Handler:       _EnclaveService_GetBulkPerformanceMetrics_Handler,
+			ServerStreams: true,
+		},
+		{
+			StreamName:    "StreamSnapshotTimeSeries",
+			Handler:       _EnclaveService_StreamSnapshotTimeSeries_Handler,
+			ServerStreams: true,
+		},
 	},
-	Streams:  []grpc.StreamDesc{},
 	Metadata: "api/proto/enclave.proto",
 }
@@ -16,6 +16,7 @@ import (
 	"github.com/trackrecord/enclave/internal/attestation"
 	"github.com/trackrecord/enclave/internal/bootstrap"
 	"github.com/trackrecord/enclave/internal/cache"
+	"github.com/trackrecord/enclave/internal/concurrency"
 	"github.com/trackrecord/enclave/internal/config"
 	"github.com/trackrecord/enclave/internal/connector"
 	"github.com/trackrecord/enclave/internal/db"
@@ -131,7 +132,7 @@ func main() {
 	defer cancel()
 
 	// 8. Connect database
-	pool := connectDatabase(ctx, cfg, logger)
+	pool, schema := connectDatabase(ctx, cfg, logger)
 
 	// 9. Init encryption (AES for credentials at rest).
 	//
@@ -225,6 +226,39 @@ func main() {
 		signedReportRepo = repository.NewSignedReportRepo(pool)
 		rateLimitRepo = repository.NewRateLimitRepo(pool)
 		syncStatusRepo = repository.NewSyncStatusRepo(pool)
+		if schema != nil {
+			connRepo.SetSchema(schema)
+			snapshotRepo.SetSchema(schema)
+			userRepo.SetSchema(schema)
+			syncStatusRepo.SetSchema(schema)
+		}
+		if cfg.SnapshotCacheMaxMB > 0 {
+			snapshotRepo.SetSeriesCache(int64(cfg.SnapshotCacheMaxMB)<<20, cfg.SnapshotCacheTTL)
+		}
+	}
+
+	// 10b. When snapshot_data has been converted to monthly partitions
+	// (migrations/optional/snapshot_data_partitioned.sql), keep the coming
+	// months' partitions created so writes never pile up in the default one.
+	if snapshotRepo != nil && cfg.SnapshotPartitionMonthsAhead > 0 {
+		if partitioned, err := snapshotRepo.IsPartitioned(ctx); err != nil {
+			logger.Warn("snapshot partition check failed", zap.Error(err))
+		} else if partitioned {
+			ensureSnapshotPartitions(ctx, snapshotRepo, cfg.SnapshotPartitionMonthsAhead, logger)
+			go func() {
+				ticker := time.NewTicker(24 * time.Hour)
+				defer ticker.Stop()
+				for {
+					select {
+					case <-ctx.Done():
+						return
+					case <-ticker.C:
+						ensureSnapshotPartitions(ctx, snapshotRepo, cfg.SnapshotPartitionMonthsAhead, logger)
+					}
+				}
+			}()
+			logger.Info("snapshot partition upkeep scheduled", zap.Int("months_ahead", cfg.SnapshotPartitionMonthsAhead))
+		}
 	}
 
 	// 11. Init services
@@ -246,6 +280,18 @@ func main() {
 			syncSvc.SetSyncStatusRepo(syncStatusRepo)
 		}
 		metricsSvc = service.NewMetricsService(snapshotRepo)
+		if cfg.ReturnSeriesMaxProfiles > 0 {
+			seriesRepo := repository.NewReturnSeriesRepo(pool)
+			if err := seriesRepo.EnsureTable(ctx); err != nil {
+				logger.Warn("return series disabled: table unavailable", zap.Error(err))
+			} else {
+				returnSeries := service.NewReturnSeriesService(snapshotRepo, seriesRepo, logger)
+				returnSeries.SetMaxProfiles(cfg.ReturnSeriesMaxProfiles)
+				returnSeries.SetMaxAge(cfg.ReturnSeriesMaxAge)
+				metricsSvc.SetReturnSeries(returnSeries)
+				syncSvc.SetReturnSeries(returnSeries)
+			}
+		}
 
 		if rateLimitRepo != nil {
 			rateLimiterSvc = service.NewRateLimiterService(rateLimitRepo, logger)
@@ -269,6 +315,22 @@ func main() {
 		)
 	}
 
+	// 11d. Override the per-exchange request budgets shared by all
+	// connectors, e.g. EXCHANGE_RATE_LIMITS=api.binance.com=40:100.
+	if cfg.ExchangeRateLimits != "" {
+		budgets, err := connector.ParseExchangeBudgets(cfg.ExchangeRateLimits)
+		if err != nil {
+			logger.Fatal("invalid EXCHANGE_RATE_LIMITS", zap.Error(err))
+		}
+		for host, b := range budgets {
+			connector.DefaultGovernor().Configure(host, b)
+		}
+		logger.Info("exchange rate limits configured", zap.Int("hosts", len(budgets)))
+	}
+	if cfg.IBKRFlexCacheMaxMB > 0 {
+		connector.SetFlexCacheMaxBytes(int64(cfg.IBKRFlexCacheMaxMB) << 20)
+	}
+
 	// 12. Init report signer (ephemeral key per startup)
 	signer, err := signing.NewReportSignerGenerate()
 	if err != nil {
@@ -288,6 +350,9 @@ func main() {
 		if connSvc != nil {
 			reportSvc.SetConnectionService(connSvc)
 		}
+		if cfg.ReportCacheMaxMB > 0 {
+			reportSvc.SetReportCache(int64(cfg.ReportCacheMaxMB)<<20, cfg.ReportCacheTTL)
+		}
 	}
 
 	// 13. Attestation service
@@ -395,6 +460,7 @@ func main() {
 		enclaveGrpc.ServerOptions{
 			JWTSecret:         jwtSecret,
 			JWTExpectedIssuer: cfg.JWTExpectedIssuer,
+			BulkMetrics:       cfg.EnableBulkMetrics,
 		},
 	)
 	go func() {
@@ -470,7 +536,42 @@ func main() {
 	var syncScheduler *scheduler.SyncScheduler
 	if syncSvc != nil && userRepo != nil {
 		syncScheduler = scheduler.NewSyncScheduler(syncSvc, userRepo, logger)
+		syncScheduler.SetFlexPollers(cfg.IBKRFlexPollers)
+		if cfg.SyncSharded {
+			syncQueue := repository.NewSyncQueueRepo(pool)
+			if err := syncQueue.EnsureTable(ctx); err != nil {
+				logger.Warn("sharded daily sync disabled: work queue table unavailable", zap.Error(err))
+			} else {
+				syncScheduler.SetWorkQueue(syncQueue, scheduler.ShardOptions{
+					WorkerID: cfg.SyncWorkerID,
+					Lease:    cfg.SyncLease,
+				})
+				logger.Info("sharded daily sync enabled (sync_work_items queue)",
+					zap.Duration("lease", cfg.SyncLease),
+				)
+			}
+		}
 		restServer.SetScheduler(syncScheduler)
+		limiters := []*concurrency.Limiter{syncScheduler.UserLimiter(), syncSvc.ConnectionLimiter()}
+		for _, l := range limiters {
+			l.OnAdjust(func(name string, from, to int, reason string) {
+				logger.Info("sync concurrency limit adjusted",
+					zap.String("limiter", name),
+					zap.Int("from", from),
+					zap.Int("to", to),
+					zap.String("reason", reason),
+				)
+			})
+		}
+		if metricsServer != nil {
+			metricsServer.RegisterCollector(func(m *metrics.Metrics) {
+				publishConcurrencyMetrics(m, limiters)
+				publishGovernorMetrics(m, connector.DefaultGovernor())
+				publishFlexCacheMetrics(m, connector.FlexCacheStatistics())
+				publishSnapshotCacheMetrics(m, snapshotRepo.SeriesCacheStatistics())
+				publishReportCacheMetrics(m, reportSvc.ReportCacheStatistics())
+			})
+		}
 		if cfg.EnableDailySync {
 			syncScheduler.Start()
 		} else {
@@ -521,16 +622,83 @@ func main() {
 	logger.Info("graceful shutdown completed")
 }
 
-func connectDatabase(ctx context.Context, cfg *config.Config, logger *zap.Logger) *pgxpool.Pool {
+// publishConcurrencyMetrics exports the adaptive sync limits: current
+// limit, occupancy, and how often / why each limit moved.
+func publishConcurrencyMetrics(m *metrics.Metrics, limiters []*concurrency.Limiter) {
+	for _, l := range limiters {
+		st := l.Stats()
+		m.SetGauge("sync_concurrency_limit", float64(st.Limit), st.Name)
+		m.SetGauge("sync_concurrency_in_flight", float64(st.InFlight), st.Name)
+		m.SetGauge("sync_concurrency_waiting", float64(st.Waiting), st.Name)
+		m.SetGauge("sync_concurrency_live_heap_bytes", float64(st.LiveHeap), st.Name)
+		for kind, n := range st.Adjustments {
+			m.SetGauge("sync_concurrency_adjustments", float64(n), st.Name, kind)
+		}
+		if !st.LastChange.IsZero() {
+			m.SetGauge("sync_concurrency_last_change_timestamp_seconds", float64(st.LastChange.Unix()), st.Name, st.LastReason)
+		}
+	}
+}
+
+// publishGovernorMetrics exports the shared per-exchange request budgets:
+// requests paced, cumulative time spent waiting for tokens, and how many
+// 429 / 418 cooldowns each host has imposed.
+func publishGovernorMetrics(m *metrics.Metrics, g *connector.Governor) {
+	for _, st := range g.Stats() {
+		m.SetGauge("exchange_governor_tokens", st.Tokens, st.Host)
+		m.SetGauge("exchange_governor_requests", float64(st.Requests), st.Host)
+		m.SetGauge("exchange_governor_wait_seconds", st.Waited.Seconds(), st.Host)
+		m.SetGauge("exchange_governor_cooldowns", float64(st.Cooldowns), st.Host)
+	}
+}
+
+// publishFlexCacheMetrics exports the size and effectiveness of the shared
+// IBKR Flex report cache.
+func publishFlexCacheMetrics(m *metrics.Metrics, st connector.FlexCacheStats) {
+	m.SetGauge("ibkr_flex_cache_bytes", float64(st.Bytes))
+	m.SetGauge("ibkr_flex_cache_max_bytes", float64(st.MaxBytes))
+	m.SetGauge("ibkr_flex_cache_entries", float64(st.Entries))
+	m.SetGauge("ibkr_flex_cache_evictions", float64(st.Evictions))
+	m.SetGauge("ibkr_flex_cache_lookups", float64(st.Hits), "hit")
+	m.SetGauge("ibkr_flex_cache_lookups", float64(st.Misses), "miss")
+}
+
+// publishSnapshotCacheMetrics exports the size and effectiveness of the
+// per-user snapshot series cache.
+func publishSnapshotCacheMetrics(m *metrics.Metrics, st repository.SnapshotCacheStats) {
+	m.SetGauge("snapshot_series_cache_bytes", float64(st.Bytes))
+	m.SetGauge("snapshot_series_cache_max_bytes", float64(st.MaxBytes))
+	m.SetGauge("snapshot_series_cache_users", float64(st.Users))
+	m.SetGauge("snapshot_series_cache_evictions", float64(st.Evictions))
+	m.SetGauge("snapshot_series_cache_invalidations", float64(st.Invalidations))
+	m.SetGauge("snapshot_series_cache_lookups", float64(st.Hits), "hit")
+	m.SetGauge("snapshot_series_cache_lookups", float64(st.Misses), "miss")
+}
+
+func publishReportCacheMetrics(m *metrics.Metrics, st service.ReportCacheStats) {
+	m.SetGauge("report_cache_bytes", float64(st.Bytes))
+	m.SetGauge("report_cache_max_bytes", float64(st.MaxBytes))
+	m.SetGauge("report_cache_reports", float64(st.Reports))
+	m.SetGauge("report_cache_evictions", float64(st.Evictions))
+	m.SetGauge("report_cache_invalidations", float64(st.Invalidations))
+	m.SetGauge("report_cache_lookups", float64(st.Hits), "hit")
+	m.SetGauge("report_cache_lookups", float64(st.Misses), "miss")
+}
+
+// connectDatabase returns the pool and its schema descriptor, loaded once
+// after migrations so every repository picks its SQL variants from the same
+// single information_schema pass. The schema is nil when it could not be
+// read; repositories then detect their schema themselves.
+func connectDatabase(ctx context.Context, cfg *config.Config, logger *zap.Logger) (*pgxpool.Pool, *db.Schema) {
 	if cfg.DatabaseURL == "" {
 		logger.Warn("DATABASE_URL not set, running without database")
-		return nil
+		return nil, nil
 	}
 
 	pool, err := db.Connect(ctx, cfg.DatabaseURL, logger)
 	if err != nil {
 		logger.Error("database connection failed, running without database", zap.Error(err))
-		return nil
+		return nil, nil
 	}
 
 	if cfg.AutoMigrate {
@@ -540,11 +708,18 @@ func connectDatabase(ctx context.Context, cfg *config.Config, logger *zap.Logger
 				zap.Error(err),
 			)
 			pool.Close()
-			return nil
+			return nil, nil
 		}
 	}
 
-	return pool
+	schema, err := db.LoadSchema(ctx, pool)
+	if err != nil {
+		logger.Warn("schema probe failed, repositories will detect it lazily", zap.Error(err))
+		return pool, nil
+	}
+	// Audit critical parity columns at startup.
+	schema.Audit(logger)
+	return pool, schema
 }
 
 func buildGRPCTLSConfig(cfg *config.Config) (*tls.Config, error) {
@@ -634,6 +809,20 @@ func buildClientCNVerifier(allowlist []string) func([][]byte, [][]*x509.Certific
 	}
 }
 
+// ensureSnapshotPartitions creates the missing snapshot_data partitions up
+// to monthsAhead months from now. Errors are logged: writes keep landing in
+// the default partition until a later run succeeds.
+func ensureSnapshotPartitions(ctx context.Context, repo *repository.SnapshotRepo, monthsAhead int, logger *zap.Logger) {
+	created, err := repo.EnsurePartitions(ctx, time.Now(), monthsAhead)
+	if err != nil {
+		logger.Warn("snapshot partition upkeep failed", zap.Error(err))
+		return
+	}
+	if len(created) > 0 {
+		logger.Info("snapshot partitions created", zap.Strings("partitions", created))
+	}
+}
+
 // refreshSignerAttestation fetches a fresh SEV-SNP attestation and rebinds
 // it to the signer (SEC-112). Called once at startup (initial=true) and then
 // periodically by the re-attestation goroutine. A transient fetch failure is
@@ -0,0 +1,109 @@
+package cache
+
+import (
+	"container/list"
+	"time"
+)
+
+// LRU is a least-recently-used map bounded by the estimated size of its
+// values rather than their number, with an optional TTL. It is the storage
+// shared by the in-process caches that hold large decoded values (the
+// snapshot series and signed report caches); they keep their own lock
+// around it together with their invalidation state, so LRU itself is not
+// safe for concurrent use.
+type LRU[K comparable, V any] struct {
+	items     map[K]*list.Element
+	order     *list.List // of *lruItem[K, V], most recently used first
+	bytes     int64
+	maxBytes  int64
+	ttl       time.Duration
+	now       func() time.Time
+	onRemove  func(K, V)
+	evictions int64
+}
+
+type lruItem[K comparable, V any] struct {
+	key     K
+	value   V
+	size    int64
+	addedAt time.Time
+}
+
+// NewLRU returns an LRU holding at most maxBytes of values, each for at most
+// ttl (0 = no expiry) as measured by now. onRemove, when non-nil, is called
+// with every value that leaves the LRU, whatever the reason.
+func NewLRU[K comparable, V any](maxBytes int64, ttl time.Duration, now func() time.Time, onRemove func(K, V)) *LRU[K, V] {
+	return &LRU[K, V]{
+		items:    make(map[K]*list.Element),
+		order:    list.New(),
+		maxBytes: maxBytes,
+		ttl:      ttl,
+		now:      now,
+		onRemove: onRemove,
+	}
+}
+
+// Get returns the value under key and marks it most recently used. An
+// expired value is removed and reported missing.
+func (c *LRU[K, V]) Get(key K) (V, bool) {
+	elem, ok := c.items[key]
+	if !ok {
+		var zero V
+		return zero, false
+	}
+	item := elem.Value.(*lruItem[K, V])
+	if c.ttl > 0 && c.now().Sub(item.addedAt) > c.ttl {
+		c.remove(elem)
+		var zero V
+		return zero, false
+	}
+	c.order.MoveToFront(elem)
+	return item.value, true
+}
+
+// Add stores value under key, replacing any previous value, then evicts the
+// least recently used values until the LRU fits its budget. A value larger
+// than the whole budget is not stored, and Add returns false.
+func (c *LRU[K, V]) Add(key K, value V, size int64) bool {
+	if size > c.maxBytes {
+		return false
+	}
+	c.Remove(key)
+	c.items[key] = c.order.PushFront(&lruItem[K, V]{key: key, value: value, size: size, addedAt: c.now()})
+	c.bytes += size
+	for c.bytes > c.maxBytes {
+		c.remove(c.order.Back())
+		c.evictions++
+	}
+	return true
+}
+
+// Remove drops the value under key, reporting whether there was one.
+func (c *LRU[K, V]) Remove(key K) bool {
+	elem, ok := c.items[key]
+	if ok {
+		c.remove(elem)
+	}
+	return ok
+}
+
+func (c *LRU[K, V]) remove(elem *list.Element) {
+	item := c.order.Remove(elem).(*lruItem[K, V])
+	delete(c.items, item.key)
+	c.bytes -= item.size
+	if c.onRemove != nil {
+		c.onRemove(item.key, item.value)
+	}
+}
+
+// Len returns the number of values held, expired ones included.
+func (c *LRU[K, V]) Len() int { return len(c.items) }
+
+// Bytes returns the summed size of the values held.
+func (c *LRU[K, V]) Bytes() int64 { return c.bytes }
+
+// MaxBytes returns the budget.
+func (c *LRU[K, V]) MaxBytes() int64 { return c.maxBytes }
+
+// Evictions returns how many values were evicted to fit the budget.
+func (c *LRU[K, V]) Evictions() int64 { return c.evictions }
@@ -0,0 +1,437 @@
+// Package concurrency provides the adaptive (AIMD) concurrency limits used by
+// the daily sync: one for concurrent user syncs in the scheduler and one for
+// the per-user connection fan-out in SyncService.
+//
+// A Limiter behaves like a counting semaphore whose capacity moves at
+// runtime. Every finished task reports its latency and outcome; once per
+// evaluation window the limiter either widens by one slot (additive
+// increase) when tasks queued behind a healthy limit, or narrows
+// multiplicatively when it sees memory pressure (live heap from
+// runtime/metrics), exchange rate limiting (HTTP 429), a high error rate, or
+// latency well above the observed baseline.
+package concurrency
+
+import (
+	"context"
+	"math"
+	"os"
+	"runtime/debug"
+	"runtime/metrics"
+	"strconv"
+	"strings"
+	"sync"
+	"time"
+)
+
+// Outcome classifies a finished task for the controller.
+type Outcome int
+
+const (
+	OutcomeOK Outcome = iota
+	OutcomeError
+	OutcomeRateLimited
+)
+
+// Adjustment reasons, exposed as metric labels.
+const (
+	ReasonHeadroom     = "headroom"
+	ReasonHeapPressure = "heap_pressure"
+	ReasonRateLimited  = "rate_limited"
+	ReasonErrors       = "errors"
+	ReasonLatency      = "latency"
+)
+
+// Config tunes a Limiter. Zero values take the defaults noted per field.
+type Config struct {
+	// Name labels the limiter in metrics ("scheduler_users", "user_connections").
+	Name string
+	// Initial, Min and Max bound the limit. Initial defaults to Min,
+	// Min defaults to 1, Max defaults to 4×Initial.
+	Initial int
+	Min     int
+	Max     int
+	// Window is the evaluation interval. Default 15s.
+	Window time.Duration
+	// MinSamples is the number of finished tasks a window needs before the
+	// error/latency signals are trusted. Default 4.
+	MinSamples int
+	// ErrorRate above which the limit is cut. Default 0.25.
+	ErrorRate float64
+	// RateLimitedRate (share of 429 outcomes) above which the limit is cut.
+	// Default 0.05 — a few 429s already mean the exchange wants us slower.
+	RateLimitedRate float64
+	// LatencyTolerance: window mean latency above baseline×tolerance cuts
+	// the limit. Default 2.0.
+	LatencyTolerance float64
+	// Backoff is the multiplicative decrease factor. Default 0.7.
+	Backoff float64
+	// HeapHighWatermark is the live-heap share of HeapCeiling above which the
+	// limit is cut (and never raised). Default 0.75.
+	HeapHighWatermark float64
+	// HeapCeiling in bytes. 0 = GOMEMLIMIT if set, else the cgroup v2
+	// memory.max of the guest, else the heap signal is disabled.
+	HeapCeiling uint64
+}
+
+func (c Config) withDefaults() Config {
+	if c.Min <= 0 {
+		c.Min = 1
+	}
+	if c.Initial < c.Min {
+		c.Initial = c.Min
+	}
+	if c.Max <= 0 {
+		c.Max = 4 * c.Initial
+	}
+	if c.Max < c.Initial {
+		c.Max = c.Initial
+	}
+	if c.Window <= 0 {
+		c.Window = 15 * time.Second
+	}
+	if c.MinSamples <= 0 {
+		c.MinSamples = 4
+	}
+	if c.ErrorRate <= 0 {
+		c.ErrorRate = 0.25
+	}
+	if c.RateLimitedRate <= 0 {
+		c.RateLimitedRate = 0.05
+	}
+	if c.LatencyTolerance <= 1 {
+		c.LatencyTolerance = 2.0
+	}
+	if c.Backoff <= 0 || c.Backoff >= 1 {
+		c.Backoff = 0.7
+	}
+	if c.HeapHighWatermark <= 0 || c.HeapHighWatermark > 1 {
+		c.HeapHighWatermark = 0.75
+	}
+	if c.HeapCeiling == 0 {
+		c.HeapCeiling = detectHeapCeiling()
+	}
+	return c
+}
+
+// Stats is a point-in-time view of a Limiter for metrics and logs.
+type Stats struct {
+	Name        string
+	Limit       int
+	InFlight    int
+	Waiting     int
+	LiveHeap    uint64
+	HeapCeiling uint64
+	LastReason  string
+	LastChange  time.Time
+	// Adjustments counts limit changes by "increase:<reason>" /
+	// "decrease:<reason>".
+	Adjustments map[string]uint64
+}
+
+// Limiter is an adaptive counting semaphore. Safe for concurrent use.
+type Limiter struct {
+	cfg Config
+
+	mu       sync.Mutex
+	limit    int
+	inFlight int // slots taken via Limiter.Acquire
+	active   int // all slots taken, including through Scopes
+	waiting  int
+	wake     chan struct{} // closed and replaced whenever a slot may be free
+
+	// Current window.
+	windowStart time.Time
+	samples     int
+	errors      int
+	rateLimited int
+	latencySum  time.Duration
+	saturated   bool // a caller had to wait during this window
+
+	baseline    time.Duration // lowest window mean latency seen, slowly decaying
+	liveHeap    uint64
+	lastReason  string
+	lastChange  time.Time
+	adjustments map[string]uint64
+
+	// onAdjust, when set, is called (outside the lock) after every change.
+	onAdjust func(name string, from, to int, reason string)
+
+	now      func() time.Time
+	readHeap func() uint64
+}
+
+// New creates a Limiter starting at cfg.Initial.
+func New(cfg Config) *Limiter {
+	cfg = cfg.withDefaults()
+	return &Limiter{
+		cfg:         cfg,
+		limit:       cfg.Initial,
+		wake:        make(chan struct{}),
+		windowStart: time.Now(),
+		adjustments: make(map[string]uint64),
+		now:         time.Now,
+		readHeap:    readLiveHeap,
+	}
+}
+
+// OnAdjust registers a callback fired after every limit change (logging).
+func (l *Limiter) OnAdjust(fn func(name string, from, to int, reason string)) {
+	l.mu.Lock()
+	l.onAdjust = fn
+	l.mu.Unlock()
+}
+
+// Acquire blocks until a slot is free or ctx is done.
+func (l *Limiter) Acquire(ctx context.Context) error {
+	return l.acquire(ctx, &l.inFlight)
+}
+
+// Release frees the slot taken by Acquire and records how the task went.
+func (l *Limiter) Release(latency time.Duration, outcome Outcome) {
+	l.release(&l.inFlight, latency, outcome)
+}
+
+// ReleaseUnused frees a slot taken by Acquire without recording an outcome,
+// for callers that acquired a slot and then found no work to do.
+func (l *Limiter) ReleaseUnused() {
+	l.mu.Lock()
+	l.inFlight--
+	l.active--
+	l.broadcastLocked()
+	l.mu.Unlock()
+}
+
+// Scope is a per-caller slice of a Limiter: each Scope may run up to the
+// limiter's current limit concurrently, independently of other scopes, while
+// every outcome feeds the shared AIMD state. Used where the limit is "per
+// unit of work" — e.g. at most N connections in flight per user, with N
+// learned across all users.
+type Scope struct {
+	l        *Limiter
+	inFlight int
+}
+
+// Scope returns a new independent slice of l.
+func (l *Limiter) Scope() *Scope {
+	return &Scope{l: l}
+}
+
+// Acquire blocks until the scope has a free slot or ctx is done.
+func (s *Scope) Acquire(ctx context.Context) error {
+	return s.l.acquire(ctx, &s.inFlight)
+}
+
+// Release frees the slot taken by Acquire and records how the task went.
+func (s *Scope) Release(latency time.Duration, outcome Outcome) {
+	s.l.release(&s.inFlight, latency, outcome)
+}
+
+// acquire waits until *gate is below the limit, then takes a slot. gate is
+// either the limiter-wide counter or a Scope's; both are guarded by l.mu.
+func (l *Limiter) acquire(ctx context.Context, gate *int) error {
+	l.mu.Lock()
+	waited := false
+	for *gate >= l.limit {
+		if !waited {
+			waited = true
+			l.waiting++
+		}
+		l.saturated = true
+		wake := l.wake
+		l.mu.Unlock()
+
+		select {
+		case <-ctx.Done():
+			l.mu.Lock()
+			l.waiting--
+			l.mu.Unlock()
+			return ctx.Err()
+		case <-wake:
+		}
+		l.mu.Lock()
+	}
+	if waited {
+		l.waiting--
+	}
+	*gate++
+	l.active++
+	l.mu.Unlock()
+	return nil
+}
+
+func (l *Limiter) release(gate *int, latency time.Duration, outcome Outcome) {
+	l.mu.Lock()
+	*gate--
+	l.active--
+	l.samples++
+	l.latencySum += latency
+	switch outcome {
+	case OutcomeError:
+		l.errors++
+	case OutcomeRateLimited:
+		l.rateLimited++
+	}
+
+	var from, to int
+	var reason string
+	if l.now().Sub(l.windowStart) >= l.cfg.Window {
+		from, to, reason = l.evaluateLocked()
+	}
+	l.broadcastLocked()
+	hook := l.onAdjust
+	name := l.cfg.Name
+	l.mu.Unlock()
+
+	if hook != nil && from != to {
+		hook(name, from, to, reason)
+	}
+}
+
+// Limit returns the current limit.
+func (l *Limiter) Limit() int {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+	return l.limit
+}
+
+// Max returns the configured upper bound — the most tasks that can ever run
+// concurrently, e.g. the worker pool size a caller needs to saturate it.
+func (l *Limiter) Max() int {
+	return l.cfg.Max
+}
+
+// Stats returns a snapshot for metrics.
+func (l *Limiter) Stats() Stats {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+	adj := make(map[string]uint64, len(l.adjustments))
+	for k, v := range l.adjustments {
+		adj[k] = v
+	}
+	return Stats{
+		Name:        l.cfg.Name,
+		Limit:       l.limit,
+		InFlight:    l.active,
+		Waiting:     l.waiting,
+		LiveHeap:    l.liveHeap,
+		HeapCeiling: l.cfg.HeapCeiling,
+		LastReason:  l.lastReason,
+		LastChange:  l.lastChange,
+		Adjustments: adj,
+	}
+}
+
+// evaluateLocked closes the current window and applies AIMD. Returns the
+// old and new limit and the reason; from == to means no change.
+func (l *Limiter) evaluateLocked() (int, int, string) {
+	from := l.limit
+	to := from
+	reason := ""
+
+	l.liveHeap = l.readHeap()
+	heapHigh := l.cfg.HeapCeiling > 0 &&
+		float64(l.liveHeap) > l.cfg.HeapHighWatermark*float64(l.cfg.HeapCeiling)
+
+	var mean time.Duration
+	enough := l.samples >= l.cfg.MinSamples
+	if l.samples > 0 {
+		mean = l.latencySum / time.Duration(l.samples)
+	}
+
+	switch {
+	case heapHigh:
+		reason = ReasonHeapPressure
+	case l.samples > 0 && float64(l.rateLimited)/float64(l.samples) > l.cfg.RateLimitedRate:
+		reason = ReasonRateLimited
+	case enough && float64(l.errors)/float64(l.samples) > l.cfg.ErrorRate:
+		reason = ReasonErrors
+	case enough && l.baseline > 0 && float64(mean) > l.cfg.LatencyTolerance*float64(l.baseline):
+		reason = ReasonLatency
+	}
+
+	if reason != "" {
+		to = int(math.Floor(float64(from) * l.cfg.Backoff))
+		if to < l.cfg.Min {
+			to = l.cfg.Min
+		}
+	} else if l.saturated && from < l.cfg.Max {
+		to = from + 1
+		reason = ReasonHeadroom
+	}
+
+	// Track the latency baseline from healthy windows only, decaying it
+	// upward by 5% per window so a permanently slower upstream is
+	// eventually accepted as the new normal.
+	if enough && reason != ReasonErrors && reason != ReasonRateLimited {
+		if l.baseline == 0 || mean < l.baseline {
+			l.baseline = mean
+		} else {
+			l.baseline += l.baseline / 20
+		}
+	}
+
+	if to != from {
+		l.limit = to
+		l.lastReason = reason
+		l.lastChange = l.now()
+		dir := "increase"
+		if to < from {
+			dir = "decrease"
+		}
+		l.adjustments[dir+":"+reason]++
+	}
+
+	l.windowStart = l.now()
+	l.samples, l.errors, l.rateLimited = 0, 0, 0
+	l.latencySum = 0
+	l.saturated = l.waiting > 0
+	return from, to, reason
+}
+
+// broadcastLocked wakes every waiter so they re-check the limit.
+func (l *Limiter) broadcastLocked() {
+	close(l.wake)
+	l.wake = make(chan struct{})
+}
+
+// ClassifyError maps a sync error message onto an Outcome. Connectors embed
+// the upstream status as "HTTP 429: ..." (see CryptoBase.DoRequest); a few
+// venues only say "rate limit" in the body.
+func ClassifyError(msg string) Outcome {
+	if msg == "" {
+		return OutcomeOK
+	}
+	lower := strings.ToLower(msg)
+	if strings.Contains(lower, "http 429") || strings.Contains(lower, "rate limit") ||
+		strings.Contains(lower, "too many requests") {
+		return OutcomeRateLimited
+	}
+	return OutcomeError
+}
+
+// readLiveHeap returns the heap bytes marked live by the last GC.
+func readLiveHeap() uint64 {
+	sample := []metrics.Sample{{Name: "/gc/heap/live:bytes"}}
+	metrics.Read(sample)
+	if sample[0].Value.Kind() != metrics.KindUint64 {
+		return 0
+	}
+	return sample[0].Value.Uint64()
+}
+
+// detectHeapCeiling returns GOMEMLIMIT when set, else the cgroup v2 memory
+// limit of the guest, else 0 (unknown: heap signal disabled).
+func detectHeapCeiling() uint64 {
+	if limit := debug.SetMemoryLimit(-1); limit > 0 && limit != math.MaxInt64 {
+		return uint64(limit)
+	}
+	raw, err := os.ReadFile("/sys/fs/cgroup/memory.max")
+	if err != nil {
+		return 0
+	}
+	v, err := strconv.ParseUint(strings.TrimSpace(string(raw)), 10, 64)
+	if err != nil { // "max" = unlimited
+		return 0
+	}
+	return v
+}
@@ -0,0 +1,90 @@
+package concurrency
+
+import (
+	"context"
+	"testing"
+	"time"
+)
+
+// newTestLimiter returns a limiter driven by a fake clock and heap reading.
+func newTestLimiter(cfg Config, heap *uint64) (*Limiter, *time.Time) {
+	cfg.HeapCeiling = 1000
+	l := New(cfg)
+	clock := time.Date(2026, 1, 1, 0, 0, 0, 0, time.UTC)
+	l.now = func() time.Time { return clock }
+	l.readHeap = func() uint64 { return *heap }
+	l.windowStart = clock
+	return l, &clock
+}
+
+func TestLimiter_AdditiveIncreaseWhenSaturated(t *testing.T) {
+	heap := uint64(100)
+	l, clock := newTestLimiter(Config{Name: "t", Initial: 2, Max: 4, Window: time.Second}, &heap)
+	ctx := context.Background()
+
+	_ = l.Acquire(ctx)
+	_ = l.Acquire(ctx)
+	// Third caller queues behind the limit.
+	ctx3, cancel := context.WithTimeout(ctx, 10*time.Millisecond)
+	defer cancel()
+	if err := l.Acquire(ctx3); err == nil {
+		t.Fatal("expected third Acquire to block until ctx deadline")
+	}
+
+	*clock = clock.Add(2 * time.Second)
+	l.Release(time.Second, OutcomeOK)
+	if got := l.Limit(); got != 3 {
+		t.Fatalf("limit = %d, want 3 after saturated healthy window", got)
+	}
+	if st := l.Stats(); st.LastReason != ReasonHeadroom || st.Adjustments["increase:headroom"] != 1 {
+		t.Fatalf("unexpected stats: %+v", st)
+	}
+}
+
+func TestLimiter_MultiplicativeDecreaseOnRateLimit(t *testing.T) {
+	heap := uint64(100)
+	l, clock := newTestLimiter(Config{Name: "t", Initial: 10, Min: 2, Window: time.Second}, &heap)
+
+	for i := 0; i < 4; i++ {
+		_ = l.Acquire(context.Background())
+	}
+	l.Release(time.Second, OutcomeRateLimited)
+	l.Release(time.Second, OutcomeOK)
+	l.Release(time.Second, OutcomeOK)
+	*clock = clock.Add(2 * time.Second)
+	l.Release(time.Second, OutcomeOK)
+
+	if got := l.Limit(); got != 7 {
+		t.Fatalf("limit = %d, want 7 (10 × 0.7)", got)
+	}
+	if st := l.Stats(); st.LastReason != ReasonRateLimited {
+		t.Fatalf("reason = %q, want %q", st.LastReason, ReasonRateLimited)
+	}
+}
+
+func TestLimiter_HeapPressureNeverGoesBelowMin(t *testing.T) {
+	heap := uint64(900) // 90% of the 1000-byte test ceiling
+	l, clock := newTestLimiter(Config{Name: "t", Initial: 2, Min: 2, Window: time.Second}, &heap)
+
+	_ = l.Acquire(context.Background())
+	*clock = clock.Add(2 * time.Second)
+	l.Release(time.Second, OutcomeOK)
+
+	if got := l.Limit(); got != 2 {
+		t.Fatalf("limit = %d, want Min=2", got)
+	}
+}
+
+func TestClassifyError(t *testing.T) {
+	cases := map[string]Outcome{
+		"":                                  OutcomeOK,
+		"get balance: HTTP 429: slow down":  OutcomeRateLimited,
+		"bybit: Rate limit exceeded":        OutcomeRateLimited,
+		"get credentials: decryption error": OutcomeError,
+	}
+	for msg, want := range cases {
+		if got := ClassifyError(msg); got != want {
+			t.Errorf("ClassifyError(%q) = %v, want %v", msg, got, want)
+		}
+	}
+}
@@ -28,6 +28,37 @@ type Config struct {
 	ExchangeHTTPProxy string
 	ProxyExchanges    string // Comma-separated list, default: "binance"
 
+	// Per-exchange request budgets overriding the connector defaults,
+	// "host=rate[:burst],..." (e.g. "api.binance.com=80:200").
+	ExchangeRateLimits string
+
+	// IBKR Flex pipeline: GetStatement requests the daily run keeps in
+	// flight, and the memory budget of the parsed-report cache.
+	IBKRFlexPollers    int
+	IBKRFlexCacheMaxMB int
+
+	// Per-user snapshot series cache: memory budget (0 disables it) and
+	// the age after which a series is reloaded regardless of writes, which
+	// bounds staleness for writes made by other replicas.
+	SnapshotCacheMaxMB int
+	SnapshotCacheTTL   time.Duration
+
+	// In-process signed report cache: memory budget (0 disables it) and
+	// the age after which a report is regenerated regardless of writes.
+	ReportCacheMaxMB int
+	ReportCacheTTL   time.Duration
+
+	// Derived daily return series (return_series table): how many snapshot
+	// filters are materialized per user (0 disables the series), and the
+	// age after which a series is rebuilt before it is read, which bounds
+	// staleness for snapshot writes made outside the sync.
+	ReturnSeriesMaxProfiles int
+	ReturnSeriesMaxAge      time.Duration
+
+	// Monthly snapshot_data partitions kept ahead of the current month when
+	// the table is partitioned (migrations/optional); 0 disables upkeep.
+	SnapshotPartitionMonthsAhead int
+
 	// CORS
 	CORSOrigin string // Comma-separated allowed origins
 
@@ -41,6 +72,21 @@ type Config struct {
 	EnableDailySync  bool
 	EnableLegacyREST bool
 
+	// EnableBulkMetrics serves the cross-user GetBulkPerformanceMetrics
+	// RPC (ENABLE_BULK_METRICS). It trusts the mTLS-authenticated gateway
+	// with every user's metrics, so it is off by default.
+	EnableBulkMetrics bool
+
+	// Sharded daily sync: when SyncSharded is true, every replica pointed at
+	// the same database splits the 00:00 UTC run through the sync_work_items
+	// queue instead of syncing all users itself. SyncWorkerID names this
+	// replica in the queue (empty = hostname-pid); SyncLease is how long a
+	// claimed user stays reserved without renewal before another replica may
+	// reclaim it. Parsed from SYNC_SHARDED, SYNC_WORKER_ID, SYNC_LEASE.
+	SyncSharded  bool
+	SyncWorkerID string
+	SyncLease    time.Duration
+
 	// Migrations
 	AutoMigrate   bool
 	MigrationsDir string
@@ -123,6 +169,21 @@ func Load() *Config {
 		ExchangeHTTPProxy: getEnv("EXCHANGE_HTTP_PROXY", ""),
 		ProxyExchanges:    getEnv("PROXY_EXCHANGES", "binance"),
 
+		ExchangeRateLimits: getEnv("EXCHANGE_RATE_LIMITS", ""),
+
+		IBKRFlexPollers:    getEnvInt("IBKR_FLEX_POLLERS", 4),
+		IBKRFlexCacheMaxMB: getEnvInt("IBKR_FLEX_CACHE_MAX_MB", 256),
+
+		SnapshotCacheMaxMB: getEnvInt("SNAPSHOT_CACHE_MAX_MB", 128),
+		SnapshotCacheTTL:   getEnvDuration("SNAPSHOT_CACHE_TTL", 15*time.Minute),
+		ReportCacheMaxMB:   getEnvInt("REPORT_CACHE_MAX_MB", 64),
+		ReportCacheTTL:     getEnvDuration("REPORT_CACHE_TTL", 15*time.Minute),
+
+		ReturnSeriesMaxProfiles: getEnvInt("RETURN_SERIES_MAX_PROFILES", 8),
+		ReturnSeriesMaxAge:      getEnvDuration("RETURN_SERIES_MAX_AGE", 15*time.Minute),
+
+		SnapshotPartitionMonthsAhead: getEnvInt("SNAPSHOT_PARTITION_MONTHS_AHEAD", 3),
+
 		CORSOrigin: getEnv("CORS_ORIGIN", ""),
 
 		BenchmarkServiceURL: getEnv("BENCHMARK_SERVICE_URL", ""),
@@ -132,6 +193,12 @@ func Load() *Config {
 		EnableDailySync:  getEnvBool("ENABLE_DAILY_SYNC", true),
 		EnableLegacyREST: getEnvBool("ENABLE_LEGACY_REST", false),
 
+		EnableBulkMetrics: getEnvBool("ENABLE_BULK_METRICS", false),
+
+		SyncSharded:  getEnvBool("SYNC_SHARDED", false),
+		SyncWorkerID: strings.TrimSpace(getEnv("SYNC_WORKER_ID", "")),
+		SyncLease:    getEnvDuration("SYNC_LEASE", 10*time.Minute),
+
 		AutoMigrate:   getEnvBool("AUTO_MIGRATE", false),
 		MigrationsDir: getEnv("MIGRATIONS_DIR", "migrations"),
 
@@ -59,7 +59,7 @@ func (a *Alpaca) doRequest(ctx context.Context, baseURL, path string) ([]byte, e
 	req.Header.Set("APCA-API-KEY-ID", a.apiKey)
 	req.Header.Set("APCA-API-SECRET-KEY", a.apiSecret)
 
-	resp, err := a.client.Do(req)
+	resp, err := doGoverned(a.client, req)
 	if err != nil {
 		return nil, err
 	}
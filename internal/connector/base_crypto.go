@@ -158,7 +158,7 @@ func NewCryptoBase(apiKey, apiSecret, baseURL string) CryptoBase {
 // Use DoRequestWithRetry for idempotent requests that should survive
 // transient 429 / 5xx responses (CONN-004).
 func (b *CryptoBase) DoRequest(req *http.Request) ([]byte, error) {
-	resp, err := b.Client.Do(req)
+	resp, err := doGoverned(b.Client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -193,7 +193,7 @@ func (b *CryptoBase) DoRequestWithRetry(req *http.Request) ([]byte, error) {
 	backoff := baseBackoff
 
 	for attempt := 1; attempt <= maxRetryAttempts; attempt++ {
-		resp, err := b.Client.Do(req)
+		resp, err := doGoverned(b.Client, req)
 		if err != nil {
 			// Network error — retry unless the context is already done.
 			lastErr = err
@@ -0,0 +1,185 @@
+package connector
+
+import (
+	"bytes"
+	"encoding/xml"
+	"fmt"
+	"testing"
+	"time"
+)
+
+// PERF-008: a sync used to xml.Unmarshal the cached Flex report once per
+// accessor (balance, positions, cashflows, historical snapshots, trades).
+// The benchmarks compare that against one streaming parseFlexReport pass on
+// a synthetic report shaped like a year of an active account: 365 equity
+// rows, 20k trades, 200 open positions, 500 cash transactions, plus the
+// unread sections (AccountInformation, StmtFunds) that pad real reports.
+
+func makeFlexReportForBench() []byte {
+	var b bytes.Buffer
+	day := time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC)
+	b.WriteString(`<FlexQueryResponse queryName="perf" type="AF"><FlexStatements count="1"><FlexStatement accountId="U1234567">`)
+	b.WriteString(`<AccountInformation accountId="U1234567" currency="USD" name="Perf"/>`)
+	b.WriteString("<EquitySummaryInBase>\n")
+	for d := 0; d < 365; d++ {
+		fmt.Fprintf(&b, `<EquitySummaryByReportDateInBase reportDate="%s" currency="USD" total="%d.25" cash="%d.5" stock="%d" options="120.5" commodities="0" unrealizedPnL="12.75" cfdUnrealizedPl="0" forexCfdUnrealizedPl="0"/>`+"\n",
+			day.AddDate(0, 0, d).Format("20060102"), 100000+d, 40000+d, 60000+d)
+	}
+	b.WriteString("</EquitySummaryInBase>\n<OpenPositions>\n")
+	for p := 0; p < 200; p++ {
+		fmt.Fprintf(&b, `<OpenPosition symbol="SYM%d" position="%d" markPrice="101.25" costBasisMoney="%d.5" fifoPnlUnrealized="3.5" assetCategory="STK"/>`+"\n", p, p+1, 100*(p+1))
+	}
+	b.WriteString("</OpenPositions>\n<CashTransactions>\n")
+	for c := 0; c < 500; c++ {
+		fmt.Fprintf(&b, `<CashTransaction type="Deposits/Withdrawals" amount="%d.5" currency="USD" dateTime="%s;120000"/>`+"\n",
+			c-250, day.AddDate(0, 0, c%365).Format("20060102"))
+	}
+	b.WriteString("</CashTransactions>\n<Trades>\n")
+	for t := 0; t < 20000; t++ {
+		fmt.Fprintf(&b, `<Trade tradeID="%d" symbol="SYM%d" buySell="BUY" tradePrice="101.25" quantity="10" ibCommission="-1" currency="USD" dateTime="%s;093000" assetCategory="STK" fifoPnlRealized="2.5"/>`+"\n",
+			t, t%200, day.AddDate(0, 0, t%365).Format("20060102"))
+	}
+	b.WriteString("</Trades>\n<StmtFunds>\n")
+	for s := 0; s < 20000; s++ {
+		fmt.Fprintf(&b, `<StatementOfFundsLine date="%s" activityCode="BUY" amount="-1013.5" balance="%d.5" description="Buy 10 SYM%d"/>`+"\n",
+			day.AddDate(0, 0, s%365).Format("20060102"), s, s%200)
+	}
+	b.WriteString("</StmtFunds>\n</FlexStatement></FlexStatements></FlexQueryResponse>")
+	return b.Bytes()
+}
+
+// legacyFlexUnmarshal decodes report the way the five accessors did before
+// PERF-008: one DOM unmarshal per accessor, each into its own model.
+func legacyFlexUnmarshal(report []byte) error {
+	type equityRow struct {
+		ReportDate           string `xml:"reportDate,attr"`
+		Currency             string `xml:"currency,attr"`
+		Total                string `xml:"total,attr"`
+		Cash                 string `xml:"cash,attr"`
+		Stock                string `xml:"stock,attr"`
+		Options              string `xml:"options,attr"`
+		Commodities          string `xml:"commodities,attr"`
+		UnrealizedPnL        string `xml:"unrealizedPnL,attr"`
+		CfdUnrealizedPl      string `xml:"cfdUnrealizedPl,attr"`
+		ForexCfdUnrealizedPl string `xml:"forexCfdUnrealizedPl,attr"`
+	}
+	type positionRow struct {
+		Symbol            string `xml:"symbol,attr"`
+		Position          string `xml:"position,attr"`
+		MarkPrice         string `xml:"markPrice,attr"`
+		CostBasisMoney    string `xml:"costBasisMoney,attr"`
+		FifoPnlUnrealized string `xml:"fifoPnlUnrealized,attr"`
+		AssetCategory     string `xml:"assetCategory,attr"`
+	}
+	type cashRow struct {
+		Type     string `xml:"type,attr"`
+		Amount   string `xml:"amount,attr"`
+		Currency string `xml:"currency,attr"`
+		DateTime string `xml:"dateTime,attr"`
+	}
+	type tradeRow struct {
+		TradeID         string `xml:"tradeID,attr"`
+		Symbol          string `xml:"symbol,attr"`
+		BuySell         string `xml:"buySell,attr"`
+		TradePrice      string `xml:"tradePrice,attr"`
+		Quantity        string `xml:"quantity,attr"`
+		IbCommission    string `xml:"ibCommission,attr"`
+		Currency        string `xml:"currency,attr"`
+		DateTime        string `xml:"dateTime,attr"`
+		AssetCategory   string `xml:"assetCategory,attr"`
+		FifoPnlRealized string `xml:"fifoPnlRealized,attr"`
+	}
+	var balance struct {
+		XMLName        xml.Name `xml:"FlexQueryResponse"`
+		FlexStatements struct {
+			FlexStatement struct {
+				AccountID           string `xml:"accountId,attr"`
+				EquitySummaryInBase struct {
+					Rows []equityRow `xml:"EquitySummaryByReportDateInBase"`
+				} `xml:"EquitySummaryInBase"`
+				OpenPositions struct {
+					Rows []positionRow `xml:"OpenPosition"`
+				} `xml:"OpenPositions"`
+			} `xml:"FlexStatement"`
+		} `xml:"FlexStatements"`
+	}
+	var positions struct {
+		XMLName        xml.Name `xml:"FlexQueryResponse"`
+		FlexStatements struct {
+			FlexStatement struct {
+				OpenPositions struct {
+					Rows []positionRow `xml:"OpenPosition"`
+				} `xml:"OpenPositions"`
+			} `xml:"FlexStatement"`
+		} `xml:"FlexStatements"`
+	}
+	var cashflows struct {
+		XMLName        xml.Name `xml:"FlexQueryResponse"`
+		FlexStatements struct {
+			FlexStatement struct {
+				CashTransactions struct {
+					Rows []cashRow `xml:"CashTransaction"`
+				} `xml:"CashTransactions"`
+			} `xml:"FlexStatement"`
+		} `xml:"FlexStatements"`
+	}
+	var historical struct {
+		XMLName        xml.Name `xml:"FlexQueryResponse"`
+		FlexStatements struct {
+			FlexStatement struct {
+				EquitySummaryInBase struct {
+					Rows []equityRow `xml:"EquitySummaryByReportDateInBase"`
+				} `xml:"EquitySummaryInBase"`
+			} `xml:"FlexStatement"`
+		} `xml:"FlexStatements"`
+	}
+	var trades struct {
+		XMLName        xml.Name `xml:"FlexQueryResponse"`
+		FlexStatements struct {
+			FlexStatement struct {
+				Trades struct {
+					Rows []tradeRow `xml:"Trade"`
+				} `xml:"Trades"`
+			} `xml:"FlexStatement"`
+		} `xml:"FlexStatements"`
+	}
+	// GetHistoricalSnapshots also re-parsed the cashflows.
+	historicalCashflows := cashflows
+	for _, v := range []any{&balance, &positions, &cashflows, &historical, &historicalCashflows, &trades} {
+		if err := xml.Unmarshal(report, v); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+func BenchmarkFlexReport_LegacyUnmarshalPerAccessor(b *testing.B) {
+	report := makeFlexReportForBench()
+	b.SetBytes(int64(len(report)))
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		if err := legacyFlexUnmarshal(report); err != nil {
+			b.Fatal(err)
+		}
+	}
+}
+
+func BenchmarkFlexReport_ParseOnce(b *testing.B) {
+	report := makeFlexReportForBench()
+	since := time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC)
+	b.SetBytes(int64(len(report)))
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		parsed, err := parseFlexReport(bytes.NewReader(report))
+		if err != nil {
+			b.Fatal(err)
+		}
+		(&IBKR{}).balanceFromReport(parsed)
+		positionsFromReport(parsed)
+		cashflowsFromReport(parsed, since)
+		historicalSnapshotsFromReport(parsed, since)
+		tradesFromReport(parsed, since, since.AddDate(1, 0, 0))
+	}
+}
@@ -22,6 +22,17 @@ const (
 	binancePathAccount = "/api/v3/account"
 )
 
+// binanceRequestWeights are the documented request weights of the endpoints
+// we call. Binance's IP limit is counted in weight, not requests, so the
+// governor (CONN-008) charges each call accordingly; unlisted paths cost 1.
+var binanceRequestWeights = map[string]int{
+	binancePathAccount:      20,
+	"/api/v3/myTrades":      20,
+	"/fapi/v2/balance":      5,
+	"/fapi/v2/positionRisk": 5,
+	"/fapi/v1/userTrades":   5,
+}
+
 // Binance implements Connector for Binance exchange.
 type Binance struct {
 	apiKey    string
@@ -62,6 +73,12 @@ func (b *Binance) sign(params url.Values) string {
 }
 
 func (b *Binance) doRequest(ctx context.Context, method, baseURL, path string, params url.Values, signed bool) ([]byte, error) {
+	// CONN-008: wait for the shared budget before timestamping so queueing
+	// cannot push the signature outside Binance's 5 s recvWindow.
+	ctx, err := DefaultGovernor().Pace(ctx, hostOf(baseURL), binanceRequestWeights[path])
+	if err != nil {
+		return nil, err
+	}
 	if signed {
 		params.Set("timestamp", strconv.FormatInt(time.Now().UnixMilli(), 10))
 		params.Set("signature", b.sign(params))
@@ -79,7 +96,7 @@ func (b *Binance) doRequest(ctx context.Context, method, baseURL, path string, p
 
 	req.Header.Set("X-MBX-APIKEY", b.apiKey)
 
-	resp, err := b.client.Do(req)
+	resp, err := doGoverned(b.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -244,25 +261,39 @@ func (b *Binance) GetPositions(ctx context.Context) ([]*Position, error) {
 }
 
 func (b *Binance) GetTrades(ctx context.Context, start, end time.Time) ([]*Trade, error) {
-	var allTrades []*Trade
+	return CollectTrades(ctx, b, start, end)
+}
 
+// StreamTrades implements TradeStreamer: every spot myTrades page (one per
+// symbol) and the futures userTrades page is handed to fn as soon as it is
+// parsed. As in GetTrades, a failed page is skipped rather than failing the
+// whole window.
+func (b *Binance) StreamTrades(ctx context.Context, start, end time.Time, fn func(batch []*Trade) error) error {
 	// Spot trades
-	spotTrades, err := b.getSpotTrades(ctx, start, end)
-	if err == nil {
-		allTrades = append(allTrades, spotTrades...)
+	if symbols, err := b.spotTradeSymbols(ctx); err == nil {
+		for _, symbol := range symbols {
+			page, err := b.getSpotTradesForSymbol(ctx, symbol, start, end)
+			if err != nil || len(page) == 0 {
+				continue
+			}
+			if err := fn(page); err != nil {
+				return err
+			}
+		}
 	}
 
 	// Futures trades
-	futuresTrades, err := b.getFuturesTrades(ctx, start, end)
-	if err == nil {
-		allTrades = append(allTrades, futuresTrades...)
+	if page, err := b.getFuturesTrades(ctx, start, end); err == nil && len(page) > 0 {
+		if err := fn(page); err != nil {
+			return err
+		}
 	}
-
-	return allTrades, nil
+	return nil
 }
 
-func (b *Binance) getSpotTrades(ctx context.Context, start, end time.Time) ([]*Trade, error) {
-	// Get active trading pairs first
+// spotTradeSymbols returns the USDT pairs of the assets the account holds,
+// the symbols whose spot trades are fetched.
+func (b *Binance) spotTradeSymbols(ctx context.Context) ([]string, error) {
 	params := url.Values{}
 	body, err := b.doRequest(ctx, "GET", binanceSpotAPI, binancePathAccount, params, true)
 	if err != nil {
@@ -277,22 +308,16 @@ func (b *Binance) getSpotTrades(ctx context.Context, start, end time.Time) ([]*T
 	}
 	json.Unmarshal(body, &account)
 
-	// Get trades for USDT pairs of assets with balance
-	var trades []*Trade
+	var symbols []string
 	for _, bal := range account.Balances {
 		free, _ := strconv.ParseFloat(bal.Free, 64)
 		if free < 0.001 || bal.Asset == "USDT" {
 			continue
 		}
-
-		symbol := bal.Asset + "USDT"
-		symbolTrades, err := b.getSpotTradesForSymbol(ctx, symbol, start, end)
-		if err == nil {
-			trades = append(trades, symbolTrades...)
-		}
+		symbols = append(symbols, bal.Asset+"USDT")
 	}
 
-	return trades, nil
+	return symbols, nil
 }
 
 func (b *Binance) getSpotTradesForSymbol(ctx context.Context, symbol string, start, end time.Time) ([]*Trade, error) {
@@ -42,6 +42,11 @@ func (b *Bybit) sign(timestamp, params string) string {
 }
 
 func (b *Bybit) doRequest(ctx context.Context, method, path, params string) ([]byte, error) {
+	// CONN-008: pace before timestamping (5 s X-BAPI-RECV-WINDOW).
+	ctx, err := DefaultGovernor().Pace(ctx, hostOf(bybitAPI), 1)
+	if err != nil {
+		return nil, err
+	}
 	timestamp := strconv.FormatInt(time.Now().UnixMilli(), 10)
 	signature := b.sign(timestamp, params)
 
@@ -60,7 +65,7 @@ func (b *Bybit) doRequest(ctx context.Context, method, path, params string) ([]b
 	req.Header.Set("X-BAPI-SIGN", signature)
 	req.Header.Set("X-BAPI-RECV-WINDOW", "5000")
 
-	resp, err := b.client.Do(req)
+	resp, err := doGoverned(b.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -714,7 +714,7 @@ func (c *CTrader) refreshAccessToken(ctx context.Context) error {
 	}
 	req.Header.Set("Content-Type", "application/x-www-form-urlencoded")
 
-	resp, err := c.httpClient.Do(req)
+	resp, err := doGoverned(c.httpClient, req)
 	if err != nil {
 		return err
 	}
@@ -322,7 +322,7 @@ func (d *Deribit) ensureToken(ctx context.Context) error {
 	basic := base64.StdEncoding.EncodeToString([]byte(d.apiKey + ":" + d.apiSecret))
 	req.Header.Set("Authorization", "Basic "+basic)
 
-	resp, err := d.client.Do(req)
+	resp, err := doGoverned(d.client, req)
 	if err != nil {
 		return err
 	}
@@ -382,7 +382,7 @@ func (d *Deribit) privateGET(ctx context.Context, path string, params url.Values
 	d.mu.Unlock()
 	req.Header.Set("Authorization", "Bearer "+token)
 
-	resp, err := d.client.Do(req)
+	resp, err := doGoverned(d.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -418,7 +418,7 @@ func (d *Deribit) publicGET(ctx context.Context, path string, params url.Values)
 		return nil, err
 	}
 
-	resp, err := d.client.Do(req)
+	resp, err := doGoverned(d.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -0,0 +1,323 @@
+package connector
+
+import (
+	"context"
+	"fmt"
+	"net/http"
+	"net/url"
+	"sort"
+	"strconv"
+	"strings"
+	"sync"
+	"time"
+)
+
+// ExchangeBudget is the request budget shared by every connector instance
+// that talks to one exchange host. Rate is in weight units per second (one
+// unit per request, or the weight passed to Pace); Burst is how many units
+// may be spent back-to-back after an idle period.
+type ExchangeBudget struct {
+	Rate  float64
+	Burst float64
+}
+
+// defaultExchangeBudgets holds the IP-wide budgets of the exchanges whose
+// limits are enforced per source address rather than per API key, set at
+// roughly 80% of the documented limit so the daily run leaves headroom for
+// the on-demand sync path. Hosts not listed here are not paced, but still
+// honour the 429 cooldown below.
+var defaultExchangeBudgets = map[string]ExchangeBudget{
+	"api.binance.com":    {Rate: 80, Burst: 200}, // 6000 weight / min
+	"fapi.binance.com":   {Rate: 32, Burst: 100}, // 2400 weight / min
+	"api.bybit.com":      {Rate: 50, Burst: 50},  // 600 req / 5 s
+	"www.okx.com":        {Rate: 8, Burst: 10},   // 20 req / 2 s on account endpoints
+	"api.mexc.com":       {Rate: 14, Burst: 14},  // /api/v3/myTrades ~20 req / s (CONN-006)
+	"www.deribit.com":    {Rate: 15, Burst: 30},  // 20 credits / s non-matching engine
+	"api.bitget.com":     {Rate: 8, Burst: 10},   // 10 req / s on account endpoints
+	"api.kucoin.com":     {Rate: 50, Burst: 100}, // 2000 req / 30 s
+	"api.gateio.ws":      {Rate: 15, Burst: 30},  // 200 req / 10 s
+	"api.huobi.pro":      {Rate: 8, Burst: 10},   // 10 req / s per endpoint group
+	"open-api.bingx.com": {Rate: 8, Burst: 10},   // 10 req / s
+}
+
+// isCooldownStatus reports the responses that mean "this IP is over budget":
+// 429 everywhere, 418 for Binance's automated IP ban.
+func isCooldownStatus(code int) bool {
+	return code == http.StatusTooManyRequests || code == http.StatusTeapot
+}
+
+// defaultCooldown is used when a 429 carries no Retry-After header.
+const defaultCooldown = 2 * time.Second
+
+// Governor paces outbound exchange requests with one token bucket per host,
+// shared process-wide (CONN-008). Before it, every connector instance paced
+// itself, so N concurrent syncs on the same exchange added their request
+// rates together and tripped the exchange's IP-wide limit. A 429 response
+// puts the whole host into a cooldown that every user waits out, instead of
+// each connector retrying into the same limit independently.
+type Governor struct {
+	mu      sync.Mutex
+	budgets map[string]ExchangeBudget
+	buckets map[string]*tokenBucket
+	now     func() time.Time
+}
+
+// GovernorStats is a point-in-time view of one host's bucket.
+type GovernorStats struct {
+	Host      string
+	Rate      float64
+	Burst     float64
+	Tokens    float64
+	Requests  uint64
+	Waited    time.Duration
+	Cooldowns uint64
+}
+
+type tokenBucket struct {
+	budget ExchangeBudget
+	tokens float64
+	// last is when tokens were last refilled. During a cooldown it is set
+	// in the future, so nothing accrues and every reservation waits for it.
+	last time.Time
+
+	requests  uint64
+	waited    time.Duration
+	cooldowns uint64
+}
+
+// NewGovernor returns a governor enforcing the given per-host budgets.
+func NewGovernor(budgets map[string]ExchangeBudget) *Governor {
+	g := &Governor{
+		budgets: make(map[string]ExchangeBudget, len(budgets)),
+		buckets: make(map[string]*tokenBucket),
+		now:     time.Now,
+	}
+	for host, b := range budgets {
+		g.budgets[strings.ToLower(host)] = b
+	}
+	return g
+}
+
+var defaultGovernor = NewGovernor(defaultExchangeBudgets)
+
+// DefaultGovernor returns the process-wide governor used by every connector.
+func DefaultGovernor() *Governor {
+	return defaultGovernor
+}
+
+// Configure sets (or, with a zero Rate, removes) the budget for host.
+// Takes effect for the next request to that host.
+func (g *Governor) Configure(host string, b ExchangeBudget) {
+	host = strings.ToLower(host)
+	g.mu.Lock()
+	defer g.mu.Unlock()
+	if b.Rate <= 0 {
+		delete(g.budgets, host)
+	} else {
+		if b.Burst < 1 {
+			b.Burst = 1
+		}
+		g.budgets[host] = b
+	}
+	if bucket, ok := g.buckets[host]; ok {
+		bucket.budget = g.budgets[host]
+		if bucket.tokens > bucket.budget.Burst {
+			bucket.tokens = bucket.budget.Burst
+		}
+	}
+}
+
+// Wait blocks until host's budget can pay for weight units or ctx is done.
+func (g *Governor) Wait(ctx context.Context, host string, weight float64) error {
+	wait := g.reserve(strings.ToLower(host), weight)
+	if wait <= 0 {
+		return nil
+	}
+	t := time.NewTimer(wait)
+	defer t.Stop()
+	select {
+	case <-ctx.Done():
+		g.refund(strings.ToLower(host), weight)
+		return ctx.Err()
+	case <-t.C:
+		return nil
+	}
+}
+
+// Cooldown stops all requests to host for d (from a 429's Retry-After).
+// Overlapping cooldowns keep the later deadline.
+func (g *Governor) Cooldown(host string, d time.Duration) {
+	g.mu.Lock()
+	defer g.mu.Unlock()
+	b := g.bucketLocked(strings.ToLower(host))
+	until := g.now().Add(d)
+	if until.After(b.last) {
+		b.last = until
+	}
+	if b.tokens > 0 {
+		b.tokens = 0
+	}
+	b.cooldowns++
+}
+
+type pacedKey struct{}
+
+// Pace waits for host's budget up front and returns a context whose requests
+// Do will not pace again. Connectors that sign a timestamp with a short
+// receive window (Binance, Bybit: 5 s) call it before signing, so time spent
+// queued or in a cooldown cannot push the request outside the window.
+func (g *Governor) Pace(ctx context.Context, host string, weight int) (context.Context, error) {
+	w := float64(weight)
+	if w < 1 {
+		w = 1
+	}
+	if err := g.Wait(ctx, host, w); err != nil {
+		return ctx, err
+	}
+	return context.WithValue(ctx, pacedKey{}, true), nil
+}
+
+// Do paces req against its host's budget at one unit (unless its context
+// came from Pace), sends it with client, and starts a host-wide cooldown
+// when the exchange answers 429 / 418.
+func (g *Governor) Do(client *http.Client, req *http.Request) (*http.Response, error) {
+	ctx := req.Context()
+	if paced, _ := ctx.Value(pacedKey{}).(bool); !paced {
+		if err := g.Wait(ctx, req.URL.Hostname(), 1); err != nil {
+			return nil, err
+		}
+	}
+	resp, err := client.Do(req)
+	if err == nil && isCooldownStatus(resp.StatusCode) {
+		g.Cooldown(req.URL.Hostname(), parseRetryAfter(resp.Header, defaultCooldown))
+	}
+	return resp, err
+}
+
+// Stats returns one entry per host seen so far, sorted by host.
+func (g *Governor) Stats() []GovernorStats {
+	g.mu.Lock()
+	defer g.mu.Unlock()
+	now := g.now()
+	out := make([]GovernorStats, 0, len(g.buckets))
+	for host, b := range g.buckets {
+		b.refill(now)
+		out = append(out, GovernorStats{
+			Host:      host,
+			Rate:      b.budget.Rate,
+			Burst:     b.budget.Burst,
+			Tokens:    b.tokens,
+			Requests:  b.requests,
+			Waited:    b.waited,
+			Cooldowns: b.cooldowns,
+		})
+	}
+	sort.Slice(out, func(i, j int) bool { return out[i].Host < out[j].Host })
+	return out
+}
+
+// reserve takes weight units now (the balance may go negative, which queues
+// later callers behind this one) and returns how long the caller must wait
+// before sending.
+func (g *Governor) reserve(host string, weight float64) time.Duration {
+	g.mu.Lock()
+	defer g.mu.Unlock()
+	now := g.now()
+	b := g.bucketLocked(host)
+	b.refill(now)
+	b.requests++
+
+	var wait time.Duration
+	if b.last.After(now) {
+		wait = b.last.Sub(now) // cooldown in progress
+	}
+	if b.budget.Rate > 0 {
+		b.tokens -= weight
+		if b.tokens < 0 {
+			wait += time.Duration(-b.tokens / b.budget.Rate * float64(time.Second))
+		}
+	}
+	b.waited += wait
+	return wait
+}
+
+func (g *Governor) refund(host string, weight float64) {
+	g.mu.Lock()
+	defer g.mu.Unlock()
+	if b, ok := g.buckets[host]; ok && b.budget.Rate > 0 {
+		b.tokens += weight
+		if b.tokens > b.budget.Burst {
+			b.tokens = b.budget.Burst
+		}
+	}
+}
+
+func (g *Governor) bucketLocked(host string) *tokenBucket {
+	b, ok := g.buckets[host]
+	if !ok {
+		budget := g.budgets[host]
+		b = &tokenBucket{budget: budget, tokens: budget.Burst, last: g.now()}
+		g.buckets[host] = b
+	}
+	return b
+}
+
+func (b *tokenBucket) refill(now time.Time) {
+	if !now.After(b.last) {
+		return
+	}
+	if b.budget.Rate > 0 {
+		b.tokens += now.Sub(b.last).Seconds() * b.budget.Rate
+		if b.tokens > b.budget.Burst {
+			b.tokens = b.budget.Burst
+		}
+	}
+	b.last = now
+}
+
+// hostOf returns the host part of an API base URL ("https://api.bybit.com"
+// → "api.bybit.com"), the key the governor's budgets are configured by.
+func hostOf(baseURL string) string {
+	if u, err := url.Parse(baseURL); err == nil && u.Host != "" {
+		return u.Hostname()
+	}
+	return baseURL
+}
+
+// doGoverned sends req through the process-wide governor. Every connector
+// uses it in place of client.Do so all users share one budget per exchange.
+func doGoverned(client *http.Client, req *http.Request) (*http.Response, error) {
+	return defaultGovernor.Do(client, req)
+}
+
+// ParseExchangeBudgets parses "host=rate[:burst],..." (e.g.
+// "api.binance.com=80:200,www.okx.com=8"). Burst defaults to rate; a rate
+// of 0 disables pacing for that host.
+func ParseExchangeBudgets(spec string) (map[string]ExchangeBudget, error) {
+	out := make(map[string]ExchangeBudget)
+	for _, part := range strings.Split(spec, ",") {
+		part = strings.TrimSpace(part)
+		if part == "" {
+			continue
+		}
+		host, val, ok := strings.Cut(part, "=")
+		host = strings.TrimSpace(host)
+		if !ok || host == "" {
+			return nil, fmt.Errorf("invalid exchange budget %q: want host=rate[:burst]", part)
+		}
+		rateStr, burstStr, hasBurst := strings.Cut(strings.TrimSpace(val), ":")
+		rate, err := strconv.ParseFloat(rateStr, 64)
+		if err != nil || rate < 0 {
+			return nil, fmt.Errorf("invalid rate in exchange budget %q", part)
+		}
+		burst := rate
+		if hasBurst {
+			burst, err = strconv.ParseFloat(burstStr, 64)
+			if err != nil || burst < 0 {
+				return nil, fmt.Errorf("invalid burst in exchange budget %q", part)
+			}
+		}
+		out[strings.ToLower(host)] = ExchangeBudget{Rate: rate, Burst: burst}
+	}
+	return out, nil
+}
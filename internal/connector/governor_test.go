@@ -0,0 +1,110 @@
+package connector
+
+import (
+	"context"
+	"net/http"
+	"net/http/httptest"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+func newTestGovernor(budgets map[string]ExchangeBudget) (*Governor, *time.Time) {
+	g := NewGovernor(budgets)
+	clock := time.Date(2026, 1, 1, 0, 0, 0, 0, time.UTC)
+	g.now = func() time.Time { return clock }
+	return g, &clock
+}
+
+func TestGovernor_ReservationsShareOneBudget(t *testing.T) {
+	g, clock := newTestGovernor(map[string]ExchangeBudget{"api.mexc.com": {Rate: 10, Burst: 2}})
+
+	// Burst is free; the next callers queue behind it at 1/Rate each,
+	// regardless of which connector instance they come from.
+	want := []time.Duration{0, 0, 100 * time.Millisecond, 200 * time.Millisecond}
+	for i, w := range want {
+		if got := g.reserve("api.mexc.com", 1); got != w {
+			t.Fatalf("reservation %d waits %v, want %v", i, got, w)
+		}
+	}
+
+	// One second later the debt is repaid and the bucket refilled to Burst.
+	*clock = clock.Add(time.Second)
+	if got := g.reserve("api.mexc.com", 2); got != 0 {
+		t.Fatalf("after refill waits %v, want 0", got)
+	}
+}
+
+func TestGovernor_CooldownBlocksHost(t *testing.T) {
+	g, clock := newTestGovernor(map[string]ExchangeBudget{"api.bybit.com": {Rate: 10, Burst: 10}})
+
+	g.Cooldown("api.bybit.com", 3*time.Second)
+	if got := g.reserve("api.bybit.com", 1); got != 3*time.Second+100*time.Millisecond {
+		t.Fatalf("wait during cooldown = %v", got)
+	}
+	// Unconfigured hosts are never paced, only cooled down.
+	if got := g.reserve("example.com", 1); got != 0 {
+		t.Fatalf("unpaced host waits %v", got)
+	}
+	g.Cooldown("example.com", time.Second)
+	if got := g.reserve("example.com", 1); got != time.Second {
+		t.Fatalf("unpaced host during cooldown waits %v", got)
+	}
+
+	*clock = clock.Add(10 * time.Second)
+	if got := g.reserve("api.bybit.com", 1); got != 0 {
+		t.Fatalf("wait after cooldown = %v", got)
+	}
+	st := g.Stats()
+	if len(st) != 2 || st[0].Host != "api.bybit.com" || st[0].Cooldowns != 1 {
+		t.Fatalf("unexpected stats: %+v", st)
+	}
+}
+
+func TestGovernor_DoStartsCooldownOn429(t *testing.T) {
+	var hits int32
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if atomic.AddInt32(&hits, 1) == 1 {
+			w.Header().Set("Retry-After", "1")
+			w.WriteHeader(http.StatusTooManyRequests)
+			return
+		}
+		w.WriteHeader(http.StatusOK)
+	}))
+	defer srv.Close()
+
+	g := NewGovernor(nil)
+	req, _ := http.NewRequest(http.MethodGet, srv.URL, nil)
+	resp, err := g.Do(srv.Client(), req)
+	if err != nil {
+		t.Fatalf("Do: %v", err)
+	}
+	resp.Body.Close()
+
+	// The next request to the same host must wait out Retry-After; a short
+	// context deadline proves it is held back.
+	ctx, cancel := context.WithTimeout(context.Background(), 50*time.Millisecond)
+	defer cancel()
+	req, _ = http.NewRequestWithContext(ctx, http.MethodGet, srv.URL, nil)
+	if _, err := g.Do(srv.Client(), req); err == nil {
+		t.Fatal("expected request during cooldown to be held until ctx deadline")
+	}
+	if n := atomic.LoadInt32(&hits); n != 1 {
+		t.Fatalf("server hit %d times, want 1", n)
+	}
+}
+
+func TestParseExchangeBudgets(t *testing.T) {
+	got, err := ParseExchangeBudgets(" api.binance.com=40:100, www.okx.com=5 ,")
+	if err != nil {
+		t.Fatalf("parse: %v", err)
+	}
+	if got["api.binance.com"] != (ExchangeBudget{Rate: 40, Burst: 100}) || got["www.okx.com"] != (ExchangeBudget{Rate: 5, Burst: 5}) {
+		t.Fatalf("unexpected budgets: %+v", got)
+	}
+	for _, bad := range []string{"api.binance.com", "=5", "api.binance.com=x", "api.binance.com=5:y"} {
+		if _, err := ParseExchangeBudgets(bad); err == nil {
+			t.Errorf("ParseExchangeBudgets(%q) succeeded, want error", bad)
+		}
+	}
+}
@@ -243,7 +243,7 @@ func (h *Hyperliquid) postInfo(ctx context.Context, body interface{}) (json.RawM
 	}
 	req.Header.Set("Content-Type", "application/json")
 
-	resp, err := h.client.Do(req)
+	resp, err := doGoverned(h.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -1,14 +1,13 @@
 package connector
 
 import (
+	"bytes"
 	"context"
 	"encoding/xml"
 	"fmt"
 	"net/http"
 	"net/url"
-	"strconv"
 	"strings"
-	"sync"
 	"time"
 
 	"golang.org/x/sync/singleflight"
@@ -19,25 +18,10 @@ const (
 	ibkrFlexGetURL = "https://gdcdyn.interactivebrokers.com/Universal/servlet/FlexStatementService.GetStatement"
 )
 
-// flexReportEntry holds a cached Flex XML report, shared across IBKR connector
-// instances that use the same token:queryId. Required because IBKR enforces a
-// token-level rate limit (error 1018) and users who link the same Flex
-// credentials would otherwise hammer each other out.
-type flexReportEntry struct {
-	xml       []byte
-	fetchedAt time.Time
-}
-
-var (
-	flexReportCache   = make(map[string]*flexReportEntry)
-	flexReportCacheMu sync.Mutex
-	// flexSingleflight coalesces concurrent fetches for the same token:queryId.
-	// Without it, two parallel syncs for users sharing a Flex token both see a
-	// cache miss and race into IBKR, triggering rate limit 1018.
-	flexSingleflight singleflight.Group
-)
-
-const flexReportCacheTTL = 5 * time.Minute
+// flexSingleflight coalesces concurrent fetches for the same token:queryId.
+// Without it, two parallel syncs for users sharing a Flex token both see a
+// cache miss and race into IBKR, triggering rate limit 1018.
+var flexSingleflight singleflight.Group
 
 // IBKR implements Connector for Interactive Brokers via Flex Query
 type IBKR struct {
@@ -62,52 +46,60 @@ func NewIBKR(creds *Credentials) *IBKR {
 	}
 }
 
-// fetchFlexReport returns the raw Flex XML, reusing a cached copy if it is
-// younger than flexReportCacheTTL. Callers that need fresh data across syncs
-// rely on the daily sync cadence (24h apart, well beyond the cache TTL).
-func (i *IBKR) fetchFlexReport(ctx context.Context) ([]byte, error) {
-	key := i.token + ":" + i.queryID
+// fetchFlexReport returns the parsed Flex report, reusing a cached copy if
+// it is younger than flexReportCacheTTL. Callers that need fresh data across
+// syncs rely on the daily sync cadence (24h apart, well beyond the cache TTL).
+// The XML is decoded once, inside the flight, and only the parsed model is
+// cached (PERF-008).
+func (i *IBKR) fetchFlexReport(ctx context.Context) (*flexReport, error) {
+	return i.loadFlexReport(ctx, nil)
+}
+
+// loadFlexReport is fetchFlexReport with an optional poller pool: when
+// pollSlots is non-nil, each GetStatement attempt holds one of its slots
+// (see FlexBatch).
+func (i *IBKR) loadFlexReport(ctx context.Context, pollSlots chan struct{}) (*flexReport, error) {
+	key := i.flexKey()
 
 	// Fast path: fresh cache hit.
-	flexReportCacheMu.Lock()
-	if entry, ok := flexReportCache[key]; ok && time.Since(entry.fetchedAt) < flexReportCacheTTL {
-		xml := entry.xml
-		flexReportCacheMu.Unlock()
-		return xml, nil
+	if report := flexReportCache.get(key); report != nil {
+		return report, nil
 	}
-	flexReportCacheMu.Unlock()
 
 	// Slow path: coalesce concurrent fetches for the same token so parallel
 	// user syncs share one Flex API round-trip.
 	v, err, _ := flexSingleflight.Do(key, func() (interface{}, error) {
 		// Re-check the cache inside the flight in case another goroutine won
 		// the singleflight race and already populated it.
-		flexReportCacheMu.Lock()
-		if entry, ok := flexReportCache[key]; ok && time.Since(entry.fetchedAt) < flexReportCacheTTL {
-			xml := entry.xml
-			flexReportCacheMu.Unlock()
-			return xml, nil
+		if report := flexReportCache.get(key); report != nil {
+			return report, nil
 		}
-		flexReportCacheMu.Unlock()
 
 		refCode, err := i.requestFlexReport(ctx)
 		if err != nil {
 			return nil, err
 		}
-		report, err := i.getFlexReport(ctx, refCode)
+		body, err := i.getFlexReport(ctx, refCode, pollSlots)
 		if err != nil {
 			return nil, err
 		}
+		report, err := parseFlexReport(bytes.NewReader(body))
+		if err != nil {
+			return nil, fmt.Errorf("parse flex report: %w", err)
+		}
 
-		flexReportCacheMu.Lock()
-		flexReportCache[key] = &flexReportEntry{xml: report, fetchedAt: time.Now()}
-		flexReportCacheMu.Unlock()
+		flexReportCache.put(key, report)
 		return report, nil
 	})
 	if err != nil {
 		return nil, err
 	}
-	return v.([]byte), nil
+	return v.(*flexReport), nil
+}
+
+// flexKey identifies the report in flexReportCache and flexSingleflight.
+func (i *IBKR) flexKey() string {
+	return i.token + ":" + i.queryID
 }
 
 func (i *IBKR) Exchange() string {
@@ -155,7 +147,7 @@ func (i *IBKR) requestFlexReport(ctx context.Context) (string, error) {
 		return "", err
 	}
 
-	resp, err := i.client.Do(req)
+	resp, err := doGoverned(i.client, req)
 	if err != nil {
 		return "", err
 	}
@@ -197,7 +189,10 @@ func (i *IBKR) requestFlexReport(ctx context.Context) (string, error) {
 	return result.ReferenceCode, nil
 }
 
-func (i *IBKR) getFlexReport(ctx context.Context, refCode string) ([]byte, error) {
+// getFlexReport polls GetStatement until the report for refCode is ready.
+// With a non-nil pollSlots, each attempt waits for a free slot first; the
+// backoff sleeps between attempts do not hold one.
+func (i *IBKR) getFlexReport(ctx context.Context, refCode string, pollSlots chan struct{}) ([]byte, error) {
 	u := flexURL(ibkrFlexGetURL, i.token, refCode)
 
 	// Poll with exponential backoff. Small Flex reports (LastBusinessWeek)
@@ -214,13 +209,17 @@ func (i *IBKR) getFlexReport(ctx context.Context, refCode string) ([]byte, error
 			return nil, err
 		}
 
-		resp, err := i.client.Do(req)
-		if err != nil {
-			return nil, err
+		if pollSlots != nil {
+			select {
+			case pollSlots <- struct{}{}:
+			case <-ctx.Done():
+				return nil, ctx.Err()
+			}
+		}
+		body, err := i.downloadFlexStatement(req)
+		if pollSlots != nil {
+			<-pollSlots
 		}
-
-		// CONN-AUDIT-001: Flex statement download — use the higher cap.
-		body, err := ReadCappedBody(resp.Body, IBKRFlexMaxResponseBytes)
 		if err != nil {
 			return nil, err
 		}
@@ -230,15 +229,17 @@ func (i *IBKR) getFlexReport(ctx context.Context, refCode string) ([]byte, error
 		//   - <FlexQueryResponse> → the actual report is ready
 		// Substring matching on "1019" was wrong because numeric values inside
 		// a real report can trip it. The root-element distinction is exact.
-		trimmed := strings.TrimSpace(string(body))
-		if strings.HasPrefix(trimmed, "<FlexQueryResponse") {
+		// Checked on the bytes: converting a multi-MB report to a string
+		// just to look at its first element doubled the download's memory.
+		trimmed := bytes.TrimSpace(body)
+		if bytes.HasPrefix(trimmed, []byte("<FlexQueryResponse")) {
 			return body, nil
 		}
-		if strings.HasPrefix(trimmed, "<FlexStatementResponse") {
+		if bytes.HasPrefix(trimmed, []byte("<FlexStatementResponse")) {
 			// Error if Status="Error", otherwise keep polling.
-			if strings.Contains(trimmed, "<Status>Error</Status>") {
+			if bytes.Contains(trimmed, []byte("<Status>Error</Status>")) {
 				// CONN-002: scrub the token in case IBKR echoed our request URL.
-				return nil, fmt.Errorf("flex report error: %s", preview(scrubSecret(trimmed, i.token), 300))
+				return nil, fmt.Errorf("flex report error: %s", preview(scrubSecret(string(trimmed), i.token), 300))
 			}
 			// CONN-005: ctx-aware wait so a cancelled sync propagates
 			// immediately instead of blocking up to 30 s per tick.
@@ -250,12 +251,21 @@ func (i *IBKR) getFlexReport(ctx context.Context, refCode string) ([]byte, error
 			continue
 		}
 		// Unknown response shape — surface it (token scrubbed).
-		return nil, fmt.Errorf("unexpected flex response: %s", preview(scrubSecret(trimmed, i.token), 300))
+		return nil, fmt.Errorf("unexpected flex response: %s", preview(scrubSecret(string(trimmed), i.token), 300))
 	}
 
 	return nil, fmt.Errorf("flex report timeout after %d attempts", len(delays))
 }
 
+func (i *IBKR) downloadFlexStatement(req *http.Request) ([]byte, error) {
+	resp, err := doGoverned(i.client, req)
+	if err != nil {
+		return nil, err
+	}
+	// CONN-AUDIT-001: Flex statement download — use the higher cap.
+	return ReadCappedBody(resp.Body, IBKRFlexMaxResponseBytes)
+}
+
 // preview returns the first n chars of s with an ellipsis when truncated.
 // Used to include a snippet of unexpected IBKR responses in error messages.
 func preview(s string, n int) string {
@@ -280,81 +290,36 @@ func (i *IBKR) GetBalance(ctx context.Context) (*Balance, error) {
 	if err != nil {
 		return nil, err
 	}
+	return i.balanceFromReport(report), nil
+}
 
-	if err != nil {
-		return nil, err
+func (i *IBKR) balanceFromReport(report *flexReport) *Balance {
+	if len(report.equity) == 0 {
+		return &Balance{Currency: "USD"}
 	}
 
-	return i.parseBalanceFromReport(report)
-}
-
-func (i *IBKR) parseBalanceFromReport(report []byte) (*Balance, error) {
-	var flex struct {
-		XMLName        xml.Name `xml:"FlexQueryResponse"`
-		FlexStatements struct {
-			FlexStatement struct {
-				AccountID           string `xml:"accountId,attr"`
-				EquitySummaryInBase struct {
-					EquitySummaryByReportDateInBase []struct {
-						Currency             string `xml:"currency,attr"`
-						Total                string `xml:"total,attr"`
-						Cash                 string `xml:"cash,attr"`
-						Stock                string `xml:"stock,attr"`
-						Options              string `xml:"options,attr"`
-						Commodities          string `xml:"commodities,attr"`
-						UnrealizedPnL        string `xml:"unrealizedPnL,attr"`
-						CfdUnrealizedPl      string `xml:"cfdUnrealizedPl,attr"`
-						ForexCfdUnrealizedPl string `xml:"forexCfdUnrealizedPl,attr"`
-					} `xml:"EquitySummaryByReportDateInBase"`
-				} `xml:"EquitySummaryInBase"`
-				OpenPositions struct {
-					OpenPosition []struct {
-						FifoPnlUnrealized string `xml:"fifoPnlUnrealized,attr"`
-					} `xml:"OpenPosition"`
-				} `xml:"OpenPositions"`
-			} `xml:"FlexStatement"`
-		} `xml:"FlexStatements"`
-	}
-
-	if err := xml.Unmarshal(report, &flex); err != nil {
-		return nil, fmt.Errorf("parse flex report: %w", err)
-	}
-
-	summaries := flex.FlexStatements.FlexStatement.EquitySummaryInBase.EquitySummaryByReportDateInBase
-	if len(summaries) == 0 {
-		return &Balance{Currency: "USD"}, nil
-	}
-
-	summary := summaries[len(summaries)-1] // Latest
+	summary := report.equity[len(report.equity)-1] // Latest
 	// Flex reports "in base currency" — the account's denomination, not always USD.
-	currency := summary.Currency
+	currency := summary.currency
 	if currency == "" {
 		currency = "USD"
 	}
-	total, _ := strconv.ParseFloat(summary.Total, 64)
-	cash, _ := strconv.ParseFloat(summary.Cash, 64)
-	unrealized, _ := strconv.ParseFloat(summary.UnrealizedPnL, 64)
+	unrealized := summary.unrealizedPnL
 
 	// IBKR EquitySummary only has cfd/forexCfd unrealized fields — not stocks/futures.
 	// Sum fifoPnlUnrealized from OpenPositions for the complete picture.
 	if unrealized == 0 {
-		for _, pos := range flex.FlexStatements.FlexStatement.OpenPositions.OpenPosition {
-			pnl, _ := strconv.ParseFloat(pos.FifoPnlUnrealized, 64)
-			unrealized += pnl
+		for _, pos := range report.positions {
+			unrealized += pos.fifoPnlUnrealized
 		}
 	}
 	// Fallback to CFD fields if no open positions in the report
 	if unrealized == 0 {
-		cfdUnreal, _ := strconv.ParseFloat(summary.CfdUnrealizedPl, 64)
-		fxCfdUnreal, _ := strconv.ParseFloat(summary.ForexCfdUnrealizedPl, 64)
-		unrealized = cfdUnreal + fxCfdUnreal
+		unrealized = summary.cfdUnrealizedPl + summary.forexCfdUnrealizedPl
 	}
-	stockVal, _ := strconv.ParseFloat(summary.Stock, 64)
-	optionsVal, _ := strconv.ParseFloat(summary.Options, 64)
-	commoditiesVal, _ := strconv.ParseFloat(summary.Commodities, 64)
 
 	// Cache paper detection from account ID (avoids extra Flex call for DetectIsPaper)
-	accountID := strings.ToUpper(strings.TrimSpace(flex.FlexStatements.FlexStatement.AccountID))
+	accountID := strings.ToUpper(strings.TrimSpace(report.accountID))
 	if accountID != "" {
 		isPaper := strings.HasPrefix(accountID, "DU") || strings.HasPrefix(accountID, "DF")
 		i.cachedIsPaper = &isPaper
@@ -362,28 +327,28 @@ func (i *IBKR) parseBalanceFromReport(report []byte) (*Balance, error) {
 
 	// Cache breakdown for GetBalanceByMarket (avoids 2nd Flex API call)
 	i.cachedBreakdown = nil
-	if stockVal != 0 {
+	if summary.stock != 0 {
 		i.cachedBreakdown = append(i.cachedBreakdown, &MarketBalance{
-			MarketType: MarketStocks, Equity: stockVal, AvailableMargin: cash,
+			MarketType: MarketStocks, Equity: summary.stock, AvailableMargin: summary.cash,
 		})
 	}
-	if optionsVal != 0 {
+	if summary.options != 0 {
 		i.cachedBreakdown = append(i.cachedBreakdown, &MarketBalance{
-			MarketType: MarketOptions, Equity: optionsVal,
+			MarketType: MarketOptions, Equity: summary.options,
 		})
 	}
-	if commoditiesVal != 0 {
+	if summary.commodities != 0 {
 		i.cachedBreakdown = append(i.cachedBreakdown, &MarketBalance{
-			MarketType: MarketFutures, Equity: commoditiesVal,
+			MarketType: MarketFutures, Equity: summary.commodities,
 		})
 	}
 
 	return &Balance{
-		Available:     cash,
-		Equity:        total,
+		Available:     summary.cash,
+		Equity:        summary.total,
 		UnrealizedPnL: unrealized,
 		Currency:      currency,
-	}, nil
+	}
 }
 
 // GetBalanceByMarket returns per-asset-class equity breakdown from IBKR Flex.
@@ -398,48 +363,17 @@ func (i *IBKR) GetPositions(ctx context.Context) ([]*Position, error) {
 	if err != nil {
 		return nil, err
 	}
-
-	if err != nil {
-		return nil, err
-	}
-
-	return i.parsePositionsFromReport(report)
+	return positionsFromReport(report), nil
 }
 
-func (i *IBKR) parsePositionsFromReport(report []byte) ([]*Position, error) {
-	var flex struct {
-		XMLName        xml.Name `xml:"FlexQueryResponse"`
-		FlexStatements struct {
-			FlexStatement struct {
-				OpenPositions struct {
-					OpenPosition []struct {
-						Symbol            string `xml:"symbol,attr"`
-						Position          string `xml:"position,attr"`
-						MarkPrice         string `xml:"markPrice,attr"`
-						CostBasisMoney    string `xml:"costBasisMoney,attr"`
-						FifoPnlUnrealized string `xml:"fifoPnlUnrealized,attr"`
-						AssetCategory     string `xml:"assetCategory,attr"`
-					} `xml:"OpenPosition"`
-				} `xml:"OpenPositions"`
-			} `xml:"FlexStatement"`
-		} `xml:"FlexStatements"`
-	}
-
-	if err := xml.Unmarshal(report, &flex); err != nil {
-		return nil, fmt.Errorf("parse flex positions: %w", err)
-	}
-
+func positionsFromReport(report *flexReport) []*Position {
 	var positions []*Position
-	for _, p := range flex.FlexStatements.FlexStatement.OpenPositions.OpenPosition {
-		size, _ := strconv.ParseFloat(p.Position, 64)
+	for _, p := range report.positions {
+		size := p.position
 		if size == 0 {
 			continue
 		}
 
-		mark, _ := strconv.ParseFloat(p.MarkPrice, 64)
-		costBasis, _ := strconv.ParseFloat(p.CostBasisMoney, 64)
-		unrealized, _ := strconv.ParseFloat(p.FifoPnlUnrealized, 64)
-
 		side := "long"
 		if size < 0 {
 			side = "short"
@@ -448,33 +382,21 @@ func (i *IBKR) parsePositionsFromReport(report []byte) ([]*Position, error) {
 
 		entryPrice := 0.0
 		if size > 0 {
-			entryPrice = costBasis / size
-		}
-
-		marketType := MarketStocks
-		switch p.AssetCategory {
-		case "FUT":
-			marketType = MarketFutures
-		case "OPT":
-			marketType = MarketOptions
-		case "CFD":
-			marketType = MarketCFD
-		case "CASH":
-			marketType = MarketForex
+			entryPrice = p.costBasisMoney / size
 		}
 
 		positions = append(positions, &Position{
-			Symbol:        p.Symbol,
+			Symbol:        p.symbol,
 			Side:          side,
 			Size:          size,
 			EntryPrice:    entryPrice,
-			MarkPrice:     mark,
-			UnrealizedPnL: unrealized,
-			MarketType:    marketType,
+			MarkPrice:     p.markPrice,
+			UnrealizedPnL: p.fifoPnlUnrealized,
+			MarketType:    p.marketType,
 		})
 	}
 
-	return positions, nil
+	return positions
 }
 
 // GetCashflows returns deposits and withdrawals since the given date.
@@ -484,56 +406,23 @@ func (i *IBKR) GetCashflows(ctx context.Context, since time.Time) ([]*Cashflow,
 	if err != nil {
 		return nil, err
 	}
-
-	if err != nil {
-		return nil, err
-	}
-
-	return i.parseCashflowsFromReport(report, since)
+	return cashflowsFromReport(report, since), nil
 }
 
-func (i *IBKR) parseCashflowsFromReport(report []byte, since time.Time) ([]*Cashflow, error) {
-	var flex struct {
-		XMLName        xml.Name `xml:"FlexQueryResponse"`
-		FlexStatements struct {
-			FlexStatement struct {
-				CashTransactions struct {
-					CashTransaction []struct {
-						Type     string `xml:"type,attr"`
-						Amount   string `xml:"amount,attr"`
-						Currency string `xml:"currency,attr"`
-						DateTime string `xml:"dateTime,attr"`
-					} `xml:"CashTransaction"`
-				} `xml:"CashTransactions"`
-			} `xml:"FlexStatement"`
-		} `xml:"FlexStatements"`
-	}
-
-	if err := xml.Unmarshal(report, &flex); err != nil {
-		return nil, fmt.Errorf("parse flex cashflows: %w", err)
-	}
-
+func cashflowsFromReport(report *flexReport, since time.Time) []*Cashflow {
 	var cashflows []*Cashflow
-	for _, tx := range flex.FlexStatements.FlexStatement.CashTransactions.CashTransaction {
-		ts, err := time.Parse("20060102;150405", tx.DateTime)
-		if err != nil {
-			// Try date-only format
-			ts, err = time.Parse("20060102", tx.DateTime)
-			if err != nil {
-				continue
-			}
-		}
-		if ts.Before(since) {
+	for _, tx := range report.cashTxns {
+		if tx.at.IsZero() || tx.at.Before(since) {
 			continue
 		}
 
-		amount, _ := strconv.ParseFloat(tx.Amount, 64)
+		amount := tx.amount
 		if amount == 0 {
 			continue
 		}
 
-		isDeposit := tx.Type == "Deposits" || (tx.Type == "Deposits/Withdrawals" && amount > 0)
-		isWithdrawal := tx.Type == "Withdrawals" || (tx.Type == "Deposits/Withdrawals" && amount < 0)
+		isDeposit := tx.txType == "Deposits" || (tx.txType == "Deposits/Withdrawals" && amount > 0)
+		isWithdrawal := tx.txType == "Withdrawals" || (tx.txType == "Deposits/Withdrawals" && amount < 0)
 
 		if !isDeposit && !isWithdrawal {
 			continue
@@ -541,12 +430,12 @@ func (i *IBKR) parseCashflowsFromReport(report []byte, since time.Time) ([]*Cash
 
 		cashflows = append(cashflows, &Cashflow{
 			Amount:    amount, // positive=deposit, negative=withdrawal
-			Currency:  tx.Currency,
-			Timestamp: ts,
+			Currency:  tx.currency,
+			Timestamp: tx.at,
 		})
 	}
 
-	return cashflows, nil
+	return cashflows
 }
 
 // GetHistoricalSnapshots returns daily equity snapshots from IBKR Flex (up to 365 days).
@@ -556,39 +445,13 @@ func (i *IBKR) GetHistoricalSnapshots(ctx context.Context, since time.Time) ([]*
 	if err != nil {
 		return nil, err
 	}
+	return historicalSnapshotsFromReport(report, since), nil
+}
 
-	if err != nil {
-		return nil, err
-	}
-
-	// Parse all daily equity summaries with per-asset breakdown
-	var flex struct {
-		XMLName        xml.Name `xml:"FlexQueryResponse"`
-		FlexStatements struct {
-			FlexStatement struct {
-				EquitySummaryInBase struct {
-					EquitySummaryByReportDateInBase []struct {
-						ReportDate    string `xml:"reportDate,attr"`
-						Total         string `xml:"total,attr"`
-						Cash          string `xml:"cash,attr"`
-						Stock         string `xml:"stock,attr"`
-						Options       string `xml:"options,attr"`
-						Commodities   string `xml:"commodities,attr"`
-						UnrealizedPnL string `xml:"unrealizedPnL,attr"`
-					} `xml:"EquitySummaryByReportDateInBase"`
-				} `xml:"EquitySummaryInBase"`
-			} `xml:"FlexStatement"`
-		} `xml:"FlexStatements"`
-	}
-
-	if err := xml.Unmarshal(report, &flex); err != nil {
-		return nil, fmt.Errorf("parse flex historical: %w", err)
-	}
-
-	// Parse cashflows grouped by date for deposit/withdrawal assignment
-	cashflows, _ := i.parseCashflowsFromReport(report, since)
+func historicalSnapshotsFromReport(report *flexReport, since time.Time) []*HistoricalSnapshot {
+	// Cashflows grouped by date for deposit/withdrawal assignment
 	cashflowsByDate := make(map[string]struct{ deposits, withdrawals float64 })
-	for _, cf := range cashflows {
+	for _, cf := range cashflowsFromReport(report, since) {
 		dateKey := cf.Timestamp.Format("20060102")
 		entry := cashflowsByDate[dateKey]
 		if cf.Amount > 0 {
@@ -600,59 +463,48 @@ func (i *IBKR) GetHistoricalSnapshots(ctx context.Context, since time.Time) ([]*
 	}
 
 	var snapshots []*HistoricalSnapshot
-	for _, s := range flex.FlexStatements.FlexStatement.EquitySummaryInBase.EquitySummaryByReportDateInBase {
-		date, err := time.Parse("20060102", s.ReportDate)
-		if err != nil {
+	for _, s := range report.equity {
+		if s.date.IsZero() || s.date.Before(since) {
 			continue
 		}
-		if date.Before(since) {
-			continue
-		}
-
-		total, _ := strconv.ParseFloat(s.Total, 64)
-		if total == 0 {
+		if s.total == 0 {
 			continue // Skip zero-equity days
 		}
-		unrealized, _ := strconv.ParseFloat(s.UnrealizedPnL, 64)
-		stockVal, _ := strconv.ParseFloat(s.Stock, 64)
-		optionsVal, _ := strconv.ParseFloat(s.Options, 64)
-		commoditiesVal, _ := strconv.ParseFloat(s.Commodities, 64)
-		cashVal, _ := strconv.ParseFloat(s.Cash, 64)
 
 		// Build per-asset breakdown (TS parity: getHistoricalSummaries)
 		breakdown := make(map[string]*MarketBalance)
-		if stockVal != 0 {
+		if s.stock != 0 {
 			breakdown[MarketStocks] = &MarketBalance{
 				MarketType:      MarketStocks,
-				Equity:          stockVal,
-				AvailableMargin: cashVal,
+				Equity:          s.stock,
+				AvailableMargin: s.cash,
 			}
 		}
-		if optionsVal != 0 {
+		if s.options != 0 {
 			breakdown[MarketOptions] = &MarketBalance{
 				MarketType: MarketOptions,
-				Equity:     optionsVal,
+				Equity:     s.options,
 			}
 		}
-		if commoditiesVal != 0 {
+		if s.commodities != 0 {
 			breakdown[MarketFutures] = &MarketBalance{
 				MarketType: MarketFutures,
-				Equity:     commoditiesVal,
+				Equity:     s.commodities,
 			}
 		}
 
-		cf := cashflowsByDate[s.ReportDate]
+		cf := cashflowsByDate[s.reportDate]
 		snapshots = append(snapshots, &HistoricalSnapshot{
-			Date:            time.Date(date.Year(), date.Month(), date.Day(), 0, 0, 0, 0, time.UTC),
-			TotalEquity:     total,
-			RealizedBalance: total - unrealized,
+			Date:            time.Date(s.date.Year(), s.date.Month(), s.date.Day(), 0, 0, 0, 0, time.UTC),
+			TotalEquity:     s.total,
+			RealizedBalance: s.total - s.unrealizedPnL,
 			Deposits:        cf.deposits,
 			Withdrawals:     cf.withdrawals,
 			Breakdown:       breakdown,
 		})
 	}
 
-	return snapshots, nil
+	return snapshots
 }
 
 func (i *IBKR) GetTrades(ctx context.Context, start, end time.Time) ([]*Trade, error) {
@@ -660,95 +512,44 @@ func (i *IBKR) GetTrades(ctx context.Context, start, end time.Time) ([]*Trade, e
 	if err != nil {
 		return nil, err
 	}
-
-	if err != nil {
-		return nil, err
-	}
-
-	return i.parseTradesFromReport(report, start, end)
+	return tradesFromReport(report, start, end), nil
 }
 
-func (i *IBKR) parseTradesFromReport(report []byte, start, end time.Time) ([]*Trade, error) {
-	var flex struct {
-		XMLName        xml.Name `xml:"FlexQueryResponse"`
-		FlexStatements struct {
-			FlexStatement struct {
-				Trades struct {
-					Trade []struct {
-						TradeID         string `xml:"tradeID,attr"`
-						Symbol          string `xml:"symbol,attr"`
-						BuySell         string `xml:"buySell,attr"`
-						TradePrice      string `xml:"tradePrice,attr"`
-						Quantity        string `xml:"quantity,attr"`
-						IbCommission    string `xml:"ibCommission,attr"`
-						Currency        string `xml:"currency,attr"`
-						DateTime        string `xml:"dateTime,attr"`
-						AssetCategory   string `xml:"assetCategory,attr"`
-						FifoPnlRealized string `xml:"fifoPnlRealized,attr"`
-					} `xml:"Trade"`
-				} `xml:"Trades"`
-			} `xml:"FlexStatement"`
-		} `xml:"FlexStatements"`
-	}
-
-	if err := xml.Unmarshal(report, &flex); err != nil {
-		return nil, fmt.Errorf("parse flex trades: %w", err)
-	}
-
+func tradesFromReport(report *flexReport, start, end time.Time) []*Trade {
 	var trades []*Trade
-	for _, t := range flex.FlexStatements.FlexStatement.Trades.Trade {
-		// Parse datetime (format: YYYYMMDD;HHMMSS)
-		ts, err := time.Parse("20060102;150405", t.DateTime)
-		if err != nil {
+	for _, t := range report.trades {
+		// Filter by date range; rows whose dateTime is not YYYYMMDD;HHMMSS are dropped
+		if t.at.IsZero() || t.at.Before(start) || t.at.After(end) {
 			continue
 		}
 
-		// Filter by date range
-		if ts.Before(start) || ts.After(end) {
-			continue
-		}
-
-		price, _ := strconv.ParseFloat(t.TradePrice, 64)
-		qty, _ := strconv.ParseFloat(t.Quantity, 64)
+		qty := t.quantity
 		if qty < 0 {
 			qty = -qty
 		}
-		fee, _ := strconv.ParseFloat(t.IbCommission, 64)
+		fee := t.ibCommission
 		if fee < 0 {
 			fee = -fee
 		}
-		pnl, _ := strconv.ParseFloat(t.FifoPnlRealized, 64)
 
 		side := "buy"
-		if t.BuySell == "SELL" {
+		if t.buySell == "SELL" {
 			side = "sell"
 		}
 
-		marketType := MarketStocks
-		switch t.AssetCategory {
-		case "FUT":
-			marketType = MarketFutures
-		case "OPT":
-			marketType = MarketOptions
-		case "CFD":
-			marketType = MarketCFD
-		case "CASH":
-			marketType = MarketForex
-		}
-
 		trades = append(trades, &Trade{
-			ID:          t.TradeID,
-			Symbol:      t.Symbol,
+			ID:          t.id,
+			Symbol:      t.symbol,
 			Side:        side,
-			Price:       price,
+			Price:       t.price,
 			Quantity:    qty,
 			Fee:         fee,
-			FeeCurrency: t.Currency,
-			RealizedPnL: pnl,
-			Timestamp:   ts,
-			MarketType:  marketType,
+			FeeCurrency: t.currency,
+			RealizedPnL: t.fifoPnlRealized,
+			Timestamp:   t.at,
+			MarketType:  t.marketType,
 		})
 	}
 
-	return trades, nil
+	return trades
 }
@@ -0,0 +1,162 @@
+package connector
+
+import (
+	"context"
+	"sync"
+	"time"
+)
+
+// DefaultFlexPollers is the poller pool size used by the daily sync.
+const DefaultFlexPollers = 4
+
+// defaultFlexBatchHold pins the reports of a batch run without a deadline.
+const defaultFlexBatchHold = 30 * time.Minute
+
+// FlexBatch fetches the Flex reports of many IBKR connections in two phases
+// (CONN-009). A Flex report is a SendRequest, then a GetStatement poll loop
+// that can run for minutes while IBKR generates it; done one connection at
+// a time inside a sync slot, every IBKR user held a slot for that whole
+// wait. The batch issues phase 1 (SendRequest) for every distinct
+// token:queryId up front so all reports generate server-side at the same
+// time, then collects them in phase 2, where each GetStatement attempt
+// holds one of a small pool of poller slots and the backoff sleeps hold
+// none.
+//
+// Fetches go through the same singleflight and flexReportCache as
+// IBKR.fetchFlexReport, so a sync that reaches an IBKR connection while its
+// report is still in the batch joins that flight instead of requesting its
+// own, and one that comes later gets a cache hit. The reports it fetches
+// stay cached past flexReportCacheTTL until the run's deadline or Release,
+// whichever comes first.
+type FlexBatch struct {
+	pollSlots chan struct{}
+
+	mu       sync.Mutex
+	jobs     map[string]*flexJob
+	ran      bool
+	released bool
+	pinned   []string // keys pinned in flexReportCache
+}
+
+type flexJob struct {
+	ibkr *IBKR
+	done chan struct{}
+	err  error
+}
+
+// FlexBatchStats summarises a completed batch.
+type FlexBatchStats struct {
+	Reports  int
+	Failed   int
+	Duration time.Duration
+}
+
+// NewFlexBatch returns an empty batch whose phase 2 runs at most pollers
+// GetStatement requests at a time.
+func NewFlexBatch(pollers int) *FlexBatch {
+	if pollers < 1 {
+		pollers = 1
+	}
+	return &FlexBatch{
+		pollSlots: make(chan struct{}, pollers),
+		jobs:      make(map[string]*flexJob),
+	}
+}
+
+// Add registers conn with the batch. It returns a channel closed once conn's
+// report is cached or its fetch has failed, and false when conn is not an
+// IBKR connector. Connections sharing a Flex token and query share one job.
+// Must be called before Run.
+func (b *FlexBatch) Add(conn Connector) (<-chan struct{}, bool) {
+	ibkr, ok := conn.(*IBKR)
+	if !ok {
+		return nil, false
+	}
+	b.mu.Lock()
+	defer b.mu.Unlock()
+	key := ibkr.flexKey()
+	job, ok := b.jobs[key]
+	if !ok {
+		job = &flexJob{ibkr: ibkr, done: make(chan struct{})}
+		if b.ran {
+			// Too late to join the batch: report it done so the caller
+			// falls back to the connector's own fetch.
+			close(job.done)
+			return job.done, true
+		}
+		b.jobs[key] = job
+	}
+	return job.done, true
+}
+
+// Len returns the number of distinct reports in the batch.
+func (b *FlexBatch) Len() int {
+	b.mu.Lock()
+	defer b.mu.Unlock()
+	return len(b.jobs)
+}
+
+// Run fetches every registered report and returns once all are cached or
+// have failed. Each report is pinned in the cache until ctx's deadline (or
+// defaultFlexBatchHold without one) or Release. Failures are not returned:
+// the connection's own sync retries the fetch and reports the error through
+// its usual path.
+func (b *FlexBatch) Run(ctx context.Context) FlexBatchStats {
+	b.mu.Lock()
+	b.ran = true
+	jobs := make([]*flexJob, 0, len(b.jobs))
+	for _, job := range b.jobs {
+		jobs = append(jobs, job)
+	}
+	b.mu.Unlock()
+
+	holdUntil, ok := ctx.Deadline()
+	if !ok {
+		holdUntil = time.Now().Add(defaultFlexBatchHold)
+	}
+
+	start := time.Now()
+	var wg sync.WaitGroup
+	for _, job := range jobs {
+		wg.Add(1)
+		go func(job *flexJob) {
+			defer wg.Done()
+			defer close(job.done)
+			var report *flexReport
+			report, job.err = job.ibkr.loadFlexReport(ctx, b.pollSlots)
+			if job.err == nil {
+				b.pin(job.ibkr.flexKey(), report, holdUntil)
+			}
+		}(job)
+	}
+	wg.Wait()
+
+	stats := FlexBatchStats{Reports: len(jobs), Duration: time.Since(start)}
+	for _, job := range jobs {
+		if job.err != nil {
+			stats.Failed++
+		}
+	}
+	return stats
+}
+
+// Release returns the batch's reports to the cache's TTL and memory budget.
+// Call it once the syncs the batch prefetched for have run; reports fetched
+// after it are not pinned.
+func (b *FlexBatch) Release() {
+	b.mu.Lock()
+	defer b.mu.Unlock()
+	b.released = true
+	flexReportCache.unpin(b.pinned)
+	b.pinned = nil
+}
+
+func (b *FlexBatch) pin(key string, report *flexReport, until time.Time) {
+	b.mu.Lock()
+	defer b.mu.Unlock()
+	if b.released {
+		return
+	}
+	flexReportCache.pin(key, report, until)
+	b.pinned = append(b.pinned, key)
+}
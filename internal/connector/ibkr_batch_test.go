@@ -0,0 +1,179 @@
+package connector
+
+import (
+	"context"
+	"net/http"
+	"net/http/httptest"
+	"strings"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+// roundTripFunc serves the hard-coded IBKR Flex URLs from a test handler.
+type roundTripFunc func(*http.Request) (*http.Response, error)
+
+func (f roundTripFunc) RoundTrip(r *http.Request) (*http.Response, error) { return f(r) }
+
+func newFlexTestClient(h http.Handler) *http.Client {
+	return &http.Client{Transport: roundTripFunc(func(r *http.Request) (*http.Response, error) {
+		rec := httptest.NewRecorder()
+		h.ServeHTTP(rec, r)
+		return rec.Result(), nil
+	})}
+}
+
+func TestFlexBatch_OneRequestPerTokenBoundedPollers(t *testing.T) {
+	var sends, polls, inFlight, peak int32
+	h := http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if strings.HasSuffix(r.URL.Path, "SendRequest") {
+			atomic.AddInt32(&sends, 1)
+			w.Write([]byte(`<FlexStatementResponse><Status>Success</Status><ReferenceCode>ref-` + r.URL.Query().Get("t") + `</ReferenceCode></FlexStatementResponse>`))
+			return
+		}
+		atomic.AddInt32(&polls, 1)
+		n := atomic.AddInt32(&inFlight, 1)
+		defer atomic.AddInt32(&inFlight, -1)
+		for {
+			p := atomic.LoadInt32(&peak)
+			if n <= p || atomic.CompareAndSwapInt32(&peak, p, n) {
+				break
+			}
+		}
+		time.Sleep(20 * time.Millisecond)
+		w.Write([]byte(`<FlexQueryResponse><FlexStatements><FlexStatement accountId="U1"><EquitySummaryInBase>` +
+			`<EquitySummaryByReportDateInBase reportDate="20250102" total="` + strings.TrimPrefix(r.URL.Query().Get("q"), "ref-tok") + `"/>` +
+			`</EquitySummaryInBase></FlexStatement></FlexStatements></FlexQueryResponse>`))
+	})
+	client := newFlexTestClient(h)
+
+	batch := NewFlexBatch(2)
+	var ready []<-chan struct{}
+	for _, tok := range []string{"tok1", "tok2", "tok3", "tok4", "tok1"} {
+		conn := &IBKR{token: tok, queryID: "q-batch-test", client: client}
+		done, ok := batch.Add(conn)
+		if !ok {
+			t.Fatal("IBKR connector rejected by the batch")
+		}
+		ready = append(ready, done)
+	}
+	if _, ok := batch.Add(NewMock()); ok {
+		t.Fatal("non-IBKR connector accepted by the batch")
+	}
+
+	stats := batch.Run(context.Background())
+	for _, ch := range ready {
+		<-ch
+	}
+	if stats.Reports != 4 || stats.Failed != 0 {
+		t.Fatalf("stats = %+v, want 4 reports, 0 failed", stats)
+	}
+	if sends != 4 || polls != 4 {
+		t.Fatalf("SendRequest %d / GetStatement %d, want one of each per distinct token", sends, polls)
+	}
+	if peak > 2 {
+		t.Fatalf("%d GetStatement in flight, want at most the 2 pollers", peak)
+	}
+
+	// The reports are now cached: a sync on the shared token gets a hit.
+	conn := &IBKR{token: "tok3", queryID: "q-batch-test", client: client}
+	bal, err := conn.GetBalance(context.Background())
+	if err != nil || bal.Equity != 3 {
+		t.Fatalf("GetBalance = %+v, %v; want the batch's report (equity 3)", bal, err)
+	}
+	if sends != 4 {
+		t.Fatal("GetBalance after the batch requested a new report")
+	}
+}
+
+func TestFlexCache_EvictsExpiredThenLeastRecentlyUsed(t *testing.T) {
+	clock := time.Date(2026, 1, 1, 0, 0, 0, 0, time.UTC)
+	c := newFlexCache(0, time.Minute)
+	c.now = func() time.Time { return clock }
+
+	report := func(trades int) *flexReport { return &flexReport{trades: make([]flexTrade, trades)} }
+	unit := report(10).sizeBytes()
+	c.maxBytes = 2*unit + unit/2
+
+	c.put("a", report(10))
+	clock = clock.Add(time.Second)
+	c.put("b", report(10))
+	clock = clock.Add(time.Second)
+	if c.get("a") == nil {
+		t.Fatal("a missing")
+	}
+	c.put("c", report(10)) // over budget: b is least recently used
+	if c.get("b") != nil || c.get("a") == nil || c.get("c") == nil {
+		t.Fatalf("want b evicted, a and c kept: %+v", c.stats())
+	}
+
+	// A report over the whole budget is kept until the next insert.
+	c.put("big", report(100))
+	if st := c.stats(); st.Entries != 1 || c.get("big") == nil {
+		t.Fatalf("want only the oversized report cached: %+v", st)
+	}
+
+	clock = clock.Add(2 * time.Minute)
+	if c.get("big") != nil {
+		t.Fatal("expired report served")
+	}
+	if st := c.stats(); st.Entries != 0 || st.Bytes != 0 {
+		t.Fatalf("accounting not back to zero: %+v", st)
+	}
+}
+
+func TestFlexBatch_PinsReportsPastTTLUntilRelease(t *testing.T) {
+	var sends int32
+	h := http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if strings.HasSuffix(r.URL.Path, "SendRequest") {
+			atomic.AddInt32(&sends, 1)
+			w.Write([]byte(`<FlexStatementResponse><Status>Success</Status><ReferenceCode>ref</ReferenceCode></FlexStatementResponse>`))
+			return
+		}
+		w.Write([]byte(`<FlexQueryResponse><FlexStatements><FlexStatement accountId="U1"><EquitySummaryInBase>` +
+			`<EquitySummaryByReportDateInBase reportDate="20250102" total="7"/>` +
+			`</EquitySummaryInBase></FlexStatement></FlexStatements></FlexQueryResponse>`))
+	})
+	client := newFlexTestClient(h)
+
+	clock := time.Now()
+	c := flexReportCache
+	c.mu.Lock()
+	c.now = func() time.Time { return clock }
+	c.mu.Unlock()
+	t.Cleanup(func() {
+		c.mu.Lock()
+		c.now = time.Now
+		c.mu.Unlock()
+	})
+
+	ctx, cancel := context.WithTimeout(context.Background(), time.Hour)
+	defer cancel()
+	batch := NewFlexBatch(1)
+	conn := &IBKR{token: "tok-pinned", queryID: "q-pin-test", client: client}
+	if _, ok := batch.Add(conn); !ok {
+		t.Fatal("IBKR connector rejected by the batch")
+	}
+	batch.Run(ctx)
+
+	// The user waited on a sync slot for longer than the cache TTL, and the
+	// cache was squeezed meanwhile: the batch's report is still served.
+	clock = clock.Add(flexReportCacheTTL + time.Minute)
+	c.mu.Lock()
+	c.evictLocked("")
+	c.mu.Unlock()
+	later := &IBKR{token: "tok-pinned", queryID: "q-pin-test", client: client}
+	bal, err := later.GetBalance(ctx)
+	if err != nil || bal.Equity != 7 {
+		t.Fatalf("GetBalance = %+v, %v; want the batch's report (equity 7)", bal, err)
+	}
+	if sends != 1 {
+		t.Fatalf("SendRequest %d times, want the batch's only", sends)
+	}
+
+	// Released at the end of the run, it is subject to the TTL again.
+	batch.Release()
+	if c.get(conn.flexKey()) != nil {
+		t.Fatal("released report served past its TTL")
+	}
+}
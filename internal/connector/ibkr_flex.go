@@ -0,0 +1,279 @@
+package connector
+
+import (
+	"encoding/xml"
+	"fmt"
+	"io"
+	"strconv"
+	"time"
+)
+
+// flexReport is the part of an IBKR Flex statement the connector reads,
+// decoded once per fetched report (PERF-008). Each accessor used to run its
+// own xml.Unmarshal over the same multi-MB document, so one sync decoded the
+// whole report five times and kept five DOM copies of the sections it
+// needed. Numbers and dates are parsed here, at decode time; the accessors
+// only filter and convert.
+//
+// A report with several FlexStatement elements is read the way xml.Unmarshal
+// read it into the old single-struct models: records from every statement
+// are concatenated in document order and accountID is the last one seen.
+//
+// A flexReport is shared by every connector instance using the same Flex
+// token and query through flexReportCache, so it must not be modified after
+// parseFlexReport returns.
+type flexReport struct {
+	accountID string
+	equity    []flexEquitySummary
+	positions []flexPosition
+	cashTxns  []flexCashTransaction
+	trades    []flexTrade
+}
+
+// flexEquitySummary is one EquitySummaryByReportDateInBase row.
+type flexEquitySummary struct {
+	reportDate           string
+	date                 time.Time // zero when reportDate is not YYYYMMDD
+	currency             string
+	total                float64
+	cash                 float64
+	stock                float64
+	options              float64
+	commodities          float64
+	unrealizedPnL        float64
+	cfdUnrealizedPl      float64
+	forexCfdUnrealizedPl float64
+}
+
+// flexPosition is one OpenPosition row.
+type flexPosition struct {
+	symbol            string
+	position          float64
+	markPrice         float64
+	costBasisMoney    float64
+	fifoPnlUnrealized float64
+	marketType        string
+}
+
+// flexCashTransaction is one CashTransaction row.
+type flexCashTransaction struct {
+	txType   string
+	amount   float64
+	currency string
+	at       time.Time // zero when dateTime is neither YYYYMMDD;HHMMSS nor YYYYMMDD
+}
+
+// flexTrade is one Trade row.
+type flexTrade struct {
+	id              string
+	symbol          string
+	buySell         string
+	price           float64
+	quantity        float64
+	ibCommission    float64
+	currency        string
+	fifoPnlRealized float64
+	at              time.Time // zero when dateTime is not YYYYMMDD;HHMMSS
+	marketType      string
+}
+
+// flexSections maps each FlexStatement section the connector reads to the
+// element name of its rows. Every other section is skipped unread.
+var flexSections = map[string]string{
+	"EquitySummaryInBase": "EquitySummaryByReportDateInBase",
+	"OpenPositions":       "OpenPosition",
+	"CashTransactions":    "CashTransaction",
+	"Trades":              "Trade",
+}
+
+// parseFlexReport decodes a FlexQueryResponse document with a streaming
+// decoder. Only the FlexQueryResponse > FlexStatements > FlexStatement >
+// section > row paths the old Unmarshal models matched are read; anything
+// else is skipped without being materialised.
+func parseFlexReport(r io.Reader) (*flexReport, error) {
+	d := xml.NewDecoder(r)
+	rep := &flexReport{}
+
+	// path holds the open elements down to the section (depth 0..3). Deeper
+	// elements are rows, which are read from their attributes and skipped.
+	var path [4]string
+	depth := 0
+	for {
+		tok, err := d.Token()
+		if err != nil {
+			// io.EOF before the root closes, as xml.Unmarshal reports it.
+			return nil, err
+		}
+		switch t := tok.(type) {
+		case xml.StartElement:
+			name := t.Name.Local
+			skip := false
+			switch depth {
+			case 0:
+				if name != "FlexQueryResponse" {
+					return nil, fmt.Errorf("expected element type <FlexQueryResponse> but have <%s>", name)
+				}
+			case 1:
+				skip = name != "FlexStatements"
+			case 2:
+				if skip = name != "FlexStatement"; !skip {
+					if v, ok := attrValue(t.Attr, "accountId"); ok {
+						rep.accountID = v
+					}
+				}
+			case 3:
+				_, known := flexSections[name]
+				skip = !known
+			default:
+				if name == flexSections[path[3]] {
+					rep.addRow(path[3], t.Attr)
+				}
+				skip = true
+			}
+			if skip {
+				if err := d.Skip(); err != nil {
+					return nil, err
+				}
+				continue
+			}
+			path[depth] = name
+			depth++
+		case xml.EndElement:
+			depth--
+			if depth == 0 {
+				// Like xml.Unmarshal, stop at the end of the root element.
+				return rep, nil
+			}
+		}
+	}
+}
+
+func (rep *flexReport) addRow(section string, attrs []xml.Attr) {
+	switch section {
+	case "EquitySummaryInBase":
+		var s flexEquitySummary
+		for _, a := range attrs {
+			switch a.Name.Local {
+			case "reportDate":
+				s.reportDate = a.Value
+				s.date, _ = time.Parse("20060102", a.Value)
+			case "currency":
+				s.currency = a.Value
+			case "total":
+				s.total = parseFlexFloat(a.Value)
+			case "cash":
+				s.cash = parseFlexFloat(a.Value)
+			case "stock":
+				s.stock = parseFlexFloat(a.Value)
+			case "options":
+				s.options = parseFlexFloat(a.Value)
+			case "commodities":
+				s.commodities = parseFlexFloat(a.Value)
+			case "unrealizedPnL":
+				s.unrealizedPnL = parseFlexFloat(a.Value)
+			case "cfdUnrealizedPl":
+				s.cfdUnrealizedPl = parseFlexFloat(a.Value)
+			case "forexCfdUnrealizedPl":
+				s.forexCfdUnrealizedPl = parseFlexFloat(a.Value)
+			}
+		}
+		rep.equity = append(rep.equity, s)
+	case "OpenPositions":
+		p := flexPosition{marketType: MarketStocks}
+		for _, a := range attrs {
+			switch a.Name.Local {
+			case "symbol":
+				p.symbol = a.Value
+			case "position":
+				p.position = parseFlexFloat(a.Value)
+			case "markPrice":
+				p.markPrice = parseFlexFloat(a.Value)
+			case "costBasisMoney":
+				p.costBasisMoney = parseFlexFloat(a.Value)
+			case "fifoPnlUnrealized":
+				p.fifoPnlUnrealized = parseFlexFloat(a.Value)
+			case "assetCategory":
+				p.marketType = flexMarketType(a.Value)
+			}
+		}
+		rep.positions = append(rep.positions, p)
+	case "CashTransactions":
+		var tx flexCashTransaction
+		for _, a := range attrs {
+			switch a.Name.Local {
+			case "type":
+				tx.txType = a.Value
+			case "amount":
+				tx.amount = parseFlexFloat(a.Value)
+			case "currency":
+				tx.currency = a.Value
+			case "dateTime":
+				ts, err := time.Parse("20060102;150405", a.Value)
+				if err != nil {
+					// Try date-only format
+					ts, _ = time.Parse("20060102", a.Value)
+				}
+				tx.at = ts
+			}
+		}
+		rep.cashTxns = append(rep.cashTxns, tx)
+	case "Trades":
+		t := flexTrade{marketType: MarketStocks}
+		for _, a := range attrs {
+			switch a.Name.Local {
+			case "tradeID":
+				t.id = a.Value
+			case "symbol":
+				t.symbol = a.Value
+			case "buySell":
+				t.buySell = a.Value
+			case "tradePrice":
+				t.price = parseFlexFloat(a.Value)
+			case "quantity":
+				t.quantity = parseFlexFloat(a.Value)
+			case "ibCommission":
+				t.ibCommission = parseFlexFloat(a.Value)
+			case "currency":
+				t.currency = a.Value
+			case "dateTime":
+				t.at, _ = time.Parse("20060102;150405", a.Value)
+			case "assetCategory":
+				t.marketType = flexMarketType(a.Value)
+			case "fifoPnlRealized":
+				t.fifoPnlRealized = parseFlexFloat(a.Value)
+			}
+		}
+		rep.trades = append(rep.trades, t)
+	}
+}
+
+// parseFlexFloat reads a Flex numeric attribute; blanks and malformed
+// values count as 0, as they always have.
+func parseFlexFloat(s string) float64 {
+	f, _ := strconv.ParseFloat(s, 64)
+	return f
+}
+
+// flexMarketType maps a Flex assetCategory to the connector market type.
+func flexMarketType(assetCategory string) string {
+	switch assetCategory {
+	case "FUT":
+		return MarketFutures
+	case "OPT":
+		return MarketOptions
+	case "CFD":
+		return MarketCFD
+	case "CASH":
+		return MarketForex
+	}
+	return MarketStocks
+}
+
+func attrValue(attrs []xml.Attr, local string) (string, bool) {
+	for _, a := range attrs {
+		if a.Name.Local == local {
+			return a.Value, true
+		}
+	}
+	return "", false
+}
@@ -0,0 +1,233 @@
+package connector
+
+import (
+	"sync"
+	"sync/atomic"
+	"time"
+	"unsafe"
+)
+
+const (
+	flexReportCacheTTL = 5 * time.Minute
+	// defaultFlexCacheMaxBytes bounds the parsed reports kept in memory. A
+	// year-long report of an active account is a few MB once parsed, so
+	// this holds a full daily run's worth of distinct Flex tokens.
+	defaultFlexCacheMaxBytes = 256 << 20
+)
+
+// flexCache holds parsed Flex reports by token:queryId, shared across
+// IBKR connector instances. Required because IBKR enforces a token-level
+// rate limit (error 1018) and users who link the same Flex credentials
+// would otherwise hammer each other out.
+//
+// It used to be a plain map that only ever grew: expired reports stayed
+// resident until the same token was fetched again. It is now bounded by
+// the estimated size of the parsed reports; expired entries are dropped
+// first, then the least recently used (CONN-009).
+//
+// Reports fetched by a FlexBatch are pinned for the run that prefetched
+// them: their users may wait longer than the TTL for a sync slot, and a
+// report that expired or was evicted meanwhile would be requested again,
+// hitting the token rate limit the batch exists to avoid. A pinned entry
+// neither expires nor is evicted, so the cache can exceed maxBytes until
+// the batch releases it.
+type flexCache struct {
+	mu       sync.Mutex
+	entries  map[string]*flexCacheEntry
+	bytes    int64
+	maxBytes int64
+	ttl      time.Duration
+	now      func() time.Time
+
+	hits      atomic.Int64
+	misses    atomic.Int64
+	evictions atomic.Int64
+}
+
+type flexCacheEntry struct {
+	report    *flexReport
+	size      int64
+	fetchedAt time.Time
+	lastUsed  time.Time
+	// pinnedUntil keeps the entry past the TTL and out of eviction.
+	pinnedUntil time.Time
+}
+
+// FlexCacheStats holds Flex report cache statistics.
+type FlexCacheStats struct {
+	Hits      int64
+	Misses    int64
+	Evictions int64
+	Entries   int
+	Bytes     int64
+	MaxBytes  int64
+}
+
+var flexReportCache = newFlexCache(defaultFlexCacheMaxBytes, flexReportCacheTTL)
+
+func newFlexCache(maxBytes int64, ttl time.Duration) *flexCache {
+	return &flexCache{
+		entries:  make(map[string]*flexCacheEntry),
+		maxBytes: maxBytes,
+		ttl:      ttl,
+		now:      time.Now,
+	}
+}
+
+// SetFlexCacheMaxBytes changes the memory budget of the process-wide Flex
+// report cache, evicting immediately if it is now over budget.
+func SetFlexCacheMaxBytes(maxBytes int64) {
+	c := flexReportCache
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	c.maxBytes = maxBytes
+	c.evictLocked("")
+}
+
+// FlexCacheStatistics returns the process-wide Flex report cache statistics.
+func FlexCacheStatistics() FlexCacheStats {
+	return flexReportCache.stats()
+}
+
+// get returns the report for key if it is younger than the TTL or pinned.
+func (c *flexCache) get(key string) *flexReport {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	entry, ok := c.entries[key]
+	if !ok {
+		c.misses.Add(1)
+		return nil
+	}
+	now := c.now()
+	if entry.expired(now, c.ttl) {
+		c.removeLocked(key, entry)
+		c.misses.Add(1)
+		return nil
+	}
+	entry.lastUsed = now
+	c.hits.Add(1)
+	return entry.report
+}
+
+// put stores report under key and evicts down to the memory budget. The
+// entry just stored is never the one evicted, so a report larger than the
+// whole budget still serves the syncs sharing its token for one TTL.
+func (c *flexCache) put(key string, report *flexReport) {
+	now := c.now()
+	entry := &flexCacheEntry{report: report, size: report.sizeBytes(), fetchedAt: now, lastUsed: now}
+
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if old, ok := c.entries[key]; ok {
+		c.bytes -= old.size
+	}
+	c.entries[key] = entry
+	c.bytes += entry.size
+	c.evictLocked(key)
+}
+
+// pin keeps report cached under key until until, storing it again if it has
+// been evicted since it was fetched.
+func (c *flexCache) pin(key string, report *flexReport, until time.Time) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	entry, ok := c.entries[key]
+	if !ok || entry.report != report {
+		now := c.now()
+		if ok {
+			c.bytes -= entry.size
+		}
+		entry = &flexCacheEntry{report: report, size: report.sizeBytes(), fetchedAt: now, lastUsed: now}
+		c.entries[key] = entry
+		c.bytes += entry.size
+	}
+	if until.After(entry.pinnedUntil) {
+		entry.pinnedUntil = until
+	}
+}
+
+// unpin returns the entries under keys to the TTL and the memory budget.
+func (c *flexCache) unpin(keys []string) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	for _, key := range keys {
+		if entry, ok := c.entries[key]; ok {
+			entry.pinnedUntil = time.Time{}
+		}
+	}
+	c.evictLocked("")
+}
+
+func (c *flexCache) stats() FlexCacheStats {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return FlexCacheStats{
+		Hits:      c.hits.Load(),
+		Misses:    c.misses.Load(),
+		Evictions: c.evictions.Load(),
+		Entries:   len(c.entries),
+		Bytes:     c.bytes,
+		MaxBytes:  c.maxBytes,
+	}
+}
+
+// evictLocked drops expired entries, then least-recently-used ones until
+// the cache fits maxBytes. keep and pinned entries are exempt.
+func (c *flexCache) evictLocked(keep string) {
+	now := c.now()
+	for key, entry := range c.entries {
+		if key != keep && entry.expired(now, c.ttl) {
+			c.removeLocked(key, entry)
+		}
+	}
+	for c.bytes > c.maxBytes {
+		var oldestKey string
+		var oldest *flexCacheEntry
+		for key, entry := range c.entries {
+			if key == keep || now.Before(entry.pinnedUntil) {
+				continue
+			}
+			if oldest == nil || entry.lastUsed.Before(oldest.lastUsed) {
+				oldestKey, oldest = key, entry
+			}
+		}
+		if oldest == nil {
+			return
+		}
+		c.removeLocked(oldestKey, oldest)
+	}
+}
+
+func (e *flexCacheEntry) expired(now time.Time, ttl time.Duration) bool {
+	return now.Sub(e.fetchedAt) >= ttl && !now.Before(e.pinnedUntil)
+}
+
+func (c *flexCache) removeLocked(key string, entry *flexCacheEntry) {
+	delete(c.entries, key)
+	c.bytes -= entry.size
+	c.evictions.Add(1)
+}
+
+// sizeBytes estimates the heap held by the report: the row arrays at their
+// capacity plus the bytes of every string.
+func (rep *flexReport) sizeBytes() int64 {
+	n := int64(unsafe.Sizeof(*rep)) + int64(len(rep.accountID))
+	n += int64(cap(rep.equity)) * int64(unsafe.Sizeof(flexEquitySummary{}))
+	for i := range rep.equity {
+		n += int64(len(rep.equity[i].reportDate) + len(rep.equity[i].currency))
+	}
+	n += int64(cap(rep.positions)) * int64(unsafe.Sizeof(flexPosition{}))
+	for i := range rep.positions {
+		n += int64(len(rep.positions[i].symbol))
+	}
+	n += int64(cap(rep.cashTxns)) * int64(unsafe.Sizeof(flexCashTransaction{}))
+	for i := range rep.cashTxns {
+		n += int64(len(rep.cashTxns[i].txType) + len(rep.cashTxns[i].currency))
+	}
+	n += int64(cap(rep.trades)) * int64(unsafe.Sizeof(flexTrade{}))
+	for i := range rep.trades {
+		t := &rep.trades[i]
+		n += int64(len(t.id) + len(t.symbol) + len(t.buySell) + len(t.currency))
+	}
+	return n
+}
@@ -0,0 +1,113 @@
+package connector
+
+import (
+	"strings"
+	"testing"
+	"time"
+)
+
+// flexFixture covers the shapes the accessors depend on: two statements
+// (rows concatenate, the last accountId wins), sections the connector does
+// not read (including row-named elements nested where Unmarshal would not
+// have matched them), malformed dates and numbers, and both cashflow date
+// formats.
+const flexFixture = `<?xml version="1.0" encoding="UTF-8"?>
+<FlexQueryResponse queryName="perf" type="AF">
+<FlexStatements count="2">
+<FlexStatement accountId="U1234567" fromDate="20250101" toDate="20250131">
+<AccountInformation accountId="U1234567" currency="USD"/>
+<EquitySummaryInBase>
+<EquitySummaryByReportDateInBase reportDate="20250102" currency="EUR" total="1000" cash="400" stock="600" options="0" commodities="0" unrealizedPnL="0"/>
+<EquitySummaryByReportDateInBase reportDate="bogus" total="999"/>
+<EquitySummaryByReportDateInBase reportDate="20250103" currency="EUR" total="0" cash="0"/>
+</EquitySummaryInBase>
+<Trades>
+<Trade tradeID="t1" symbol="AAPL" buySell="BUY" tradePrice="190.5" quantity="10" ibCommission="-1.25" currency="USD" dateTime="20250102;153000" assetCategory="STK" fifoPnlRealized="0"/>
+<Trade tradeID="t2" symbol="ES" buySell="SELL" tradePrice="5000" quantity="-2" ibCommission="-4" currency="USD" dateTime="20250102" assetCategory="FUT" fifoPnlRealized="120"/>
+</Trades>
+<StmtFunds><Trades><Trade tradeID="nested" dateTime="20250102;100000"/></Trades></StmtFunds>
+</FlexStatement>
+<FlexStatement accountId="DU7654321">
+<EquitySummaryInBase>
+<EquitySummaryByReportDateInBase reportDate="20250104" currency="EUR" total="1500" cash="-100" stock="1200" options="300" commodities="100" unrealizedPnL="0" cfdUnrealizedPl="7" forexCfdUnrealizedPl="1"/>
+</EquitySummaryInBase>
+<OpenPositions>
+<OpenPosition symbol="AAPL" position="10" markPrice="200" costBasisMoney="1905" fifoPnlUnrealized="95" assetCategory="STK"/>
+<OpenPosition symbol="EUR.USD" position="-1000" markPrice="1.1" costBasisMoney="1050" fifoPnlUnrealized="-50" assetCategory="CASH"/>
+<OpenPosition symbol="FLAT" position="0" fifoPnlUnrealized="5"/>
+</OpenPositions>
+<CashTransactions>
+<CashTransaction type="Deposits/Withdrawals" amount="250" currency="EUR" dateTime="20250104;090000"/>
+<CashTransaction type="Deposits/Withdrawals" amount="-40" currency="EUR" dateTime="20250104"/>
+<CashTransaction type="Dividends" amount="3" currency="EUR" dateTime="20250104"/>
+<CashTransaction type="Deposits" amount="100" currency="EUR" dateTime="2025-01-01"/>
+<CashTransaction type="Withdrawals" amount="-10" currency="EUR" dateTime="20241231"/>
+</CashTransactions>
+</FlexStatement>
+</FlexStatements>
+</FlexQueryResponse>`
+
+func TestParseFlexReport_Accessors(t *testing.T) {
+	report, err := parseFlexReport(strings.NewReader(flexFixture))
+	if err != nil {
+		t.Fatalf("parse: %v", err)
+	}
+	if len(report.equity) != 4 || len(report.positions) != 3 || len(report.cashTxns) != 5 || len(report.trades) != 2 {
+		t.Fatalf("rows: equity=%d positions=%d cash=%d trades=%d",
+			len(report.equity), len(report.positions), len(report.cashTxns), len(report.trades))
+	}
+
+	i := &IBKR{}
+	bal := i.balanceFromReport(report)
+	if bal.Equity != 1500 || bal.Available != -100 || bal.Currency != "EUR" || bal.UnrealizedPnL != 50 {
+		t.Fatalf("balance = %+v", bal)
+	}
+	if i.cachedIsPaper == nil || !*i.cachedIsPaper {
+		t.Fatal("account DU7654321 of the last statement should be detected as paper")
+	}
+	if len(i.cachedBreakdown) != 3 || i.cachedBreakdown[0].AvailableMargin != -100 || i.cachedBreakdown[2].MarketType != MarketFutures {
+		t.Fatalf("breakdown = %+v", i.cachedBreakdown)
+	}
+
+	positions := positionsFromReport(report)
+	if len(positions) != 2 {
+		t.Fatalf("positions = %d, want the two non-flat ones", len(positions))
+	}
+	if p := positions[1]; p.Side != "short" || p.Size != 1000 || p.EntryPrice != 1.05 || p.MarketType != MarketForex {
+		t.Fatalf("short position = %+v", p)
+	}
+
+	since := time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC)
+	cashflows := cashflowsFromReport(report, since)
+	if len(cashflows) != 2 || cashflows[0].Amount != 250 || cashflows[1].Amount != -40 {
+		t.Fatalf("cashflows = %+v", cashflows)
+	}
+
+	snaps := historicalSnapshotsFromReport(report, since)
+	if len(snaps) != 2 {
+		t.Fatalf("snapshots = %d, want the two dated non-zero days", len(snaps))
+	}
+	if s := snaps[1]; s.TotalEquity != 1500 || s.Deposits != 250 || s.Withdrawals != 40 || len(s.Breakdown) != 3 {
+		t.Fatalf("snapshot = %+v", s)
+	}
+
+	trades := tradesFromReport(report, since, since.AddDate(0, 1, 0))
+	if len(trades) != 1 {
+		t.Fatalf("trades = %d, want only the one with a full dateTime", len(trades))
+	}
+	if tr := trades[0]; tr.ID != "t1" || tr.Fee != 1.25 || tr.Side != "buy" || tr.MarketType != MarketStocks {
+		t.Fatalf("trade = %+v", tr)
+	}
+}
+
+func TestParseFlexReport_RejectsOtherRoots(t *testing.T) {
+	for _, doc := range []string{
+		"",
+		`<FlexStatementResponse><Status>Warn</Status></FlexStatementResponse>`,
+		`<FlexQueryResponse><FlexStatements><FlexStatement>`,
+	} {
+		if _, err := parseFlexReport(strings.NewReader(doc)); err == nil {
+			t.Errorf("parseFlexReport(%q) succeeded, want error", doc)
+		}
+	}
+}
@@ -102,6 +102,42 @@ type PerMarketTradeFetcher interface {
 	GetTradesByMarket(ctx context.Context, marketType string, since time.Time) ([]*Trade, error)
 }
 
+// TradeStreamer optionally streams trades in batches (typically one API
+// page) instead of materialising the whole window as one slice, so a sync's
+// peak memory is bounded by page size rather than daily trade count. fn is
+// called with each batch in order and must not retain the slice; an error
+// from fn stops the stream and is returned as-is.
+type TradeStreamer interface {
+	StreamTrades(ctx context.Context, start, end time.Time, fn func(batch []*Trade) error) error
+}
+
+// StreamTrades streams c's trades through fn: natively when c implements
+// TradeStreamer, otherwise as a single batch from GetTrades.
+func StreamTrades(ctx context.Context, c Connector, start, end time.Time, fn func(batch []*Trade) error) error {
+	if ts, ok := c.(TradeStreamer); ok {
+		return ts.StreamTrades(ctx, start, end, fn)
+	}
+	trades, err := c.GetTrades(ctx, start, end)
+	if err != nil {
+		return err
+	}
+	if len(trades) == 0 {
+		return nil
+	}
+	return fn(trades)
+}
+
+// CollectTrades drains a TradeStreamer into a slice. Streaming connectors
+// use it to implement GetTrades.
+func CollectTrades(ctx context.Context, ts TradeStreamer, start, end time.Time) ([]*Trade, error) {
+	var trades []*Trade
+	err := ts.StreamTrades(ctx, start, end, func(batch []*Trade) error {
+		trades = append(trades, batch...)
+		return nil
+	})
+	return trades, err
+}
+
 // TokenPersister is called when OAuth tokens are refreshed, to persist them to DB.
 type TokenPersister func(ctx context.Context, accessToken, refreshToken string) error
 
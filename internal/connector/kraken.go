@@ -14,6 +14,8 @@ import (
 	"sort"
 	"strconv"
 	"strings"
+	"sync"
+	"sync/atomic"
 	"time"
 )
 
@@ -24,6 +26,13 @@ type Kraken struct {
 	apiKey    string
 	apiSecret string
 	client    *http.Client
+
+	// Kraken rejects a private call whose nonce is not above the last one it
+	// saw for the key ("EAPI:Invalid nonce"). privateMu keeps private calls
+	// in nonce order; lastNonce keeps nonces strictly increasing when two
+	// calls fall in the same millisecond.
+	privateMu sync.Mutex
+	lastNonce atomic.Int64
 }
 
 // NewKraken creates a new Kraken connector.
@@ -56,12 +65,30 @@ func (k *Kraken) sign(path, nonce, postData string) (string, error) {
 	return base64.StdEncoding.EncodeToString(mac.Sum(nil)), nil
 }
 
+// nextNonce returns the current time in milliseconds, or one more than the
+// last nonce when the clock has not moved past it.
+func (k *Kraken) nextNonce() int64 {
+	for {
+		last := k.lastNonce.Load()
+		next := time.Now().UnixMilli()
+		if next <= last {
+			next = last + 1
+		}
+		if k.lastNonce.CompareAndSwap(last, next) {
+			return next
+		}
+	}
+}
+
 func (k *Kraken) doPrivate(ctx context.Context, path string, params url.Values) ([]byte, error) {
 	if params == nil {
 		params = url.Values{}
 	}
 
-	nonce := strconv.FormatInt(time.Now().UnixNano()/int64(time.Millisecond), 10)
+	k.privateMu.Lock()
+	defer k.privateMu.Unlock()
+
+	nonce := strconv.FormatInt(k.nextNonce(), 10)
 	params.Set("nonce", nonce)
 	postData := params.Encode()
 
@@ -78,7 +105,7 @@ func (k *Kraken) doPrivate(ctx context.Context, path string, params url.Values)
 	req.Header.Set("API-Key", k.apiKey)
 	req.Header.Set("API-Sign", signature)
 
-	resp, err := k.client.Do(req)
+	resp, err := doGoverned(k.client, req)
 	if err != nil {
 		return nil, err
 	}
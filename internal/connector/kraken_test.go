@@ -0,0 +1,44 @@
+package connector
+
+import (
+	"sync"
+	"testing"
+	"time"
+)
+
+func TestKrakenNextNonce_StrictlyIncreasing(t *testing.T) {
+	k := NewKraken(&Credentials{})
+	start := time.Now().UnixMilli()
+
+	const goroutines, perGoroutine = 8, 500
+	nonces := make(chan int64, goroutines*perGoroutine)
+	var wg sync.WaitGroup
+	for g := 0; g < goroutines; g++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			last := int64(0)
+			for i := 0; i < perGoroutine; i++ {
+				n := k.nextNonce()
+				if n <= last {
+					t.Errorf("nonce %d after %d", n, last)
+				}
+				last = n
+				nonces <- n
+			}
+		}()
+	}
+	wg.Wait()
+	close(nonces)
+
+	seen := make(map[int64]struct{}, goroutines*perGoroutine)
+	for n := range nonces {
+		if n < start {
+			t.Fatalf("nonce %d below the clock %d", n, start)
+		}
+		if _, dup := seen[n]; dup {
+			t.Fatalf("nonce %d issued twice", n)
+		}
+		seen[n] = struct{}{}
+	}
+}
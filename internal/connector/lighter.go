@@ -11,6 +11,7 @@ import (
 	"net/url"
 	"strconv"
 	"strings"
+	"sync"
 	"time"
 )
 
@@ -26,8 +27,12 @@ const lighterAPI = "https://mainnet.zklighter.elliot.ai"
 type Lighter struct {
 	authToken     string
 	walletAddress string
-	accountIndex  *int
 	client        *http.Client
+
+	// mu guards accountIndex: it is resolved lazily and the sync pipeline
+	// calls GetBalance and GetTrades concurrently.
+	mu           sync.Mutex
+	accountIndex *int
 }
 
 // NewLighter creates a new Lighter connector.
@@ -203,22 +208,37 @@ type lighterExportRow struct {
 }
 
 func (l *Lighter) getAccountIndex(ctx context.Context) (int, error) {
-	if l.accountIndex != nil {
-		return *l.accountIndex, nil
+	if idx, ok := l.knownAccountIndex(); ok {
+		return idx, nil
 	}
 	account, err := l.fetchAccount(ctx)
 	if err != nil {
 		return 0, err
 	}
-	l.accountIndex = &account.Index
+	l.setAccountIndex(account.Index)
 	return account.Index, nil
 }
 
+func (l *Lighter) knownAccountIndex() (int, bool) {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+	if l.accountIndex == nil {
+		return 0, false
+	}
+	return *l.accountIndex, true
+}
+
+func (l *Lighter) setAccountIndex(idx int) {
+	l.mu.Lock()
+	l.accountIndex = &idx
+	l.mu.Unlock()
+}
+
 func (l *Lighter) fetchAccount(ctx context.Context) (*lighterAccount, error) {
-	if l.accountIndex != nil && *l.accountIndex > 0 {
+	if idx, ok := l.knownAccountIndex(); ok && idx > 0 {
 		data, err := l.doGet(ctx, "/api/v1/account", map[string]string{
 			"by":    "index",
-			"value": strconv.Itoa(*l.accountIndex),
+			"value": strconv.Itoa(idx),
 		})
 		if err == nil {
 			var resp lighterAccountResponse
@@ -226,7 +246,7 @@ func (l *Lighter) fetchAccount(ctx context.Context) (*lighterAccount, error) {
 				return &resp.Accounts[0], nil
 			}
 		}
-		return nil, fmt.Errorf("lighter: could not fetch account (index=%d)", *l.accountIndex)
+		return nil, fmt.Errorf("lighter: could not fetch account (index=%d)", idx)
 	}
 
 	if l.walletAddress != "" {
@@ -248,8 +268,7 @@ func (l *Lighter) fetchAccount(ctx context.Context) (*lighterAccount, error) {
 		if len(resp.Accounts) == 0 {
 			return nil, fmt.Errorf("lighter: no account found for l1_address %s", walletPrefix(l.walletAddress))
 		}
-		idx := resp.Accounts[0].Index
-		l.accountIndex = &idx
+		l.setAccountIndex(resp.Accounts[0].Index)
 		return &resp.Accounts[0], nil
 	}
 
@@ -299,7 +318,7 @@ func (l *Lighter) downloadCSV(ctx context.Context, csvURL string) ([]lighterExpo
 		return nil, err
 	}
 
-	resp, err := l.client.Do(req)
+	resp, err := doGoverned(l.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -381,7 +400,7 @@ func (l *Lighter) doGet(ctx context.Context, path string, query map[string]strin
 		return nil, err
 	}
 
-	resp, err := l.client.Do(req)
+	resp, err := doGoverned(l.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -419,7 +438,7 @@ func (l *Lighter) doGetAuth(ctx context.Context, path string, query map[string]s
 	}
 	req.Header.Set("authorization", l.authToken)
 
-	resp, err := l.client.Do(req)
+	resp, err := doGoverned(l.client, req)
 	if err != nil {
 		return nil, err
 	}
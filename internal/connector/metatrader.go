@@ -279,7 +279,7 @@ func (m *MetaTrader) callBridge(ctx context.Context, method, path string, body a
 	req.Header.Set("X-MT-Bridge-Timestamp", ts)
 	req.Header.Set("X-MT-Bridge-Signature", signature)
 
-	resp, err := m.client.Do(req)
+	resp, err := doGoverned(m.client, req)
 	if err != nil {
 		return err
 	}
@@ -374,22 +374,15 @@ func (m *MEXC) GetTrades(ctx context.Context, start, end time.Time) ([]*Trade, e
 
 	// CONN-006: MEXC rate-limits /api/v3/myTrades to ~20 req/s. A user holding
 	// 40+ assets can burn that budget in a single sync call if we fire
-	// requests back-to-back. 70ms between requests keeps us at ~14 req/s,
-	// well under MEXC's cap and leaving headroom for concurrent connectors.
-	const perSymbolGap = 70 * time.Millisecond
+	// requests back-to-back. Pacing is done by the process-wide governor
+	// (CONN-008), whose api.mexc.com budget of ~14 req/s is shared by every
+	// concurrent MEXC sync rather than applied per connector instance.
 	// Distinguish permanent failures (delisted pairs → HTTP 400) from
 	// transient ones (429 / 5xx / network). Permanent: skip with debug log.
 	// Transient: escalate so the caller retries the sync cleanly, rather
 	// than silently truncating the user's trade history.
 	var trades []*Trade
-	for i, sym := range symbols {
-		if i > 0 {
-			select {
-			case <-ctx.Done():
-				return nil, ctx.Err()
-			case <-time.After(perSymbolGap):
-			}
-		}
+	for _, sym := range symbols {
 		symTrades, err := m.fetchTradesForSymbol(ctx, sym, start, end)
 		if err != nil {
 			if isMEXCTransient(err) {
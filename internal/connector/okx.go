@@ -58,7 +58,7 @@ func (o *OKX) doRequest(ctx context.Context, method, path string) ([]byte, error
 	req.Header.Set("OK-ACCESS-PASSPHRASE", o.passphrase)
 	req.Header.Set("Content-Type", "application/json")
 
-	resp, err := o.client.Do(req)
+	resp, err := doGoverned(o.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -7,6 +7,7 @@ import (
 	"net/http"
 	"net/url"
 	"strings"
+	"sync"
 	"time"
 )
 
@@ -23,9 +24,13 @@ type TradeStation struct {
 	clientID     string
 	clientSecret string
 	refreshToken string
-	accessToken  string
-	tokenExpiry  time.Time
 	client       *http.Client
+
+	// tokenMu serialises token refresh; balance and trade fetches run
+	// concurrently during a sync.
+	tokenMu     sync.Mutex
+	accessToken string
+	tokenExpiry time.Time
 }
 
 // NewTradeStation creates a new TradeStation connector
@@ -69,9 +74,11 @@ func (t *TradeStation) DetectIsPaper(ctx context.Context) (bool, error) {
 	return true, nil
 }
 
-func (t *TradeStation) refreshAccessToken(ctx context.Context) error {
+func (t *TradeStation) refreshAccessToken(ctx context.Context) (string, error) {
+	t.tokenMu.Lock()
+	defer t.tokenMu.Unlock()
 	if t.accessToken != "" && time.Now().Before(t.tokenExpiry) {
-		return nil
+		return t.accessToken, nil
 	}
 
 	data := url.Values{}
@@ -82,23 +89,23 @@ func (t *TradeStation) refreshAccessToken(ctx context.Context) error {
 
 	req, err := http.NewRequestWithContext(ctx, "POST", tradeStationAuthURL, strings.NewReader(data.Encode()))
 	if err != nil {
-		return err
+		return "", err
 	}
 	req.Header.Set("Content-Type", "application/x-www-form-urlencoded")
 
-	resp, err := t.client.Do(req)
+	resp, err := doGoverned(t.client, req)
 	if err != nil {
-		return err
+		return "", err
 	}
 
 	// CONN-AUDIT-001: bounded read for both error and success paths.
 	body, err := ReadCappedBody(resp.Body, DefaultMaxResponseBytes)
 	if err != nil {
-		return err
+		return "", err
 	}
 
 	if resp.StatusCode != http.StatusOK {
-		return fmt.Errorf("token refresh failed: %s", TruncatedBody(body))
+		return "", fmt.Errorf("token refresh failed: %s", TruncatedBody(body))
 	}
 
 	var tokenResp struct {
@@ -107,17 +114,18 @@ func (t *TradeStation) refreshAccessToken(ctx context.Context) error {
 	}
 
 	if err := json.Unmarshal(body, &tokenResp); err != nil {
-		return err
+		return "", err
 	}
 
 	t.accessToken = tokenResp.AccessToken
 	t.tokenExpiry = time.Now().Add(time.Duration(tokenResp.ExpiresIn-60) * time.Second)
 
-	return nil
+	return t.accessToken, nil
 }
 
 func (t *TradeStation) doRequest(ctx context.Context, path string) ([]byte, error) {
-	if err := t.refreshAccessToken(ctx); err != nil {
+	token, err := t.refreshAccessToken(ctx)
+	if err != nil {
 		return nil, err
 	}
 
@@ -126,9 +134,9 @@ func (t *TradeStation) doRequest(ctx context.Context, path string) ([]byte, erro
 		return nil, err
 	}
 
-	req.Header.Set("Authorization", "Bearer "+t.accessToken)
+	req.Header.Set("Authorization", "Bearer "+token)
 
-	resp, err := t.client.Do(req)
+	resp, err := doGoverned(t.client, req)
 	if err != nil {
 		return nil, err
 	}
@@ -40,56 +40,5 @@ func Connect(ctx context.Context, databaseURL string, logger *zap.Logger) (*pgxp
 		zap.Int32("max_conns", config.MaxConns),
 	)
 
-	// Audit critical parity columns at startup.
-	auditSchemaColumns(ctx, pool, logger)
-
 	return pool, nil
 }
-
-func auditSchemaColumns(ctx context.Context, pool *pgxpool.Pool, logger *zap.Logger) {
-	// Check both Go (snake_case) and TS Prisma (camelCase) column names.
-	// If either exists, the column is present.
-	required := []struct {
-		table    string
-		snakeCol string
-		camelCol string
-	}{
-		{"users", "platform_hash", "platformHash"},
-		{"exchange_connections", "credentials_hash", "credentialsHash"},
-		{"exchange_connections", "sync_interval_minutes", "syncIntervalMinutes"},
-		{"exchange_connections", "exclude_from_report", "excludeFromReport"},
-		{"exchange_connections", "kyc_level", "kycLevel"},
-		{"exchange_connections", "is_paper", "isPaper"},
-		{"snapshot_data", "label", "label"},
-	}
-
-	for _, rc := range required {
-		snakeExists, _ := columnExists(ctx, pool, rc.table, rc.snakeCol)
-		camelExists, _ := columnExists(ctx, pool, rc.table, rc.camelCol)
-
-		if !snakeExists && !camelExists {
-			logger.Warn("schema column missing",
-				zap.String("table", rc.table),
-				zap.String("column", rc.snakeCol),
-				zap.String("hint", "apply latest SQL migrations"),
-			)
-		}
-	}
-}
-
-func columnExists(ctx context.Context, pool *pgxpool.Pool, tableName, columnName string) (bool, error) {
-	const query = `
-		SELECT EXISTS (
-			SELECT 1
-			FROM information_schema.columns
-			WHERE table_schema = 'public'
-			  AND table_name = $1
-			  AND column_name = $2
-		)`
-
-	var exists bool
-	if err := pool.QueryRow(ctx, query, tableName, columnName).Scan(&exists); err != nil {
-		return false, err
-	}
-	return exists, nil
-}
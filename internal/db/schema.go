@@ -0,0 +1,101 @@
+package db
+
+import (
+	"context"
+	"fmt"
+
+	"github.com/jackc/pgx/v5/pgxpool"
+	"go.uber.org/zap"
+)
+
+// Schema is the set of columns of the public tables the repositories read,
+// loaded once in a single information_schema query. Repositories pick their
+// TS (Prisma camelCase) or Go (snake_case) SQL variant and their optional
+// columns from it instead of probing information_schema each on their first
+// request.
+type Schema struct {
+	columns map[string]map[string]struct{}
+}
+
+// schemaTables are the tables whose columns LoadSchema records.
+var schemaTables = []string{
+	"users", "exchange_connections", "snapshot_data", "sync_statuses",
+}
+
+// LoadSchema reads the columns of every table in schemaTables. Call it after
+// migrations have been applied.
+func LoadSchema(ctx context.Context, pool *pgxpool.Pool) (*Schema, error) {
+	rows, err := pool.Query(ctx, `
+		SELECT table_name, column_name
+		FROM information_schema.columns
+		WHERE table_schema = 'public'
+		  AND table_name = ANY($1)`, schemaTables)
+	if err != nil {
+		return nil, fmt.Errorf("load schema: %w", err)
+	}
+	defer rows.Close()
+
+	s := &Schema{columns: make(map[string]map[string]struct{}, len(schemaTables))}
+	for rows.Next() {
+		var table, column string
+		if err := rows.Scan(&table, &column); err != nil {
+			return nil, fmt.Errorf("load schema: %w", err)
+		}
+		if s.columns[table] == nil {
+			s.columns[table] = make(map[string]struct{})
+		}
+		s.columns[table][column] = struct{}{}
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("load schema: %w", err)
+	}
+	return s, nil
+}
+
+// NewSchema builds a descriptor from table → column names, for tests and
+// tools that know the schema without querying it.
+func NewSchema(columns map[string][]string) *Schema {
+	s := &Schema{columns: make(map[string]map[string]struct{}, len(columns))}
+	for table, cols := range columns {
+		s.columns[table] = make(map[string]struct{}, len(cols))
+		for _, c := range cols {
+			s.columns[table][c] = struct{}{}
+		}
+	}
+	return s
+}
+
+// HasColumn reports whether table has column. Names are matched exactly, so
+// TS columns are passed in camelCase.
+func (s *Schema) HasColumn(table, column string) bool {
+	_, ok := s.columns[table][column]
+	return ok
+}
+
+// Audit logs a warning for each critical parity column that exists under
+// neither its Go (snake_case) nor its TS Prisma (camelCase) name.
+func (s *Schema) Audit(logger *zap.Logger) {
+	required := []struct {
+		table    string
+		snakeCol string
+		camelCol string
+	}{
+		{"users", "platform_hash", "platformHash"},
+		{"exchange_connections", "credentials_hash", "credentialsHash"},
+		{"exchange_connections", "sync_interval_minutes", "syncIntervalMinutes"},
+		{"exchange_connections", "exclude_from_report", "excludeFromReport"},
+		{"exchange_connections", "kyc_level", "kycLevel"},
+		{"exchange_connections", "is_paper", "isPaper"},
+		{"snapshot_data", "label", "label"},
+	}
+
+	for _, rc := range required {
+		if !s.HasColumn(rc.table, rc.snakeCol) && !s.HasColumn(rc.table, rc.camelCol) {
+			logger.Warn("schema column missing",
+				zap.String("table", rc.table),
+				zap.String("column", rc.snakeCol),
+				zap.String("hint", "apply latest SQL migrations"),
+			)
+		}
+	}
+}
@@ -0,0 +1,13 @@
+package db
+
+import "testing"
+
+func TestSchema_HasColumnIsExact(t *testing.T) {
+	s := NewSchema(map[string][]string{"users": {"platform_hash", "createdAt"}})
+	if !s.HasColumn("users", "createdAt") || s.HasColumn("users", "created_at") {
+		t.Fatal("column names must match exactly")
+	}
+	if s.HasColumn("snapshot_data", "label") {
+		t.Fatal("unknown table reported a column")
+	}
+}
@@ -24,6 +24,9 @@ import (
 	pb "github.com/trackrecord/enclave/api/proto"
 	"github.com/trackrecord/enclave/internal/auth"
 	"go.uber.org/zap"
+	gogrpc "google.golang.org/grpc"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/status"
 )
 
 func TestAuditGRPCJWTIDORCreateUserConnection(t *testing.T) {
@@ -107,9 +110,28 @@ func TestAuditGRPCMethodsRequireJWTExpanded(t *testing.T) {
 		"/enclave.EnclaveService/GetPerformanceMetrics",
 		"/enclave.EnclaveService/GetSnapshotTimeSeries",
 		"/enclave.EnclaveService/GetAggregatedMetrics",
+		"/enclave.EnclaveService/GetPerformanceMetricsWindows",
+		"/enclave.EnclaveService/StreamSnapshotTimeSeries",
 	} {
 		if !methodsRequireJWT[m] {
 			t.Errorf("methodsRequireJWT missing %q — every RPC accepting user_uid must be gated", m)
 		}
 	}
 }
+
+// TestAuditGRPCStreamAuthInterceptor checks that streaming RPCs in
+// methodsRequireJWT are gated too: unary interceptors never see them.
+func TestAuditGRPCStreamAuthInterceptor(t *testing.T) {
+	srv := NewServer(zap.NewNop(), Services{}, ServerOptions{JWTSecret: []byte("test-secret-at-least-32-bytes-long!")})
+	info := &gogrpc.StreamServerInfo{FullMethod: "/enclave.EnclaveService/StreamSnapshotTimeSeries", IsServerStream: true}
+
+	called := false
+	err := srv.streamAuthInterceptor(nil, &authenticatedStream{ctx: context.Background()}, info,
+		func(interface{}, gogrpc.ServerStream) error {
+			called = true
+			return nil
+		})
+	if status.Code(err) != codes.Unauthenticated || called {
+		t.Fatalf("unauthenticated stream: err = %v, handler called = %v", err, called)
+	}
+}
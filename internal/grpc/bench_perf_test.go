@@ -0,0 +1,99 @@
+package grpc
+
+import (
+	"fmt"
+	"testing"
+
+	pb "github.com/trackrecord/enclave/api/proto"
+	"github.com/trackrecord/enclave/internal/repository"
+	"google.golang.org/protobuf/proto"
+)
+
+// PERF-015: wire size and marshal/unmarshal time of a snapshot history in
+// the GetSnapshotTimeSeries shape (one response, a DailySnapshot per row)
+// against the StreamSnapshotTimeSeries pages, as rows and as columns.
+//
+//	go test ./internal/grpc/ -run '^$' -bench SnapshotTimeSeriesEncoding
+
+func BenchmarkSnapshotTimeSeriesEncoding(b *testing.B) {
+	const pageSize = defaultSnapshotPageSize
+
+	rowPages := func(snapshots []*repository.Snapshot) []proto.Message {
+		var msgs []proto.Message
+		for len(snapshots) > 0 {
+			page := snapshots[:min(pageSize, len(snapshots))]
+			snapshots = snapshots[len(page):]
+			chunk := &pb.SnapshotTimeSeriesChunk{Snapshots: make([]*pb.DailySnapshot, len(page))}
+			for i, snap := range page {
+				chunk.Snapshots[i] = mapDailySnapshot(snap)
+			}
+			msgs = append(msgs, chunk)
+		}
+		return msgs
+	}
+	columnPages := func(snapshots []*repository.Snapshot) []proto.Message {
+		var msgs []proto.Message
+		for len(snapshots) > 0 {
+			page := snapshots[:min(pageSize, len(snapshots))]
+			snapshots = snapshots[len(page):]
+			msgs = append(msgs, &pb.SnapshotTimeSeriesChunk{Columns: mapSnapshotColumns(page)})
+		}
+		return msgs
+	}
+	response := func(snapshots []*repository.Snapshot) []proto.Message {
+		resp := &pb.SnapshotTimeSeriesResponse{Snapshots: make([]*pb.DailySnapshot, len(snapshots))}
+		for i, snap := range snapshots {
+			resp.Snapshots[i] = mapDailySnapshot(snap)
+		}
+		return []proto.Message{resp}
+	}
+
+	for _, size := range []struct{ days, connections int }{{365, 1}, {3 * 365, 4}} {
+		snapshots := columnsTestSnapshots(size.days, size.connections)
+		for _, shape := range []struct {
+			name  string
+			build func([]*repository.Snapshot) []proto.Message
+			empty func() proto.Message
+		}{
+			{"Response", response, func() proto.Message { return &pb.SnapshotTimeSeriesResponse{} }},
+			{"RowPages", rowPages, func() proto.Message { return &pb.SnapshotTimeSeriesChunk{} }},
+			{"ColumnPages", columnPages, func() proto.Message { return &pb.SnapshotTimeSeriesChunk{} }},
+		} {
+			name := fmt.Sprintf("%s/snapshots=%d", shape.name, len(snapshots))
+			b.Run(name+"/marshal", func(b *testing.B) {
+				b.ReportAllocs()
+				var wire int
+				for i := 0; i < b.N; i++ {
+					wire = 0
+					for _, msg := range shape.build(snapshots) {
+						buf, err := proto.Marshal(msg)
+						if err != nil {
+							b.Fatal(err)
+						}
+						wire += len(buf)
+					}
+				}
+				b.ReportMetric(float64(wire), "wire-bytes")
+			})
+
+			var encoded [][]byte
+			for _, msg := range shape.build(snapshots) {
+				buf, err := proto.Marshal(msg)
+				if err != nil {
+					b.Fatal(err)
+				}
+				encoded = append(encoded, buf)
+			}
+			b.Run(name+"/unmarshal", func(b *testing.B) {
+				b.ReportAllocs()
+				for i := 0; i < b.N; i++ {
+					for _, buf := range encoded {
+						if err := proto.Unmarshal(buf, shape.empty()); err != nil {
+							b.Fatal(err)
+						}
+					}
+				}
+			})
+		}
+	}
+}
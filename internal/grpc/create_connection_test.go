@@ -26,6 +26,10 @@ func (f *fakeConnectionService) GetExcludedConnectionKeys(_ context.Context, _ s
 	return map[string]struct{}{}, nil
 }
 
+func (f *fakeConnectionService) GetExcludedConnectionKeysForUsers(_ context.Context, _ []string) (map[string]map[string]struct{}, error) {
+	return map[string]map[string]struct{}{}, nil
+}
+
 func (f *fakeConnectionService) GetActiveConnections(_ context.Context, _ string) ([]*repository.ExchangeConnection, error) {
 	return []*repository.ExchangeConnection{}, nil
 }
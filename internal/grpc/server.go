@@ -7,6 +7,7 @@ import (
 	"fmt"
 	"net"
 	"os"
+	"slices"
 	"strings"
 	"time"
 
@@ -58,11 +59,13 @@ type Server struct {
 	grpcServer        *grpc.Server
 	jwtSecret         []byte // HMAC-SHA256 secret for JWT verification; nil = dev mode (no auth)
 	jwtExpectedIssuer string // pins the `iss` claim when non-empty (AUTH-002)
+	bulkMetrics       bool   // serves GetBulkPerformanceMetrics
 }
 
 type connectionService interface {
 	Create(ctx context.Context, req *service.CreateConnectionRequest) error
 	GetExcludedConnectionKeys(ctx context.Context, userUID string) (map[string]struct{}, error)
+	GetExcludedConnectionKeysForUsers(ctx context.Context, userUIDs []string) (map[string]map[string]struct{}, error)
 	GetActiveConnections(ctx context.Context, userUID string) ([]*repository.ExchangeConnection, error)
 }
 
@@ -77,6 +80,12 @@ type ServerOptions struct {
 	// JWTExpectedIssuer pins the `iss` claim required on every inbound
 	// JWT (AUTH-002 follow-up). Empty leaves issuer unchecked (legacy).
 	JWTExpectedIssuer string
+
+	// BulkMetrics enables GetBulkPerformanceMetrics. The RPC returns the
+	// metrics of any user the caller names, so unlike the per-user RPCs it
+	// cannot be scoped by a JWT subject: it trusts the mTLS-authenticated
+	// caller. Off unless the deployment's gateway needs rankings.
+	BulkMetrics bool
 }
 
 // Services bundles every dependency the gRPC server needs (QUAL-001:
@@ -115,6 +124,7 @@ func NewServer(logger *zap.Logger, svcs Services, opts ServerOptions) *Server {
 		attestSvc:         svcs.AttestSvc,
 		jwtSecret:         opts.JWTSecret,
 		jwtExpectedIssuer: opts.JWTExpectedIssuer,
+		bulkMetrics:       opts.BulkMetrics,
 	}
 }
 
@@ -127,6 +137,7 @@ func (s *Server) Start(port int, tlsConfig *tls.Config) error {
 
 	serverOpts := []grpc.ServerOption{
 		grpc.ChainUnaryInterceptor(s.authInterceptor, s.loggingInterceptor),
+		grpc.ChainStreamInterceptor(s.streamAuthInterceptor),
 		// GRPC-001: cap inbound message size at 256 KiB. The largest
 		// legitimate payload is the SignedReportRequest (a few date / flag
 		// fields) — REST applies a 64 KiB MaxBytesReader on the same
@@ -190,12 +201,14 @@ func (s *Server) loggingInterceptor(
 // on any of these calls. Handlers below pair this with resolveUserUID()
 // so claims.Sub wins over req.UserUid whenever the JWT is verified.
 var methodsRequireJWT = map[string]bool{
-	"/enclave.EnclaveService/GenerateSignedReport":  true,
-	"/enclave.EnclaveService/CreateUserConnection":  true,
-	"/enclave.EnclaveService/ProcessSyncJob":        true,
-	"/enclave.EnclaveService/GetPerformanceMetrics": true,
-	"/enclave.EnclaveService/GetSnapshotTimeSeries": true,
-	"/enclave.EnclaveService/GetAggregatedMetrics":  true,
+	"/enclave.EnclaveService/GenerateSignedReport":         true,
+	"/enclave.EnclaveService/CreateUserConnection":         true,
+	"/enclave.EnclaveService/ProcessSyncJob":               true,
+	"/enclave.EnclaveService/GetPerformanceMetrics":        true,
+	"/enclave.EnclaveService/GetSnapshotTimeSeries":        true,
+	"/enclave.EnclaveService/GetAggregatedMetrics":         true,
+	"/enclave.EnclaveService/GetPerformanceMetricsWindows": true,
+	"/enclave.EnclaveService/StreamSnapshotTimeSeries":     true,
 }
 
 // resolveUserUID returns the authenticated caller UID (AUTH-002). When
@@ -225,15 +238,52 @@ func (s *Server) authInterceptor(
 	info *grpc.UnaryServerInfo,
 	handler grpc.UnaryHandler,
 ) (interface{}, error) {
-	if !methodsRequireJWT[info.FullMethod] {
-		return handler(ctx, req)
+	ctx, err := s.authenticate(ctx, info.FullMethod)
+	if err != nil {
+		return nil, err
+	}
+	return handler(ctx, req)
+}
+
+// streamAuthInterceptor applies authInterceptor's checks to streaming RPCs:
+// without it a server-streaming method in methodsRequireJWT would run
+// unauthenticated, as unary interceptors never see streams.
+func (s *Server) streamAuthInterceptor(
+	srv interface{},
+	ss grpc.ServerStream,
+	info *grpc.StreamServerInfo,
+	handler grpc.StreamHandler,
+) error {
+	ctx, err := s.authenticate(ss.Context(), info.FullMethod)
+	if err != nil {
+		return err
+	}
+	return handler(srv, &authenticatedStream{ServerStream: ss, ctx: ctx})
+}
+
+// authenticatedStream carries the context authenticate returned.
+type authenticatedStream struct {
+	grpc.ServerStream
+	ctx context.Context
+}
+
+func (s *authenticatedStream) Context() context.Context {
+	return s.ctx
+}
+
+// authenticate verifies the bearer token of a call to method and returns
+// ctx with the verified user UID, or ctx unchanged when method needs no JWT
+// or auth is skipped in dev mode.
+func (s *Server) authenticate(ctx context.Context, method string) (context.Context, error) {
+	if !methodsRequireJWT[method] {
+		return ctx, nil
 	}
 
 	if len(s.jwtSecret) == 0 {
 		s.logger.Warn("JWT auth skipped (ENCLAVE_JWT_SECRET not set)",
-			zap.String("method", info.FullMethod),
+			zap.String("method", method),
 		)
-		return handler(ctx, req)
+		return ctx, nil
 	}
 
 	// Extract Authorization header from gRPC metadata
@@ -257,15 +307,14 @@ func (s *Server) authInterceptor(
 	})
 	if err != nil {
 		s.logger.Warn("JWT verification failed",
-			zap.String("method", info.FullMethod),
+			zap.String("method", method),
 			zap.Error(err),
 		)
 		return nil, status.Error(codes.Unauthenticated, "invalid or expired token")
 	}
 
 	// Inject verified user UID into context — handlers must use this, not req.UserUid
-	ctx = auth.WithUserUID(ctx, claims.Sub)
-	return handler(ctx, req)
+	return auth.WithUserUID(ctx, claims.Sub), nil
 }
 
 func (s *Server) isProduction() bool {
@@ -535,6 +584,182 @@ func (s *Server) GetPerformanceMetrics(ctx context.Context, req *pb.PerformanceM
 		return &pb.PerformanceMetricsResponse{Success: false, Error: s.sanitizeErrorForClient(err)}, nil
 	}
 
+	return mapPerformanceMetrics(metrics), nil
+}
+
+// Bounds of a GetPerformanceMetricsWindows request: every window × split
+// pair is a result, so the two together bound the response size.
+const (
+	maxMetricsWindows = 32
+	maxMetricsSplits  = 16
+)
+
+// GetPerformanceMetricsWindows implements EnclaveService. It answers what
+// the gateway used to ask with one GetPerformanceMetrics call per period
+// (and per exchange): validation and the exclusion lookup run once, and
+// MetricsService.CalculateWindowSplits serves every window and split from
+// one snapshot fetch.
+func (s *Server) GetPerformanceMetricsWindows(ctx context.Context, req *pb.PerformanceMetricsWindowsRequest) (*pb.PerformanceMetricsWindowsResponse, error) {
+	if s.metricsSvc == nil {
+		return nil, status.Error(codes.Unavailable, "metrics service not available")
+	}
+	// AUTH-002: prefer the JWT-verified uid over the body-supplied one.
+	userUID := resolveUserUID(ctx, req.UserUid)
+	if err := validation.ValidateUserUID(userUID); err != nil {
+		return nil, status.Error(codes.InvalidArgument, err.Error())
+	}
+	if len(req.Windows) == 0 || len(req.Windows) > maxMetricsWindows {
+		return nil, status.Errorf(codes.InvalidArgument, "between 1 and %d windows are required", maxMetricsWindows)
+	}
+	if len(req.Exchanges) > maxMetricsSplits {
+		return nil, status.Errorf(codes.InvalidArgument, "at most %d exchanges can be requested", maxMetricsSplits)
+	}
+
+	exchanges := []string{""}
+	for _, rawExchange := range req.Exchanges {
+		if err := validation.ValidateExchange(rawExchange); err != nil {
+			return nil, status.Error(codes.InvalidArgument, err.Error())
+		}
+		if exchange := strings.ToLower(rawExchange); !slices.Contains(exchanges, exchange) {
+			exchanges = append(exchanges, exchange)
+		}
+	}
+
+	now := time.Now()
+	windows := make([]service.MetricsWindow, len(req.Windows))
+	for i, w := range req.Windows {
+		if err := validation.ValidateOptionalTimestampMillis(w.StartDate, "start_date"); err != nil {
+			return nil, status.Error(codes.InvalidArgument, err.Error())
+		}
+		if err := validation.ValidateOptionalTimestampMillis(w.EndDate, "end_date"); err != nil {
+			return nil, status.Error(codes.InvalidArgument, err.Error())
+		}
+		if w.StartDate != 0 && w.EndDate != 0 && w.StartDate >= w.EndDate {
+			return nil, status.Error(codes.InvalidArgument, "end_date must be after start_date")
+		}
+		windows[i] = service.MetricsWindow{Start: now.AddDate(-1, 0, 0), End: now}
+		if w.StartDate != 0 {
+			windows[i].Start = time.UnixMilli(w.StartDate)
+		}
+		if w.EndDate != 0 {
+			windows[i].End = time.UnixMilli(w.EndDate)
+		}
+	}
+
+	excludedConnectionKeys := map[string]struct{}{}
+	if s.connSvc != nil {
+		excluded, err := s.connSvc.GetExcludedConnectionKeys(ctx, userUID)
+		if err != nil {
+			return nil, status.Error(codes.Internal, s.sanitizeErrorForClient(err))
+		}
+		excludedConnectionKeys = excluded
+	}
+
+	splits, err := s.metricsSvc.CalculateWindowSplits(ctx, userUID, windows, exchanges, excludedConnectionKeys)
+	if err != nil {
+		return nil, status.Error(codes.Internal, s.sanitizeErrorForClient(err))
+	}
+
+	resp := &pb.PerformanceMetricsWindowsResponse{
+		Results: make([]*pb.WindowPerformanceMetrics, 0, len(exchanges)*len(windows)),
+	}
+	for i, exchange := range exchanges {
+		for j, res := range splits[i] {
+			// Per window, as GetPerformanceMetrics reports it: a window
+			// with too little data does not fail the others.
+			metrics := &pb.PerformanceMetricsResponse{Success: false}
+			if res.Err != nil {
+				metrics.Error = s.sanitizeErrorForClient(res.Err)
+			} else {
+				metrics = mapPerformanceMetrics(res.Metrics)
+			}
+			resp.Results = append(resp.Results, &pb.WindowPerformanceMetrics{
+				Window:   req.Windows[j].Name,
+				Exchange: exchange,
+				Metrics:  metrics,
+			})
+		}
+	}
+	return resp, nil
+}
+
+// maxBulkMetricsUsers bounds the users of one GetBulkPerformanceMetrics call.
+const maxBulkMetricsUsers = 1000
+
+// GetBulkPerformanceMetrics implements EnclaveService. Each requested user
+// gets one message, sent as soon as its metrics are computed (see
+// MetricsService.CalculateBulk); users with too little data in the window
+// get a message with success=false, as GetPerformanceMetrics reports them.
+func (s *Server) GetBulkPerformanceMetrics(req *pb.BulkPerformanceMetricsRequest, stream pb.EnclaveService_GetBulkPerformanceMetricsServer) error {
+	if !s.bulkMetrics {
+		return status.Error(codes.PermissionDenied, "bulk metrics are disabled")
+	}
+	if s.metricsSvc == nil || s.connSvc == nil {
+		return status.Error(codes.Unavailable, "metrics service not available")
+	}
+	ctx := stream.Context()
+
+	if len(req.UserUids) == 0 || len(req.UserUids) > maxBulkMetricsUsers {
+		return status.Errorf(codes.InvalidArgument, "between 1 and %d user_uids are required", maxBulkMetricsUsers)
+	}
+	for _, userUID := range req.UserUids {
+		if err := validation.ValidateUserUID(userUID); err != nil {
+			return status.Error(codes.InvalidArgument, err.Error())
+		}
+	}
+	if req.Exchange != "" {
+		if err := validation.ValidateExchange(req.Exchange); err != nil {
+			return status.Error(codes.InvalidArgument, err.Error())
+		}
+	}
+	if err := validation.ValidateOptionalTimestampMillis(req.StartDate, "start_date"); err != nil {
+		return status.Error(codes.InvalidArgument, err.Error())
+	}
+	if err := validation.ValidateOptionalTimestampMillis(req.EndDate, "end_date"); err != nil {
+		return status.Error(codes.InvalidArgument, err.Error())
+	}
+	if req.StartDate != 0 && req.EndDate != 0 && req.StartDate >= req.EndDate {
+		return status.Error(codes.InvalidArgument, "end_date must be after start_date")
+	}
+	exchange := strings.ToLower(req.Exchange)
+
+	start := time.UnixMilli(req.StartDate)
+	end := time.UnixMilli(req.EndDate)
+	if req.StartDate == 0 {
+		start = time.Now().AddDate(-1, 0, 0)
+	}
+	if req.EndDate == 0 {
+		end = time.Now()
+	}
+
+	excluded, err := s.connSvc.GetExcludedConnectionKeysForUsers(ctx, req.UserUids)
+	if err != nil {
+		return status.Error(codes.Internal, s.sanitizeErrorForClient(err))
+	}
+
+	err = s.metricsSvc.CalculateBulk(ctx, req.UserUids, start, end, exchange, excluded, func(res service.UserMetrics) error {
+		metrics := &pb.PerformanceMetricsResponse{Success: false}
+		if res.Err != nil {
+			metrics.Error = s.sanitizeErrorForClient(res.Err)
+		} else {
+			metrics = mapPerformanceMetrics(res.Metrics)
+		}
+		return stream.Send(&pb.UserPerformanceMetrics{UserUid: res.UserUID, Metrics: metrics})
+	})
+	if err != nil {
+		if ctx.Err() != nil {
+			return status.FromContextError(ctx.Err()).Err()
+		}
+		if _, ok := status.FromError(err); ok {
+			return err
+		}
+		return status.Error(codes.Internal, s.sanitizeErrorForClient(err))
+	}
+	return nil
+}
+
+// mapPerformanceMetrics converts computed metrics to their wire form.
+func mapPerformanceMetrics(metrics *service.PerformanceMetrics) *pb.PerformanceMetricsResponse {
 	return &pb.PerformanceMetricsResponse{
 		SharpeRatio:         metrics.SharpeRatio,
 		SortinoRatio:        metrics.SortinoRatio,
@@ -552,7 +777,7 @@ func (s *Server) GetPerformanceMetrics(ctx context.Context, req *pb.PerformanceM
 		PeriodEnd:           metrics.PeriodEnd.UnixMilli(),
 		DataPoints:          int32(metrics.DataPoints),
 		Success:             true,
-	}, nil
+	}
 }
 
 // GetSnapshotTimeSeries implements EnclaveService.
@@ -561,78 +786,184 @@ func (s *Server) GetSnapshotTimeSeries(ctx context.Context, req *pb.SnapshotTime
 		return nil, status.Error(codes.Unavailable, msgDatabaseNotConfigured)
 	}
 	// AUTH-002: prefer the JWT-verified uid over the body-supplied one.
-	userUID := resolveUserUID(ctx, req.UserUid)
-	rawExchange := req.Exchange
+	q, err := parseSnapshotSeriesQuery(resolveUserUID(ctx, req.UserUid), req.Exchange, req.StartDate, req.EndDate)
+	if err != nil {
+		return nil, err
+	}
+
+	snapshots, err := s.snapshotRepo.GetSeriesByUserAndDateRange(ctx, q.userUID, q.start, q.end, repository.ProjectBreakdown)
+	if err != nil {
+		return nil, status.Error(codes.Internal, s.sanitizeErrorForClient(err))
+	}
+
+	excludedConnectionKeys, err := s.excludedConnectionKeys(ctx, q.userUID)
+	if err != nil {
+		return nil, err
+	}
+
+	resp := &pb.SnapshotTimeSeriesResponse{Snapshots: make([]*pb.DailySnapshot, 0, len(snapshots))}
+	for _, snap := range q.filter(snapshots, excludedConnectionKeys) {
+		resp.Snapshots = append(resp.Snapshots, mapDailySnapshot(snap))
+	}
+
+	return resp, nil
+}
 
+const (
+	// defaultSnapshotPageSize and maxSnapshotPageSize bound the snapshots
+	// of one StreamSnapshotTimeSeries message.
+	defaultSnapshotPageSize = 500
+	maxSnapshotPageSize     = 5000
+)
+
+// StreamSnapshotTimeSeries implements EnclaveService. It returns what
+// GetSnapshotTimeSeries returns, as a stream of pages read from the
+// repository with a cursor (SnapshotRepo.ScanSeriesPages), so neither side
+// materializes a multi-year history in one message (PERF-015). With
+// columnar set each page is sent as SnapshotColumns, whose packed arrays
+// are smaller and cheaper to marshal than one DailySnapshot per row.
+// Pages may hold fewer than page_size snapshots once excluded connections
+// and other exchanges are filtered out.
+func (s *Server) StreamSnapshotTimeSeries(req *pb.SnapshotTimeSeriesStreamRequest, stream pb.EnclaveService_StreamSnapshotTimeSeriesServer) error {
+	if s.snapshotRepo == nil {
+		return status.Error(codes.Unavailable, msgDatabaseNotConfigured)
+	}
+	ctx := stream.Context()
+	// AUTH-002: prefer the JWT-verified uid over the body-supplied one.
+	q, err := parseSnapshotSeriesQuery(resolveUserUID(ctx, req.UserUid), req.Exchange, req.StartDate, req.EndDate)
+	if err != nil {
+		return err
+	}
+	pageSize := int(req.PageSize)
+	switch {
+	case pageSize == 0:
+		pageSize = defaultSnapshotPageSize
+	case pageSize < 0 || pageSize > maxSnapshotPageSize:
+		return status.Errorf(codes.InvalidArgument, "page_size must be between 1 and %d", maxSnapshotPageSize)
+	}
+
+	excludedConnectionKeys, err := s.excludedConnectionKeys(ctx, q.userUID)
+	if err != nil {
+		return err
+	}
+
+	err = s.snapshotRepo.ScanSeriesPages(ctx, q.userUID, q.start, q.end, pageSize, func(page []*repository.Snapshot) error {
+		page = q.filter(page, excludedConnectionKeys)
+		if len(page) == 0 {
+			return nil
+		}
+		chunk := &pb.SnapshotTimeSeriesChunk{}
+		if req.Columnar {
+			chunk.Columns = mapSnapshotColumns(page)
+		} else {
+			chunk.Snapshots = make([]*pb.DailySnapshot, len(page))
+			for i, snap := range page {
+				chunk.Snapshots[i] = mapDailySnapshot(snap)
+			}
+		}
+		return stream.Send(chunk)
+	})
+	if err != nil {
+		if ctx.Err() != nil {
+			return status.FromContextError(ctx.Err()).Err()
+		}
+		if _, ok := status.FromError(err); ok {
+			return err
+		}
+		return status.Error(codes.Internal, s.sanitizeErrorForClient(err))
+	}
+	return nil
+}
+
+// snapshotSeriesQuery is a validated snapshot time series request.
+type snapshotSeriesQuery struct {
+	userUID    string
+	exchange   string // lower-cased, "" = every exchange
+	start, end time.Time
+}
+
+// parseSnapshotSeriesQuery validates the fields of a snapshot time series
+// request; the range defaults to the last year.
+func parseSnapshotSeriesQuery(userUID, rawExchange string, startDate, endDate int64) (snapshotSeriesQuery, error) {
 	if err := validation.ValidateUserUID(userUID); err != nil {
-		return nil, status.Error(codes.InvalidArgument, err.Error())
+		return snapshotSeriesQuery{}, status.Error(codes.InvalidArgument, err.Error())
 	}
 	if rawExchange != "" {
 		if err := validation.ValidateExchange(rawExchange); err != nil {
-			return nil, status.Error(codes.InvalidArgument, err.Error())
+			return snapshotSeriesQuery{}, status.Error(codes.InvalidArgument, err.Error())
 		}
 	}
-	if err := validation.ValidateOptionalTimestampMillis(req.StartDate, "start_date"); err != nil {
-		return nil, status.Error(codes.InvalidArgument, err.Error())
+	if err := validation.ValidateOptionalTimestampMillis(startDate, "start_date"); err != nil {
+		return snapshotSeriesQuery{}, status.Error(codes.InvalidArgument, err.Error())
 	}
-	if err := validation.ValidateOptionalTimestampMillis(req.EndDate, "end_date"); err != nil {
-		return nil, status.Error(codes.InvalidArgument, err.Error())
+	if err := validation.ValidateOptionalTimestampMillis(endDate, "end_date"); err != nil {
+		return snapshotSeriesQuery{}, status.Error(codes.InvalidArgument, err.Error())
 	}
-	if req.StartDate != 0 && req.EndDate != 0 {
-		if req.StartDate >= req.EndDate {
-			return nil, status.Error(codes.InvalidArgument, "end_date must be after start_date")
+	if startDate != 0 && endDate != 0 {
+		if startDate >= endDate {
+			return snapshotSeriesQuery{}, status.Error(codes.InvalidArgument, "end_date must be after start_date")
 		}
-		if err := validation.ValidateTimestampRange(time.UnixMilli(req.StartDate), time.UnixMilli(req.EndDate)); err != nil {
-			return nil, status.Error(codes.InvalidArgument, err.Error())
+		if err := validation.ValidateTimestampRange(time.UnixMilli(startDate), time.UnixMilli(endDate)); err != nil {
+			return snapshotSeriesQuery{}, status.Error(codes.InvalidArgument, err.Error())
 		}
 	}
-	exchange := strings.ToLower(rawExchange)
 
-	start := time.UnixMilli(req.StartDate)
-	end := time.UnixMilli(req.EndDate)
-	if req.StartDate == 0 {
-		start = time.Now().AddDate(-1, 0, 0)
+	q := snapshotSeriesQuery{
+		userUID:  userUID,
+		exchange: strings.ToLower(rawExchange),
+		start:    time.UnixMilli(startDate),
+		end:      time.UnixMilli(endDate),
 	}
-	if req.EndDate == 0 {
-		end = time.Now()
+	if startDate == 0 {
+		q.start = time.Now().AddDate(-1, 0, 0)
 	}
-
-	snapshots, err := s.snapshotRepo.GetByUserAndDateRange(ctx, userUID, start, end)
-	if err != nil {
-		return nil, status.Error(codes.Internal, s.sanitizeErrorForClient(err))
-	}
-
-	excludedConnectionKeys := map[string]struct{}{}
-	if s.connSvc != nil {
-		excluded, err := s.connSvc.GetExcludedConnectionKeys(ctx, userUID)
-		if err != nil {
-			return nil, status.Error(codes.Internal, s.sanitizeErrorForClient(err))
-		}
-		excludedConnectionKeys = excluded
+	if endDate == 0 {
+		q.end = time.Now()
 	}
+	return q, nil
+}
 
-	resp := &pb.SnapshotTimeSeriesResponse{Snapshots: make([]*pb.DailySnapshot, 0, len(snapshots))}
+// filter returns the snapshots of the requested exchange that are not
+// excluded, in a new slice.
+func (q snapshotSeriesQuery) filter(snapshots []*repository.Snapshot, excluded map[string]struct{}) []*repository.Snapshot {
+	out := make([]*repository.Snapshot, 0, len(snapshots))
 	for _, snap := range snapshots {
-		if isConnectionExcluded(excludedConnectionKeys, snap.Exchange, snap.Label) {
+		if isConnectionExcluded(excluded, snap.Exchange, snap.Label) {
 			continue
 		}
-		if exchange != "" && strings.ToLower(snap.Exchange) != exchange {
+		if q.exchange != "" && strings.ToLower(snap.Exchange) != q.exchange {
 			continue
 		}
-		resp.Snapshots = append(resp.Snapshots, &pb.DailySnapshot{
-			UserUid:         snap.UserUID,
-			Exchange:        snap.Exchange,
-			Timestamp:       snap.Timestamp.UnixMilli(),
-			TotalEquity:     snap.TotalEquity,
-			RealizedBalance: snap.RealizedBalance,
-			UnrealizedPnl:   snap.UnrealizedPnL,
-			Deposits:        snap.Deposits,
-			Withdrawals:     snap.Withdrawals,
-			Breakdown:       mapMarketBreakdown(snap.Breakdown),
-		})
+		out = append(out, snap)
+	}
+	return out
+}
+
+// excludedConnectionKeys returns the user's excluded connections, or none
+// when the server runs without a connection service.
+func (s *Server) excludedConnectionKeys(ctx context.Context, userUID string) (map[string]struct{}, error) {
+	if s.connSvc == nil {
+		return map[string]struct{}{}, nil
+	}
+	excluded, err := s.connSvc.GetExcludedConnectionKeys(ctx, userUID)
+	if err != nil {
+		return nil, status.Error(codes.Internal, s.sanitizeErrorForClient(err))
 	}
+	return excluded, nil
+}
 
-	return resp, nil
+func mapDailySnapshot(snap *repository.Snapshot) *pb.DailySnapshot {
+	return &pb.DailySnapshot{
+		UserUid:         snap.UserUID,
+		Exchange:        snap.Exchange,
+		Timestamp:       snap.Timestamp.UnixMilli(),
+		TotalEquity:     snap.TotalEquity,
+		RealizedBalance: snap.RealizedBalance,
+		UnrealizedPnl:   snap.UnrealizedPnL,
+		Deposits:        snap.Deposits,
+		Withdrawals:     snap.Withdrawals,
+		Breakdown:       mapMarketBreakdown(snap.LoadBreakdown()),
+	}
 }
 
 // GetAggregatedMetrics implements EnclaveService.
@@ -679,35 +1010,22 @@ func (s *Server) GetAggregatedMetrics(ctx context.Context, req *pb.AggregatedMet
 		return &pb.AggregatedMetricsResponse{}, nil
 	}
 
-	resp := &pb.AggregatedMetricsResponse{}
-	var lastSync time.Time
-
-	for _, conn := range connections {
-		if isConnectionExcluded(excludedConnectionKeys, conn.Exchange, conn.Label) {
-			continue
-		}
-		if exchange != "" && strings.ToLower(conn.Exchange) != exchange {
-			continue
-		}
-
-		snapshot, err := s.snapshotRepo.GetLatestByUserExchangeLabel(ctx, userUID, conn.Exchange, conn.Label)
-		if err != nil {
-			continue
-		}
-
-		resp.TotalBalance += snapshot.RealizedBalance
-		resp.TotalEquity += snapshot.TotalEquity
-		resp.TotalUnrealizedPnl += snapshot.UnrealizedPnL
-		resp.TotalFees += snapshot.TotalFees
-		resp.TotalTrades += int32(snapshot.TotalTrades)
-
-		if snapshot.Timestamp.After(lastSync) {
-			lastSync = snapshot.Timestamp
-		}
+	// One query for every connection's latest snapshot, not one each.
+	latest, err := s.snapshotRepo.GetLatestByConnections(ctx, userUID, connections)
+	if err != nil {
+		return nil, status.Error(codes.Internal, s.sanitizeErrorForClient(err))
 	}
+	agg := service.AggregateLatest(latest, exchange, excludedConnectionKeys)
 
-	if !lastSync.IsZero() {
-		resp.LastSync = lastSync.UnixMilli()
+	resp := &pb.AggregatedMetricsResponse{
+		TotalBalance:       agg.TotalBalance,
+		TotalEquity:        agg.TotalEquity,
+		TotalUnrealizedPnl: agg.TotalUnrealizedPnL,
+		TotalFees:          agg.TotalFees,
+		TotalTrades:        int32(agg.TotalTrades),
+	}
+	if !agg.LastSync.IsZero() {
+		resp.LastSync = agg.LastSync.UnixMilli()
 	}
 
 	return resp, nil
@@ -935,7 +1253,7 @@ func (s *Server) resolveReportPeriod(
 		return time.Time{}, time.Time{}, fmt.Errorf("end_date must be after start_date")
 	}
 
-	snapshots, err := s.snapshotRepo.GetByUserAndDateRange(ctx, userUID, rangeStart, rangeEnd)
+	snapshots, err := s.snapshotRepo.GetSeriesByUserAndDateRange(ctx, userUID, rangeStart, rangeEnd, repository.ProjectEquity)
 	if err != nil {
 		return time.Time{}, time.Time{}, err
 	}
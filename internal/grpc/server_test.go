@@ -250,6 +250,93 @@ func TestGetAggregatedMetrics_InvalidExchange_ReturnsInvalidArgument(t *testing.
 	}
 }
 
+func TestGetPerformanceMetricsWindows_InvalidRequests_ReturnInvalidArgument(t *testing.T) {
+	srv := NewServer(zap.NewNop(), Services{MetricsSvc: service.NewMetricsService(nil)}, ServerOptions{})
+	client, cleanup := newBufconnClient(t, srv)
+	defer cleanup()
+
+	tooMany := make([]*pb.MetricsWindow, maxMetricsWindows+1)
+	for i := range tooMany {
+		tooMany[i] = &pb.MetricsWindow{Name: "1M"}
+	}
+	for name, req := range map[string]*pb.PerformanceMetricsWindowsRequest{
+		"no windows":       {UserUid: "user_abc1234567890"},
+		"too many windows": {UserUid: "user_abc1234567890", Windows: tooMany},
+		"invalid split": {
+			UserUid:   "user_abc1234567890",
+			Windows:   []*pb.MetricsWindow{{Name: "1M"}},
+			Exchanges: []string{"binance", "bit@stamp"},
+		},
+		"end before start": {
+			UserUid: "user_abc1234567890",
+			Windows: []*pb.MetricsWindow{{Name: "1M"}, {Name: "bad", StartDate: 1700000000000, EndDate: 1690000000000}},
+		},
+	} {
+		ctx, cancel := context.WithTimeout(context.Background(), 2*time.Second)
+		_, err := client.GetPerformanceMetricsWindows(ctx, req)
+		cancel()
+		if status.Code(err) != codes.InvalidArgument {
+			t.Errorf("%s: expected InvalidArgument, got %v (err=%v)", name, status.Code(err), err)
+		}
+	}
+}
+
+func TestGetBulkPerformanceMetrics_DisabledOrInvalid_IsRejected(t *testing.T) {
+	svcs := Services{MetricsSvc: service.NewMetricsService(nil), ConnSvc: &fakeConnectionService{}}
+	for _, tc := range []struct {
+		name    string
+		enabled bool
+		req     *pb.BulkPerformanceMetricsRequest
+		want    codes.Code
+	}{
+		{"disabled", false, &pb.BulkPerformanceMetricsRequest{UserUids: []string{"user_abc1234567890"}}, codes.PermissionDenied},
+		{"no users", true, &pb.BulkPerformanceMetricsRequest{}, codes.InvalidArgument},
+		{"invalid user", true, &pb.BulkPerformanceMetricsRequest{UserUids: []string{"user_abc1234567890", "bad"}}, codes.InvalidArgument},
+		{"invalid exchange", true, &pb.BulkPerformanceMetricsRequest{UserUids: []string{"user_abc1234567890"}, Exchange: "bit@stamp"}, codes.InvalidArgument},
+	} {
+		t.Run(tc.name, func(t *testing.T) {
+			srv := NewServer(zap.NewNop(), svcs, ServerOptions{BulkMetrics: tc.enabled})
+			client, cleanup := newBufconnClient(t, srv)
+			defer cleanup()
+
+			ctx, cancel := context.WithTimeout(context.Background(), 2*time.Second)
+			defer cancel()
+
+			stream, err := client.GetBulkPerformanceMetrics(ctx, tc.req)
+			if err == nil {
+				_, err = stream.Recv()
+			}
+			if status.Code(err) != tc.want {
+				t.Fatalf("expected %v, got %v (err=%v)", tc.want, status.Code(err), err)
+			}
+		})
+	}
+}
+
+func TestStreamSnapshotTimeSeries_InvalidRequests_ReturnInvalidArgument(t *testing.T) {
+	srv := NewServer(zap.NewNop(), Services{SnapshotRepo: &repository.SnapshotRepo{}}, ServerOptions{})
+	client, cleanup := newBufconnClient(t, srv)
+	defer cleanup()
+
+	for name, req := range map[string]*pb.SnapshotTimeSeriesStreamRequest{
+		"invalid user":      {UserUid: "bad"},
+		"invalid exchange":  {UserUid: "user_abc1234567890", Exchange: "bit@stamp"},
+		"end before start":  {UserUid: "user_abc1234567890", StartDate: 1700000000000, EndDate: 1690000000000},
+		"negative page":     {UserUid: "user_abc1234567890", PageSize: -1},
+		"page size too big": {UserUid: "user_abc1234567890", PageSize: maxSnapshotPageSize + 1},
+	} {
+		ctx, cancel := context.WithTimeout(context.Background(), 2*time.Second)
+		stream, err := client.StreamSnapshotTimeSeries(ctx, req)
+		if err == nil {
+			_, err = stream.Recv()
+		}
+		cancel()
+		if status.Code(err) != codes.InvalidArgument {
+			t.Errorf("%s: expected InvalidArgument, got %v (err=%v)", name, status.Code(err), err)
+		}
+	}
+}
+
 func TestVerifyReportSignature_MissingFields_ReturnsInvalidArgument(t *testing.T) {
 	reportSvc := service.NewReportService(nil, nil, signing.MustNewReportSignerGenerate())
 	srv := NewServer(zap.NewNop(), Services{ReportSvc: reportSvc}, ServerOptions{})
@@ -0,0 +1,136 @@
+package grpc
+
+import (
+	pb "github.com/trackrecord/enclave/api/proto"
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+// columnMarkets are the markets of pb.MarketBreakdown in field order, with
+// what mapMarketBreakdown puts in each.
+var columnMarkets = []struct {
+	name string
+	get  func(*repository.MarketBreakdown) *repository.MarketMetrics
+}{
+	{"global", globalMarketMetrics},
+	{"spot", func(b *repository.MarketBreakdown) *repository.MarketMetrics { return b.Spot }},
+	{"swap", func(b *repository.MarketBreakdown) *repository.MarketMetrics { return b.Swap }},
+	{"options", func(b *repository.MarketBreakdown) *repository.MarketMetrics { return b.Options }},
+	{"stocks", func(b *repository.MarketBreakdown) *repository.MarketMetrics { return b.Stocks }},
+	{"futures", func(b *repository.MarketBreakdown) *repository.MarketMetrics { return b.Futures }},
+	{"cfd", func(b *repository.MarketBreakdown) *repository.MarketMetrics { return b.CFD }},
+	{"forex", func(b *repository.MarketBreakdown) *repository.MarketMetrics { return b.Forex }},
+	{"commodities", func(b *repository.MarketBreakdown) *repository.MarketMetrics { return b.Commodities }},
+}
+
+// globalMarketMetrics is the aggregate mapMarketBreakdown sends as global.
+func globalMarketMetrics(in *repository.MarketBreakdown) *repository.MarketMetrics {
+	g := aggregateMarketMetrics(in.Stocks, in.Spot, in.Swap, in.Options, in.Futures,
+		in.CFD, in.Forex, in.Commodities, in.Margin, in.Earn)
+	if g == nil {
+		return nil
+	}
+	return &repository.MarketMetrics{
+		Equity:          g.Equity,
+		AvailableMargin: g.AvailableMargin,
+		Volume:          g.Volume,
+		Trades:          int(g.Trades),
+		TradingFees:     g.TradingFees,
+		FundingFees:     g.FundingFees,
+		LongTrades:      int(g.LongTrades),
+		ShortTrades:     int(g.ShortTrades),
+		LongVolume:      g.LongVolume,
+		ShortVolume:     g.ShortVolume,
+	}
+}
+
+// mapSnapshotColumns converts snapshots to columnar form: the values
+// mapDailySnapshot would send, one packed array per field, with exchanges
+// dictionary-encoded and only the markets present on some snapshot.
+// user_uid is left out; every snapshot of a stream has the caller's.
+func mapSnapshotColumns(snapshots []*repository.Snapshot) *pb.SnapshotColumns {
+	n := len(snapshots)
+	cols := &pb.SnapshotColumns{
+		ExchangeIndex:   make([]uint32, n),
+		Timestamp:       make([]int64, n),
+		TotalEquity:     make([]float64, n),
+		RealizedBalance: make([]float64, n),
+		UnrealizedPnl:   make([]float64, n),
+		Deposits:        make([]float64, n),
+		Withdrawals:     make([]float64, n),
+	}
+
+	exchangeIndex := make(map[string]uint32)
+	markets := make([][]*repository.MarketMetrics, len(columnMarkets))
+	for i, snap := range snapshots {
+		idx, ok := exchangeIndex[snap.Exchange]
+		if !ok {
+			idx = uint32(len(cols.Exchanges))
+			exchangeIndex[snap.Exchange] = idx
+			cols.Exchanges = append(cols.Exchanges, snap.Exchange)
+		}
+		cols.ExchangeIndex[i] = idx
+		cols.Timestamp[i] = snap.Timestamp.UnixMilli()
+		cols.TotalEquity[i] = snap.TotalEquity
+		cols.RealizedBalance[i] = snap.RealizedBalance
+		cols.UnrealizedPnl[i] = snap.UnrealizedPnL
+		cols.Deposits[i] = snap.Deposits
+		cols.Withdrawals[i] = snap.Withdrawals
+
+		breakdown := snap.LoadBreakdown()
+		if breakdown == nil {
+			continue
+		}
+		for m, market := range columnMarkets {
+			if metrics := market.get(breakdown); metrics != nil {
+				if markets[m] == nil {
+					markets[m] = make([]*repository.MarketMetrics, n)
+				}
+				markets[m][i] = metrics
+			}
+		}
+	}
+
+	for m, rows := range markets {
+		if rows != nil {
+			cols.Markets = append(cols.Markets, mapMarketColumns(columnMarkets[m].name, rows))
+		}
+	}
+	return cols
+}
+
+// mapMarketColumns converts one market of n snapshots; nil rows have no
+// data for the market.
+func mapMarketColumns(name string, rows []*repository.MarketMetrics) *pb.MarketColumns {
+	n := len(rows)
+	c := &pb.MarketColumns{
+		Market:          name,
+		Present:         make([]bool, n),
+		Equity:          make([]float64, n),
+		AvailableMargin: make([]float64, n),
+		Volume:          make([]float64, n),
+		Trades:          make([]int32, n),
+		TradingFees:     make([]float64, n),
+		FundingFees:     make([]float64, n),
+		LongTrades:      make([]int32, n),
+		ShortTrades:     make([]int32, n),
+		LongVolume:      make([]float64, n),
+		ShortVolume:     make([]float64, n),
+	}
+	for i, m := range rows {
+		if m == nil {
+			continue
+		}
+		c.Present[i] = true
+		c.Equity[i] = m.Equity
+		c.AvailableMargin[i] = m.AvailableMargin
+		c.Volume[i] = m.Volume
+		c.Trades[i] = int32(m.Trades)
+		c.TradingFees[i] = m.TradingFees
+		c.FundingFees[i] = m.FundingFees
+		c.LongTrades[i] = int32(m.LongTrades)
+		c.ShortTrades[i] = int32(m.ShortTrades)
+		c.LongVolume[i] = m.LongVolume
+		c.ShortVolume[i] = m.ShortVolume
+	}
+	return c
+}
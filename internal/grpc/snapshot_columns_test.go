@@ -0,0 +1,129 @@
+package grpc
+
+import (
+	"fmt"
+	"math/rand"
+	"testing"
+	"time"
+
+	pb "github.com/trackrecord/enclave/api/proto"
+	"github.com/trackrecord/enclave/internal/repository"
+	"google.golang.org/protobuf/proto"
+)
+
+// columnsTestSnapshots returns days of daily snapshots for each of
+// connections connections, with spot, swap and (on some days) options
+// breakdowns.
+func columnsTestSnapshots(days, connections int) []*repository.Snapshot {
+	rng := rand.New(rand.NewSource(int64(days*31 + connections)))
+	day0 := time.Date(2021, 1, 1, 0, 0, 0, 0, time.UTC)
+	metrics := func() *repository.MarketMetrics {
+		return &repository.MarketMetrics{
+			Equity: rng.Float64() * 1e5, AvailableMargin: rng.Float64() * 1e4,
+			Volume: rng.Float64() * 1e6, Trades: rng.Intn(200),
+			TradingFees: rng.Float64() * 100, FundingFees: rng.Float64() * 10,
+			LongTrades: rng.Intn(100), ShortTrades: rng.Intn(100),
+			LongVolume: rng.Float64() * 5e5, ShortVolume: rng.Float64() * 5e5,
+		}
+	}
+
+	var out []*repository.Snapshot
+	for d := 0; d < days; d++ {
+		for c := 0; c < connections; c++ {
+			s := &repository.Snapshot{
+				UserUID:         "user_abc1234567890",
+				Exchange:        fmt.Sprintf("exchange%d", c),
+				Timestamp:       day0.AddDate(0, 0, d),
+				TotalEquity:     1e5 + rng.Float64()*1e4,
+				RealizedBalance: 9e4 + rng.Float64()*1e4,
+				UnrealizedPnL:   rng.NormFloat64() * 1e3,
+				Deposits:        float64(rng.Intn(3)) * 1000,
+				Breakdown:       &repository.MarketBreakdown{Spot: metrics(), Swap: metrics()},
+			}
+			if d%3 == 0 {
+				s.Breakdown.Options = metrics()
+			}
+			out = append(out, s)
+		}
+	}
+	return out
+}
+
+// rowsFromColumns rebuilds the DailySnapshot rows of a columnar page.
+func rowsFromColumns(userUID string, cols *pb.SnapshotColumns) []*pb.DailySnapshot {
+	rows := make([]*pb.DailySnapshot, len(cols.Timestamp))
+	for i := range rows {
+		rows[i] = &pb.DailySnapshot{
+			UserUid:         userUID,
+			Exchange:        cols.Exchanges[cols.ExchangeIndex[i]],
+			Timestamp:       cols.Timestamp[i],
+			TotalEquity:     cols.TotalEquity[i],
+			RealizedBalance: cols.RealizedBalance[i],
+			UnrealizedPnl:   cols.UnrealizedPnl[i],
+			Deposits:        cols.Deposits[i],
+			Withdrawals:     cols.Withdrawals[i],
+		}
+	}
+	for _, mc := range cols.Markets {
+		for i, row := range rows {
+			if !mc.Present[i] {
+				continue
+			}
+			if row.Breakdown == nil {
+				row.Breakdown = &pb.MarketBreakdown{}
+			}
+			m := &pb.MarketMetrics{
+				Equity: mc.Equity[i], AvailableMargin: mc.AvailableMargin[i],
+				Volume: mc.Volume[i], Trades: mc.Trades[i],
+				TradingFees: mc.TradingFees[i], FundingFees: mc.FundingFees[i],
+				LongTrades: mc.LongTrades[i], ShortTrades: mc.ShortTrades[i],
+				LongVolume: mc.LongVolume[i], ShortVolume: mc.ShortVolume[i],
+			}
+			switch mc.Market {
+			case "global":
+				row.Breakdown.Global = m
+			case "spot":
+				row.Breakdown.Spot = m
+			case "swap":
+				row.Breakdown.Swap = m
+			case "options":
+				row.Breakdown.Options = m
+			case "stocks":
+				row.Breakdown.Stocks = m
+			case "futures":
+				row.Breakdown.Futures = m
+			case "cfd":
+				row.Breakdown.Cfd = m
+			case "forex":
+				row.Breakdown.Forex = m
+			case "commodities":
+				row.Breakdown.Commodities = m
+			}
+		}
+	}
+	return rows
+}
+
+func TestMapSnapshotColumns_MatchesRows(t *testing.T) {
+	snapshots := columnsTestSnapshots(40, 3)
+	snapshots[7].Breakdown = nil
+
+	cols := mapSnapshotColumns(snapshots)
+	if len(cols.Exchanges) != 3 {
+		t.Fatalf("exchanges = %v, want 3 distinct", cols.Exchanges)
+	}
+	var markets []string
+	for _, mc := range cols.Markets {
+		markets = append(markets, mc.Market)
+	}
+	if fmt.Sprint(markets) != "[global spot swap options]" {
+		t.Fatalf("markets = %v, want the ones with data in field order", markets)
+	}
+
+	got := rowsFromColumns("user_abc1234567890", cols)
+	for i, snap := range snapshots {
+		if want := mapDailySnapshot(snap); !proto.Equal(got[i], want) {
+			t.Fatalf("row %d:\n got %v\nwant %v", i, got[i], want)
+		}
+	}
+}
@@ -29,6 +29,9 @@ type Metrics struct {
 	mu         sync.RWMutex
 	server     *http.Server
 	logger     *zap.Logger
+
+	collectorsMu sync.Mutex
+	collectors   []func(*Metrics)
 }
 
 type counter struct {
@@ -74,6 +77,27 @@ func New(logger *zap.Logger) *Metrics {
 	m.registerGauge("grpc_active_connections", "Active gRPC connections")
 	m.registerGauge("process_memory_bytes", "Process memory usage in bytes")
 	m.registerGauge("process_goroutines", "Number of goroutines")
+	m.registerGauge("sync_concurrency_limit", "Current adaptive sync concurrency limit per limiter")
+	m.registerGauge("sync_concurrency_in_flight", "Sync tasks currently holding a concurrency slot per limiter")
+	m.registerGauge("sync_concurrency_waiting", "Sync tasks queued behind the concurrency limit per limiter")
+	m.registerGauge("sync_concurrency_live_heap_bytes", "Live heap seen by the concurrency controller at its last evaluation")
+	m.registerGauge("sync_concurrency_adjustments", "Cumulative concurrency limit changes per limiter, direction and reason")
+	m.registerGauge("sync_concurrency_last_change_timestamp_seconds", "Unix time of the last limit change per limiter and reason")
+	m.registerGauge("exchange_governor_tokens", "Tokens left in the shared request budget per exchange host")
+	m.registerGauge("exchange_governor_requests", "Requests paced by the shared governor per exchange host")
+	m.registerGauge("exchange_governor_wait_seconds", "Cumulative time requests waited for the shared budget per exchange host")
+	m.registerGauge("exchange_governor_cooldowns", "429/418 cooldowns imposed per exchange host")
+	m.registerGauge("ibkr_flex_cache_bytes", "Estimated memory held by cached parsed IBKR Flex reports")
+	m.registerGauge("ibkr_flex_cache_max_bytes", "Memory budget of the IBKR Flex report cache")
+	m.registerGauge("ibkr_flex_cache_entries", "Parsed IBKR Flex reports currently cached")
+	m.registerGauge("ibkr_flex_cache_evictions", "IBKR Flex reports dropped for age or memory budget")
+	m.registerGauge("ibkr_flex_cache_lookups", "IBKR Flex report cache lookups per result (hit/miss)")
+	m.registerGauge("snapshot_series_cache_bytes", "Estimated memory held by cached per-user snapshot series")
+	m.registerGauge("snapshot_series_cache_max_bytes", "Memory budget of the snapshot series cache")
+	m.registerGauge("snapshot_series_cache_users", "Users whose snapshot series is currently cached")
+	m.registerGauge("snapshot_series_cache_evictions", "Snapshot series dropped for the memory budget")
+	m.registerGauge("snapshot_series_cache_invalidations", "Snapshot series invalidated by snapshot writes")
+	m.registerGauge("snapshot_series_cache_lookups", "Snapshot series cache lookups per result (hit/miss)")
 
 	// Histograms (simplified: stores latest value per label)
 	m.registerHistogram("grpc_request_duration_seconds", "gRPC request duration")
@@ -167,6 +191,24 @@ func (m *Metrics) UpdateSystemMetrics() {
 	m.SetGauge("process_goroutines", float64(runtime.NumGoroutine()))
 }
 
+// RegisterCollector adds a callback run on every scrape, before rendering,
+// so components that own their own state (e.g. the adaptive concurrency
+// limiters) can publish it through SetGauge without a metrics dependency.
+func (m *Metrics) RegisterCollector(fn func(*Metrics)) {
+	m.collectorsMu.Lock()
+	m.collectors = append(m.collectors, fn)
+	m.collectorsMu.Unlock()
+}
+
+func (m *Metrics) runCollectors() {
+	m.collectorsMu.Lock()
+	collectors := append([]func(*Metrics){}, m.collectors...)
+	m.collectorsMu.Unlock()
+	for _, fn := range collectors {
+		fn(m)
+	}
+}
+
 func (m *Metrics) registerCounter(name, help string) {
 	m.counters[name] = &counter{name: name, help: help, values: make(map[string]float64)}
 }
@@ -181,6 +223,7 @@ func (m *Metrics) registerHistogram(name, help string) {
 
 func (m *Metrics) handleMetrics(w http.ResponseWriter, r *http.Request) {
 	m.UpdateSystemMetrics()
+	m.runCollectors()
 
 	var sb strings.Builder
 
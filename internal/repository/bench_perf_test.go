@@ -0,0 +1,259 @@
+package repository
+
+import (
+	"context"
+	"fmt"
+	"os"
+	"strconv"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/jackc/pgx/v5/pgxpool"
+)
+
+// PERF-009: rows/sec of the snapshot batch writer against a local Postgres
+// (TEST_DATABASE_URL), next to the one-Exec-per-row transaction it replaced.
+//
+//	TEST_DATABASE_URL=… go test ./internal/repository/ -run '^$' -bench SnapshotUpsertBatch
+
+func BenchmarkSnapshotUpsertBatch(b *testing.B) {
+	pool := newTestPool(b)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+	const user = "__bench_upsert_batch__"
+	b.Cleanup(func() {
+		pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = $1`, user)
+	})
+
+	perRow := func(snaps []*Snapshot) error {
+		tx, err := pool.Begin(ctx)
+		if err != nil {
+			return err
+		}
+		defer tx.Rollback(ctx)
+		w := repo.writeSpec(ctx)
+		now := time.Now().UTC()
+		for _, s := range snaps {
+			args, err := w.args(s, now)
+			if err != nil {
+				return err
+			}
+			if _, err := tx.Exec(ctx, w.upsertSQL, args...); err != nil {
+				return err
+			}
+		}
+		return tx.Commit(ctx)
+	}
+
+	for _, n := range []int{10, 100, 10_000} {
+		snaps := makeSnapshotsForBatch(user, n)
+		for _, impl := range []struct {
+			name  string
+			write func([]*Snapshot) error
+		}{
+			{"PerRowExec", perRow},
+			{"UpsertBatch", func(s []*Snapshot) error { return repo.UpsertBatch(ctx, s) }},
+		} {
+			b.Run(fmt.Sprintf("%s/rows=%d", impl.name, n), func(b *testing.B) {
+				b.ReportAllocs()
+				for i := 0; i < b.N; i++ {
+					if err := impl.write(snaps); err != nil {
+						b.Fatal(err)
+					}
+				}
+				b.ReportMetric(float64(n*b.N)/b.Elapsed().Seconds(), "rows/s")
+			})
+		}
+	}
+}
+
+// PERF-010: a 5-year × 10-connection history read in full (every breakdown
+// decoded) and through the projections the metric and report paths use.
+func BenchmarkSnapshotSeriesRead(b *testing.B) {
+	pool := newTestPool(b)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+	const user = "__bench_series_read__"
+	b.Cleanup(func() {
+		pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = $1`, user)
+	})
+
+	const days, connections = 5 * 365, 10
+	var all []*Snapshot
+	for c := 0; c < connections; c++ {
+		for _, s := range makeSnapshotsForBatch(user, days) {
+			s.Label = fmt.Sprintf("conn-%d", c)
+			s.Breakdown.Spot = &MarketMetrics{Equity: s.TotalEquity / 2, Volume: 1000, Trades: 12, TradingFees: 1.5}
+			s.Breakdown.Futures = &MarketMetrics{Equity: s.TotalEquity / 2, Volume: 5000, Trades: 30, FundingFees: 0.2}
+			all = append(all, s)
+		}
+	}
+	if err := repo.UpsertBatch(ctx, all); err != nil {
+		b.Fatal(err)
+	}
+	start, end := all[0].Timestamp, all[days-1].Timestamp
+
+	for _, bc := range []struct {
+		name string
+		read func() ([]*Snapshot, error)
+	}{
+		{"Full", func() ([]*Snapshot, error) { return repo.GetByUserAndDateRange(ctx, user, start, end) }},
+		{"ProjectEquity", func() ([]*Snapshot, error) {
+			return repo.GetSeriesByUserAndDateRange(ctx, user, start, end, ProjectEquity)
+		}},
+		{"ProjectBreakdown", func() ([]*Snapshot, error) {
+			return repo.GetSeriesByUserAndDateRange(ctx, user, start, end, ProjectBreakdown)
+		}},
+	} {
+		b.Run(bc.name, func(b *testing.B) {
+			b.ReportAllocs()
+			for i := 0; i < b.N; i++ {
+				rows, err := bc.read()
+				if err != nil || len(rows) != days*connections {
+					b.Fatalf("%d rows, %v", len(rows), err)
+				}
+			}
+		})
+	}
+}
+
+// PERF-016: range-query latency on a synthetic snapshot_data of
+// SNAPSHOT_BENCH_ROWS rows (default 50M: five years of daily snapshots of
+// ~27k users) stored as one heap with the btree indexes of migrations
+// 002/011, and as monthly partitions with a BRIN timestamp index
+// (migrations/optional/snapshot_data_partitioned.sql). Both tables are
+// built once and kept, since loading 50M rows takes minutes; drop them with
+// DROP TABLE bench_snapshot_heap, bench_snapshot_part.
+//
+//	TEST_DATABASE_URL=… go test ./internal/repository/ -run '^$' -bench SnapshotRangeQueryPartitioned -timeout 2h
+func BenchmarkSnapshotRangeQueryPartitioned(b *testing.B) {
+	pool := newTestPool(b)
+	ctx := context.Background()
+
+	rows := 50_000_000
+	if v := os.Getenv("SNAPSHOT_BENCH_ROWS"); v != "" {
+		n, err := strconv.Atoi(v)
+		if err != nil || n <= 0 {
+			b.Fatalf("SNAPSHOT_BENCH_ROWS=%q", v)
+		}
+		rows = n
+	}
+	const days = 5*365 + 1
+	users := max(rows/days, 1)
+	day0 := time.Date(2020, 1, 1, 0, 0, 0, 0, time.UTC)
+
+	partitions := monthPartitions("bench_snapshot_part", day0, 61)
+	layouts := []struct {
+		table string
+		ddl   []string
+	}{
+		{"bench_snapshot_heap", []string{
+			`CREATE TABLE bench_snapshot_heap (LIKE snapshot_data INCLUDING DEFAULTS)`,
+		}},
+		{"bench_snapshot_part", append([]string{
+			`CREATE TABLE bench_snapshot_part (LIKE snapshot_data INCLUDING DEFAULTS) PARTITION BY RANGE (timestamp)`,
+			`CREATE TABLE bench_snapshot_part_default PARTITION OF bench_snapshot_part DEFAULT`,
+		}, func() []string {
+			ddl := make([]string, len(partitions))
+			for i, p := range partitions {
+				ddl[i] = fmt.Sprintf(`CREATE TABLE %s PARTITION OF bench_snapshot_part %s`, p.Name, p.bounds())
+			}
+			return ddl
+		}()...)},
+	}
+	indexes := map[string][]string{
+		"bench_snapshot_heap": {
+			`ALTER TABLE bench_snapshot_heap ADD PRIMARY KEY (id)`,
+			`CREATE UNIQUE INDEX ON bench_snapshot_heap (user_uid, exchange, label, timestamp)`,
+			`CREATE INDEX ON bench_snapshot_heap (user_uid, timestamp)`,
+			`CREATE INDEX ON bench_snapshot_heap (timestamp)`,
+		},
+		"bench_snapshot_part": {
+			`ALTER TABLE bench_snapshot_part ADD PRIMARY KEY (id, timestamp)`,
+			`CREATE UNIQUE INDEX ON bench_snapshot_part (user_uid, exchange, label, timestamp)`,
+			`CREATE INDEX ON bench_snapshot_part (user_uid, timestamp)`,
+			`CREATE INDEX ON bench_snapshot_part USING brin (timestamp) WITH (pages_per_range = 32)`,
+		},
+	}
+	for _, l := range layouts {
+		if err := loadRangeBenchTable(ctx, pool, l.table, l.ddl, indexes[l.table], day0, users, rows); err != nil {
+			b.Fatalf("%s: %v", l.table, err)
+		}
+	}
+
+	queries := []struct {
+		name string
+		sql  string
+		args func(i int) []any
+	}{
+		// One user's last year, as the metrics and report paths read it.
+		{"UserYear", `
+			SELECT timestamp, total_equity FROM %s
+			WHERE user_uid = $1 AND timestamp >= $2 AND timestamp < $3
+			ORDER BY timestamp`,
+			func(i int) []any {
+				from := day0.AddDate(0, 0, (i*37)%(days-365))
+				return []any{fmt.Sprintf("bench_user_%d", (i*7919)%users), from, from.AddDate(1, 0, 0)}
+			}},
+		// Every user over one week, as a cross-user scan would.
+		{"AllUsersWeek", `
+			SELECT count(*), sum(total_equity) FROM %s
+			WHERE timestamp >= $1 AND timestamp < $2`,
+			func(i int) []any {
+				from := day0.AddDate(0, 0, (i*37)%(days-7))
+				return []any{from, from.AddDate(0, 0, 7)}
+			}},
+	}
+	for _, l := range layouts {
+		for _, q := range queries {
+			query := fmt.Sprintf(q.sql, l.table)
+			b.Run(fmt.Sprintf("%s/%s/rows=%d", strings.TrimPrefix(l.table, "bench_snapshot_"), q.name, rows), func(b *testing.B) {
+				for i := 0; i < b.N; i++ {
+					r, err := pool.Query(ctx, query, q.args(i)...)
+					if err != nil {
+						b.Fatal(err)
+					}
+					for r.Next() {
+					}
+					if err := r.Err(); err != nil {
+						b.Fatal(err)
+					}
+				}
+			})
+		}
+	}
+}
+
+// loadRangeBenchTable (re)creates table with ddl and fills it with rows
+// synthetic snapshots in timestamp order, unless a previous run already left
+// the same number of rows, which the table comment records.
+func loadRangeBenchTable(ctx context.Context, pool *pgxpool.Pool, table string, ddl, indexes []string, day0 time.Time, users, rows int) error {
+	var comment *string
+	if err := pool.QueryRow(ctx, `
+		SELECT (SELECT obj_description(oid, 'pg_class') FROM pg_class
+		        WHERE relname = $1 AND pg_table_is_visible(oid))`, table).Scan(&comment); err != nil {
+		return err
+	}
+	want := fmt.Sprintf("rows=%d", rows)
+	if comment != nil && *comment == want {
+		return nil
+	}
+
+	stmts := append([]string{`DROP TABLE IF EXISTS ` + table}, ddl...)
+	stmts = append(stmts, fmt.Sprintf(`
+		INSERT INTO %s (user_uid, exchange, label, timestamp, total_equity, realized_balance)
+		SELECT 'bench_user_' || (g %% %d), 'binance', '',
+		       '%s'::timestamptz + (g / %d) * interval '1 day',
+		       100000 + (g %% 1000), 100000
+		FROM generate_series(0, %d) AS g`,
+		table, users, day0.Format(time.RFC3339), users, rows-1))
+	stmts = append(stmts, indexes...)
+	stmts = append(stmts, `ANALYZE `+table, fmt.Sprintf(`COMMENT ON TABLE %s IS '%s'`, table, want))
+	for _, stmt := range stmts {
+		if _, err := pool.Exec(ctx, stmt); err != nil {
+			return fmt.Errorf("%s: %w", strings.Fields(stmt)[0], err)
+		}
+	}
+	return nil
+}
@@ -8,11 +8,13 @@ import (
 	"fmt"
 	"strings"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/jackc/pgx/v5"
 	"github.com/jackc/pgx/v5/pgconn"
 	"github.com/jackc/pgx/v5/pgxpool"
+	"github.com/trackrecord/enclave/internal/db"
 )
 
 // ErrNotFound is returned when a repository lookup finds no matching row.
@@ -53,13 +55,14 @@ type ConnectionRepo struct {
 	pool *pgxpool.Pool
 
 	capMu                   sync.Mutex
-	capabilitiesLoaded      bool
+	capabilitiesLoaded      atomic.Bool // set once the fields below are final
 	hasCredentialsHashCol   bool
 	hasSyncIntervalMinsCol  bool
 	hasExcludeFromReportCol bool
 	hasKYCLevelCol          bool
 	hasIsPaperCol           bool
 	isTSSchema              bool // true = TS Prisma camelCase columns
+	activeByUserSQL         string
 }
 
 // NewConnectionRepo creates a new connection repository
@@ -77,8 +80,6 @@ func NewConnectionRepo(pool *pgxpool.Pool) *ConnectionRepo {
 // shape validation but fail GCM auth-tag verification on read.
 func (r *ConnectionRepo) IsTSSchema(ctx context.Context) bool {
 	r.getCapabilityFlags(ctx)
-	r.capMu.Lock()
-	defer r.capMu.Unlock()
 	return r.isTSSchema
 }
 
@@ -363,38 +364,7 @@ func (r *ConnectionRepo) GetActiveByUser(ctx context.Context, userUID string) ([
 		return r.getActiveByUserTS(ctx, userUID, hasCredHash, hasSyncMins, hasExclude, hasKYCLevel, hasIsPaper)
 	}
 
-	columns := []string{"id", "user_uid", "exchange", "label"}
-	if hasCredHash {
-		columns = append(columns, "credentials_hash")
-	}
-	if hasSyncMins {
-		columns = append(columns, "sync_interval_minutes")
-	}
-	if hasExclude {
-		columns = append(columns, "exclude_from_report")
-	}
-	if hasKYCLevel {
-		columns = append(columns, "kyc_level")
-	}
-	if hasIsPaper {
-		columns = append(columns, "is_paper")
-	}
-	columns = append(columns,
-		"encrypted_api_key", "api_key_iv", "api_key_auth_tag",
-		"encrypted_api_secret", "api_secret_iv", "api_secret_auth_tag",
-		"encrypted_passphrase", "passphrase_iv", "passphrase_auth_tag",
-		"is_active", "created_at", "updated_at",
-	)
-
-	query := fmt.Sprintf(`
-		SELECT %s
-		FROM exchange_connections
-		WHERE user_uid = $1 AND is_active = true
-		ORDER BY created_at`,
-		strings.Join(columns, ", "),
-	)
-
-	rows, err := r.pool.Query(ctx, query, userUID)
+	rows, err := r.pool.Query(ctx, r.activeByUserSQL, userUID)
 	if err != nil {
 		return nil, err
 	}
@@ -404,36 +374,7 @@ func (r *ConnectionRepo) GetActiveByUser(ctx context.Context, userUID string) ([
 }
 
 func (r *ConnectionRepo) getActiveByUserTS(ctx context.Context, userUID string, hasCredHash, hasSyncMins, hasExclude, hasKYCLevel, hasIsPaper bool) ([]*ExchangeConnection, error) {
-	columns := []string{`id`, `"userUid"`, `exchange`, `label`}
-	if hasCredHash {
-		columns = append(columns, `"credentialsHash"`)
-	}
-	if hasSyncMins {
-		columns = append(columns, `"syncIntervalMinutes"`)
-	}
-	if hasExclude {
-		columns = append(columns, `"excludeFromReport"`)
-	}
-	if hasKYCLevel {
-		columns = append(columns, `"kycLevel"`)
-	}
-	if hasIsPaper {
-		columns = append(columns, `"isPaper"`)
-	}
-	columns = append(columns,
-		`"encryptedApiKey"`, `"encryptedApiSecret"`, `"encryptedPassphrase"`,
-		`"isActive"`, `"createdAt"`, `"updatedAt"`,
-	)
-
-	query := fmt.Sprintf(`
-		SELECT %s
-		FROM exchange_connections
-		WHERE "userUid" = $1 AND "isActive" = true
-		ORDER BY "createdAt"`,
-		strings.Join(columns, ", "),
-	)
-
-	rows, err := r.pool.Query(ctx, query, userUID)
+	rows, err := r.pool.Query(ctx, r.activeByUserSQL, userUID)
 	if err != nil {
 		return nil, err
 	}
@@ -594,6 +535,51 @@ func (r *ConnectionRepo) GetExcludedConnectionKeysByUser(ctx context.Context, us
 	return excluded, rows.Err()
 }
 
+// GetExcludedConnectionKeysByUsers returns the excluded connection keys of
+// several users in one query, keyed by user; users without exclusions are
+// absent. Keys are built as GetExcludedConnectionKeysByUser builds them.
+func (r *ConnectionRepo) GetExcludedConnectionKeysByUsers(ctx context.Context, userUIDs []string) (map[string]map[string]struct{}, error) {
+	_, _, hasExclude, _, _ := r.getCapabilityFlags(ctx)
+	excluded := make(map[string]map[string]struct{})
+	if !hasExclude || len(userUIDs) == 0 {
+		return excluded, nil
+	}
+
+	var query string
+	if r.isTSSchema {
+		query = `
+			SELECT DISTINCT "userUid", exchange, COALESCE(label, '')
+			FROM exchange_connections
+			WHERE "userUid" = ANY($1) AND "isActive" = true AND "excludeFromReport" = true`
+	} else {
+		query = `
+			SELECT DISTINCT user_uid, exchange, COALESCE(label, '')
+			FROM exchange_connections
+			WHERE user_uid = ANY($1) AND is_active = true AND exclude_from_report = true`
+	}
+
+	rows, err := r.pool.Query(ctx, query, userUIDs)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var userUID, exchange, label string
+		if err := rows.Scan(&userUID, &exchange, &label); err != nil {
+			return nil, err
+		}
+		keys, ok := excluded[userUID]
+		if !ok {
+			keys = make(map[string]struct{})
+			excluded[userUID] = keys
+		}
+		keys[connectionKey(exchange, label)] = struct{}{}
+	}
+
+	return excluded, rows.Err()
+}
+
 // ExchangeDetails stores report-relevant metadata for an exchange.
 type ExchangeDetails struct {
 	Exchange string
@@ -786,37 +772,51 @@ func (r *ConnectionRepo) Deactivate(ctx context.Context, id string) error {
 	return err
 }
 
-func (r *ConnectionRepo) getCapabilityFlags(ctx context.Context) (hasCredentialsHash bool, hasSyncIntervalMinutes bool, hasExcludeFromReport bool, hasKYCLevel bool, hasIsPaper bool) {
+// SetSchema applies a schema descriptor loaded at startup, so no request
+// has to detect the capabilities itself.
+func (r *ConnectionRepo) SetSchema(schema *db.Schema) {
 	r.capMu.Lock()
 	defer r.capMu.Unlock()
+	r.applySchema(schema)
+}
 
-	if r.capabilitiesLoaded {
-		return r.hasCredentialsHashCol, r.hasSyncIntervalMinsCol, r.hasExcludeFromReportCol, r.hasKYCLevelCol, r.hasIsPaperCol
-	}
-
+// applySchema sets the capability fields from schema. Callers hold capMu.
+func (r *ConnectionRepo) applySchema(schema *db.Schema) {
 	// Detect TS Prisma schema (camelCase) vs Go schema (snake_case)
 	// If "userUid" column exists → TS schema; if "user_uid" → Go schema
-	tsSchema, _ := r.columnExists(ctx, "exchange_connections", "userUid")
-	r.isTSSchema = tsSchema
+	r.isTSSchema = schema.HasColumn("exchange_connections", "userUid")
 
 	// Check capability columns using the correct naming
-	credHashCol, _ := r.columnExists(ctx, "exchange_connections", r.colName("credentials_hash"))
-	syncIntervalCol, _ := r.columnExists(ctx, "exchange_connections", r.colName("sync_interval_minutes"))
-	excludeFromReportCol, _ := r.columnExists(ctx, "exchange_connections", r.colName("exclude_from_report"))
-	kycLevelCol, _ := r.columnExists(ctx, "exchange_connections", r.colName("kyc_level"))
-	isPaperCol, _ := r.columnExists(ctx, "exchange_connections", r.colName("is_paper"))
-
-	r.hasCredentialsHashCol = credHashCol
-	r.hasSyncIntervalMinsCol = syncIntervalCol
-	r.hasExcludeFromReportCol = excludeFromReportCol
-	r.hasKYCLevelCol = kycLevelCol
-	r.hasIsPaperCol = isPaperCol
-	r.capabilitiesLoaded = true
+	has := func(snakeName string) bool { return schema.HasColumn("exchange_connections", r.colName(snakeName)) }
+	r.hasCredentialsHashCol = has("credentials_hash")
+	r.hasSyncIntervalMinsCol = has("sync_interval_minutes")
+	r.hasExcludeFromReportCol = has("exclude_from_report")
+	r.hasKYCLevelCol = has("kyc_level")
+	r.hasIsPaperCol = has("is_paper")
+
+	r.activeByUserSQL = activeByUserQuery(r.isTSSchema,
+		r.hasCredentialsHashCol, r.hasSyncIntervalMinsCol, r.hasExcludeFromReportCol, r.hasKYCLevelCol, r.hasIsPaperCol)
+	r.capabilitiesLoaded.Store(true)
+}
 
+func (r *ConnectionRepo) getCapabilityFlags(ctx context.Context) (hasCredentialsHash bool, hasSyncIntervalMinutes bool, hasExcludeFromReport bool, hasKYCLevel bool, hasIsPaper bool) {
+	if !r.capabilitiesLoaded.Load() {
+		r.capMu.Lock()
+		if !r.capabilitiesLoaded.Load() {
+			// No descriptor from startup (admin tools, tests): load one
+			// for this repository.
+			schema, err := db.LoadSchema(ctx, r.pool)
+			if err != nil {
+				schema = &db.Schema{}
+			}
+			r.applySchema(schema)
+		}
+		r.capMu.Unlock()
+	}
 	return r.hasCredentialsHashCol, r.hasSyncIntervalMinsCol, r.hasExcludeFromReportCol, r.hasKYCLevelCol, r.hasIsPaperCol
 }
 
-// colName returns the raw column name (without quotes) for columnExists checks.
+// colName returns the raw column name (without quotes) for capability checks.
 func (r *ConnectionRepo) colName(snakeName string) string {
 	if !r.isTSSchema {
 		return snakeName
@@ -827,20 +827,71 @@ func (r *ConnectionRepo) colName(snakeName string) string {
 	return snakeName
 }
 
-func (r *ConnectionRepo) columnExists(ctx context.Context, tableName, columnName string) (bool, error) {
-	query := `
-		SELECT EXISTS (
-			SELECT 1
-			FROM information_schema.columns
-			WHERE table_schema = 'public'
-			  AND table_name = $1
-			  AND column_name = $2
-		)`
-	var exists bool
-	if err := r.pool.QueryRow(ctx, query, tableName, columnName).Scan(&exists); err != nil {
-		return false, fmt.Errorf("check column %s.%s: %w", tableName, columnName, err)
+// activeByUserQuery assembles the GetActiveByUser query for the detected
+// schema variant and optional columns. It runs once, when the capabilities
+// are loaded.
+func activeByUserQuery(isTSSchema, hasCredHash, hasSyncMins, hasExclude, hasKYCLevel, hasIsPaper bool) string {
+	if isTSSchema {
+		columns := []string{`id`, `"userUid"`, `exchange`, `label`}
+		if hasCredHash {
+			columns = append(columns, `"credentialsHash"`)
+		}
+		if hasSyncMins {
+			columns = append(columns, `"syncIntervalMinutes"`)
+		}
+		if hasExclude {
+			columns = append(columns, `"excludeFromReport"`)
+		}
+		if hasKYCLevel {
+			columns = append(columns, `"kycLevel"`)
+		}
+		if hasIsPaper {
+			columns = append(columns, `"isPaper"`)
+		}
+		columns = append(columns,
+			`"encryptedApiKey"`, `"encryptedApiSecret"`, `"encryptedPassphrase"`,
+			`"isActive"`, `"createdAt"`, `"updatedAt"`,
+		)
+
+		return fmt.Sprintf(`
+			SELECT %s
+			FROM exchange_connections
+			WHERE "userUid" = $1 AND "isActive" = true
+			ORDER BY "createdAt"`,
+			strings.Join(columns, ", "),
+		)
 	}
-	return exists, nil
+
+	columns := []string{"id", "user_uid", "exchange", "label"}
+	if hasCredHash {
+		columns = append(columns, "credentials_hash")
+	}
+	if hasSyncMins {
+		columns = append(columns, "sync_interval_minutes")
+	}
+	if hasExclude {
+		columns = append(columns, "exclude_from_report")
+	}
+	if hasKYCLevel {
+		columns = append(columns, "kyc_level")
+	}
+	if hasIsPaper {
+		columns = append(columns, "is_paper")
+	}
+	columns = append(columns,
+		"encrypted_api_key", "api_key_iv", "api_key_auth_tag",
+		"encrypted_api_secret", "api_secret_iv", "api_secret_auth_tag",
+		"encrypted_passphrase", "passphrase_iv", "passphrase_auth_tag",
+		"is_active", "created_at", "updated_at",
+	)
+
+	return fmt.Sprintf(`
+		SELECT %s
+		FROM exchange_connections
+		WHERE user_uid = $1 AND is_active = true
+		ORDER BY created_at`,
+		strings.Join(columns, ", "),
+	)
 }
 
 // tsColumnMap maps Go snake_case column names to TS Prisma camelCase names.
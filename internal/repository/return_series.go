@@ -0,0 +1,304 @@
+package repository
+
+import (
+	"context"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"time"
+
+	"github.com/jackc/pgx/v5"
+	"github.com/jackc/pgx/v5/pgxpool"
+)
+
+// ReturnSeriesDay is one date of a derived daily TWR series.
+type ReturnSeriesDay struct {
+	Date        string    // YYYY-MM-DD
+	FirstTS     time.Time // earliest snapshot of the day
+	LastTS      time.Time // latest snapshot of the day
+	NetReturn   float64
+	HasReturn   bool // false on the first day and on days with zero prior equity
+	Connections int  // connections with a snapshot that day
+	Known       int  // connections seen up to and including that day
+	// State is the last known equity per connection key after the day. Only
+	// loaded by Rebuild, for the day the rebuild continues from.
+	State map[string]float64
+}
+
+// returnSeriesLockClass namespaces the per-user advisory locks taken by
+// Rebuild.
+const returnSeriesLockClass = 0x52534552
+
+// ReturnSeriesRepo stores the derived per-user daily TWR series, one series
+// per snapshot filter ("profile"). The rows are a cache of what the metric
+// and report paths would compute from snapshot_data; the service layer owns
+// their content.
+//
+// Like sync_work_items the tables are enclave-owned and schema-agnostic, so
+// EnsureTable creates them on TS/Prisma databases where ApplyMigrations is
+// skipped. Go-schema databases get them from migrations/014_return_series.sql.
+type ReturnSeriesRepo struct {
+	pool *pgxpool.Pool
+}
+
+// NewReturnSeriesRepo creates a new return series repository
+func NewReturnSeriesRepo(pool *pgxpool.Pool) *ReturnSeriesRepo {
+	return &ReturnSeriesRepo{pool: pool}
+}
+
+// EnsureTable creates the return series tables if they do not exist yet.
+// Mirrors migrations/014_return_series.sql.
+func (r *ReturnSeriesRepo) EnsureTable(ctx context.Context) error {
+	const q = `
+		CREATE TABLE IF NOT EXISTS return_series_profiles (
+			user_uid VARCHAR(255) NOT NULL,
+			profile TEXT NOT NULL,
+			updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+			PRIMARY KEY (user_uid, profile)
+		);
+		CREATE TABLE IF NOT EXISTS return_series (
+			user_uid VARCHAR(255) NOT NULL,
+			profile TEXT NOT NULL,
+			day DATE NOT NULL,
+			first_ts TIMESTAMPTZ NOT NULL,
+			last_ts TIMESTAMPTZ NOT NULL,
+			net_return DOUBLE PRECISION,
+			connections INTEGER NOT NULL,
+			known INTEGER NOT NULL,
+			state JSONB NOT NULL,
+			PRIMARY KEY (user_uid, profile, day)
+		)`
+	_, err := r.pool.Exec(ctx, q)
+	return err
+}
+
+// ReturnSeriesProfile is a fully built series of a user.
+type ReturnSeriesProfile struct {
+	Profile string
+	// Fresh is false once the series was last built or refreshed longer ago
+	// than the maxAge passed to Profiles.
+	Fresh bool
+}
+
+// Profiles returns the profiles with a fully built series for a user. A
+// series is fresh when it was built or refreshed within maxAge of the
+// database clock (0 = always fresh).
+func (r *ReturnSeriesRepo) Profiles(ctx context.Context, userUID string, maxAge time.Duration) ([]ReturnSeriesProfile, error) {
+	rows, err := r.pool.Query(ctx, `
+		SELECT profile, $2::float8 <= 0 OR updated_at > NOW() - make_interval(secs => $2::float8)
+		FROM return_series_profiles WHERE user_uid = $1 ORDER BY profile`, userUID, maxAge.Seconds())
+	if err != nil {
+		return nil, err
+	}
+	return pgx.CollectRows(rows, pgx.RowToStructByPos[ReturnSeriesProfile])
+}
+
+// Range returns the days of a series that overlap [start, end]: those whose
+// latest snapshot is at or after start and whose earliest is at or before
+// end, ordered by date. State is not loaded.
+func (r *ReturnSeriesRepo) Range(ctx context.Context, userUID, profile string, start, end time.Time) ([]ReturnSeriesDay, error) {
+	rows, err := r.pool.Query(ctx, `
+		SELECT day::text, first_ts, last_ts, net_return, connections, known
+		FROM return_series
+		WHERE user_uid = $1 AND profile = $2 AND last_ts >= $3 AND first_ts <= $4
+		ORDER BY day`, userUID, profile, start, end)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	var days []ReturnSeriesDay
+	for rows.Next() {
+		var (
+			d   ReturnSeriesDay
+			ret *float64
+		)
+		if err := rows.Scan(&d.Date, &d.FirstTS, &d.LastTS, &ret, &d.Connections, &d.Known); err != nil {
+			return nil, err
+		}
+		if ret != nil {
+			d.NetReturn, d.HasReturn = *ret, true
+		}
+		days = append(days, d)
+	}
+	return days, rows.Err()
+}
+
+// Rebuild replaces the tail of a series under a per-user lock, so concurrent
+// rebuilds of one user (several connections committing at once, several
+// replicas) apply one after the other, each on the snapshots committed
+// before it started.
+//
+// With from empty the whole series is rebuilt and compute gets a nil prev.
+// Otherwise compute gets the last stored day before from, loaded with its
+// State (nil if there is none), and every stored day after prev is replaced
+// by the days compute returns. The profile is marked built on commit.
+func (r *ReturnSeriesRepo) Rebuild(ctx context.Context, userUID, profile, from string, compute func(prev *ReturnSeriesDay) ([]ReturnSeriesDay, error)) error {
+	tx, err := r.pool.Begin(ctx)
+	if err != nil {
+		return fmt.Errorf("begin: %w", err)
+	}
+	defer tx.Rollback(ctx)
+
+	if err := lockUserSeries(ctx, tx, userUID); err != nil {
+		return err
+	}
+	if err := rebuildSeries(ctx, tx, userUID, profile, from, compute); err != nil {
+		return err
+	}
+	return tx.Commit(ctx)
+}
+
+// RebuildAll is Rebuild from from for every built profile of a user, in one
+// transaction. The profiles are listed under the lock: a profile whose first
+// build was in flight when the caller's snapshots were written is committed
+// by then, and is brought up to date with the others.
+func (r *ReturnSeriesRepo) RebuildAll(ctx context.Context, userUID, from string, compute func(profile string, prev *ReturnSeriesDay) ([]ReturnSeriesDay, error)) error {
+	tx, err := r.pool.Begin(ctx)
+	if err != nil {
+		return fmt.Errorf("begin: %w", err)
+	}
+	defer tx.Rollback(ctx)
+
+	if err := lockUserSeries(ctx, tx, userUID); err != nil {
+		return err
+	}
+	rows, err := tx.Query(ctx,
+		`SELECT profile FROM return_series_profiles WHERE user_uid = $1 ORDER BY profile`, userUID)
+	if err != nil {
+		return fmt.Errorf("list series profiles: %w", err)
+	}
+	profiles, err := pgx.CollectRows(rows, pgx.RowTo[string])
+	if err != nil {
+		return fmt.Errorf("list series profiles: %w", err)
+	}
+	for _, profile := range profiles {
+		err := rebuildSeries(ctx, tx, userUID, profile, from, func(prev *ReturnSeriesDay) ([]ReturnSeriesDay, error) {
+			return compute(profile, prev)
+		})
+		if err != nil {
+			return err
+		}
+	}
+	return tx.Commit(ctx)
+}
+
+// rebuildSeries is the body of Rebuild, run under the user's lock.
+func rebuildSeries(ctx context.Context, tx pgx.Tx, userUID, profile, from string, compute func(prev *ReturnSeriesDay) ([]ReturnSeriesDay, error)) error {
+	var (
+		prev *ReturnSeriesDay
+		err  error
+	)
+	if from != "" {
+		prev, err = lastDayBefore(ctx, tx, userUID, profile, from)
+		if err != nil {
+			return fmt.Errorf("load series state: %w", err)
+		}
+	}
+
+	days, err := compute(prev)
+	if err != nil {
+		return err
+	}
+
+	if prev == nil {
+		_, err = tx.Exec(ctx, `DELETE FROM return_series WHERE user_uid = $1 AND profile = $2`, userUID, profile)
+	} else {
+		_, err = tx.Exec(ctx, `DELETE FROM return_series WHERE user_uid = $1 AND profile = $2 AND day > $3::date`,
+			userUID, profile, prev.Date)
+	}
+	if err != nil {
+		return fmt.Errorf("clear series: %w", err)
+	}
+
+	i := 0
+	src := pgx.CopyFromFunc(func() ([]any, error) {
+		if i == len(days) {
+			return nil, nil
+		}
+		d := &days[i]
+		i++
+		day, err := time.Parse("2006-01-02", d.Date)
+		if err != nil {
+			return nil, err
+		}
+		state, err := json.Marshal(d.State)
+		if err != nil {
+			return nil, err
+		}
+		var ret *float64
+		if d.HasReturn {
+			ret = &d.NetReturn
+		}
+		return []any{userUID, profile, day, d.FirstTS, d.LastTS, ret, d.Connections, d.Known, state}, nil
+	})
+	if _, err := tx.CopyFrom(ctx, pgx.Identifier{"return_series"},
+		[]string{"user_uid", "profile", "day", "first_ts", "last_ts", "net_return", "connections", "known", "state"},
+		src); err != nil {
+		return fmt.Errorf("write series: %w", err)
+	}
+
+	if _, err := tx.Exec(ctx, `
+		INSERT INTO return_series_profiles (user_uid, profile, updated_at)
+		VALUES ($1, $2, NOW())
+		ON CONFLICT (user_uid, profile) DO UPDATE SET updated_at = NOW()`, userUID, profile); err != nil {
+		return fmt.Errorf("mark series built: %w", err)
+	}
+	return nil
+}
+
+func lockUserSeries(ctx context.Context, tx pgx.Tx, userUID string) error {
+	if _, err := tx.Exec(ctx, `SELECT pg_advisory_xact_lock($1, hashtext($2))`, returnSeriesLockClass, userUID); err != nil {
+		return fmt.Errorf("lock series: %w", err)
+	}
+	return nil
+}
+
+func lastDayBefore(ctx context.Context, tx pgx.Tx, userUID, profile, before string) (*ReturnSeriesDay, error) {
+	var (
+		d     ReturnSeriesDay
+		ret   *float64
+		state []byte
+	)
+	err := tx.QueryRow(ctx, `
+		SELECT day::text, first_ts, last_ts, net_return, connections, known, state
+		FROM return_series
+		WHERE user_uid = $1 AND profile = $2 AND day < $3::date
+		ORDER BY day DESC
+		LIMIT 1`, userUID, profile, before).
+		Scan(&d.Date, &d.FirstTS, &d.LastTS, &ret, &d.Connections, &d.Known, &state)
+	if errors.Is(err, pgx.ErrNoRows) {
+		return nil, nil
+	}
+	if err != nil {
+		return nil, err
+	}
+	if ret != nil {
+		d.NetReturn, d.HasReturn = *ret, true
+	}
+	if err := json.Unmarshal(state, &d.State); err != nil {
+		return nil, err
+	}
+	return &d, nil
+}
+
+// DropUser deletes every series of a user. Used when a series could not be
+// brought up to date: reads then fall back to the snapshots until the
+// series is rebuilt.
+func (r *ReturnSeriesRepo) DropUser(ctx context.Context, userUID string) error {
+	tx, err := r.pool.Begin(ctx)
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback(ctx)
+	if err := lockUserSeries(ctx, tx, userUID); err != nil {
+		return err
+	}
+	if _, err := tx.Exec(ctx, `DELETE FROM return_series_profiles WHERE user_uid = $1`, userUID); err != nil {
+		return err
+	}
+	if _, err := tx.Exec(ctx, `DELETE FROM return_series WHERE user_uid = $1`, userUID); err != nil {
+		return err
+	}
+	return tx.Commit(ctx)
+}
@@ -0,0 +1,52 @@
+package repository
+
+import (
+	"context"
+	"strings"
+	"testing"
+
+	"github.com/trackrecord/enclave/internal/db"
+)
+
+func TestSetSchema_PicksVariantsWithoutProbing(t *testing.T) {
+	// No pool: any lazy probe would panic, so every answer below must come
+	// from the descriptor.
+	ctx := context.Background()
+	ts := db.NewSchema(map[string][]string{
+		"exchange_connections": {"id", "userUid", "credentialsHash", "isPaper"},
+		"snapshot_data":        {"id", "userUid", "label"},
+		"users":                {"id", "createdAt"},
+		"sync_statuses":        {"id", "userUid"},
+	})
+
+	conn := NewConnectionRepo(nil)
+	conn.SetSchema(ts)
+	credHash, syncMins, _, _, isPaper := conn.getCapabilityFlags(ctx)
+	if !conn.IsTSSchema(ctx) || !credHash || syncMins || !isPaper {
+		t.Fatalf("connection flags: ts=%v credHash=%v syncMins=%v isPaper=%v", conn.isTSSchema, credHash, syncMins, isPaper)
+	}
+	if !strings.Contains(conn.activeByUserSQL, `"credentialsHash"`) || strings.Contains(conn.activeByUserSQL, `"kycLevel"`) {
+		t.Fatalf("active-by-user query does not match the capabilities: %s", conn.activeByUserSQL)
+	}
+
+	snap := NewSnapshotRepo(nil)
+	snap.SetSchema(ts)
+	if !snap.hasLabelColumn(ctx) || !snap.isTSSchema {
+		t.Fatal("snapshot repo did not detect the TS schema")
+	}
+	users := NewUserRepo(nil)
+	users.SetSchema(ts)
+	if !users.detectSchema(ctx) {
+		t.Fatal("user repo did not detect the TS schema")
+	}
+
+	goSchema := db.NewSchema(map[string][]string{"snapshot_data": {"id", "user_uid"}})
+	snap = NewSnapshotRepo(nil)
+	snap.SetSchema(goSchema)
+	if snap.hasLabelColumn(ctx) || snap.goReads != snapshotReadsBase {
+		t.Fatal("Go schema without label got the labelled read queries")
+	}
+	if strings.Contains(snapshotReadsBase.byConnectionRange, "label") {
+		t.Fatalf("unlabelled range query filters on label: %s", snapshotReadsBase.byConnectionRange)
+	}
+}
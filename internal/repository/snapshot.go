@@ -7,10 +7,12 @@ import (
 	"errors"
 	"fmt"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/jackc/pgx/v5"
 	"github.com/jackc/pgx/v5/pgxpool"
+	"github.com/trackrecord/enclave/internal/db"
 )
 
 // QUAL-001: snapshot SELECT column lists, extracted to remove the 3-way
@@ -22,6 +24,66 @@ const (
 	snapshotColsWithLabel = "id, user_uid, exchange, label, timestamp"
 )
 
+// snapshotGoReads holds the Go-schema read queries of one label variant,
+// assembled once at init rather than with fmt.Sprintf on every call. A
+// constant query text also lets pgx's statement cache prepare each of them
+// once per connection and bind-and-execute afterwards.
+type snapshotGoReads struct {
+	byUserRange       string // $1 user, $2 start, $3 end
+	latestByUser      string // $1 user
+	byExchangeDate    string // $1 user, $2 exchange, $3 day; unlabeled row only
+	byConnectionRange string // $1 user, $2 exchange, $3 start, $4 end[, $5 label]
+	equityByUserRange string // $1 user, $2 start, $3 end; ProjectEquity columns
+	byUserRangePage   string // $1 user, $2 start, $3 end, $4 limit
+	byUserRangeAfter  string // as byUserRangePage, after ($5 timestamp, $6 id)
+}
+
+var (
+	snapshotReadsBase      = newSnapshotGoReads(false)
+	snapshotReadsWithLabel = newSnapshotGoReads(true)
+)
+
+func newSnapshotGoReads(hasLabel bool) *snapshotGoReads {
+	selectCols := snapshotColsBase
+	if hasLabel {
+		selectCols = snapshotColsWithLabel
+	}
+	query := func(where string) string {
+		return fmt.Sprintf(`
+		SELECT %s,
+			total_equity, realized_balance, unrealized_pnl,
+			deposits, withdrawals, total_trades, total_volume, total_fees,
+			breakdown_by_market, created_at
+		FROM snapshot_data
+		%s`, selectCols, where)
+	}
+
+	q := &snapshotGoReads{
+		byUserRange:       query("WHERE user_uid = $1 AND timestamp >= $2 AND timestamp <= $3 ORDER BY timestamp"),
+		latestByUser:      query("WHERE user_uid = $1 ORDER BY timestamp DESC LIMIT 1"),
+		byExchangeDate:    query("WHERE user_uid = $1 AND exchange = $2 AND timestamp = $3"),
+		byConnectionRange: query("WHERE user_uid = $1 AND exchange = $2 AND timestamp >= $3 AND timestamp <= $4"),
+		byUserRangePage:   query("WHERE user_uid = $1 AND timestamp >= $2 AND timestamp <= $3 ORDER BY timestamp, id LIMIT $4"),
+		byUserRangeAfter: query("WHERE user_uid = $1 AND timestamp >= $2 AND timestamp <= $3 AND (timestamp, id) > ($5, $6) " +
+			"ORDER BY timestamp, id LIMIT $4"),
+	}
+	q.equityByUserRange = `
+		SELECT user_uid, exchange, timestamp, total_equity, deposits, withdrawals
+		FROM snapshot_data
+		WHERE user_uid = $1 AND timestamp >= $2 AND timestamp <= $3
+		ORDER BY timestamp`
+	if hasLabel {
+		q.equityByUserRange = `
+		SELECT user_uid, exchange, label, timestamp, total_equity, deposits, withdrawals
+		FROM snapshot_data
+		WHERE user_uid = $1 AND timestamp >= $2 AND timestamp <= $3
+		ORDER BY timestamp`
+		q.byExchangeDate = query("WHERE user_uid = $1 AND exchange = $2 AND label = '' AND timestamp = $3")
+		q.byConnectionRange = query("WHERE user_uid = $1 AND exchange = $2 AND timestamp >= $3 AND timestamp <= $4 AND label = $5")
+	}
+	return q
+}
+
 // generateCUID generates a CUID-like identifier compatible with Prisma's @id @default(cuid()).
 func generateCUID() string {
 	b := make([]byte, 12)
@@ -46,6 +108,10 @@ type Snapshot struct {
 	TotalFees       float64          `json:"total_fees"`
 	Breakdown       *MarketBreakdown `json:"breakdown,omitempty"`
 	CreatedAt       time.Time        `json:"created_at"`
+
+	// Set by ProjectBreakdown reads until LoadBreakdown decodes it.
+	rawBreakdown []byte
+	tsTotals     bool // lift the totals from breakdown.global on decode
 }
 
 // MarketBreakdown holds metrics per market type.
@@ -89,9 +155,13 @@ type SnapshotRepo struct {
 	pool *pgxpool.Pool
 
 	capMu              sync.Mutex
-	capabilitiesLoaded bool
+	capabilitiesLoaded atomic.Bool // set once the fields below are final
 	hasLabelCol        bool
 	isTSSchema         bool // true = TS Prisma camelCase columns
+	goReads            *snapshotGoReads
+
+	seriesCache    *snapshotSeriesCache // nil = disabled
+	writeObservers []func(userUID string, from, to time.Time)
 }
 
 // NewSnapshotRepo creates a new snapshot repository
@@ -101,99 +171,14 @@ func NewSnapshotRepo(pool *pgxpool.Pool) *SnapshotRepo {
 
 // Upsert creates or updates a snapshot for a user/exchange/date
 func (r *SnapshotRepo) Upsert(ctx context.Context, s *Snapshot) error {
-	breakdownJSON, _ := json.Marshal(s.Breakdown)
-	hasLabel := r.hasLabelColumn(ctx)
-
-	if r.isTSSchema {
-		return r.upsertTS(ctx, s, breakdownJSON)
-	}
-
-	if hasLabel {
-		query := `
-			INSERT INTO snapshot_data (
-				user_uid, exchange, label, timestamp,
-				total_equity, realized_balance, unrealized_pnl,
-				deposits, withdrawals, total_trades, total_volume, total_fees,
-				breakdown_by_market, created_at
-			) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-			ON CONFLICT (user_uid, exchange, label, timestamp)
-			DO UPDATE SET
-				total_equity = EXCLUDED.total_equity,
-				realized_balance = EXCLUDED.realized_balance,
-				unrealized_pnl = EXCLUDED.unrealized_pnl,
-				deposits = EXCLUDED.deposits,
-				withdrawals = EXCLUDED.withdrawals,
-				total_trades = EXCLUDED.total_trades,
-				total_volume = EXCLUDED.total_volume,
-				total_fees = EXCLUDED.total_fees,
-				breakdown_by_market = EXCLUDED.breakdown_by_market
-			RETURNING id`
-
-		return r.pool.QueryRow(ctx, query,
-			s.UserUID, s.Exchange, s.Label, s.Timestamp,
-			s.TotalEquity, s.RealizedBalance, s.UnrealizedPnL,
-			s.Deposits, s.Withdrawals, s.TotalTrades, s.TotalVolume, s.TotalFees,
-			breakdownJSON, time.Now().UTC(),
-		).Scan(&s.ID)
+	w := r.writeSpec(ctx)
+	args, err := w.args(s, time.Now().UTC())
+	if err != nil {
+		return err
 	}
-
-	query := `
-		INSERT INTO snapshot_data (
-			user_uid, exchange, timestamp,
-			total_equity, realized_balance, unrealized_pnl,
-			deposits, withdrawals, total_trades, total_volume, total_fees,
-			breakdown_by_market, created_at
-		) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-		ON CONFLICT (user_uid, exchange, timestamp)
-		DO UPDATE SET
-			total_equity = EXCLUDED.total_equity,
-			realized_balance = EXCLUDED.realized_balance,
-			unrealized_pnl = EXCLUDED.unrealized_pnl,
-			deposits = EXCLUDED.deposits,
-			withdrawals = EXCLUDED.withdrawals,
-			total_trades = EXCLUDED.total_trades,
-			total_volume = EXCLUDED.total_volume,
-			total_fees = EXCLUDED.total_fees,
-			breakdown_by_market = EXCLUDED.breakdown_by_market
-		RETURNING id`
-
-	return r.pool.QueryRow(ctx, query,
-		s.UserUID, s.Exchange, s.Timestamp,
-		s.TotalEquity, s.RealizedBalance, s.UnrealizedPnL,
-		s.Deposits, s.Withdrawals, s.TotalTrades, s.TotalVolume, s.TotalFees,
-		breakdownJSON, time.Now().UTC(),
-	).Scan(&s.ID)
-}
-
-// upsertTS writes to TS Prisma schema (camelCase columns, no total_trades/total_volume/total_fees).
-// TS always has the label column. Generates a CUID-like id (Prisma doesn't use UUID defaults).
-func (r *SnapshotRepo) upsertTS(ctx context.Context, s *Snapshot, breakdownJSON []byte) error {
-	now := time.Now().UTC()
-	generatedID := generateCUID()
-	query := `
-		INSERT INTO snapshot_data (
-			id, "userUid", exchange, label, timestamp,
-			"totalEquity", "realizedBalance", "unrealizedPnL",
-			deposits, withdrawals,
-			breakdown_by_market, "createdAt", "updatedAt"
-		) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-		ON CONFLICT ("userUid", exchange, label, timestamp)
-		DO UPDATE SET
-			"totalEquity" = EXCLUDED."totalEquity",
-			"realizedBalance" = EXCLUDED."realizedBalance",
-			"unrealizedPnL" = EXCLUDED."unrealizedPnL",
-			deposits = EXCLUDED.deposits,
-			withdrawals = EXCLUDED.withdrawals,
-			breakdown_by_market = EXCLUDED.breakdown_by_market,
-			"updatedAt" = EXCLUDED."updatedAt"
-		RETURNING id`
-
-	return r.pool.QueryRow(ctx, query, generatedID,
-		s.UserUID, s.Exchange, s.Label, s.Timestamp,
-		s.TotalEquity, s.RealizedBalance, s.UnrealizedPnL,
-		s.Deposits, s.Withdrawals,
-		breakdownJSON, now, now,
-	).Scan(&s.ID)
+	err = r.pool.QueryRow(ctx, w.upsertSQL+" RETURNING id", args...).Scan(&s.ID)
+	r.invalidateSnapshotUsers([]*Snapshot{s})
+	return err
 }
 
 // GetByUserAndDateRange returns snapshots for a user within a date range
@@ -204,22 +189,7 @@ func (r *SnapshotRepo) GetByUserAndDateRange(ctx context.Context, userUID string
 		return r.getByUserAndDateRangeTS(ctx, userUID, start, end)
 	}
 
-	selectCols := snapshotColsBase
-	if hasLabel {
-		selectCols = snapshotColsWithLabel
-	}
-	query := fmt.Sprintf(`
-		SELECT %s,
-			total_equity, realized_balance, unrealized_pnl,
-			deposits, withdrawals, total_trades, total_volume, total_fees,
-			breakdown_by_market, created_at
-		FROM snapshot_data
-		WHERE user_uid = $1 AND timestamp >= $2 AND timestamp <= $3
-		ORDER BY timestamp`,
-		selectCols,
-	)
-
-	rows, err := r.pool.Query(ctx, query, userUID, start, end)
+	rows, err := r.pool.Query(ctx, r.goReads.byUserRange, userUID, start, end)
 	if err != nil {
 		return nil, err
 	}
@@ -228,8 +198,7 @@ func (r *SnapshotRepo) GetByUserAndDateRange(ctx context.Context, userUID string
 	return r.scanSnapshots(rows, hasLabel)
 }
 
-func (r *SnapshotRepo) getByUserAndDateRangeTS(ctx context.Context, userUID string, start, end time.Time) ([]*Snapshot, error) {
-	query := `
+const snapshotByUserRangeTS = `
 		SELECT id, "userUid", exchange, label, timestamp,
 			"totalEquity", "realizedBalance", "unrealizedPnL",
 			deposits, withdrawals,
@@ -238,7 +207,8 @@ func (r *SnapshotRepo) getByUserAndDateRangeTS(ctx context.Context, userUID stri
 		WHERE "userUid" = $1 AND timestamp >= $2 AND timestamp <= $3
 		ORDER BY timestamp`
 
-	rows, err := r.pool.Query(ctx, query, userUID, start, end)
+func (r *SnapshotRepo) getByUserAndDateRangeTS(ctx context.Context, userUID string, start, end time.Time) ([]*Snapshot, error) {
+	rows, err := r.pool.Query(ctx, snapshotByUserRangeTS, userUID, start, end)
 	if err != nil {
 		return nil, err
 	}
@@ -255,23 +225,7 @@ func (r *SnapshotRepo) GetLatestByUser(ctx context.Context, userUID string) (*Sn
 		return r.getLatestByUserTS(ctx, userUID)
 	}
 
-	selectCols := snapshotColsBase
-	if hasLabel {
-		selectCols = snapshotColsWithLabel
-	}
-	query := fmt.Sprintf(`
-		SELECT %s,
-			total_equity, realized_balance, unrealized_pnl,
-			deposits, withdrawals, total_trades, total_volume, total_fees,
-			breakdown_by_market, created_at
-		FROM snapshot_data
-		WHERE user_uid = $1
-		ORDER BY timestamp DESC
-		LIMIT 1`,
-		selectCols,
-	)
-
-	rows, err := r.pool.Query(ctx, query, userUID)
+	rows, err := r.pool.Query(ctx, r.goReads.latestByUser, userUID)
 	if err != nil {
 		return nil, err
 	}
@@ -326,25 +280,7 @@ func (r *SnapshotRepo) GetByUserExchangeAndDate(ctx context.Context, userUID, ex
 		return r.getByUserExchangeAndDateTS(ctx, userUID, exchange, date)
 	}
 
-	selectCols := snapshotColsBase
-	if hasLabel {
-		selectCols = snapshotColsWithLabel
-	}
-	whereClause := "WHERE user_uid = $1 AND exchange = $2 AND timestamp = $3"
-	if hasLabel {
-		whereClause = "WHERE user_uid = $1 AND exchange = $2 AND label = '' AND timestamp = $3"
-	}
-	query := fmt.Sprintf(`
-		SELECT %s,
-			total_equity, realized_balance, unrealized_pnl,
-			deposits, withdrawals, total_trades, total_volume, total_fees,
-			breakdown_by_market, created_at
-		FROM snapshot_data
-		%s`,
-		selectCols, whereClause,
-	)
-
-	rows, err := r.pool.Query(ctx, query, userUID, exchange, date)
+	rows, err := r.pool.Query(ctx, r.goReads.byExchangeDate, userUID, exchange, date)
 	if err != nil {
 		return nil, err
 	}
@@ -538,6 +474,115 @@ func (r *SnapshotRepo) getLatestByUserExchangeLabelTS(ctx context.Context, userU
 	return snapshots[0], nil
 }
 
+// GetLatestByConnections returns the latest snapshot of each of a user's
+// connections in one query, in place of one GetLatestByUserExchangeLabel
+// round trip per connection. Connections without snapshots are left out;
+// the order is unspecified. Without a label column the snapshots are per
+// exchange, so, as GetLatestByUserExchangeLabel does, each connection gets
+// its exchange's latest snapshot, carrying the connection's label.
+//
+// Each connection is one LIMIT 1 probe of a LATERAL join. On the Go schema
+// only the connection, Timestamp and the totals (TotalEquity,
+// RealizedBalance, UnrealizedPnL, TotalTrades, TotalFees) are loaded, which
+// idx_snapshot_data_connection_latest (migration 015) covers, so the probes
+// are index-only scans; every other field is left zero. On the TS schema
+// the totals come from breakdown.global as in scanSnapshotsTS.
+func (r *SnapshotRepo) GetLatestByConnections(ctx context.Context, userUID string, connections []*ExchangeConnection) ([]*Snapshot, error) {
+	if len(connections) == 0 {
+		return nil, nil
+	}
+	hasLabel := r.hasLabelColumn(ctx)
+
+	exchanges := make([]string, 0, len(connections))
+	labels := make([]string, 0, len(connections))
+	seen := make(map[string]struct{}, len(connections))
+	for _, conn := range connections {
+		key := conn.Exchange + "\x00" + conn.Label
+		if _, ok := seen[key]; ok {
+			continue
+		}
+		seen[key] = struct{}{}
+		exchanges = append(exchanges, conn.Exchange)
+		labels = append(labels, conn.Label)
+	}
+
+	if r.isTSSchema {
+		rows, err := r.pool.Query(ctx, snapshotLatestByConnectionsTS, userUID, exchanges, labels)
+		if err != nil {
+			return nil, err
+		}
+		defer rows.Close()
+		return r.scanSnapshotsTS(rows)
+	}
+
+	query := snapshotLatestByConnectionsNoLabel
+	if hasLabel {
+		query = snapshotLatestByConnections
+	}
+	rows, err := r.pool.Query(ctx, query, userUID, exchanges, labels)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	var snapshots []*Snapshot
+	for rows.Next() {
+		s := &Snapshot{UserUID: userUID}
+		if err := rows.Scan(&s.Exchange, &s.Label, &s.Timestamp,
+			&s.TotalEquity, &s.RealizedBalance, &s.UnrealizedPnL,
+			&s.TotalTrades, &s.TotalFees); err != nil {
+			return nil, err
+		}
+		snapshots = append(snapshots, s)
+	}
+	return snapshots, rows.Err()
+}
+
+// Latest-per-connection queries: $1 user, $2 exchanges, $3 labels (parallel
+// arrays, one entry per connection).
+const (
+	snapshotLatestByConnections = `
+		SELECT s.exchange, s.label, s.timestamp,
+			s.total_equity, s.realized_balance, s.unrealized_pnl, s.total_trades, s.total_fees
+		FROM unnest($2::text[], $3::text[]) AS c(exchange, label)
+		CROSS JOIN LATERAL (
+			SELECT exchange, label, timestamp,
+				total_equity, realized_balance, unrealized_pnl, total_trades, total_fees
+			FROM snapshot_data
+			WHERE user_uid = $1 AND exchange = c.exchange AND label = c.label
+			ORDER BY timestamp DESC
+			LIMIT 1
+		) s`
+	snapshotLatestByConnectionsNoLabel = `
+		SELECT s.exchange, c.label, s.timestamp,
+			s.total_equity, s.realized_balance, s.unrealized_pnl, s.total_trades, s.total_fees
+		FROM unnest($2::text[], $3::text[]) AS c(exchange, label)
+		CROSS JOIN LATERAL (
+			SELECT exchange, timestamp,
+				total_equity, realized_balance, unrealized_pnl, total_trades, total_fees
+			FROM snapshot_data
+			WHERE user_uid = $1 AND exchange = c.exchange
+			ORDER BY timestamp DESC
+			LIMIT 1
+		) s`
+	snapshotLatestByConnectionsTS = `
+		SELECT s.id, s."userUid", s.exchange, s.label, s.timestamp,
+			s."totalEquity", s."realizedBalance", s."unrealizedPnL",
+			s.deposits, s.withdrawals,
+			s.breakdown_by_market, s."createdAt"
+		FROM unnest($2::text[], $3::text[]) AS c(exchange, label)
+		CROSS JOIN LATERAL (
+			SELECT id, "userUid", exchange, label, timestamp,
+				"totalEquity", "realizedBalance", "unrealizedPnL",
+				deposits, withdrawals,
+				breakdown_by_market, "createdAt"
+			FROM snapshot_data
+			WHERE "userUid" = $1 AND exchange = c.exchange AND label = c.label
+			ORDER BY timestamp DESC
+			LIMIT 1
+		) s`
+)
+
 // ExistsForUserExchangeLabel returns true if any snapshot already exists for
 // the given (user_uid, exchange, label) tuple. Used by the anti-cherry-pick
 // guard (ENG-001) — replaces the old full-range scan that was O(all user
@@ -571,106 +616,6 @@ func (r *SnapshotRepo) ExistsForUserExchangeLabel(ctx context.Context, userUID,
 	return true, nil
 }
 
-// UpsertBatch atomically upserts multiple snapshots in a single transaction.
-// If any snapshot fails, the entire batch is rolled back (TS parity: atomic daily sync).
-func (r *SnapshotRepo) UpsertBatch(ctx context.Context, snapshots []*Snapshot) error {
-	if len(snapshots) == 0 {
-		return nil
-	}
-
-	tx, err := r.pool.Begin(ctx)
-	if err != nil {
-		return fmt.Errorf("begin tx: %w", err)
-	}
-	defer tx.Rollback(ctx)
-
-	hasLabel := r.hasLabelColumn(ctx)
-
-	for _, s := range snapshots {
-		breakdownJSON, _ := json.Marshal(s.Breakdown)
-
-		if r.isTSSchema {
-			now := time.Now().UTC()
-			_, err = tx.Exec(ctx, `
-				INSERT INTO snapshot_data (
-					id, "userUid", exchange, label, timestamp,
-					"totalEquity", "realizedBalance", "unrealizedPnL",
-					deposits, withdrawals,
-					breakdown_by_market, "createdAt", "updatedAt"
-				) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-				ON CONFLICT ("userUid", exchange, label, timestamp)
-				DO UPDATE SET
-					"totalEquity" = EXCLUDED."totalEquity",
-					"realizedBalance" = EXCLUDED."realizedBalance",
-					"unrealizedPnL" = EXCLUDED."unrealizedPnL",
-					deposits = EXCLUDED.deposits,
-					withdrawals = EXCLUDED.withdrawals,
-					breakdown_by_market = EXCLUDED.breakdown_by_market,
-					"updatedAt" = EXCLUDED."updatedAt"`,
-				generateCUID(),
-				s.UserUID, s.Exchange, s.Label, s.Timestamp,
-				s.TotalEquity, s.RealizedBalance, s.UnrealizedPnL,
-				s.Deposits, s.Withdrawals,
-				breakdownJSON, now, now,
-			)
-		} else if hasLabel {
-			_, err = tx.Exec(ctx, `
-				INSERT INTO snapshot_data (
-					user_uid, exchange, label, timestamp,
-					total_equity, realized_balance, unrealized_pnl,
-					deposits, withdrawals, total_trades, total_volume, total_fees,
-					breakdown_by_market, created_at
-				) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-				ON CONFLICT (user_uid, exchange, label, timestamp)
-				DO UPDATE SET
-					total_equity = EXCLUDED.total_equity,
-					realized_balance = EXCLUDED.realized_balance,
-					unrealized_pnl = EXCLUDED.unrealized_pnl,
-					deposits = EXCLUDED.deposits,
-					withdrawals = EXCLUDED.withdrawals,
-					total_trades = EXCLUDED.total_trades,
-					total_volume = EXCLUDED.total_volume,
-					total_fees = EXCLUDED.total_fees,
-					breakdown_by_market = EXCLUDED.breakdown_by_market`,
-				s.UserUID, s.Exchange, s.Label, s.Timestamp,
-				s.TotalEquity, s.RealizedBalance, s.UnrealizedPnL,
-				s.Deposits, s.Withdrawals, s.TotalTrades, s.TotalVolume, s.TotalFees,
-				breakdownJSON, time.Now().UTC(),
-			)
-		} else {
-			_, err = tx.Exec(ctx, `
-				INSERT INTO snapshot_data (
-					user_uid, exchange, timestamp,
-					total_equity, realized_balance, unrealized_pnl,
-					deposits, withdrawals, total_trades, total_volume, total_fees,
-					breakdown_by_market, created_at
-				) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-				ON CONFLICT (user_uid, exchange, timestamp)
-				DO UPDATE SET
-					total_equity = EXCLUDED.total_equity,
-					realized_balance = EXCLUDED.realized_balance,
-					unrealized_pnl = EXCLUDED.unrealized_pnl,
-					deposits = EXCLUDED.deposits,
-					withdrawals = EXCLUDED.withdrawals,
-					total_trades = EXCLUDED.total_trades,
-					total_volume = EXCLUDED.total_volume,
-					total_fees = EXCLUDED.total_fees,
-					breakdown_by_market = EXCLUDED.breakdown_by_market`,
-				s.UserUID, s.Exchange, s.Timestamp,
-				s.TotalEquity, s.RealizedBalance, s.UnrealizedPnL,
-				s.Deposits, s.Withdrawals, s.TotalTrades, s.TotalVolume, s.TotalFees,
-				breakdownJSON, time.Now().UTC(),
-			)
-		}
-
-		if err != nil {
-			return fmt.Errorf("upsert snapshot %s/%s: %w", s.Exchange, s.Label, err)
-		}
-	}
-
-	return tx.Commit(ctx)
-}
-
 func (r *SnapshotRepo) scanSnapshots(rows pgx.Rows, hasLabel bool) ([]*Snapshot, error) {
 	var snapshots []*Snapshot
 
@@ -739,11 +684,8 @@ func (r *SnapshotRepo) scanSnapshotsTS(rows pgx.Rows) ([]*Snapshot, error) {
 		s.TotalFees = 0
 
 		if len(breakdownJSON) > 0 {
-			if err := json.Unmarshal(breakdownJSON, &s.Breakdown); err == nil && s.Breakdown != nil && s.Breakdown.Global != nil {
-				g := s.Breakdown.Global
-				s.TotalTrades = g.Trades
-				s.TotalVolume = g.Volume
-				s.TotalFees = g.TradingFees + g.FundingFees
+			if err := json.Unmarshal(breakdownJSON, &s.Breakdown); err == nil {
+				liftTSTotals(&s)
 			}
 		}
 
@@ -753,48 +695,44 @@ func (r *SnapshotRepo) scanSnapshotsTS(rows pgx.Rows) ([]*Snapshot, error) {
 	return snapshots, rows.Err()
 }
 
-func (r *SnapshotRepo) hasLabelColumn(ctx context.Context) bool {
+// SetSchema applies a schema descriptor loaded at startup, so no request
+// has to detect the schema itself.
+func (r *SnapshotRepo) SetSchema(schema *db.Schema) {
 	r.capMu.Lock()
 	defer r.capMu.Unlock()
+	r.applySchema(schema)
+}
 
-	if r.capabilitiesLoaded {
+// applySchema sets the capability fields from schema. Callers hold capMu.
+func (r *SnapshotRepo) applySchema(schema *db.Schema) {
+	// Detect TS Prisma schema (camelCase) vs Go schema (snake_case).
+	// If "userUid" column exists in snapshot_data → TS schema.
+	r.isTSSchema = schema.HasColumn("snapshot_data", "userUid")
+	// TS Prisma always has the label column
+	r.hasLabelCol = r.isTSSchema || schema.HasColumn("snapshot_data", "label")
+	r.goReads = snapshotReadsBase
+	if r.hasLabelCol {
+		r.goReads = snapshotReadsWithLabel
+	}
+	r.capabilitiesLoaded.Store(true)
+}
+
+func (r *SnapshotRepo) hasLabelColumn(ctx context.Context) bool {
+	if r.capabilitiesLoaded.Load() {
 		return r.hasLabelCol
 	}
 
-	// Detect TS Prisma schema (camelCase) vs Go schema (snake_case).
-	// If "userUid" column exists in snapshot_data → TS schema.
-	tsSchema, _ := r.columnExists(ctx, "snapshot_data", "userUid")
-	r.isTSSchema = tsSchema
-
-	if tsSchema {
-		// TS Prisma always has the label column
-		r.hasLabelCol = true
-	} else {
-		exists, err := r.columnExists(ctx, "snapshot_data", "label")
+	r.capMu.Lock()
+	defer r.capMu.Unlock()
+	if !r.capabilitiesLoaded.Load() {
+		// No descriptor from startup (admin tools, tests): load one for
+		// this repository. A failed probe falls back to the Go schema
+		// without label, as before.
+		schema, err := db.LoadSchema(ctx, r.pool)
 		if err != nil {
-			r.hasLabelCol = false
-		} else {
-			r.hasLabelCol = exists
+			schema = &db.Schema{}
 		}
+		r.applySchema(schema)
 	}
-
-	r.capabilitiesLoaded = true
 	return r.hasLabelCol
 }
-
-func (r *SnapshotRepo) columnExists(ctx context.Context, tableName, columnName string) (bool, error) {
-	const query = `
-		SELECT EXISTS (
-			SELECT 1
-			FROM information_schema.columns
-			WHERE table_schema = 'public'
-			  AND table_name = $1
-			  AND column_name = $2
-		)`
-
-	var exists bool
-	if err := r.pool.QueryRow(ctx, query, tableName, columnName).Scan(&exists); err != nil {
-		return false, fmt.Errorf("check column %s.%s: %w", tableName, columnName, err)
-	}
-	return exists, nil
-}
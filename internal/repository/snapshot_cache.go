@@ -0,0 +1,251 @@
+package repository
+
+import (
+	"context"
+	"sort"
+	"sync"
+	"sync/atomic"
+	"time"
+	"unsafe"
+
+	"github.com/trackrecord/enclave/internal/cache"
+	"golang.org/x/sync/singleflight"
+)
+
+// PERF-011: in-process cache of each user's decoded snapshot history. A
+// report generation reads the same range twice (GenerateReport, then
+// CalculateWithExcludedExchanges) and every dashboard render reads it again
+// through GetPerformanceMetrics / GetSnapshotTimeSeries / the REST handlers,
+// while the rows only change once a day when the sync writes them. The cache
+// holds the whole history per user, so any date range is a slice of it, and
+// is invalidated by this repository's writes for that user.
+//
+// The TTL bounds staleness for writes this process does not see (another
+// replica's sync, admin tools).
+type snapshotSeriesCache struct {
+	mu     sync.Mutex
+	series *cache.LRU[string, []*Snapshot] // by user; ascending by timestamp, fully decoded, read-only
+	loads  map[string]*seriesLoad
+	now    func() time.Time
+
+	flight singleflight.Group
+
+	hits, misses, invalidations atomic.Int64
+}
+
+// seriesLoad marks a load in flight; an invalidation meanwhile makes its
+// result stale, so it is returned to its callers but not cached.
+type seriesLoad struct {
+	stale bool
+}
+
+// SnapshotCacheStats is a point-in-time view of the snapshot series cache.
+type SnapshotCacheStats struct {
+	Hits          int64
+	Misses        int64
+	Evictions     int64
+	Invalidations int64
+	Users         int
+	Bytes         int64
+	MaxBytes      int64
+}
+
+func newSnapshotSeriesCache(maxBytes int64, ttl time.Duration) *snapshotSeriesCache {
+	c := &snapshotSeriesCache{
+		loads: make(map[string]*seriesLoad),
+		now:   time.Now,
+	}
+	c.series = cache.NewLRU[string, []*Snapshot](maxBytes, ttl, func() time.Time { return c.now() }, nil)
+	return c
+}
+
+// SetSeriesCache enables the per-user snapshot series cache with a memory
+// budget of maxBytes; entries older than ttl are reloaded (0 = no expiry).
+// Series reads then return snapshots shared with the cache, which callers
+// must not modify. Call before the repository is shared.
+func (r *SnapshotRepo) SetSeriesCache(maxBytes int64, ttl time.Duration) {
+	r.seriesCache = newSnapshotSeriesCache(maxBytes, ttl)
+}
+
+// SeriesCacheStatistics returns the series cache counters; zero when the
+// cache is disabled or the repository is nil.
+func (r *SnapshotRepo) SeriesCacheStatistics() SnapshotCacheStats {
+	if r == nil || r.seriesCache == nil {
+		return SnapshotCacheStats{}
+	}
+	return r.seriesCache.stats()
+}
+
+// cachedSeriesRange returns the user's snapshots within [start, end] from
+// the cache, loading the full history on a miss.
+func (r *SnapshotRepo) cachedSeriesRange(ctx context.Context, userUID string, start, end time.Time) ([]*Snapshot, error) {
+	c := r.seriesCache
+	series, ok := c.get(userUID)
+	if !ok {
+		v, err, _ := c.flight.Do(userUID, func() (any, error) {
+			load := c.beginLoad(userUID)
+			// Shared by every caller joining the flight: one caller
+			// going away must not fail the others.
+			loaded, err := r.loadFullSeries(context.WithoutCancel(ctx), userUID)
+			c.endLoad(userUID, load, loaded, err)
+			return loaded, err
+		})
+		if err != nil {
+			return nil, err
+		}
+		series = v.([]*Snapshot)
+	}
+
+	lo := sort.Search(len(series), func(i int) bool { return !series[i].Timestamp.Before(start) })
+	hi := sort.Search(len(series), func(i int) bool { return series[i].Timestamp.After(end) })
+	if lo >= hi {
+		return nil, nil
+	}
+	// A fresh slice: callers filter and sort what they get.
+	return append([]*Snapshot(nil), series[lo:hi]...), nil
+}
+
+// loadFullSeries reads and decodes a user's whole history.
+func (r *SnapshotRepo) loadFullSeries(ctx context.Context, userUID string) ([]*Snapshot, error) {
+	series, err := r.querySeries(ctx, userUID, time.Time{}, time.Date(9999, 12, 31, 0, 0, 0, 0, time.UTC), ProjectBreakdown)
+	if err != nil {
+		return nil, err
+	}
+	for _, s := range series {
+		s.LoadBreakdown()
+	}
+	return series, nil
+}
+
+// InvalidateSeries drops the cached series of each user in userUIDs and
+// tells the write observers their whole history may have changed. The
+// repository's own writes do this; it is exported for callers that write
+// snapshot_data in their own transaction (UpsertBatchTx).
+func (r *SnapshotRepo) InvalidateSeries(userUIDs ...string) {
+	for _, uid := range userUIDs {
+		if r.seriesCache != nil {
+			r.seriesCache.invalidate(uid)
+		}
+		for _, fn := range r.writeObservers {
+			fn(uid, time.Time{}, time.Time{})
+		}
+	}
+}
+
+// OnSnapshotsWritten registers fn to be told about the snapshots this
+// repository writes: fn(userUID, from, to) covers the timestamps written for
+// userUID, and a zero from and to mean any of the user's snapshots. Like the
+// series cache, observers are told before and again after a batch commits.
+// Call before the repository is shared.
+func (r *SnapshotRepo) OnSnapshotsWritten(fn func(userUID string, from, to time.Time)) {
+	r.writeObservers = append(r.writeObservers, fn)
+}
+
+// invalidateSnapshotUsers invalidates every user written by a batch and
+// tells the write observers the span written for each run of a user.
+func (r *SnapshotRepo) invalidateSnapshotUsers(snapshots []*Snapshot) {
+	if r.seriesCache == nil && len(r.writeObservers) == 0 {
+		return
+	}
+	for i := 0; i < len(snapshots); {
+		uid := snapshots[i].UserUID
+		from, to := snapshots[i].Timestamp, snapshots[i].Timestamp
+		j := i + 1
+		for ; j < len(snapshots) && snapshots[j].UserUID == uid; j++ {
+			if ts := snapshots[j].Timestamp; ts.Before(from) {
+				from = ts
+			} else if ts.After(to) {
+				to = ts
+			}
+		}
+		if r.seriesCache != nil {
+			r.seriesCache.invalidate(uid)
+		}
+		for _, fn := range r.writeObservers {
+			fn(uid, from, to)
+		}
+		i = j
+	}
+}
+
+func (c *snapshotSeriesCache) get(userUID string) ([]*Snapshot, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	series, ok := c.series.Get(userUID)
+	if !ok {
+		c.misses.Add(1)
+		return nil, false
+	}
+	c.hits.Add(1)
+	return series, true
+}
+
+func (c *snapshotSeriesCache) beginLoad(userUID string) *seriesLoad {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	load := &seriesLoad{}
+	c.loads[userUID] = load
+	return load
+}
+
+func (c *snapshotSeriesCache) endLoad(userUID string, load *seriesLoad, series []*Snapshot, err error) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if c.loads[userUID] == load {
+		delete(c.loads, userUID)
+	}
+	if err != nil || load.stale {
+		return
+	}
+	c.series.Add(userUID, series, seriesSizeBytes(series))
+}
+
+func (c *snapshotSeriesCache) invalidate(userUID string) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	c.series.Remove(userUID)
+	if load, ok := c.loads[userUID]; ok {
+		load.stale = true
+	}
+	// Reads starting after the write must not join a load that began
+	// before it.
+	c.flight.Forget(userUID)
+	c.invalidations.Add(1)
+}
+
+func (c *snapshotSeriesCache) stats() SnapshotCacheStats {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return SnapshotCacheStats{
+		Hits:          c.hits.Load(),
+		Misses:        c.misses.Load(),
+		Evictions:     c.series.Evictions(),
+		Invalidations: c.invalidations.Load(),
+		Users:         c.series.Len(),
+		Bytes:         c.series.Bytes(),
+		MaxBytes:      c.series.MaxBytes(),
+	}
+}
+
+// seriesSizeBytes estimates the memory held by a decoded series.
+func seriesSizeBytes(series []*Snapshot) int64 {
+	const (
+		snapshotSize = int64(unsafe.Sizeof(Snapshot{}))
+		metricsSize  = int64(unsafe.Sizeof(MarketMetrics{}))
+		ptrSize      = int64(unsafe.Sizeof(uintptr(0)))
+	)
+	size := int64(len(series)) * (ptrSize + snapshotSize)
+	for _, s := range series {
+		size += int64(len(s.ID) + len(s.UserUID) + len(s.Exchange) + len(s.Label))
+		if b := s.Breakdown; b != nil {
+			size += int64(unsafe.Sizeof(*b))
+			for _, m := range []*MarketMetrics{b.Stocks, b.Spot, b.Swap, b.Futures, b.Options,
+				b.Margin, b.Earn, b.CFD, b.Forex, b.Commodities, b.Global} {
+				if m != nil {
+					size += metricsSize
+				}
+			}
+		}
+	}
+	return size
+}
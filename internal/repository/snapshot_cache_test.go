@@ -0,0 +1,86 @@
+package repository
+
+import (
+	"testing"
+	"time"
+)
+
+func makeSeriesForCache(user string, days int) []*Snapshot {
+	day := time.Date(2024, 1, 1, 0, 0, 0, 0, time.UTC)
+	out := make([]*Snapshot, days)
+	for i := range out {
+		out[i] = &Snapshot{UserUID: user, Exchange: "binance", Timestamp: day.AddDate(0, 0, i), TotalEquity: float64(i)}
+	}
+	return out
+}
+
+func TestSnapshotSeriesCache_InvalidationAndLRU(t *testing.T) {
+	clock := time.Date(2026, 1, 1, 0, 0, 0, 0, time.UTC)
+	unit := seriesSizeBytes(makeSeriesForCache("x", 10))
+	c := newSnapshotSeriesCache(2*unit+unit/2, time.Hour)
+	c.now = func() time.Time { return clock }
+
+	store := func(user string) {
+		load := c.beginLoad(user)
+		c.endLoad(user, load, makeSeriesForCache(user, 10), nil)
+	}
+	store("a")
+	store("b")
+	if _, ok := c.get("a"); !ok {
+		t.Fatal("a missing")
+	}
+	store("c") // over budget: b is least recently used
+	if _, ok := c.get("b"); ok {
+		t.Fatal("b not evicted")
+	}
+	if _, ok := c.get("a"); !ok {
+		t.Fatal("a evicted although recently used")
+	}
+
+	// A write lands while a load is in flight: its result is not cached.
+	load := c.beginLoad("a")
+	c.invalidate("a")
+	c.endLoad("a", load, makeSeriesForCache("a", 10), nil)
+	if _, ok := c.get("a"); ok {
+		t.Fatal("load overlapping an invalidation was cached")
+	}
+
+	clock = clock.Add(2 * time.Hour)
+	if _, ok := c.get("c"); ok {
+		t.Fatal("expired series served")
+	}
+	if st := c.stats(); st.Users != 0 || st.Bytes != 0 || st.Evictions != 1 {
+		t.Fatalf("accounting: %+v", st)
+	}
+}
+
+func TestInvalidateSnapshotUsers_TellsObserversWrittenSpans(t *testing.T) {
+	type call struct {
+		user     string
+		from, to time.Time
+	}
+	var calls []call
+	r := &SnapshotRepo{}
+	r.OnSnapshotsWritten(func(user string, from, to time.Time) {
+		calls = append(calls, call{user, from, to})
+	})
+
+	a := makeSeriesForCache("a", 5)
+	b := makeSeriesForCache("b", 3)
+	r.invalidateSnapshotUsers([]*Snapshot{a[3], a[1], a[4], b[2], b[0]})
+	r.InvalidateSeries("c")
+
+	want := []call{
+		{"a", a[1].Timestamp, a[4].Timestamp},
+		{"b", b[0].Timestamp, b[2].Timestamp},
+		{"c", time.Time{}, time.Time{}},
+	}
+	if len(calls) != len(want) {
+		t.Fatalf("got %d observer calls, want %d: %+v", len(calls), len(want), calls)
+	}
+	for i := range want {
+		if calls[i] != want[i] {
+			t.Fatalf("call %d = %+v, want %+v", i, calls[i], want[i])
+		}
+	}
+}
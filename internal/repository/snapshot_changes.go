@@ -0,0 +1,169 @@
+package repository
+
+import (
+	"context"
+	"crypto/sha256"
+	"encoding/binary"
+	"encoding/json"
+	"fmt"
+	"math/big"
+	"strconv"
+	"time"
+)
+
+// UpsertChangedResult reports what UpsertChanged did.
+type UpsertChangedResult struct {
+	Written int // new days, or days whose content changed
+	Skipped int // days identical to the stored row
+	// FirstWritten is the earliest written day, zero when nothing was
+	// written: derived data must be recomputed from there.
+	FirstWritten time.Time
+}
+
+// UpsertChanged upserts the snapshots of one connection (same user,
+// exchange and label), writing only the days whose content differs from the
+// stored row. Existing rows for the window are loaded in one query and
+// compared by snapshotContentHash; the changed days go through UpsertBatch,
+// so they are written all-or-nothing.
+//
+// Built for the IBKR Flex refresh, which re-sends up to a year of days on
+// every sync although only the last few usually change: before, each day
+// was its own Upsert round trip and JSONB rewrite (and WAL record) whether
+// or not anything had changed.
+func (r *SnapshotRepo) UpsertChanged(ctx context.Context, snapshots []*Snapshot) (UpsertChangedResult, error) {
+	var res UpsertChangedResult
+	if len(snapshots) == 0 {
+		return res, nil
+	}
+	first := snapshots[0]
+	start, end := first.Timestamp, first.Timestamp
+	for _, s := range snapshots[1:] {
+		if s.UserUID != first.UserUID || s.Exchange != first.Exchange || s.Label != first.Label {
+			return res, fmt.Errorf("upsert changed: snapshots span several connections (%s/%s and %s/%s)",
+				first.Exchange, first.Label, s.Exchange, s.Label)
+		}
+		if s.Timestamp.Before(start) {
+			start = s.Timestamp
+		}
+		if s.Timestamp.After(end) {
+			end = s.Timestamp
+		}
+	}
+
+	existing, err := r.getByConnectionAndDateRange(ctx, first.UserUID, first.Exchange, first.Label, start, end)
+	if err != nil {
+		return res, fmt.Errorf("load existing snapshots: %w", err)
+	}
+	// TS rows carry no top-level totals (they are lifted from
+	// breakdown.global on read), so they are not part of the comparison.
+	withTotals := !r.isTSSchema
+	stored := make(map[int64][sha256.Size]byte, len(existing))
+	for _, s := range existing {
+		stored[s.Timestamp.Unix()] = snapshotContentHash(s, withTotals)
+	}
+
+	changed := make([]*Snapshot, 0, len(snapshots))
+	for _, s := range snapshots {
+		if h, ok := stored[s.Timestamp.Unix()]; ok && h == snapshotContentHash(s, withTotals) {
+			res.Skipped++
+			continue
+		}
+		changed = append(changed, s)
+		if res.FirstWritten.IsZero() || s.Timestamp.Before(res.FirstWritten) {
+			res.FirstWritten = s.Timestamp
+		}
+	}
+	if err := r.UpsertBatch(ctx, changed); err != nil {
+		return res, err
+	}
+	res.Written = len(changed)
+	return res, nil
+}
+
+// getByConnectionAndDateRange returns one connection's snapshots within
+// [start, end]. Without a label column the label is ignored.
+func (r *SnapshotRepo) getByConnectionAndDateRange(ctx context.Context, userUID, exchange, label string, start, end time.Time) ([]*Snapshot, error) {
+	hasLabel := r.hasLabelColumn(ctx)
+
+	if r.isTSSchema {
+		rows, err := r.pool.Query(ctx, `
+			SELECT id, "userUid", exchange, label, timestamp,
+				"totalEquity", "realizedBalance", "unrealizedPnL",
+				deposits, withdrawals,
+				breakdown_by_market, "createdAt"
+			FROM snapshot_data
+			WHERE "userUid" = $1 AND exchange = $2 AND label = $3 AND timestamp >= $4 AND timestamp <= $5`,
+			userUID, exchange, label, start, end)
+		if err != nil {
+			return nil, err
+		}
+		defer rows.Close()
+		return r.scanSnapshotsTS(rows)
+	}
+
+	args := []any{userUID, exchange, start, end}
+	if hasLabel {
+		args = append(args, label)
+	}
+	rows, err := r.pool.Query(ctx, r.goReads.byConnectionRange, args...)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+	return r.scanSnapshots(rows, hasLabel)
+}
+
+// snapshotContentHash hashes the stored content of a snapshot: the metric
+// columns and the breakdown. Metric columns are DECIMAL(20, 8), so values
+// are hashed as Postgres stores them (rounded to 8 places) and a freshly
+// built snapshot hashes like the row read back after writing it. The
+// breakdown is hashed through its Go encoding; JSONB does not preserve key
+// order, so the stored bytes could never be compared directly.
+func snapshotContentHash(s *Snapshot, withTotals bool) [sha256.Size]byte {
+	h := sha256.New()
+	writeDecimal := func(f float64) {
+		h.Write([]byte(decimal8(f)))
+		h.Write([]byte{0})
+	}
+	writeDecimal(s.TotalEquity)
+	writeDecimal(s.RealizedBalance)
+	writeDecimal(s.UnrealizedPnL)
+	writeDecimal(s.Deposits)
+	writeDecimal(s.Withdrawals)
+	if withTotals {
+		var n [8]byte
+		binary.BigEndian.PutUint64(n[:], uint64(s.TotalTrades))
+		h.Write(n[:])
+		writeDecimal(s.TotalVolume)
+		writeDecimal(s.TotalFees)
+	}
+	breakdownJSON, _ := json.Marshal(s.Breakdown)
+	h.Write(breakdownJSON)
+
+	var sum [sha256.Size]byte
+	h.Sum(sum[:0])
+	return sum
+}
+
+var decimalScale8 = big.NewRat(100_000_000, 1)
+
+// decimal8 renders f the way a DECIMAL(20, 8) column stores it: pgx sends
+// the shortest decimal representation and Postgres rounds it half away from
+// zero to 8 places.
+func decimal8(f float64) string {
+	r, ok := new(big.Rat).SetString(strconv.FormatFloat(f, 'f', -1, 64))
+	if !ok {
+		return strconv.FormatFloat(f, 'g', -1, 64) // NaN / Inf
+	}
+	r.Mul(r, decimalScale8)
+	q, m := new(big.Int).QuoRem(r.Num(), r.Denom(), new(big.Int))
+	// Round half away from zero: |remainder| * 2 >= denominator.
+	if m.Sign() != 0 && new(big.Int).Lsh(new(big.Int).Abs(m), 1).Cmp(r.Denom()) >= 0 {
+		if r.Sign() < 0 {
+			q.Sub(q, big.NewInt(1))
+		} else {
+			q.Add(q, big.NewInt(1))
+		}
+	}
+	return q.String()
+}
@@ -0,0 +1,82 @@
+package repository
+
+import (
+	"context"
+	"testing"
+	"time"
+)
+
+func TestDecimal8_MatchesNumericRounding(t *testing.T) {
+	cases := map[float64]string{
+		0:                   "0",
+		1:                   "100000000",
+		0.30000000000000004: "30000000",
+		0.000000005:         "1",  // half rounds away from zero
+		-0.000000005:        "-1", // on both sides
+		0.0000000049:        "0",
+		123456.123456789:    "12345612345679",
+	}
+	for f, want := range cases {
+		if got := decimal8(f); got != want {
+			t.Errorf("decimal8(%v) = %s, want %s", f, got, want)
+		}
+	}
+}
+
+func TestSnapshotContentHash_IgnoresSubDecimalNoise(t *testing.T) {
+	day := time.Date(2025, 3, 1, 0, 0, 0, 0, time.UTC)
+	a := &Snapshot{Timestamp: day, TotalEquity: 1000.1, RealizedBalance: 990, Breakdown: &MarketBreakdown{Global: &MarketMetrics{Equity: 1000.1}}}
+	b := *a
+	b.TotalEquity = 1000.1000000000001 // equal once stored as DECIMAL(20, 8)
+	if snapshotContentHash(a, true) != snapshotContentHash(&b, true) {
+		t.Fatal("hash differs for values Postgres stores identically")
+	}
+	b.Deposits = 5
+	if snapshotContentHash(a, true) == snapshotContentHash(&b, true) {
+		t.Fatal("hash ignores a changed deposit")
+	}
+	b = *a
+	b.TotalTrades = 3
+	if snapshotContentHash(a, false) != snapshotContentHash(&b, false) {
+		t.Fatal("TS comparison must ignore the top-level totals")
+	}
+}
+
+func TestSnapshotRepo_UpsertChangedWritesOnlyChangedDays(t *testing.T) {
+	pool := newTestPool(t)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+
+	const user = "__upsert_changed_test__"
+	t.Cleanup(func() {
+		pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = $1`, user)
+	})
+
+	day := time.Date(1999, 1, 1, 0, 0, 0, 0, time.UTC)
+	build := func(equity float64) []*Snapshot {
+		out := make([]*Snapshot, 3)
+		for i := range out {
+			out[i] = &Snapshot{
+				UserUID: user, Exchange: "ibkr", Timestamp: day.AddDate(0, 0, i),
+				TotalEquity: equity + float64(i) + 0.123456789, RealizedBalance: equity,
+				Breakdown: &MarketBreakdown{Global: &MarketMetrics{Equity: equity + float64(i)}},
+			}
+		}
+		return out
+	}
+
+	res, err := repo.UpsertChanged(ctx, build(1000))
+	if err != nil || res.Written != 3 || res.Skipped != 0 {
+		t.Fatalf("first run: %+v, %v", res, err)
+	}
+	res, err = repo.UpsertChanged(ctx, build(1000))
+	if err != nil || res.Written != 0 || res.Skipped != 3 {
+		t.Fatalf("identical run: %+v, %v", res, err)
+	}
+	next := build(1000)
+	next[2].Deposits = 250
+	res, err = repo.UpsertChanged(ctx, next)
+	if err != nil || res.Written != 1 || res.Skipped != 2 {
+		t.Fatalf("one changed day: %+v, %v", res, err)
+	}
+}
@@ -0,0 +1,127 @@
+package repository
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"time"
+
+	"github.com/jackc/pgx/v5"
+)
+
+// snapshotPartitionLockClass namespaces the advisory lock replicas take
+// while creating snapshot_data partitions.
+const snapshotPartitionLockClass = 0x534e5054
+
+// snapshotPartition is one monthly range partition: rows with
+// From <= timestamp < To, in a table named <parent>_YYYY_MM.
+type snapshotPartition struct {
+	Name     string
+	From, To time.Time
+}
+
+// bounds returns the FOR VALUES clause of the partition. The literals carry
+// an explicit UTC offset, so they mean the same instant for timestamptz
+// columns and are read as the UTC wall clock by timestamp ones.
+func (p snapshotPartition) bounds() string {
+	const layout = "2006-01-02 15:04:05+00"
+	return fmt.Sprintf("FOR VALUES FROM ('%s') TO ('%s')", p.From.Format(layout), p.To.Format(layout))
+}
+
+// monthPartitions returns the partitions of parent for months consecutive
+// months, starting with the UTC month of from. Names and bounds match the
+// ones migrations/optional/snapshot_data_partitioned.sql creates.
+func monthPartitions(parent string, from time.Time, months int) []snapshotPartition {
+	from = from.UTC()
+	month := time.Date(from.Year(), from.Month(), 1, 0, 0, 0, 0, time.UTC)
+	out := make([]snapshotPartition, months)
+	for i := range out {
+		next := month.AddDate(0, 1, 0)
+		out[i] = snapshotPartition{
+			Name: fmt.Sprintf("%s_%04d_%02d", parent, month.Year(), int(month.Month())),
+			From: month,
+			To:   next,
+		}
+		month = next
+	}
+	return out
+}
+
+// IsPartitioned reports whether snapshot_data has been converted to a
+// partitioned table (migrations/optional/snapshot_data_partitioned.sql).
+func (r *SnapshotRepo) IsPartitioned(ctx context.Context) (bool, error) {
+	var partitioned bool
+	err := r.pool.QueryRow(ctx, `
+		SELECT EXISTS (
+			SELECT 1 FROM pg_partitioned_table
+			WHERE partrelid = to_regclass('snapshot_data')
+		)`).Scan(&partitioned)
+	return partitioned, err
+}
+
+// EnsurePartitions creates the monthly partitions of a partitioned
+// snapshot_data for the month of now and the monthsAhead months after it,
+// and returns the names of those it created. Rows that already reached the
+// default partition for a new month are moved into it. Safe to run from
+// every replica: creation is serialized by an advisory lock and existing
+// partitions are left alone.
+func (r *SnapshotRepo) EnsurePartitions(ctx context.Context, now time.Time, monthsAhead int) ([]string, error) {
+	tx, err := r.pool.Begin(ctx)
+	if err != nil {
+		return nil, err
+	}
+	defer tx.Rollback(ctx)
+
+	if _, err := tx.Exec(ctx, `SELECT pg_advisory_xact_lock($1, 0)`, snapshotPartitionLockClass); err != nil {
+		return nil, fmt.Errorf("lock partitions: %w", err)
+	}
+
+	var defaultPartition string
+	err = tx.QueryRow(ctx, `
+		SELECT c.relname
+		FROM pg_inherits i
+		JOIN pg_class c ON c.oid = i.inhrelid
+		WHERE i.inhparent = 'snapshot_data'::regclass
+		  AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT'`).Scan(&defaultPartition)
+	if err != nil && !errors.Is(err, pgx.ErrNoRows) {
+		return nil, fmt.Errorf("find default partition: %w", err)
+	}
+
+	var created []string
+	for _, p := range monthPartitions("snapshot_data", now, monthsAhead+1) {
+		var exists bool
+		if err := tx.QueryRow(ctx, `
+			SELECT EXISTS (SELECT 1 FROM pg_class WHERE relname = $1 AND pg_table_is_visible(oid))`, p.Name).Scan(&exists); err != nil {
+			return nil, fmt.Errorf("check partition %s: %w", p.Name, err)
+		}
+		if exists {
+			continue
+		}
+
+		// Create standalone and attach: a default partition holding rows
+		// of the range would make CREATE … PARTITION OF fail.
+		name := pgx.Identifier{p.Name}.Sanitize()
+		if _, err := tx.Exec(ctx, fmt.Sprintf(`CREATE TABLE %s (LIKE snapshot_data INCLUDING DEFAULTS)`, name)); err != nil {
+			return nil, fmt.Errorf("create partition %s: %w", p.Name, err)
+		}
+		if defaultPartition != "" {
+			move := fmt.Sprintf(`
+				WITH moved AS (
+					DELETE FROM %s WHERE timestamp >= $1 AND timestamp < $2 RETURNING *
+				)
+				INSERT INTO %s SELECT * FROM moved`,
+				pgx.Identifier{defaultPartition}.Sanitize(), name)
+			if _, err := tx.Exec(ctx, move, p.From, p.To); err != nil {
+				return nil, fmt.Errorf("move default rows to %s: %w", p.Name, err)
+			}
+		}
+		if _, err := tx.Exec(ctx, fmt.Sprintf(`ALTER TABLE snapshot_data ATTACH PARTITION %s %s`, name, p.bounds())); err != nil {
+			return nil, fmt.Errorf("attach partition %s: %w", p.Name, err)
+		}
+		created = append(created, p.Name)
+	}
+	if err := tx.Commit(ctx); err != nil {
+		return nil, err
+	}
+	return created, nil
+}
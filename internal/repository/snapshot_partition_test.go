@@ -0,0 +1,28 @@
+package repository
+
+import (
+	"testing"
+	"time"
+)
+
+func TestMonthPartitions_CrossYearUTCBounds(t *testing.T) {
+	// 23:30 on Nov 30 in UTC-5 is already December in UTC.
+	from := time.Date(2025, 11, 30, 23, 30, 0, 0, time.FixedZone("EST", -5*3600))
+	parts := monthPartitions("snapshot_data", from, 3)
+
+	want := []string{"snapshot_data_2025_12", "snapshot_data_2026_01", "snapshot_data_2026_02"}
+	if len(parts) != len(want) {
+		t.Fatalf("got %d partitions, want %d", len(parts), len(want))
+	}
+	for i, p := range parts {
+		if p.Name != want[i] {
+			t.Fatalf("partition %d = %s, want %s", i, p.Name, want[i])
+		}
+		if i > 0 && !p.From.Equal(parts[i-1].To) {
+			t.Fatalf("gap between %s and %s", parts[i-1].Name, p.Name)
+		}
+	}
+	if got := parts[1].bounds(); got != "FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00')" {
+		t.Fatalf("bounds = %s", got)
+	}
+}
@@ -0,0 +1,421 @@
+package repository
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"strings"
+	"time"
+
+	"github.com/jackc/pgx/v5"
+)
+
+// SnapshotProjection selects what GetSeriesByUserAndDateRange loads.
+type SnapshotProjection int
+
+const (
+	// ProjectEquity loads the connection (UserUID, Exchange, Label), the
+	// timestamp, TotalEquity, Deposits and Withdrawals, and leaves every
+	// other field zero. It is what the TWR conversion and the performance
+	// metrics read, without the breakdown_by_market JSONB.
+	ProjectEquity SnapshotProjection = iota + 1
+	// ProjectBreakdown loads every column but keeps breakdown_by_market
+	// undecoded until LoadBreakdown is called, so rows the caller filters
+	// out never pay for the JSON decode.
+	ProjectBreakdown
+)
+
+// snapshotSlab is how many snapshots a series read allocates at a time.
+const snapshotSlab = 256
+
+// GetSeriesByUserAndDateRange returns a user's snapshots within a date range,
+// ordered by timestamp, loading only what proj selects (PERF-010). For a
+// multi-year, multi-connection history GetByUserAndDateRange spends most of
+// its time decoding every breakdown into eleven *MarketMetrics; the metric
+// and report paths need none of them.
+//
+// With the series cache enabled (SetSeriesCache) the range is served from
+// the user's cached, fully decoded history whatever the projection, and the
+// returned snapshots must not be modified.
+func (r *SnapshotRepo) GetSeriesByUserAndDateRange(ctx context.Context, userUID string, start, end time.Time, proj SnapshotProjection) ([]*Snapshot, error) {
+	if r.seriesCache != nil {
+		return r.cachedSeriesRange(ctx, userUID, start, end)
+	}
+	return r.querySeries(ctx, userUID, start, end, proj)
+}
+
+// GetSeriesByUserAndDateRangeUncached is GetSeriesByUserAndDateRange read
+// from the database even with the series cache enabled, for callers that
+// must see every committed snapshot: the cache does not see other
+// replicas' writes until its TTL runs out.
+func (r *SnapshotRepo) GetSeriesByUserAndDateRangeUncached(ctx context.Context, userUID string, start, end time.Time, proj SnapshotProjection) ([]*Snapshot, error) {
+	return r.querySeries(ctx, userUID, start, end, proj)
+}
+
+func (r *SnapshotRepo) querySeries(ctx context.Context, userUID string, start, end time.Time, proj SnapshotProjection) ([]*Snapshot, error) {
+	hasLabel := r.hasLabelColumn(ctx)
+
+	var query string
+	switch {
+	case proj == ProjectEquity && r.isTSSchema:
+		query = snapshotEquityByUserRangeTS
+	case proj == ProjectEquity:
+		query = r.goReads.equityByUserRange
+	case r.isTSSchema:
+		query = snapshotByUserRangeTS
+	default:
+		query = r.goReads.byUserRange
+	}
+
+	rows, err := r.pool.Query(ctx, query, userUID, start, end)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	return scanSnapshotSeries(rows, proj, hasLabel, r.isTSSchema)
+}
+
+const snapshotEquityByUserRangeTS = `
+		SELECT "userUid", exchange, label, timestamp, "totalEquity", deposits, withdrawals
+		FROM snapshot_data
+		WHERE "userUid" = $1 AND timestamp >= $2 AND timestamp <= $3
+		ORDER BY timestamp`
+
+// scanSnapshotSeries scans a projected read. Snapshots are carved out of
+// slabs rather than allocated one by one.
+func scanSnapshotSeries(rows pgx.Rows, proj SnapshotProjection, hasLabel, tsSchema bool) ([]*Snapshot, error) {
+	var (
+		snapshots []*Snapshot
+		slab      []Snapshot
+		dest      []any
+	)
+	for rows.Next() {
+		if len(slab) == 0 {
+			slab = make([]Snapshot, snapshotSlab)
+		}
+		s := &slab[0]
+		slab = slab[1:]
+
+		dest = dest[:0]
+		if proj == ProjectEquity {
+			dest = append(dest, &s.UserUID, &s.Exchange)
+			if hasLabel {
+				dest = append(dest, &s.Label)
+			}
+			dest = append(dest, &s.Timestamp, &s.TotalEquity, &s.Deposits, &s.Withdrawals)
+		} else {
+			dest = append(dest, &s.ID, &s.UserUID, &s.Exchange)
+			if hasLabel {
+				dest = append(dest, &s.Label)
+			}
+			dest = append(dest, &s.Timestamp,
+				&s.TotalEquity, &s.RealizedBalance, &s.UnrealizedPnL,
+				&s.Deposits, &s.Withdrawals)
+			if !tsSchema {
+				dest = append(dest, &s.TotalTrades, &s.TotalVolume, &s.TotalFees)
+			}
+			dest = append(dest, &s.rawBreakdown, &s.CreatedAt)
+			s.tsTotals = tsSchema
+		}
+		if err := rows.Scan(dest...); err != nil {
+			return nil, err
+		}
+		snapshots = append(snapshots, s)
+	}
+	return snapshots, rows.Err()
+}
+
+// LoadBreakdown returns the market breakdown, decoding it on the first call
+// for snapshots read with ProjectBreakdown; for any other snapshot it
+// returns Breakdown as is. On the TS schema the decode also fills the
+// top-level totals from breakdown.global, as scanSnapshotsTS does. Not safe
+// for concurrent use on the same snapshot.
+func (s *Snapshot) LoadBreakdown() *MarketBreakdown {
+	if s.rawBreakdown == nil {
+		return s.Breakdown
+	}
+	raw := s.rawBreakdown
+	s.rawBreakdown = nil
+	if err := json.Unmarshal(raw, &s.Breakdown); err == nil && s.tsTotals {
+		liftTSTotals(s)
+	}
+	return s.Breakdown
+}
+
+// liftTSTotals fills the totals the TS schema has no columns for from
+// breakdown.global; they stay zero when it is missing.
+func liftTSTotals(s *Snapshot) {
+	if s.Breakdown == nil || s.Breakdown.Global == nil {
+		return
+	}
+	g := s.Breakdown.Global
+	s.TotalTrades = g.Trades
+	s.TotalVolume = g.Volume
+	s.TotalFees = g.TradingFees + g.FundingFees
+}
+
+// ScanSeriesPages reads a user's ProjectBreakdown series within [start, end]
+// and calls fn with each page of at most pageSize time-sorted snapshots
+// (PERF-015). Pages are keyset-paginated on (timestamp, id), so a long
+// history is never held in memory at once; fn runs between pages, not
+// while a page's rows are open.
+//
+// With the series cache enabled, pages are cut from the user's cached
+// series and must not be modified.
+func (r *SnapshotRepo) ScanSeriesPages(
+	ctx context.Context,
+	userUID string,
+	start, end time.Time,
+	pageSize int,
+	fn func(snapshots []*Snapshot) error,
+) error {
+	if pageSize <= 0 {
+		return fmt.Errorf("page size must be positive, got %d", pageSize)
+	}
+
+	if r.seriesCache != nil {
+		series, err := r.cachedSeriesRange(ctx, userUID, start, end)
+		if err != nil {
+			return err
+		}
+		for len(series) > 0 {
+			page := series[:min(pageSize, len(series))]
+			series = series[len(page):]
+			if err := fn(page); err != nil {
+				return err
+			}
+		}
+		return nil
+	}
+
+	hasLabel := r.hasLabelColumn(ctx)
+	first, next := r.goReads.byUserRangePage, r.goReads.byUserRangeAfter
+	if r.isTSSchema {
+		first, next = snapshotByUserRangePageTS, snapshotByUserRangeAfterTS
+	}
+
+	var last *Snapshot
+	for {
+		var (
+			rows pgx.Rows
+			err  error
+		)
+		if last == nil {
+			rows, err = r.pool.Query(ctx, first, userUID, start, end, pageSize)
+		} else {
+			rows, err = r.pool.Query(ctx, next, userUID, start, end, pageSize, last.Timestamp, last.ID)
+		}
+		if err != nil {
+			return err
+		}
+		page, err := scanSnapshotSeries(rows, ProjectBreakdown, hasLabel, r.isTSSchema)
+		rows.Close()
+		if err != nil {
+			return err
+		}
+
+		if len(page) > 0 {
+			if err := fn(page); err != nil {
+				return err
+			}
+		}
+		if len(page) < pageSize {
+			return nil
+		}
+		last = page[len(page)-1]
+	}
+}
+
+const (
+	snapshotByUserRangePageTS = `
+		SELECT id, "userUid", exchange, label, timestamp,
+			"totalEquity", "realizedBalance", "unrealizedPnL",
+			deposits, withdrawals,
+			breakdown_by_market, "createdAt"
+		FROM snapshot_data
+		WHERE "userUid" = $1 AND timestamp >= $2 AND timestamp <= $3
+		ORDER BY timestamp, id
+		LIMIT $4`
+	snapshotByUserRangeAfterTS = `
+		SELECT id, "userUid", exchange, label, timestamp,
+			"totalEquity", "realizedBalance", "unrealizedPnL",
+			deposits, withdrawals,
+			breakdown_by_market, "createdAt"
+		FROM snapshot_data
+		WHERE "userUid" = $1 AND timestamp >= $2 AND timestamp <= $3 AND (timestamp, id) > ($5, $6)
+		ORDER BY timestamp, id
+		LIMIT $4`
+)
+
+// DefaultBulkSeriesPageSize is the page size ScanSeriesByUsers uses when
+// given 0.
+const DefaultBulkSeriesPageSize = 20000
+
+// ScanSeriesByUsers reads the ProjectEquity series of several users within
+// [start, end] and calls fn once per user that has snapshots, with the
+// user's time-sorted snapshots, in user_uid order. Instead of one query per
+// user, the rows of every user are read in keyset-paginated pages of
+// pageSize rows ordered by (user_uid, timestamp, id); a user's series may
+// span pages and is handed to fn once complete. fn runs between pages, not
+// while a page's rows are open.
+//
+// With the series cache enabled, users whose history is cached are served
+// from it (as GetSeriesByUserAndDateRange would) and left out of the query,
+// after the queried users.
+func (r *SnapshotRepo) ScanSeriesByUsers(
+	ctx context.Context,
+	userUIDs []string,
+	start, end time.Time,
+	pageSize int,
+	fn func(userUID string, snapshots []*Snapshot) error,
+) error {
+	if pageSize <= 0 {
+		pageSize = DefaultBulkSeriesPageSize
+	}
+
+	query := userUIDs
+	var cached []string
+	if c := r.seriesCache; c != nil {
+		query = make([]string, 0, len(userUIDs))
+		for _, uid := range userUIDs {
+			if _, ok := c.get(uid); ok {
+				cached = append(cached, uid)
+			} else {
+				query = append(query, uid)
+			}
+		}
+	}
+
+	if len(query) > 0 {
+		if err := r.scanSeriesPages(ctx, query, start, end, pageSize, fn); err != nil {
+			return err
+		}
+	}
+	for _, uid := range cached {
+		series, err := r.cachedSeriesRange(ctx, uid, start, end)
+		if err != nil {
+			return err
+		}
+		if len(series) > 0 {
+			if err := fn(uid, series); err != nil {
+				return err
+			}
+		}
+	}
+	return nil
+}
+
+func (r *SnapshotRepo) scanSeriesPages(
+	ctx context.Context,
+	userUIDs []string,
+	start, end time.Time,
+	pageSize int,
+	fn func(userUID string, snapshots []*Snapshot) error,
+) error {
+	hasLabel := r.hasLabelColumn(ctx)
+	first, next := equityByUsersQueries(r.isTSSchema, hasLabel)
+
+	type userSeries struct {
+		userUID   string
+		snapshots []*Snapshot
+	}
+	var (
+		current  userSeries // the user the last page ended in
+		lastID   string
+		haveLast bool
+	)
+	for {
+		var (
+			rows pgx.Rows
+			err  error
+		)
+		if !haveLast {
+			rows, err = r.pool.Query(ctx, first, userUIDs, start, end, pageSize)
+		} else {
+			last := current.snapshots[len(current.snapshots)-1]
+			rows, err = r.pool.Query(ctx, next, userUIDs, start, end, pageSize, current.userUID, last.Timestamp, lastID)
+		}
+		if err != nil {
+			return err
+		}
+
+		var (
+			done []userSeries
+			n    int
+			slab []Snapshot
+		)
+		for rows.Next() {
+			if len(slab) == 0 {
+				slab = make([]Snapshot, snapshotSlab)
+			}
+			s := &slab[0]
+			slab = slab[1:]
+
+			dest := []any{&lastID, &s.UserUID, &s.Exchange}
+			if hasLabel {
+				dest = append(dest, &s.Label)
+			}
+			dest = append(dest, &s.Timestamp, &s.TotalEquity, &s.Deposits, &s.Withdrawals)
+			if err := rows.Scan(dest...); err != nil {
+				rows.Close()
+				return err
+			}
+			if s.UserUID != current.userUID {
+				if len(current.snapshots) > 0 {
+					done = append(done, current)
+				}
+				current = userSeries{userUID: s.UserUID}
+			}
+			current.snapshots = append(current.snapshots, s)
+			n++
+		}
+		rows.Close()
+		if err := rows.Err(); err != nil {
+			return err
+		}
+
+		if n < pageSize && len(current.snapshots) > 0 {
+			done = append(done, current)
+		}
+		for _, u := range done {
+			if err := fn(u.userUID, u.snapshots); err != nil {
+				return err
+			}
+		}
+		if n < pageSize {
+			return nil
+		}
+		haveLast = true
+	}
+}
+
+// equityByUsersQueries returns the first-page and next-page queries of
+// ScanSeriesByUsers. $1 users, $2 start, $3 end, $4 page size; the next
+// page continues after the row ($5 user, $6 timestamp, $7 id).
+func equityByUsersQueries(tsSchema, hasLabel bool) (first, next string) {
+	cols := "id, user_uid, exchange, timestamp, total_equity, deposits, withdrawals"
+	key := "(user_uid, timestamp, id)"
+	where := "user_uid = ANY($1) AND timestamp >= $2 AND timestamp <= $3"
+	switch {
+	case tsSchema:
+		cols = `id, "userUid", exchange, label, timestamp, "totalEquity", deposits, withdrawals`
+		key = `("userUid", timestamp, id)`
+		where = `"userUid" = ANY($1) AND timestamp >= $2 AND timestamp <= $3`
+	case hasLabel:
+		cols = "id, user_uid, exchange, label, timestamp, total_equity, deposits, withdrawals"
+	}
+	first = fmt.Sprintf(`
+		SELECT %s
+		FROM snapshot_data
+		WHERE %s
+		ORDER BY %s
+		LIMIT $4`, cols, where, strings.Trim(key, "()"))
+	next = fmt.Sprintf(`
+		SELECT %s
+		FROM snapshot_data
+		WHERE %s AND %s > ($5, $6, $7)
+		ORDER BY %s
+		LIMIT $4`, cols, where, key, strings.Trim(key, "()"))
+	return first, next
+}
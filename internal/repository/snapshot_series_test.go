@@ -0,0 +1,204 @@
+package repository
+
+import (
+	"context"
+	"testing"
+	"time"
+)
+
+func TestSnapshot_LoadBreakdownDecodesOnce(t *testing.T) {
+	s := &Snapshot{
+		rawBreakdown: []byte(`{"spot":{"volume":10,"trades":2,"trading_fees":0.5,"funding_fees":0},"global":{"volume":30,"trades":4,"trading_fees":1,"funding_fees":0.25}}`),
+		tsTotals:     true,
+	}
+	b := s.LoadBreakdown()
+	if b == nil || b.Spot == nil || b.Spot.Trades != 2 {
+		t.Fatalf("breakdown not decoded: %+v", b)
+	}
+	if s.TotalTrades != 4 || s.TotalVolume != 30 || s.TotalFees != 1.25 {
+		t.Fatalf("TS totals not lifted from global: %+v", s)
+	}
+	if s.rawBreakdown != nil || s.LoadBreakdown() != b {
+		t.Fatal("breakdown decoded twice")
+	}
+
+	plain := &Snapshot{Breakdown: &MarketBreakdown{}}
+	if plain.LoadBreakdown() != plain.Breakdown {
+		t.Fatal("eagerly decoded breakdown not returned as is")
+	}
+}
+
+func TestSnapshotRepo_SeriesProjectionsMatchFullRead(t *testing.T) {
+	pool := newTestPool(t)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+
+	const user = "__series_projection_test__"
+	t.Cleanup(func() {
+		pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = $1`, user)
+	})
+	snaps := makeSnapshotsForBatch(user, 30)
+	if err := repo.UpsertBatch(ctx, snaps); err != nil {
+		t.Fatal(err)
+	}
+	start, end := snaps[0].Timestamp, snaps[len(snaps)-1].Timestamp
+
+	full, err := repo.GetByUserAndDateRange(ctx, user, start, end)
+	if err != nil {
+		t.Fatal(err)
+	}
+	equity, err := repo.GetSeriesByUserAndDateRange(ctx, user, start, end, ProjectEquity)
+	if err != nil {
+		t.Fatal(err)
+	}
+	lazy, err := repo.GetSeriesByUserAndDateRange(ctx, user, start, end, ProjectBreakdown)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(equity) != len(full) || len(lazy) != len(full) {
+		t.Fatalf("rows: full %d, equity %d, breakdown %d", len(full), len(equity), len(lazy))
+	}
+	for i, f := range full {
+		e, l := equity[i], lazy[i]
+		if !e.Timestamp.Equal(f.Timestamp) || e.Exchange != f.Exchange || e.Label != f.Label ||
+			e.TotalEquity != f.TotalEquity || e.Deposits != f.Deposits || e.Withdrawals != f.Withdrawals {
+			t.Fatalf("row %d: equity projection %+v differs from %+v", i, e, f)
+		}
+		if e.Breakdown != nil || e.RealizedBalance != 0 {
+			t.Fatalf("row %d: equity projection loaded unselected fields", i)
+		}
+		if l.Breakdown != nil {
+			t.Fatalf("row %d: breakdown decoded before LoadBreakdown", i)
+		}
+		if l.LoadBreakdown().Global.Equity != f.Breakdown.Global.Equity || l.TotalTrades != f.TotalTrades {
+			t.Fatalf("row %d: lazy breakdown differs from the full read", i)
+		}
+	}
+}
+
+func TestSnapshotRepo_ScanSeriesByUsersMatchesPerUserReads(t *testing.T) {
+	pool := newTestPool(t)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+
+	users := []string{"__bulk_series_test_a__", "__bulk_series_test_b__", "__bulk_series_test_c__"}
+	t.Cleanup(func() {
+		pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = ANY($1)`, users)
+	})
+	for i, user := range users[:2] {
+		if err := repo.UpsertBatch(ctx, makeSnapshotsForBatch(user, 20+i*7)); err != nil {
+			t.Fatal(err)
+		}
+	}
+	start, end := time.Time{}, time.Date(9999, 1, 1, 0, 0, 0, 0, time.UTC)
+
+	// A page size that splits both users' series across pages.
+	var got []string
+	err := repo.ScanSeriesByUsers(ctx, users, start, end, 6, func(user string, snapshots []*Snapshot) error {
+		got = append(got, user)
+		want, err := repo.GetSeriesByUserAndDateRange(ctx, user, start, end, ProjectEquity)
+		if err != nil {
+			return err
+		}
+		if len(snapshots) != len(want) {
+			t.Fatalf("%s: %d snapshots, want %d", user, len(snapshots), len(want))
+		}
+		for i := range want {
+			if !snapshots[i].Timestamp.Equal(want[i].Timestamp) || snapshots[i].Exchange != want[i].Exchange ||
+				snapshots[i].TotalEquity != want[i].TotalEquity {
+				t.Fatalf("%s row %d: %+v, want %+v", user, i, snapshots[i], want[i])
+			}
+		}
+		return nil
+	})
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(got) != 2 || got[0] != users[0] || got[1] != users[1] {
+		t.Fatalf("users scanned %v, want %v", got, users[:2])
+	}
+}
+
+func TestSnapshotRepo_ScanSeriesPagesMatchesRangeRead(t *testing.T) {
+	pool := newTestPool(t)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+
+	const user = "__series_pages_test__"
+	t.Cleanup(func() {
+		pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = $1`, user)
+	})
+	if err := repo.UpsertBatch(ctx, makeSnapshotsForBatch(user, 23)); err != nil {
+		t.Fatal(err)
+	}
+	start, end := time.Time{}, time.Date(9999, 1, 1, 0, 0, 0, 0, time.UTC)
+
+	want, err := repo.GetSeriesByUserAndDateRange(ctx, user, start, end, ProjectBreakdown)
+	if err != nil {
+		t.Fatal(err)
+	}
+	var got []*Snapshot
+	pages := 0
+	err = repo.ScanSeriesPages(ctx, user, start, end, 5, func(page []*Snapshot) error {
+		if len(page) > 5 {
+			t.Fatalf("page of %d snapshots, want at most 5", len(page))
+		}
+		pages++
+		got = append(got, page...)
+		return nil
+	})
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(got) != len(want) || pages != (len(want)+4)/5 {
+		t.Fatalf("%d snapshots in %d pages, want %d", len(got), pages, len(want))
+	}
+	for i := range want {
+		if got[i].ID != want[i].ID || !got[i].Timestamp.Equal(want[i].Timestamp) || got[i].TotalEquity != want[i].TotalEquity {
+			t.Fatalf("row %d: %+v, want %+v", i, got[i], want[i])
+		}
+	}
+}
+
+func TestSnapshotRepo_GetLatestByConnectionsMatchesPerConnectionReads(t *testing.T) {
+	pool := newTestPool(t)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+
+	const user = "__latest_by_connections_test__"
+	t.Cleanup(func() {
+		pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = $1`, user)
+	})
+	snaps := makeSnapshotsForBatch(user, 12)
+	for i, s := range makeSnapshotsForBatch(user, 5) {
+		s.Label = "alt"
+		s.TotalEquity = 500 + float64(i)
+		snaps = append(snaps, s)
+	}
+	if err := repo.UpsertBatch(ctx, snaps); err != nil {
+		t.Fatal(err)
+	}
+
+	connections := []*ExchangeConnection{
+		{Exchange: "ibkr", Label: "main"},
+		{Exchange: "ibkr", Label: "alt"},
+		{Exchange: "ibkr", Label: "no-snapshots"},
+	}
+	got, err := repo.GetLatestByConnections(ctx, user, connections)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(got) != 2 {
+		t.Fatalf("%d snapshots, want one per connection with snapshots", len(got))
+	}
+	for _, s := range got {
+		want, err := repo.GetLatestByUserExchangeLabel(ctx, user, s.Exchange, s.Label)
+		if err != nil {
+			t.Fatal(err)
+		}
+		if !s.Timestamp.Equal(want.Timestamp) || s.TotalEquity != want.TotalEquity ||
+			s.RealizedBalance != want.RealizedBalance || s.TotalTrades != want.TotalTrades || s.TotalFees != want.TotalFees {
+			t.Fatalf("%s/%s: %+v, want %+v", s.Exchange, s.Label, s, want)
+		}
+	}
+}
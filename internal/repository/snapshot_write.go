@@ -0,0 +1,241 @@
+package repository
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"strings"
+	"time"
+
+	"github.com/jackc/pgx/v5"
+)
+
+// PERF-009: one description per snapshot_data schema variant, from which the
+// INSERT … ON CONFLICT used by Upsert and UpsertBatch and the COPY staging
+// merge are all generated. The TS / Go-with-label / Go-without-label SQL used
+// to be pasted into each write path.
+type snapshotWriteSpec struct {
+	cols  []string // unquoted, in argument order
+	tsIDs bool     // TS Prisma: client-side CUID id and updatedAt
+	label bool
+
+	upsertSQL string // INSERT … VALUES ($1, …) ON CONFLICT … DO UPDATE
+	stageSQL  string // CREATE TEMP TABLE snapshot_upsert_stage …
+	mergeSQL  string // INSERT … SELECT FROM snapshot_upsert_stage ON CONFLICT …
+}
+
+var (
+	snapshotWriteTS = newSnapshotWriteSpec(true,
+		[]string{"id", "userUid", "exchange", "label", "timestamp",
+			"totalEquity", "realizedBalance", "unrealizedPnL", "deposits", "withdrawals",
+			"breakdown_by_market", "createdAt", "updatedAt"},
+		[]string{"userUid", "exchange", "label", "timestamp"},
+		[]string{"totalEquity", "realizedBalance", "unrealizedPnL", "deposits", "withdrawals",
+			"breakdown_by_market", "updatedAt"},
+	)
+	snapshotWriteWithLabel = newSnapshotWriteSpec(false,
+		[]string{"user_uid", "exchange", "label", "timestamp",
+			"total_equity", "realized_balance", "unrealized_pnl", "deposits", "withdrawals",
+			"total_trades", "total_volume", "total_fees", "breakdown_by_market", "created_at"},
+		[]string{"user_uid", "exchange", "label", "timestamp"},
+		snapshotUpdateColsGo,
+	)
+	snapshotWriteBase = newSnapshotWriteSpec(false,
+		[]string{"user_uid", "exchange", "timestamp",
+			"total_equity", "realized_balance", "unrealized_pnl", "deposits", "withdrawals",
+			"total_trades", "total_volume", "total_fees", "breakdown_by_market", "created_at"},
+		[]string{"user_uid", "exchange", "timestamp"},
+		snapshotUpdateColsGo,
+	)
+)
+
+var snapshotUpdateColsGo = []string{"total_equity", "realized_balance", "unrealized_pnl",
+	"deposits", "withdrawals", "total_trades", "total_volume", "total_fees", "breakdown_by_market"}
+
+func newSnapshotWriteSpec(tsIDs bool, cols, conflict, update []string) *snapshotWriteSpec {
+	quote := func(names []string) string {
+		q := make([]string, len(names))
+		for i, n := range names {
+			q[i] = pgx.Identifier{n}.Sanitize()
+		}
+		return strings.Join(q, ", ")
+	}
+	sets := make([]string, len(update))
+	for i, c := range update {
+		q := pgx.Identifier{c}.Sanitize()
+		sets[i] = q + " = EXCLUDED." + q
+	}
+	placeholders := make([]string, len(cols))
+	for i := range cols {
+		placeholders[i] = fmt.Sprintf("$%d", i+1)
+	}
+	colList, conflictList := quote(cols), quote(conflict)
+	onConflict := fmt.Sprintf("ON CONFLICT (%s) DO UPDATE SET %s", conflictList, strings.Join(sets, ", "))
+
+	hasLabel := false
+	for _, c := range cols {
+		hasLabel = hasLabel || c == "label"
+	}
+
+	return &snapshotWriteSpec{
+		cols:  cols,
+		tsIDs: tsIDs,
+		label: hasLabel,
+		upsertSQL: fmt.Sprintf("INSERT INTO snapshot_data (%s) VALUES (%s) %s",
+			colList, strings.Join(placeholders, ", "), onConflict),
+		// Same column types as snapshot_data, none of its constraints.
+		stageSQL: fmt.Sprintf(`CREATE TEMP TABLE snapshot_upsert_stage ON COMMIT DROP AS
+			SELECT %s, 0 AS batch_seq FROM snapshot_data WITH NO DATA`, colList),
+		// A key repeated in one batch would make ON CONFLICT touch the same
+		// row twice, which Postgres rejects; keep the last occurrence, as
+		// the per-row path did.
+		mergeSQL: fmt.Sprintf(`INSERT INTO snapshot_data (%[1]s)
+			SELECT DISTINCT ON (%[2]s) %[1]s FROM snapshot_upsert_stage
+			ORDER BY %[2]s, batch_seq DESC
+			%[3]s`, colList, conflictList, onConflict),
+	}
+}
+
+// args returns s's values in cols order.
+func (w *snapshotWriteSpec) args(s *Snapshot, now time.Time) ([]any, error) {
+	breakdownJSON, err := json.Marshal(s.Breakdown)
+	if err != nil {
+		return nil, fmt.Errorf("marshal breakdown: %w", err)
+	}
+	if w.tsIDs {
+		return []any{generateCUID(),
+			s.UserUID, s.Exchange, s.Label, s.Timestamp,
+			s.TotalEquity, s.RealizedBalance, s.UnrealizedPnL, s.Deposits, s.Withdrawals,
+			breakdownJSON, now, now,
+		}, nil
+	}
+	args := make([]any, 0, len(w.cols))
+	args = append(args, s.UserUID, s.Exchange)
+	if w.label {
+		args = append(args, s.Label)
+	}
+	return append(args, s.Timestamp,
+		s.TotalEquity, s.RealizedBalance, s.UnrealizedPnL, s.Deposits, s.Withdrawals,
+		s.TotalTrades, s.TotalVolume, s.TotalFees, breakdownJSON, now,
+	), nil
+}
+
+// writeSpec returns the spec matching the detected schema.
+func (r *SnapshotRepo) writeSpec(ctx context.Context) *snapshotWriteSpec {
+	hasLabel := r.hasLabelColumn(ctx)
+	switch {
+	case r.isTSSchema:
+		return snapshotWriteTS
+	case hasLabel:
+		return snapshotWriteWithLabel
+	default:
+		return snapshotWriteBase
+	}
+}
+
+// snapshotCopyThreshold is the batch size from which UpsertBatch stages rows
+// with COPY instead of pipelining one INSERT per row. Below it the temp
+// table's create/drop costs more than it saves (see
+// BenchmarkSnapshotUpsertBatch).
+const snapshotCopyThreshold = 256
+
+// UpsertBatch atomically upserts multiple snapshots in a single transaction.
+// If any snapshot fails, the entire batch is rolled back (TS parity: atomic daily sync).
+func (r *SnapshotRepo) UpsertBatch(ctx context.Context, snapshots []*Snapshot) error {
+	if len(snapshots) == 0 {
+		return nil
+	}
+	tx, err := r.pool.Begin(ctx)
+	if err != nil {
+		return fmt.Errorf("begin tx: %w", err)
+	}
+	defer tx.Rollback(ctx)
+
+	if err := r.UpsertBatchTx(ctx, tx, snapshots); err != nil {
+		return err
+	}
+	err = tx.Commit(ctx)
+	// Again after commit: a series read between UpsertBatchTx's
+	// invalidation and the commit may have cached the old rows.
+	r.invalidateSnapshotUsers(snapshots)
+	return err
+}
+
+// UpsertBatchTx upserts snapshots inside the caller's transaction, for
+// callers that commit other writes atomically with them. Batches below
+// snapshotCopyThreshold are sent as one pipelined pgx.Batch (a single round
+// trip instead of one per row); larger ones are COPYed into a temporary
+// table and merged with one INSERT … ON CONFLICT. When a snapshot repeats a
+// key, the last one wins.
+//
+// The written users' cached series are invalidated before the write; a
+// caller that commits the transaction itself must call InvalidateSeries for
+// them once it has committed.
+func (r *SnapshotRepo) UpsertBatchTx(ctx context.Context, tx pgx.Tx, snapshots []*Snapshot) error {
+	if len(snapshots) == 0 {
+		return nil
+	}
+	r.invalidateSnapshotUsers(snapshots)
+	w := r.writeSpec(ctx)
+	now := time.Now().UTC()
+	if len(snapshots) < snapshotCopyThreshold {
+		return w.pipeline(ctx, tx, snapshots, now)
+	}
+	return w.copyMerge(ctx, tx, snapshots, now)
+}
+
+func (w *snapshotWriteSpec) pipeline(ctx context.Context, tx pgx.Tx, snapshots []*Snapshot, now time.Time) error {
+	batch := &pgx.Batch{}
+	for _, s := range snapshots {
+		args, err := w.args(s, now)
+		if err != nil {
+			return fmt.Errorf("upsert snapshot %s/%s: %w", s.Exchange, s.Label, err)
+		}
+		batch.Queue(w.upsertSQL, args...)
+	}
+	br := tx.SendBatch(ctx, batch)
+	for _, s := range snapshots {
+		if _, err := br.Exec(); err != nil {
+			br.Close()
+			return fmt.Errorf("upsert snapshot %s/%s: %w", s.Exchange, s.Label, err)
+		}
+	}
+	return br.Close()
+}
+
+func (w *snapshotWriteSpec) copyMerge(ctx context.Context, tx pgx.Tx, snapshots []*Snapshot, now time.Time) error {
+	if _, err := tx.Exec(ctx, w.stageSQL); err != nil {
+		return fmt.Errorf("create snapshot stage: %w", err)
+	}
+	i := 0
+	var rowErr error
+	src := pgx.CopyFromFunc(func() ([]any, error) {
+		if i == len(snapshots) {
+			return nil, nil
+		}
+		s := snapshots[i]
+		args, err := w.args(s, now)
+		if err != nil {
+			rowErr = fmt.Errorf("upsert snapshot %s/%s: %w", s.Exchange, s.Label, err)
+			return nil, rowErr
+		}
+		i++
+		return append(args, i), nil
+	})
+	cols := append(append([]string(nil), w.cols...), "batch_seq")
+	if _, err := tx.CopyFrom(ctx, pgx.Identifier{"snapshot_upsert_stage"}, cols, src); err != nil {
+		if rowErr != nil {
+			return rowErr
+		}
+		return fmt.Errorf("copy snapshots: %w", err)
+	}
+	if _, err := tx.Exec(ctx, w.mergeSQL); err != nil {
+		return fmt.Errorf("merge snapshots: %w", err)
+	}
+	// Dropped at commit anyway; dropping now lets the caller's transaction
+	// run another batch.
+	if _, err := tx.Exec(ctx, `DROP TABLE snapshot_upsert_stage`); err != nil {
+		return fmt.Errorf("drop snapshot stage: %w", err)
+	}
+	return nil
+}
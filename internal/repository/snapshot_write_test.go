@@ -0,0 +1,109 @@
+package repository
+
+import (
+	"context"
+	"fmt"
+	"strings"
+	"testing"
+	"time"
+)
+
+func TestSnapshotWriteSpec_ArgsMatchColumns(t *testing.T) {
+	for name, w := range map[string]*snapshotWriteSpec{
+		"ts": snapshotWriteTS, "label": snapshotWriteWithLabel, "base": snapshotWriteBase,
+	} {
+		args, err := w.args(&Snapshot{Label: "main"}, time.Now())
+		if err != nil {
+			t.Fatal(err)
+		}
+		if len(args) != len(w.cols) {
+			t.Errorf("%s: %d args for %d columns", name, len(args), len(w.cols))
+		}
+		if want := fmt.Sprintf("$%d)", len(w.cols)); !strings.Contains(w.upsertSQL, want) {
+			t.Errorf("%s: placeholders do not end at %s: %s", name, want, w.upsertSQL)
+		}
+	}
+	if !strings.Contains(snapshotWriteTS.upsertSQL, `"updatedAt" = EXCLUDED."updatedAt"`) {
+		t.Errorf("TS upsert does not refresh updatedAt: %s", snapshotWriteTS.upsertSQL)
+	}
+}
+
+// makeSnapshotsForBatch returns n daily snapshots of one connection.
+func makeSnapshotsForBatch(user string, n int) []*Snapshot {
+	day := time.Date(1990, 1, 1, 0, 0, 0, 0, time.UTC)
+	out := make([]*Snapshot, n)
+	for i := range out {
+		out[i] = &Snapshot{
+			UserUID: user, Exchange: "ibkr", Label: "main", Timestamp: day.AddDate(0, 0, i),
+			TotalEquity: 10_000 + float64(i), RealizedBalance: 9_000, Deposits: float64(i % 7),
+			TotalTrades: i, TotalVolume: float64(i) * 12.5,
+			Breakdown: &MarketBreakdown{Global: &MarketMetrics{Equity: 10_000 + float64(i), Trades: i}},
+		}
+	}
+	return out
+}
+
+func TestSnapshotRepo_UpsertBatchPipelineAndCopyAgree(t *testing.T) {
+	pool := newTestPool(t)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+
+	for _, n := range []int{3, snapshotCopyThreshold + 10} {
+		user := fmt.Sprintf("__upsert_batch_test_%d__", n)
+		t.Cleanup(func() {
+			pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = $1`, user)
+		})
+
+		snaps := makeSnapshotsForBatch(user, n)
+		if err := repo.UpsertBatch(ctx, snaps); err != nil {
+			t.Fatalf("n=%d: first write: %v", n, err)
+		}
+		// Rewrite with a repeated key: the later snapshot wins.
+		again := makeSnapshotsForBatch(user, n)
+		dup := *again[0]
+		dup.TotalEquity = 42
+		again = append(again, &dup)
+		if err := repo.UpsertBatch(ctx, again); err != nil {
+			t.Fatalf("n=%d: rewrite: %v", n, err)
+		}
+
+		got, err := repo.getByConnectionAndDateRange(ctx, user, "ibkr", "main", snaps[0].Timestamp, snaps[n-1].Timestamp)
+		if err != nil {
+			t.Fatal(err)
+		}
+		if len(got) != n {
+			t.Fatalf("n=%d: %d rows stored", n, len(got))
+		}
+		for _, s := range got {
+			if s.Timestamp.Equal(snaps[0].Timestamp) && s.TotalEquity != 42 {
+				t.Fatalf("n=%d: repeated key kept equity %v, want the last value 42", n, s.TotalEquity)
+			}
+		}
+	}
+}
+
+func TestSnapshotRepo_UpsertBatchIsAllOrNothing(t *testing.T) {
+	pool := newTestPool(t)
+	ctx := context.Background()
+	repo := NewSnapshotRepo(pool)
+
+	const user = "__upsert_batch_atomic_test__"
+	t.Cleanup(func() {
+		pool.Exec(context.Background(), `DELETE FROM snapshot_data WHERE user_uid = $1`, user)
+	})
+
+	for _, n := range []int{3, snapshotCopyThreshold + 10} {
+		snaps := makeSnapshotsForBatch(user, n)
+		snaps[n-1].TotalEquity = 1e15 // overflows DECIMAL(20, 8)
+		if err := repo.UpsertBatch(ctx, snaps); err == nil {
+			t.Fatalf("n=%d: overflowing batch accepted", n)
+		}
+		var count int
+		if err := pool.QueryRow(ctx, `SELECT count(*) FROM snapshot_data WHERE user_uid = $1`, user).Scan(&count); err != nil {
+			t.Fatal(err)
+		}
+		if count != 0 {
+			t.Fatalf("n=%d: %d rows written by a failed batch", n, count)
+		}
+	}
+}
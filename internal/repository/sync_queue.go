@@ -0,0 +1,207 @@
+package repository
+
+import (
+	"context"
+	"time"
+
+	"github.com/jackc/pgx/v5/pgxpool"
+)
+
+// Work item states for the sharded daily sync queue.
+const (
+	WorkItemPending = "pending"
+	WorkItemClaimed = "claimed"
+	WorkItemDone    = "done"
+	WorkItemFailed  = "failed"
+)
+
+// SyncWorkItem is one user's share of a daily sync run.
+type SyncWorkItem struct {
+	RunDate        time.Time  `json:"run_date"`
+	UserUID        string     `json:"user_uid"`
+	Status         string     `json:"status"`
+	ClaimedBy      string     `json:"claimed_by,omitempty"`
+	LeaseExpiresAt *time.Time `json:"lease_expires_at,omitempty"`
+	Attempts       int        `json:"attempts"`
+}
+
+// SyncQueueRepo is the durable work queue behind the sharded daily sync.
+// Several enclave replicas enqueue the same run idempotently, then claim
+// users with FOR UPDATE SKIP LOCKED so no two replicas sync the same user.
+// Claims are leases: a replica that crashes mid-sync stops renewing, the
+// lease expires and another replica reclaims the item.
+//
+// The table is enclave-owned and schema-agnostic (no TS/Go column split), so
+// EnsureTable creates it on TS/Prisma databases where ApplyMigrations is
+// skipped. Go-schema databases get it from migrations/013_sync_work_items.sql.
+type SyncQueueRepo struct {
+	pool *pgxpool.Pool
+}
+
+// NewSyncQueueRepo creates a new sync work queue repository
+func NewSyncQueueRepo(pool *pgxpool.Pool) *SyncQueueRepo {
+	return &SyncQueueRepo{pool: pool}
+}
+
+// EnsureTable creates sync_work_items if it does not exist yet. Mirrors
+// migrations/013_sync_work_items.sql.
+func (r *SyncQueueRepo) EnsureTable(ctx context.Context) error {
+	const q = `
+		CREATE TABLE IF NOT EXISTS sync_work_items (
+			run_date DATE NOT NULL,
+			user_uid VARCHAR(255) NOT NULL,
+			status VARCHAR(20) NOT NULL DEFAULT 'pending',
+			claimed_by VARCHAR(255),
+			lease_expires_at TIMESTAMPTZ,
+			attempts INTEGER NOT NULL DEFAULT 0,
+			last_error TEXT,
+			created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+			updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+			PRIMARY KEY (run_date, user_uid)
+		);
+		CREATE INDEX IF NOT EXISTS idx_sync_work_items_claimable
+			ON sync_work_items(run_date, status, lease_expires_at)`
+	_, err := r.pool.Exec(ctx, q)
+	return err
+}
+
+// Enqueue inserts one pending item per user for runDate. Idempotent: every
+// replica enqueues the same run at 00:00 UTC and only the first insert per
+// (run_date, user_uid) wins. Returns the number of newly inserted rows.
+func (r *SyncQueueRepo) Enqueue(ctx context.Context, runDate time.Time, userUIDs []string) (int64, error) {
+	if len(userUIDs) == 0 {
+		return 0, nil
+	}
+
+	query := `
+		INSERT INTO sync_work_items (run_date, user_uid, status, created_at, updated_at)
+		SELECT $1::date, uid, 'pending', NOW(), NOW()
+		FROM unnest($2::text[]) AS uid
+		ON CONFLICT (run_date, user_uid) DO NOTHING`
+
+	tag, err := r.pool.Exec(ctx, query, runDay(runDate), userUIDs)
+	if err != nil {
+		return 0, err
+	}
+	return tag.RowsAffected(), nil
+}
+
+// Claim leases up to limit items of runDate to workerID. Claimable items are
+// pending ones and claimed ones whose lease expired (crashed replica), as
+// long as they have been attempted fewer than maxAttempts times. SKIP LOCKED
+// lets concurrent replicas claim disjoint items without blocking each other.
+func (r *SyncQueueRepo) Claim(ctx context.Context, runDate time.Time, workerID string, limit int, lease time.Duration, maxAttempts int) ([]*SyncWorkItem, error) {
+	query := `
+		UPDATE sync_work_items w
+		SET status = 'claimed',
+			claimed_by = $2,
+			lease_expires_at = NOW() + make_interval(secs => $3),
+			attempts = w.attempts + 1,
+			updated_at = NOW()
+		FROM (
+			SELECT run_date, user_uid
+			FROM sync_work_items
+			WHERE run_date = $1::date
+			  AND attempts < $5
+			  AND (status = 'pending' OR (status = 'claimed' AND lease_expires_at < NOW()))
+			ORDER BY attempts, user_uid
+			LIMIT $4
+			FOR UPDATE SKIP LOCKED
+		) c
+		WHERE w.run_date = c.run_date AND w.user_uid = c.user_uid
+		RETURNING w.run_date, w.user_uid, w.status, w.claimed_by, w.lease_expires_at, w.attempts`
+
+	rows, err := r.pool.Query(ctx, query,
+		runDay(runDate), workerID, lease.Seconds(), limit, maxAttempts,
+	)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	var items []*SyncWorkItem
+	for rows.Next() {
+		var it SyncWorkItem
+		var claimedBy *string
+		if err := rows.Scan(&it.RunDate, &it.UserUID, &it.Status, &claimedBy, &it.LeaseExpiresAt, &it.Attempts); err != nil {
+			return nil, err
+		}
+		if claimedBy != nil {
+			it.ClaimedBy = *claimedBy
+		}
+		items = append(items, &it)
+	}
+	return items, rows.Err()
+}
+
+// ExtendLeases renews every lease workerID currently holds on runDate.
+// Called periodically while user syncs are in flight so a slow user (IBKR
+// Flex polling) is not reclaimed by another replica.
+func (r *SyncQueueRepo) ExtendLeases(ctx context.Context, runDate time.Time, workerID string, lease time.Duration) (int64, error) {
+	query := `
+		UPDATE sync_work_items
+		SET lease_expires_at = NOW() + make_interval(secs => $3), updated_at = NOW()
+		WHERE run_date = $1::date AND claimed_by = $2 AND status = 'claimed'`
+
+	tag, err := r.pool.Exec(ctx, query, runDay(runDate), workerID, lease.Seconds())
+	if err != nil {
+		return 0, err
+	}
+	return tag.RowsAffected(), nil
+}
+
+// Complete marks a claimed item done (errMsg empty) or failed. The update is
+// fenced on claimed_by so a replica whose lease was taken over cannot
+// overwrite the new owner's outcome. Returns false when the claim was lost.
+func (r *SyncQueueRepo) Complete(ctx context.Context, runDate time.Time, userUID, workerID, errMsg string) (bool, error) {
+	status := WorkItemDone
+	if errMsg != "" {
+		status = WorkItemFailed
+	}
+
+	query := `
+		UPDATE sync_work_items
+		SET status = $4, last_error = NULLIF($5, ''), lease_expires_at = NULL, updated_at = NOW()
+		WHERE run_date = $1::date AND user_uid = $2 AND claimed_by = $3 AND status = 'claimed'`
+
+	tag, err := r.pool.Exec(ctx, query, runDay(runDate), userUID, workerID, status, errMsg)
+	if err != nil {
+		return false, err
+	}
+	return tag.RowsAffected() == 1, nil
+}
+
+// CountOutstanding returns how many items of runDate are not finished yet:
+// pending, or claimed by any replica (live or expired lease), excluding
+// items that exhausted maxAttempts. Workers keep polling while this is
+// non-zero so items orphaned by a crashed replica are picked up.
+func (r *SyncQueueRepo) CountOutstanding(ctx context.Context, runDate time.Time, maxAttempts int) (int, error) {
+	query := `
+		SELECT COUNT(*)
+		FROM sync_work_items
+		WHERE run_date = $1::date
+		  AND (status = 'pending' OR status = 'claimed')
+		  AND NOT (status = 'claimed' AND lease_expires_at < NOW() AND attempts >= $2)`
+
+	var n int
+	if err := r.pool.QueryRow(ctx, query, runDay(runDate), maxAttempts).Scan(&n); err != nil {
+		return 0, err
+	}
+	return n, nil
+}
+
+// DeleteBefore removes work items of runs older than cutoff.
+func (r *SyncQueueRepo) DeleteBefore(ctx context.Context, cutoff time.Time) (int64, error) {
+	tag, err := r.pool.Exec(ctx, `DELETE FROM sync_work_items WHERE run_date < $1::date`, runDay(cutoff))
+	if err != nil {
+		return 0, err
+	}
+	return tag.RowsAffected(), nil
+}
+
+// runDay normalises a run timestamp to its UTC calendar day, the granularity
+// of sync_work_items.run_date.
+func runDay(t time.Time) time.Time {
+	t = t.UTC()
+	return time.Date(t.Year(), t.Month(), t.Day(), 0, 0, 0, 0, time.UTC)
+}
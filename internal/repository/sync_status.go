@@ -4,10 +4,12 @@ import (
 	"context"
 	"errors"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/jackc/pgx/v5"
 	"github.com/jackc/pgx/v5/pgxpool"
+	"github.com/trackrecord/enclave/internal/db"
 )
 
 // SyncStatus represents the sync state for a user/exchange/label combination
@@ -29,7 +31,7 @@ type SyncStatus struct {
 type SyncStatusRepo struct {
 	pool           *pgxpool.Pool
 	schemaMu       sync.Mutex
-	schemaDetected bool
+	schemaDetected atomic.Bool // set once isTSSchema is final
 	isTSSchema     bool
 }
 
@@ -38,23 +40,35 @@ func NewSyncStatusRepo(pool *pgxpool.Pool) *SyncStatusRepo {
 	return &SyncStatusRepo{pool: pool}
 }
 
+// SetSchema applies a schema descriptor loaded at startup, so no request
+// has to detect the schema itself.
+func (r *SyncStatusRepo) SetSchema(schema *db.Schema) {
+	r.schemaMu.Lock()
+	defer r.schemaMu.Unlock()
+	r.applySchema(schema)
+}
+
+// applySchema records whether sync_statuses uses camelCase (TS) or
+// snake_case (Go). Callers hold schemaMu.
+func (r *SyncStatusRepo) applySchema(schema *db.Schema) {
+	r.isTSSchema = schema.HasColumn("sync_statuses", "userUid")
+	r.schemaDetected.Store(true)
+}
+
 func (r *SyncStatusRepo) detectSchema(ctx context.Context) {
+	if r.schemaDetected.Load() {
+		return
+	}
 	r.schemaMu.Lock()
 	defer r.schemaMu.Unlock()
-	if r.schemaDetected {
+	if r.schemaDetected.Load() {
 		return
 	}
-
-	// Check if sync_statuses uses camelCase (TS) or snake_case (Go)
-	var exists bool
-	r.pool.QueryRow(ctx, `
-		SELECT EXISTS (
-			SELECT 1 FROM information_schema.columns
-			WHERE table_schema = 'public' AND table_name = 'sync_statuses' AND column_name = 'userUid'
-		)`).Scan(&exists)
-
-	r.isTSSchema = exists
-	r.schemaDetected = true
+	schema, err := db.LoadSchema(ctx, r.pool)
+	if err != nil {
+		schema = &db.Schema{}
+	}
+	r.applySchema(schema)
 }
 
 // Upsert creates or updates a sync status
@@ -5,9 +5,11 @@ import (
 	"crypto/sha256"
 	"encoding/hex"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/jackc/pgx/v5/pgxpool"
+	"github.com/trackrecord/enclave/internal/db"
 )
 
 // User represents a user in the system
@@ -26,8 +28,8 @@ type UserRepo struct {
 	pool *pgxpool.Pool
 
 	schemaMu     sync.Mutex
-	schemaLoaded bool
-	isTSSchema   bool // true = TS Prisma camelCase columns
+	schemaLoaded atomic.Bool // set once isTSSchema is final
+	isTSSchema   bool        // true = TS Prisma camelCase columns
 }
 
 // NewUserRepo creates a new user repository
@@ -35,34 +37,37 @@ func NewUserRepo(pool *pgxpool.Pool) *UserRepo {
 	return &UserRepo{pool: pool}
 }
 
-// detectSchema checks once whether the DB uses TS Prisma camelCase columns.
-// Detection: if "createdAt" column exists in users → TS schema.
-func (r *UserRepo) detectSchema(ctx context.Context) bool {
+// SetSchema applies a schema descriptor loaded at startup, so no request
+// has to detect the schema itself.
+func (r *UserRepo) SetSchema(schema *db.Schema) {
 	r.schemaMu.Lock()
 	defer r.schemaMu.Unlock()
+	r.applySchema(schema)
+}
+
+// applySchema records the schema variant. Callers hold schemaMu.
+// Detection: if "createdAt" column exists in users → TS schema.
+func (r *UserRepo) applySchema(schema *db.Schema) {
+	r.isTSSchema = schema.HasColumn("users", "createdAt")
+	r.schemaLoaded.Store(true)
+}
 
-	if r.schemaLoaded {
+// detectSchema reports whether the DB uses TS Prisma camelCase columns,
+// loading the schema once if SetSchema was not called.
+func (r *UserRepo) detectSchema(ctx context.Context) bool {
+	if r.schemaLoaded.Load() {
 		return r.isTSSchema
 	}
 
-	const query = `
-		SELECT EXISTS (
-			SELECT 1
-			FROM information_schema.columns
-			WHERE table_schema = 'public'
-			  AND table_name = 'users'
-			  AND column_name = 'createdAt'
-		)`
-
-	var exists bool
-	if err := r.pool.QueryRow(ctx, query).Scan(&exists); err != nil {
-		r.schemaLoaded = true
-		r.isTSSchema = false
-		return false
+	r.schemaMu.Lock()
+	defer r.schemaMu.Unlock()
+	if !r.schemaLoaded.Load() {
+		schema, err := db.LoadSchema(ctx, r.pool)
+		if err != nil {
+			schema = &db.Schema{}
+		}
+		r.applySchema(schema)
 	}
-
-	r.isTSSchema = exists
-	r.schemaLoaded = true
 	return r.isTSSchema
 }
 
@@ -5,6 +5,8 @@ import (
 	"sync"
 	"time"
 
+	"github.com/trackrecord/enclave/internal/concurrency"
+	"github.com/trackrecord/enclave/internal/connector"
 	"github.com/trackrecord/enclave/internal/repository"
 	"github.com/trackrecord/enclave/internal/service"
 	"go.uber.org/zap"
@@ -17,6 +19,20 @@ type SyncScheduler struct {
 	userRepo *repository.UserRepo
 	logger   *zap.Logger
 
+	// userLimiter caps concurrent user syncs on this process. Starts at 3
+	// (the historical fixed semaphore) and adapts at runtime (AIMD, see
+	// internal/concurrency).
+	userLimiter *concurrency.Limiter
+
+	// queue switches executeDailySync to the sharded multi-replica mode
+	// (see sharded.go). nil = every user is synced by this process.
+	queue     *repository.SyncQueueRepo
+	shardOpts ShardOptions
+
+	// flexPollers sizes the GetStatement poller pool of the batched IBKR
+	// Flex pipeline run ahead of the user syncs (see executeDailySync).
+	flexPollers int
+
 	stopCh chan struct{}
 	wg     sync.WaitGroup
 }
@@ -31,7 +47,28 @@ func NewSyncScheduler(
 		syncSvc:  syncSvc,
 		userRepo: userRepo,
 		logger:   logger,
-		stopCh:   make(chan struct{}),
+		userLimiter: concurrency.New(concurrency.Config{
+			Name:    "scheduler_users",
+			Initial: 3,
+			Min:     1,
+			Max:     12,
+		}),
+		flexPollers: connector.DefaultFlexPollers,
+		stopCh:      make(chan struct{}),
+	}
+}
+
+// UserLimiter exposes the adaptive user-sync limit for metrics and
+// adjustment logging.
+func (s *SyncScheduler) UserLimiter() *concurrency.Limiter {
+	return s.userLimiter
+}
+
+// SetFlexPollers sets how many IBKR Flex GetStatement requests the daily
+// run keeps in flight.
+func (s *SyncScheduler) SetFlexPollers(n int) {
+	if n > 0 {
+		s.flexPollers = n
 	}
 }
 
@@ -82,6 +119,16 @@ func timeUntilMidnightUTC() time.Duration {
 }
 
 func (s *SyncScheduler) executeDailySync() {
+	if s.queue != nil {
+		s.executeShardedSync()
+		return
+	}
+	s.executeLocalSync()
+}
+
+// executeLocalSync syncs every due user from this process alone: the
+// single-process daily run, and every manual RunNow.
+func (s *SyncScheduler) executeLocalSync() {
 	ctx, cancel := context.WithTimeout(context.Background(), 30*time.Minute)
 	defer cancel()
 
@@ -102,64 +149,131 @@ func (s *SyncScheduler) executeDailySync() {
 
 	s.logger.Info("syncing all users", zap.Int("users", len(users)))
 
+	// Request every due IBKR Flex report up front (CONN-009). Users with
+	// IBKR connections wait for their reports before taking a slot, so the
+	// minutes IBKR spends generating them overlap the other users' syncs.
+	// The reports stay cached until every user has synced.
+	uids := make([]string, 0, len(users))
+	for _, u := range users {
+		uids = append(uids, u.UID)
+	}
+	flexReady, releaseFlex := s.syncSvc.PrefetchFlexReports(ctx, uids, now, s.flexPollers)
+	defer releaseFlex()
+
 	var (
-		userSyncedCount int
-		successCount    int
-		failCount       int
-		mu              sync.Mutex
-		wg              sync.WaitGroup
+		tally syncTally
+		wg    sync.WaitGroup
 	)
 
-	sem := make(chan struct{}, 3) // Max 3 concurrent user syncs (CCXT loads ~40MB per connector)
-
 	for _, user := range users {
 		wg.Add(1)
 		go func(u *repository.User) {
 			defer wg.Done()
 
-			sem <- struct{}{}
-			defer func() { <-sem }()
-
-			results, err := s.syncSvc.SyncUserScheduledDueAtomic(ctx, u.UID, now)
-
-			mu.Lock()
-			defer mu.Unlock()
-
-			if err != nil {
-				failCount++
-				s.logger.Error("user sync failed",
+			// On ctx expiry fall through: Acquire fails and reports it.
+			if ready, ok := flexReady[u.UID]; ok {
+				select {
+				case <-ready:
+				case <-ctx.Done():
+				}
+			}
+			if err := s.userLimiter.Acquire(ctx); err != nil {
+				s.logger.Error("user sync not started before deadline",
 					zap.String("user_uid", u.UID),
 					zap.Error(err),
 				)
+				tally.addFailed()
 				return
 			}
-
-			if len(results) > 0 {
-				userSyncedCount++
-			}
-
-			for _, r := range results {
-				if r.Success {
-					successCount++
-				} else {
-					failCount++
-				}
-			}
+			s.syncUser(ctx, u.UID, now, &tally)
 		}(user)
 	}
 
 	wg.Wait()
 
 	s.logger.Info("daily sync completed",
-		zap.Int("users_synced", userSyncedCount),
+		zap.Int("users_synced", tally.usersSynced),
 		zap.Int("total_users", len(users)),
-		zap.Int("snapshots_success", successCount),
-		zap.Int("snapshots_failed", failCount),
+		zap.Int("snapshots_success", tally.success),
+		zap.Int("snapshots_failed", tally.failed),
 		zap.Duration("duration", time.Since(start)),
 	)
 }
 
-// RunNow executes sync immediately for all users (for manual trigger / testing).
+// syncUser runs the atomic scheduled sync for one user, releases the
+// userLimiter slot the caller acquired (feeding latency and outcome to the
+// controller) and folds the outcome into tally. Shared by the
+// single-process and sharded run modes.
+func (s *SyncScheduler) syncUser(ctx context.Context, userUID string, now time.Time, tally *syncTally) error {
+	started := time.Now()
+	results, err := s.syncSvc.SyncUserScheduledDueAtomic(ctx, userUID, now)
+	s.userLimiter.Release(time.Since(started), userOutcome(results, err))
+
+	tally.mu.Lock()
+	defer tally.mu.Unlock()
+
+	if err != nil {
+		tally.failed++
+		s.logger.Error("user sync failed",
+			zap.String("user_uid", userUID),
+			zap.Error(err),
+		)
+		return err
+	}
+
+	if len(results) > 0 {
+		tally.usersSynced++
+	}
+
+	for _, r := range results {
+		if r.Success {
+			tally.success++
+		} else {
+			tally.failed++
+		}
+	}
+	return nil
+}
+
+// userOutcome summarises a user sync for the concurrency controller: any
+// rate-limited connection marks the whole user rate-limited, a failed call
+// or a majority of failed connections marks it an error.
+func userOutcome(results []*service.SyncResult, err error) concurrency.Outcome {
+	if err != nil {
+		return concurrency.ClassifyError(err.Error())
+	}
+	failed := 0
+	for _, r := range results {
+		switch concurrency.ClassifyError(r.Error) {
+		case concurrency.OutcomeRateLimited:
+			return concurrency.OutcomeRateLimited
+		case concurrency.OutcomeError:
+			failed++
+		}
+	}
+	if len(results) > 0 && 2*failed > len(results) {
+		return concurrency.OutcomeError
+	}
+	return concurrency.OutcomeOK
+}
+
+// syncTally accumulates per-run counters across concurrent user syncs.
+type syncTally struct {
+	mu          sync.Mutex
+	usersSynced int
+	success     int
+	failed      int
+}
+
+func (t *syncTally) addFailed() {
+	t.mu.Lock()
+	t.failed++
+	t.mu.Unlock()
+}
+
+// RunNow executes sync immediately for all users (for manual trigger /
+// testing). It always runs in this process: in sharded mode today's work
+// items may already be done or failed, and re-enqueueing them is a no-op.
 func (s *SyncScheduler) RunNow() {
-	s.executeDailySync()
+	s.executeLocalSync()
 }
@@ -0,0 +1,261 @@
+package scheduler
+
+import (
+	"context"
+	"fmt"
+	"os"
+	"sync"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+	"go.uber.org/zap"
+)
+
+// ShardOptions configures the sharded daily sync, where several enclave
+// replicas split the 00:00 UTC run through the sync_work_items queue.
+type ShardOptions struct {
+	// WorkerID identifies this replica in sync_work_items.claimed_by.
+	// Empty = "<hostname>-<pid>".
+	WorkerID string
+	// Lease is how long a claimed user stays reserved without renewal.
+	// Renewed every Lease/3 while the sync runs. Default 10m.
+	Lease time.Duration
+	// MaxAttempts bounds how many times a user is claimed in one run (a user
+	// whose sync keeps crashing its replica must not take the fleet down).
+	// Default 3.
+	MaxAttempts int
+	// PollInterval is how often an idle worker re-checks the queue for items
+	// orphaned by a crashed replica. Default 15s.
+	PollInterval time.Duration
+	// RunTimeout bounds the whole run on this replica. Default 30m, same as
+	// the single-process mode; throughput grows with the replica count.
+	RunTimeout time.Duration
+	// RetainDays is how many days of finished work items are kept for
+	// post-mortems. Default 7.
+	RetainDays int
+}
+
+func (o ShardOptions) withDefaults() ShardOptions {
+	if o.WorkerID == "" {
+		host, _ := os.Hostname()
+		if host == "" {
+			host = "enclave"
+		}
+		o.WorkerID = fmt.Sprintf("%s-%d", host, os.Getpid())
+	}
+	if o.Lease <= 0 {
+		o.Lease = 10 * time.Minute
+	}
+	if o.MaxAttempts <= 0 {
+		o.MaxAttempts = 3
+	}
+	if o.PollInterval <= 0 {
+		o.PollInterval = 15 * time.Second
+	}
+	if o.RunTimeout <= 0 {
+		o.RunTimeout = 30 * time.Minute
+	}
+	if o.RetainDays <= 0 {
+		o.RetainDays = 7
+	}
+	return o
+}
+
+// SetWorkQueue enables the sharded mode: the daily run is enqueued into
+// sync_work_items and this replica claims users from it alongside every
+// other replica pointed at the same database. The table must exist (see
+// SyncQueueRepo.EnsureTable); the daily run does not create it.
+func (s *SyncScheduler) SetWorkQueue(queue *repository.SyncQueueRepo, opts ShardOptions) {
+	s.queue = queue
+	s.shardOpts = opts.withDefaults()
+}
+
+// executeShardedSync is the multi-replica counterpart of executeDailySync.
+// Every replica enqueues the same run (idempotent), then runs one worker per
+// possible userLimiter slot; each claims one user at a time while holding a
+// slot, until the queue drains. Items whose lease expired — the owning
+// replica crashed — are reclaimed by whichever worker polls next.
+//
+// The batched IBKR Flex prefetch of executeDailySync is not used here: a
+// replica does not know which users it will claim, and every replica
+// requesting every report would multiply the per-token Flex requests.
+func (s *SyncScheduler) executeShardedSync() {
+	opts := s.shardOpts
+	ctx, cancel := context.WithTimeout(context.Background(), opts.RunTimeout)
+	defer cancel()
+
+	now := time.Now().UTC()
+	start := time.Now()
+	s.logger.Info("sharded daily sync started",
+		zap.String("time", now.Format(time.RFC3339)),
+		zap.String("worker_id", opts.WorkerID),
+	)
+
+	enqueued, err := s.enqueueRun(ctx, now)
+	if err != nil {
+		s.logger.Error("failed to enqueue daily sync run", zap.Error(err))
+		return
+	}
+
+	var (
+		tally   syncTally
+		claimed int
+		claimMu sync.Mutex
+		wg      sync.WaitGroup
+	)
+
+	heartbeatDone := make(chan struct{})
+	go s.renewLeases(ctx, now, heartbeatDone)
+
+	for i := 0; i < s.userLimiter.Max(); i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			n := s.shardWorker(ctx, now, &tally)
+			claimMu.Lock()
+			claimed += n
+			claimMu.Unlock()
+		}()
+	}
+
+	wg.Wait()
+	close(heartbeatDone)
+
+	pruneCtx, cancelPrune := queueWriteContext(ctx)
+	deleted, err := s.queue.DeleteBefore(pruneCtx, now.AddDate(0, 0, -opts.RetainDays))
+	cancelPrune()
+	if err != nil {
+		s.logger.Warn("failed to prune old sync work items", zap.Error(err))
+	} else if deleted > 0 {
+		s.logger.Info("pruned old sync work items", zap.Int64("deleted", deleted))
+	}
+
+	s.logger.Info("sharded daily sync completed",
+		zap.String("worker_id", opts.WorkerID),
+		zap.Int64("users_enqueued", enqueued),
+		zap.Int("users_claimed", claimed),
+		zap.Int("users_synced", tally.usersSynced),
+		zap.Int("snapshots_success", tally.success),
+		zap.Int("snapshots_failed", tally.failed),
+		zap.Duration("duration", time.Since(start)),
+	)
+}
+
+// enqueueRun inserts today's work items from UserRepo.GetAllWithConnections.
+// Returns the rows this replica inserted (0 when a peer enqueued first).
+func (s *SyncScheduler) enqueueRun(ctx context.Context, now time.Time) (int64, error) {
+	users, err := s.userRepo.GetAllWithConnections(ctx)
+	if err != nil {
+		return 0, fmt.Errorf("get users: %w", err)
+	}
+	uids := make([]string, 0, len(users))
+	for _, u := range users {
+		uids = append(uids, u.UID)
+	}
+	return s.queue.Enqueue(ctx, now, uids)
+}
+
+// shardWorker claims and syncs users until the run is drained or the context
+// expires. Returns the number of users it claimed.
+func (s *SyncScheduler) shardWorker(ctx context.Context, now time.Time, tally *syncTally) int {
+	opts := s.shardOpts
+	claimed := 0
+
+	for ctx.Err() == nil {
+		// Hold a slot before claiming so this replica never reserves more
+		// users than it can sync right now; peers can take the rest.
+		if err := s.userLimiter.Acquire(ctx); err != nil {
+			return claimed
+		}
+		items, err := s.queue.Claim(ctx, now, opts.WorkerID, 1, opts.Lease, opts.MaxAttempts)
+		if err != nil || len(items) == 0 {
+			s.userLimiter.ReleaseUnused()
+		}
+		if err != nil {
+			s.logger.Warn("sync work queue claim failed", zap.Error(err))
+			if !sleepCtx(ctx, opts.PollInterval) {
+				return claimed
+			}
+			continue
+		}
+
+		if len(items) == 0 {
+			// Nothing claimable right now. Other replicas may still hold
+			// live leases; keep polling so their items are reclaimed if
+			// they crash, and stop once nothing is outstanding.
+			outstanding, err := s.queue.CountOutstanding(ctx, now, opts.MaxAttempts)
+			if err == nil && outstanding == 0 {
+				return claimed
+			}
+			if !sleepCtx(ctx, opts.PollInterval) {
+				return claimed
+			}
+			continue
+		}
+
+		for _, item := range items {
+			claimed++
+			errMsg := ""
+			if err := s.syncUser(ctx, item.UserUID, now, tally); err != nil {
+				errMsg = err.Error()
+			}
+			// The sync may have used up the run's deadline; the outcome is
+			// still recorded, or the user stays leased and is synced again.
+			completeCtx, cancelComplete := queueWriteContext(ctx)
+			ok, err := s.queue.Complete(completeCtx, now, item.UserUID, opts.WorkerID, errMsg)
+			cancelComplete()
+			if err != nil {
+				s.logger.Warn("failed to complete sync work item",
+					zap.String("user_uid", item.UserUID),
+					zap.Error(err),
+				)
+			} else if !ok {
+				s.logger.Warn("sync work item lease lost before completion",
+					zap.String("user_uid", item.UserUID),
+					zap.Int("attempt", item.Attempts),
+				)
+			}
+		}
+	}
+	return claimed
+}
+
+// queueWriteTimeout bounds the queue bookkeeping done after a sync.
+const queueWriteTimeout = 10 * time.Second
+
+// queueWriteContext detaches ctx from the run's deadline and cancellation
+// for bookkeeping that must happen even when the run timed out.
+func queueWriteContext(ctx context.Context) (context.Context, context.CancelFunc) {
+	return context.WithTimeout(context.WithoutCancel(ctx), queueWriteTimeout)
+}
+
+// renewLeases extends this replica's leases every Lease/3 until done closes.
+func (s *SyncScheduler) renewLeases(ctx context.Context, now time.Time, done <-chan struct{}) {
+	ticker := time.NewTicker(s.shardOpts.Lease / 3)
+	defer ticker.Stop()
+
+	for {
+		select {
+		case <-done:
+			return
+		case <-ctx.Done():
+			return
+		case <-ticker.C:
+			if _, err := s.queue.ExtendLeases(ctx, now, s.shardOpts.WorkerID, s.shardOpts.Lease); err != nil {
+				s.logger.Warn("failed to renew sync work leases", zap.Error(err))
+			}
+		}
+	}
+}
+
+// sleepCtx waits for d or until ctx is done. Returns false if ctx ended.
+func sleepCtx(ctx context.Context, d time.Duration) bool {
+	t := time.NewTimer(d)
+	defer t.Stop()
+	select {
+	case <-ctx.Done():
+		return false
+	case <-t.C:
+		return true
+	}
+}
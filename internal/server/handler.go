@@ -6,8 +6,10 @@ import (
 	"encoding/hex"
 	"encoding/json"
 	"errors"
+	"fmt"
 	"net/http"
 	"os"
+	"slices"
 	"strconv"
 	"strings"
 	"time"
@@ -104,6 +106,7 @@ type HandlerOptions struct {
 type connectionService interface {
 	Create(ctx context.Context, req *service.CreateConnectionRequest) error
 	GetExcludedConnectionKeys(ctx context.Context, userUID string) (map[string]struct{}, error)
+	GetActiveConnections(ctx context.Context, userUID string) ([]*repository.ExchangeConnection, error)
 }
 
 func NewHandler(
@@ -818,8 +821,14 @@ func (h *Handler) GetMetrics(w http.ResponseWriter, r *http.Request) {
 		return
 	}
 
-	writeJSON(w, http.StatusOK, map[string]any{
-		"success":               true,
+	resp := metricsFields(metrics)
+	resp["success"] = true
+	writeJSON(w, http.StatusOK, resp)
+}
+
+// metricsFields is the JSON form of computed metrics.
+func metricsFields(metrics *service.PerformanceMetrics) map[string]any {
+	return map[string]any{
 		"sharpe_ratio":          metrics.SharpeRatio,
 		"sortino_ratio":         metrics.SortinoRatio,
 		"calmar_ratio":          metrics.CalmarRatio,
@@ -837,6 +846,219 @@ func (h *Handler) GetMetrics(w http.ResponseWriter, r *http.Request) {
 		"period_start":          metrics.PeriodStart.Unix(),
 		"period_end":            metrics.PeriodEnd.Unix(),
 		"data_points":           metrics.DataPoints,
+	}
+}
+
+// Bounds of a GetMetricsWindows request: every window × split pair is a
+// result, so the two together bound the response size.
+const (
+	maxMetricsWindows = 32
+	maxMetricsSplits  = 16
+)
+
+// GetMetricsWindows - POST /api/v1/metrics/windows
+//
+// Body: {"user_uid", "windows": [{"name", "start", "end"}], "exchanges": [...]}
+// with start/end in milliseconds (default: the last year). Returns the
+// metrics of every window for the whole portfolio, then for each exchange
+// in exchanges, from one snapshot fetch — in place of one GET
+// /api/v1/metrics per window and exchange.
+func (h *Handler) GetMetricsWindows(w http.ResponseWriter, r *http.Request) {
+	if r.Method != http.MethodPost {
+		http.Error(w, msgMethodNotAllowed, http.StatusMethodNotAllowed)
+		return
+	}
+
+	var req struct {
+		UserUID string `json:"user_uid"`
+		Windows []struct {
+			Name  string `json:"name"`
+			Start int64  `json:"start"`
+			End   int64  `json:"end"`
+		} `json:"windows"`
+		Exchanges []string `json:"exchanges"`
+	}
+	if err := readJSON(w, r, &req); err != nil {
+		writeJSON(w, http.StatusBadRequest, map[string]any{
+			"success": false,
+			"error":   msgInvalidRequestBody,
+		})
+		return
+	}
+
+	// AUTH-001: prefer the JWT-verified uid over the body-supplied one.
+	userUID := resolveUserUID(r.Context(), req.UserUID)
+	if userUID == "" {
+		writeJSON(w, http.StatusBadRequest, map[string]any{
+			"success": false,
+			"error":   msgUserUIDRequired,
+		})
+		return
+	}
+	if len(req.Windows) == 0 || len(req.Windows) > maxMetricsWindows || len(req.Exchanges) > maxMetricsSplits {
+		writeJSON(w, http.StatusBadRequest, map[string]any{
+			"success": false,
+			"error":   fmt.Sprintf("between 1 and %d windows and at most %d exchanges are required", maxMetricsWindows, maxMetricsSplits),
+		})
+		return
+	}
+
+	if h.metricsSvc == nil {
+		writeJSON(w, http.StatusServiceUnavailable, map[string]any{
+			"success": false,
+			"error":   "metrics service not available",
+		})
+		return
+	}
+
+	exchanges := []string{""}
+	for _, rawExchange := range req.Exchanges {
+		if err := validation.ValidateExchange(rawExchange); err != nil {
+			writeJSON(w, http.StatusBadRequest, map[string]any{
+				"success": false,
+				"error":   err.Error(),
+			})
+			return
+		}
+		if exchange := strings.ToLower(rawExchange); !slices.Contains(exchanges, exchange) {
+			exchanges = append(exchanges, exchange)
+		}
+	}
+
+	now := time.Now()
+	windows := make([]service.MetricsWindow, len(req.Windows))
+	for i, win := range req.Windows {
+		windows[i] = service.MetricsWindow{Start: now.AddDate(-1, 0, 0), End: now}
+		if win.Start != 0 {
+			windows[i].Start = time.UnixMilli(win.Start)
+		}
+		if win.End != 0 {
+			windows[i].End = time.UnixMilli(win.End)
+		}
+	}
+
+	excludedConnectionKeys := map[string]struct{}{}
+	if h.connSvc != nil {
+		excluded, err := h.connSvc.GetExcludedConnectionKeys(r.Context(), userUID)
+		if err != nil {
+			writeJSON(w, http.StatusInternalServerError, map[string]any{
+				"success": false,
+				"error":   msgFailedLoadExclusions,
+			})
+			return
+		}
+		excludedConnectionKeys = excluded
+	}
+
+	splits, err := h.metricsSvc.CalculateWindowSplits(r.Context(), userUID, windows, exchanges, excludedConnectionKeys)
+	if err != nil {
+		h.logger.Error("metrics computation failed", zap.String("user_uid", userUID), zap.Error(err))
+		writeJSON(w, http.StatusOK, map[string]any{
+			"success": false,
+			"error":   h.sanitizeErr(err),
+		})
+		return
+	}
+
+	results := make([]map[string]any, 0, len(exchanges)*len(windows))
+	for i, exchange := range exchanges {
+		for j, res := range splits[i] {
+			result := map[string]any{"success": false}
+			if res.Err != nil {
+				result["error"] = h.sanitizeErr(res.Err)
+			} else {
+				result = metricsFields(res.Metrics)
+				result["success"] = true
+			}
+			result["window"] = req.Windows[j].Name
+			result["exchange"] = exchange
+			results = append(results, result)
+		}
+	}
+
+	writeJSON(w, http.StatusOK, map[string]any{
+		"success": true,
+		"results": results,
+	})
+}
+
+// GetAggregatedMetrics - GET /api/v1/metrics/aggregated?user_uid=xxx&exchange=xxx
+//
+// Returns the user's current totals, summed over the latest snapshot of
+// each active connection, as the gRPC GetAggregatedMetrics does.
+func (h *Handler) GetAggregatedMetrics(w http.ResponseWriter, r *http.Request) {
+	if r.Method != http.MethodGet {
+		http.Error(w, msgMethodNotAllowed, http.StatusMethodNotAllowed)
+		return
+	}
+
+	// AUTH-001: prefer the JWT-verified uid over the query-supplied one.
+	userUID := resolveUserUID(r.Context(), r.URL.Query().Get("user_uid"))
+	if userUID == "" {
+		writeJSON(w, http.StatusBadRequest, map[string]any{
+			"success": false,
+			"error":   msgUserUIDRequired,
+		})
+		return
+	}
+
+	if h.snapshotRepo == nil || h.connSvc == nil {
+		writeJSON(w, http.StatusServiceUnavailable, map[string]any{
+			"success": false,
+			"error":   "database not configured",
+		})
+		return
+	}
+
+	rawExchange := r.URL.Query().Get("exchange")
+	if rawExchange != "" {
+		if err := validation.ValidateExchange(rawExchange); err != nil {
+			writeJSON(w, http.StatusBadRequest, map[string]any{
+				"success": false,
+				"error":   err.Error(),
+			})
+			return
+		}
+	}
+	exchange := strings.ToLower(rawExchange)
+
+	excludedConnectionKeys, err := h.connSvc.GetExcludedConnectionKeys(r.Context(), userUID)
+	if err != nil {
+		writeJSON(w, http.StatusInternalServerError, map[string]any{
+			"success": false,
+			"error":   msgFailedLoadExclusions,
+		})
+		return
+	}
+
+	connections, err := h.connSvc.GetActiveConnections(r.Context(), userUID)
+	var latest []*repository.Snapshot
+	if err == nil {
+		latest, err = h.snapshotRepo.GetLatestByConnections(r.Context(), userUID, connections)
+	}
+	if err != nil {
+		h.logger.Error("latest snapshots fetch failed", zap.String("user_uid", userUID), zap.Error(err))
+		writeJSON(w, http.StatusInternalServerError, map[string]any{
+			"success": false,
+			"error":   h.sanitizeErr(err),
+		})
+		return
+	}
+	agg := service.AggregateLatest(latest, exchange, excludedConnectionKeys)
+
+	var lastSync int64
+	if !agg.LastSync.IsZero() {
+		lastSync = agg.LastSync.UnixMilli()
+	}
+	writeJSON(w, http.StatusOK, map[string]any{
+		"success":              true,
+		"user_uid":             userUID,
+		"total_balance":        agg.TotalBalance,
+		"total_equity":         agg.TotalEquity,
+		"total_unrealized_pnl": agg.TotalUnrealizedPnL,
+		"total_fees":           agg.TotalFees,
+		"total_trades":         agg.TotalTrades,
+		"last_sync":            lastSync,
 	})
 }
 
@@ -880,7 +1102,7 @@ func (h *Handler) GetSnapshots(w http.ResponseWriter, r *http.Request) {
 		}
 	}
 
-	snapshots, err := h.snapshotRepo.GetByUserAndDateRange(r.Context(), userUID, start, end)
+	snapshots, err := h.snapshotRepo.GetSeriesByUserAndDateRange(r.Context(), userUID, start, end, repository.ProjectBreakdown)
 	if err != nil {
 		h.logger.Error("snapshot fetch failed", zap.String("user_uid", userUID), zap.Error(err))
 		writeJSON(w, http.StatusInternalServerError, map[string]any{
@@ -932,7 +1154,7 @@ func (h *Handler) GetSnapshots(w http.ResponseWriter, r *http.Request) {
 			"unrealized_pnl":   snap.UnrealizedPnL,
 			"deposits":         snap.Deposits,
 			"withdrawals":      snap.Withdrawals,
-			"breakdown":        snap.Breakdown,
+			"breakdown":        snap.LoadBreakdown(),
 		})
 	}
 
@@ -1024,7 +1246,7 @@ func (h *Handler) GenerateReport(w http.ResponseWriter, r *http.Request) {
 		}
 	}
 
-	report, err := h.reportSvc.GenerateReport(r.Context(), &service.GenerateReportRequest{
+	data, err := h.reportSvc.GenerateReportJSON(r.Context(), &service.GenerateReportRequest{
 		UserUID:            userUID,
 		StartDate:          startDate,
 		EndDate:            endDate,
@@ -1047,7 +1269,7 @@ func (h *Handler) GenerateReport(w http.ResponseWriter, r *http.Request) {
 		return
 	}
 
-	writeJSON(w, http.StatusOK, report)
+	writeRawJSON(w, http.StatusOK, data)
 }
 
 // VerifySignature - POST /api/v1/verify
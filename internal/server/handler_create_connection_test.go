@@ -9,6 +9,7 @@ import (
 	"net/http/httptest"
 	"testing"
 
+	"github.com/trackrecord/enclave/internal/repository"
 	"github.com/trackrecord/enclave/internal/service"
 	"go.uber.org/zap"
 )
@@ -27,6 +28,10 @@ func (f *fakeHandlerConnectionService) GetExcludedConnectionKeys(_ context.Conte
 	return map[string]struct{}{}, nil
 }
 
+func (f *fakeHandlerConnectionService) GetActiveConnections(_ context.Context, _ string) ([]*repository.ExchangeConnection, error) {
+	return nil, nil
+}
+
 func TestCreateUserConnectionHandler_Success(t *testing.T) {
 	fake := &fakeHandlerConnectionService{}
 	h := &Handler{logger: zap.NewNop(), connSvc: fake}
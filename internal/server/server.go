@@ -170,6 +170,8 @@ func (s *Server) Start(ctx context.Context) error {
 		}
 		mux.HandleFunc("/api/v1/sync", s.jwtRequired(s.handler.ProcessSyncJob))
 		mux.HandleFunc("/api/v1/metrics", s.jwtRequired(s.handler.GetMetrics))
+		mux.HandleFunc("/api/v1/metrics/windows", s.jwtRequired(s.handler.GetMetricsWindows))
+		mux.HandleFunc("/api/v1/metrics/aggregated", s.jwtRequired(s.handler.GetAggregatedMetrics))
 		mux.HandleFunc("/api/v1/snapshots", s.jwtRequired(s.handler.GetSnapshots))
 		mux.HandleFunc("/api/v1/report", s.jwtRequired(s.handler.GenerateReport))
 		mux.HandleFunc("/api/v1/verify", s.handler.VerifySignature)
@@ -402,6 +404,15 @@ func writeJSON(w http.ResponseWriter, status int, data any) {
 	json.NewEncoder(w).Encode(data)
 }
 
+// writeRawJSON writes an already encoded JSON body, newline-terminated like
+// writeJSON's.
+func writeRawJSON(w http.ResponseWriter, status int, data []byte) {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(status)
+	w.Write(data)
+	w.Write([]byte{'\n'})
+}
+
 // defaultMaxRequestBodyBytes caps REST request bodies (SEC-007). 64 KiB is
 // far larger than any legitimate credential / sync / report payload and
 // small enough to absorb a burst of hostile requests without growing the
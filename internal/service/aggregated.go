@@ -0,0 +1,36 @@
+package service
+
+import (
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+// AggregatedMetrics are a user's current totals: the sums over the latest
+// snapshot of each connection.
+type AggregatedMetrics struct {
+	TotalBalance       float64
+	TotalEquity        float64
+	TotalUnrealizedPnL float64
+	TotalFees          float64
+	TotalTrades        int
+	LastSync           time.Time // latest snapshot timestamp; zero without snapshots
+}
+
+// AggregateLatest sums the latest snapshots of a user's connections, as
+// SnapshotRepo.GetLatestByConnections returns them, keeping those of
+// exchange (all when empty) that are not excluded.
+func AggregateLatest(latest []*repository.Snapshot, exchange string, excludedConnectionKeys map[string]struct{}) *AggregatedMetrics {
+	agg := &AggregatedMetrics{}
+	for _, snap := range filterSnapshots(latest, exchange, excludedConnectionKeys) {
+		agg.TotalBalance += snap.RealizedBalance
+		agg.TotalEquity += snap.TotalEquity
+		agg.TotalUnrealizedPnL += snap.UnrealizedPnL
+		agg.TotalFees += snap.TotalFees
+		agg.TotalTrades += snap.TotalTrades
+		if snap.Timestamp.After(agg.LastSync) {
+			agg.LastSync = snap.Timestamp
+		}
+	}
+	return agg
+}
@@ -0,0 +1,37 @@
+package service
+
+import (
+	"testing"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+func TestAggregateLatest_SumsKeptConnections(t *testing.T) {
+	day := time.Date(2024, 5, 1, 0, 0, 0, 0, time.UTC)
+	latest := []*repository.Snapshot{
+		{Exchange: "binance", Label: "main", Timestamp: day, TotalEquity: 100, RealizedBalance: 90, UnrealizedPnL: 10, TotalFees: 1, TotalTrades: 3},
+		{Exchange: "binance", Label: "alt", Timestamp: day.AddDate(0, 0, 2), TotalEquity: 50, RealizedBalance: 45, UnrealizedPnL: 5, TotalFees: 2, TotalTrades: 4},
+		{Exchange: "Bybit", Label: "", Timestamp: day.AddDate(0, 0, 5), TotalEquity: 30, TotalTrades: 1},
+		{Exchange: "ibkr", Label: "paper", Timestamp: day.AddDate(0, 0, 9), TotalEquity: 1000},
+	}
+	excluded := map[string]struct{}{"ibkr/paper": {}}
+
+	all := AggregateLatest(latest, "", excluded)
+	want := AggregatedMetrics{
+		TotalBalance: 135, TotalEquity: 180, TotalUnrealizedPnL: 15, TotalFees: 3, TotalTrades: 8,
+		LastSync: day.AddDate(0, 0, 5),
+	}
+	if *all != want {
+		t.Fatalf("all exchanges: got %+v, want %+v", *all, want)
+	}
+
+	bybit := AggregateLatest(latest, "bybit", excluded)
+	if bybit.TotalEquity != 30 || bybit.TotalTrades != 1 || !bybit.LastSync.Equal(day.AddDate(0, 0, 5)) {
+		t.Fatalf("bybit: got %+v", *bybit)
+	}
+
+	if empty := AggregateLatest(nil, "", nil); !empty.LastSync.IsZero() || empty.TotalEquity != 0 {
+		t.Fatalf("no snapshots: got %+v", *empty)
+	}
+}
@@ -0,0 +1,32 @@
+package service
+
+import (
+	"sort"
+	"testing"
+)
+
+// PERF-017: daily TWR of a 5-year × 20-connection history through the
+// twrMatrix sweep, as the report returns and as the stored return series.
+//
+//	go test ./internal/service/ -run '^$' -bench DailyReturns
+func BenchmarkDailyReturns(b *testing.B) {
+	// In timestamp order, as the snapshot reads return them.
+	snapshots := twrTestSnapshots(17, 5*365, 20)
+	sort.SliceStable(snapshots, func(i, j int) bool { return snapshots[i].Timestamp.Before(snapshots[j].Timestamp) })
+	for _, impl := range []struct {
+		name    string
+		convert func() int
+	}{
+		{"Returns", func() int { return len(convertSnapshotsToDailyReturns(snapshots)) }},
+		{"Series", func() int { return len(replaySeriesDays(snapshots, nil)) }},
+	} {
+		b.Run(impl.name, func(b *testing.B) {
+			b.ReportAllocs()
+			for i := 0; i < b.N; i++ {
+				if impl.convert() == 0 {
+					b.Fatal("no returns")
+				}
+			}
+		})
+	}
+}
@@ -267,6 +267,12 @@ func (s *ConnectionService) GetExcludedConnectionKeys(ctx context.Context, userU
 	return s.repo.GetExcludedConnectionKeysByUser(ctx, userUID)
 }
 
+// GetExcludedConnectionKeysForUsers returns the excluded connection keys of
+// several users, keyed by user; users without exclusions are absent.
+func (s *ConnectionService) GetExcludedConnectionKeysForUsers(ctx context.Context, userUIDs []string) (map[string]map[string]struct{}, error) {
+	return s.repo.GetExcludedConnectionKeysByUsers(ctx, userUIDs)
+}
+
 // GetExchangeMetadata returns exchange-level metadata for active connections.
 func (s *ConnectionService) GetExchangeMetadata(ctx context.Context, userUID string) ([]*ExchangeMetadata, error) {
 	details, err := s.repo.GetExchangeDetailsByUser(ctx, userUID)
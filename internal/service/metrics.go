@@ -44,6 +44,7 @@ type PerformanceMetrics struct {
 // MetricsService calculates performance metrics from snapshots
 type MetricsService struct {
 	snapshotRepo *repository.SnapshotRepo
+	series       *ReturnSeriesService // nil = always replay snapshots
 }
 
 // NewMetricsService creates a new metrics service
@@ -51,6 +52,12 @@ func NewMetricsService(snapshotRepo *repository.SnapshotRepo) *MetricsService {
 	return &MetricsService{snapshotRepo: snapshotRepo}
 }
 
+// SetReturnSeries makes the metrics read the derived daily return series
+// where it can serve a range, instead of replaying the snapshots.
+func (s *MetricsService) SetReturnSeries(series *ReturnSeriesService) {
+	s.series = series
+}
+
 // Calculate computes performance metrics for a user within a date range
 func (s *MetricsService) Calculate(ctx context.Context, userUID string, start, end time.Time) (*PerformanceMetrics, error) {
 	return s.CalculateWithFilters(ctx, userUID, start, end, "", nil)
@@ -74,7 +81,13 @@ func (s *MetricsService) CalculateWithFilters(
 	exchange string,
 	excludedConnectionKeys map[string]struct{},
 ) (*PerformanceMetrics, error) {
-	snapshots, err := s.snapshotRepo.GetByUserAndDateRange(ctx, userUID, start, end)
+	if s.series != nil {
+		if ds, ok := s.series.Range(ctx, userUID, start, end, exchange, excludedConnectionKeys); ok {
+			return s.calculateFromSeries(ds)
+		}
+	}
+
+	snapshots, err := s.snapshotRepo.GetSeriesByUserAndDateRange(ctx, userUID, start, end, repository.ProjectEquity)
 	if err != nil {
 		return nil, err
 	}
@@ -83,6 +96,130 @@ func (s *MetricsService) CalculateWithFilters(
 	return s.calculateFromSnapshots(filtered)
 }
 
+// MetricsWindow is one date window of a multi-window metrics request.
+type MetricsWindow struct {
+	Start time.Time
+	End   time.Time
+}
+
+// WindowMetrics is the result of one window: its metrics, or why it has
+// none (e.g. too little data in the window).
+type WindowMetrics struct {
+	Metrics *PerformanceMetrics
+	Err     error
+}
+
+// CalculateWindowSplits computes metrics for several windows, once per
+// exchange filter in exchanges ("" = every exchange). Per filter, the days
+// covering every window are loaded once (from the derived series, or
+// replayed from the snapshots), indexed by a returnIndex, and each window is
+// answered from the index in O(log n). The snapshots of the union of the
+// windows are fetched at most once and shared by every filter and by the
+// windows the index cannot answer exactly, which are replayed from their
+// own snapshots. Results are indexed [exchange][window].
+func (s *MetricsService) CalculateWindowSplits(
+	ctx context.Context,
+	userUID string,
+	windows []MetricsWindow,
+	exchanges []string,
+	excludedConnectionKeys map[string]struct{},
+) ([][]WindowMetrics, error) {
+	if len(windows) == 0 || len(exchanges) == 0 {
+		return nil, nil
+	}
+	start, end := windows[0].Start, windows[0].End
+	for _, w := range windows[1:] {
+		if w.Start.Before(start) {
+			start = w.Start
+		}
+		if w.End.After(end) {
+			end = w.End
+		}
+	}
+
+	var snapshots []*repository.Snapshot
+	fetched := false
+	loadSnapshots := func() ([]*repository.Snapshot, error) {
+		if !fetched {
+			var err error
+			if snapshots, err = s.snapshotRepo.GetSeriesByUserAndDateRange(ctx, userUID, start, end, repository.ProjectEquity); err != nil {
+				return nil, err
+			}
+			fetched = true
+		}
+		return snapshots, nil
+	}
+
+	out := make([][]WindowMetrics, len(exchanges))
+	for i, exchange := range exchanges {
+		var (
+			days     []repository.ReturnSeriesDay
+			stored   bool
+			filtered []*repository.Snapshot
+		)
+		if s.series != nil {
+			days, stored = s.series.Days(ctx, userUID, start, end, exchange, excludedConnectionKeys)
+		}
+		if !stored {
+			all, err := loadSnapshots()
+			if err != nil {
+				return nil, err
+			}
+			filtered = filterSnapshots(all, exchange, excludedConnectionKeys)
+			days = replaySeriesDays(filtered, nil)
+		}
+		index := newReturnIndex(days)
+
+		results := make([]WindowMetrics, len(windows))
+		for j, w := range windows {
+			var res WindowMetrics
+			if ws, ok := index.window(w.Start, w.End); ok {
+				res.Metrics, res.Err = s.calculateFromWindow(&ws)
+			} else {
+				if filtered == nil {
+					all, err := loadSnapshots()
+					if err != nil {
+						return nil, err
+					}
+					filtered = filterSnapshots(all, exchange, excludedConnectionKeys)
+				}
+				res.Metrics, res.Err = s.calculateFromSnapshots(snapshotsInRange(filtered, w.Start, w.End))
+			}
+			results[j] = res
+		}
+		out[i] = results
+	}
+	return out, nil
+}
+
+// snapshotsInRange returns the time-sorted snapshots within [start, end].
+func snapshotsInRange(snapshots []*repository.Snapshot, start, end time.Time) []*repository.Snapshot {
+	lo := sort.Search(len(snapshots), func(i int) bool { return !snapshots[i].Timestamp.Before(start) })
+	hi := sort.Search(len(snapshots), func(i int) bool { return snapshots[i].Timestamp.After(end) })
+	if lo >= hi {
+		return nil
+	}
+	return append([]*repository.Snapshot(nil), snapshots[lo:hi]...)
+}
+
+// dailyReturns returns the daily TWR series of a user's filtered, time-sorted
+// snapshots within [start, end], from the derived series when it can serve
+// the range.
+func (s *MetricsService) dailyReturns(
+	ctx context.Context,
+	userUID string,
+	start, end time.Time,
+	excludedConnectionKeys map[string]struct{},
+	snapshots []*repository.Snapshot,
+) []dailyReturn {
+	if s.series != nil {
+		if ds, ok := s.series.Range(ctx, userUID, start, end, "", excludedConnectionKeys); ok {
+			return ds.returns
+		}
+	}
+	return convertSnapshotsToDailyReturns(snapshots)
+}
+
 func (s *MetricsService) calculateFromSnapshots(snapshots []*repository.Snapshot) (*PerformanceMetrics, error) {
 	if len(snapshots) < 2 {
 		return nil, errors.New("insufficient data: need at least 2 snapshots")
@@ -94,7 +231,15 @@ func (s *MetricsService) calculateFromSnapshots(snapshots []*repository.Snapshot
 	})
 
 	// Use report-aligned TWR conversion to handle multi-exchange snapshots.
-	dailyReturns := convertSnapshotsToDailyReturns(snapshots)
+	return s.calculateFromSeries(dailySeriesFromSnapshots(snapshots))
+}
+
+func (s *MetricsService) calculateFromSeries(ds *dailySeries) (*PerformanceMetrics, error) {
+	if ds.snapshots < 2 {
+		return nil, errors.New("insufficient data: need at least 2 snapshots")
+	}
+
+	dailyReturns := ds.returns
 	if len(dailyReturns) == 0 {
 		return nil, errors.New("insufficient data: need at least 2 daily data points")
 	}
@@ -111,24 +256,42 @@ func (s *MetricsService) calculateFromSnapshots(snapshots []*repository.Snapshot
 		return nil, errors.New("no valid returns calculated")
 	}
 
-	// Core statistics
-	avgReturn := mean(returns)
-	stdDev := stddev(returns)
-	downsideDev := s.downsideDeviation(returns, 0)
-
-	// Annualized metrics (252 trading days)
-	annualizedReturn := avgReturn * 252
-	annualizedVol := stdDev * math.Sqrt(252)
-	annualizedDownside := downsideDev * math.Sqrt(252)
-
+	ws := windowStats{
+		returns:     len(returns),
+		mean:        mean(returns),
+		stddev:      stddev(returns),
+		downside:    s.downsideDeviation(returns, 0),
+		totalReturn: dailyReturns[len(dailyReturns)-1].cumulativeReturn,
+		periodStart: ds.periodStart,
+		periodEnd:   ds.periodEnd,
+		dataPoints:  ds.dataPoints,
+		snapshots:   ds.snapshots,
+	}
 	// Drawdown analysis on normalized NAV series.
-	maxDD, maxDDDuration, currentDD := s.analyzeDrawdownNAV(navSeries)
+	ws.maxDD, ws.maxDDDuration, ws.currentDD = s.analyzeDrawdownNAV(navSeries)
+	ws.winRate, ws.profitFactor, ws.avgWin, ws.avgLoss = s.analyzeWinLoss(returns)
 
-	// Win/Loss analysis
-	winRate, profitFactor, avgWin, avgLoss := s.analyzeWinLoss(returns)
+	return performanceFromStats(&ws), nil
+}
 
-	totalReturn := dailyReturns[len(dailyReturns)-1].cumulativeReturn
-	periodStart, periodEnd, dataPoints := summarizePeriod(snapshots)
+// calculateFromWindow computes metrics from a window of a returnIndex.
+func (s *MetricsService) calculateFromWindow(ws *windowStats) (*PerformanceMetrics, error) {
+	if ws.snapshots < 2 {
+		return nil, errors.New("insufficient data: need at least 2 snapshots")
+	}
+	if ws.returns == 0 {
+		return nil, errors.New("insufficient data: need at least 2 daily data points")
+	}
+	return performanceFromStats(ws), nil
+}
+
+// performanceFromStats annualizes the statistics of a window's daily
+// returns and derives the risk-adjusted ratios.
+func performanceFromStats(ws *windowStats) *PerformanceMetrics {
+	// Annualized metrics (252 trading days)
+	annualizedReturn := ws.mean * 252
+	annualizedVol := ws.stddev * math.Sqrt(252)
+	annualizedDownside := ws.downside * math.Sqrt(252)
 
 	// Risk-adjusted ratios (risk-free rate = 0)
 	sharpe := 0.0
@@ -142,8 +305,8 @@ func (s *MetricsService) calculateFromSnapshots(snapshots []*repository.Snapshot
 	}
 
 	calmar := 0.0
-	if maxDD > 0 {
-		calmar = annualizedReturn / maxDD
+	if ws.maxDD > 0 {
+		calmar = annualizedReturn / ws.maxDD
 	}
 
 	return &PerformanceMetrics{
@@ -152,19 +315,19 @@ func (s *MetricsService) calculateFromSnapshots(snapshots []*repository.Snapshot
 		CalmarRatio:         calmar,
 		Volatility:          annualizedVol,
 		DownsideDeviation:   annualizedDownside,
-		MaxDrawdown:         maxDD,
-		MaxDrawdownDuration: int(maxDDDuration),
-		CurrentDrawdown:     currentDD,
-		WinRate:             winRate,
-		ProfitFactor:        profitFactor,
-		AvgWin:              avgWin,
-		AvgLoss:             avgLoss,
-		TotalReturn:         totalReturn,
+		MaxDrawdown:         ws.maxDD,
+		MaxDrawdownDuration: ws.maxDDDuration,
+		CurrentDrawdown:     ws.currentDD,
+		WinRate:             ws.winRate,
+		ProfitFactor:        ws.profitFactor,
+		AvgWin:              ws.avgWin,
+		AvgLoss:             ws.avgLoss,
+		TotalReturn:         ws.totalReturn,
 		AnnualizedReturn:    annualizedReturn,
-		PeriodStart:         periodStart,
-		PeriodEnd:           periodEnd,
-		DataPoints:          dataPoints,
-	}, nil
+		PeriodStart:         ws.periodStart,
+		PeriodEnd:           ws.periodEnd,
+		DataPoints:          ws.dataPoints,
+	}
 }
 
 func filterSnapshots(snapshots []*repository.Snapshot, exchange string, excludedConnectionKeys map[string]struct{}) []*repository.Snapshot {
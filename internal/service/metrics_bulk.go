@@ -0,0 +1,149 @@
+package service
+
+import (
+	"context"
+	"runtime"
+	"sync"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+	"golang.org/x/sync/errgroup"
+)
+
+// UserMetrics is the result of one user of a bulk metrics request: the
+// user's metrics, or why there are none (e.g. too little data).
+type UserMetrics struct {
+	UserUID string
+	Metrics *PerformanceMetrics
+	Err     error
+}
+
+// seriesScan hands each user's time-sorted snapshots to fn, as
+// SnapshotRepo.ScanSeriesByUsers does.
+type seriesScan func(ctx context.Context, fn func(userUID string, snapshots []*repository.Snapshot) error) error
+
+// CalculateBulk computes the metrics of several users over one window
+// (PERF-014). Ranking pages used to issue one GetPerformanceMetrics per
+// user, each with its own exclusion lookup and snapshot query. Here the
+// snapshots of every user come from a few keyset-paginated queries
+// (ScanSeriesByUsers), and each user's metrics are computed by
+// calculateFromSnapshots on a pool of GOMAXPROCS workers while the next
+// page is read.
+//
+// excluded holds each user's exclusion keys, as GetExcludedConnectionKeys
+// returns them; exchange optionally restricts every user to one exchange.
+// emit is called on the calling goroutine once per distinct user of
+// userUIDs, in completion order; users without snapshots come last. An
+// error from emit stops the computation and is returned.
+func (s *MetricsService) CalculateBulk(
+	ctx context.Context,
+	userUIDs []string,
+	start, end time.Time,
+	exchange string,
+	excluded map[string]map[string]struct{},
+	emit func(UserMetrics) error,
+) error {
+	seen := make(map[string]struct{}, len(userUIDs))
+	distinct := make([]string, 0, len(userUIDs))
+	for _, uid := range userUIDs {
+		if _, ok := seen[uid]; !ok {
+			seen[uid] = struct{}{}
+			distinct = append(distinct, uid)
+		}
+	}
+	userUIDs = distinct
+
+	scan := func(ctx context.Context, fn func(string, []*repository.Snapshot) error) error {
+		return s.snapshotRepo.ScanSeriesByUsers(ctx, userUIDs, start, end, 0, fn)
+	}
+	return s.calculateBulk(ctx, userUIDs, scan, exchange, excluded, emit)
+}
+
+func (s *MetricsService) calculateBulk(
+	ctx context.Context,
+	userUIDs []string,
+	scan seriesScan,
+	exchange string,
+	excluded map[string]map[string]struct{},
+	emit func(UserMetrics) error,
+) error {
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+
+	type job struct {
+		userUID   string
+		snapshots []*repository.Snapshot
+	}
+	workers := runtime.GOMAXPROCS(0)
+	jobs := make(chan job, workers)
+	results := make(chan UserMetrics, workers)
+
+	g, gctx := errgroup.WithContext(ctx)
+	g.Go(func() error {
+		defer close(jobs)
+		return scan(gctx, func(userUID string, snapshots []*repository.Snapshot) error {
+			select {
+			case jobs <- job{userUID: userUID, snapshots: snapshots}:
+				return nil
+			case <-gctx.Done():
+				return gctx.Err()
+			}
+		})
+	})
+
+	var wg sync.WaitGroup
+	for i := 0; i < workers; i++ {
+		wg.Add(1)
+		g.Go(func() error {
+			defer wg.Done()
+			for j := range jobs {
+				res := UserMetrics{UserUID: j.userUID}
+				res.Metrics, res.Err = s.calculateFromSnapshots(filterSnapshots(j.snapshots, exchange, excluded[j.userUID]))
+				select {
+				case results <- res:
+				case <-gctx.Done():
+					return gctx.Err()
+				}
+			}
+			return nil
+		})
+	}
+	go func() {
+		wg.Wait()
+		close(results)
+	}()
+
+	pending := make(map[string]struct{}, len(userUIDs))
+	for _, uid := range userUIDs {
+		pending[uid] = struct{}{}
+	}
+	var emitErr error
+	for res := range results {
+		if emitErr != nil {
+			continue // draining after a failed emit
+		}
+		delete(pending, res.UserUID)
+		if emitErr = emit(res); emitErr != nil {
+			cancel()
+		}
+	}
+	if err := g.Wait(); emitErr == nil && err != nil {
+		return err
+	}
+	if emitErr != nil {
+		return emitErr
+	}
+
+	for _, uid := range userUIDs {
+		if _, ok := pending[uid]; !ok {
+			continue
+		}
+		delete(pending, uid)
+		res := UserMetrics{UserUID: uid}
+		res.Metrics, res.Err = s.calculateFromSnapshots(nil)
+		if err := emit(res); err != nil {
+			return err
+		}
+	}
+	return nil
+}
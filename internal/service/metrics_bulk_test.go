@@ -0,0 +1,99 @@
+package service
+
+import (
+	"context"
+	"errors"
+	"testing"
+
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+// bulkTestScan serves series as ScanSeriesByUsers does: users with
+// snapshots, in order.
+func bulkTestScan(series map[string][]*repository.Snapshot, order []string) seriesScan {
+	return func(ctx context.Context, fn func(string, []*repository.Snapshot) error) error {
+		for _, uid := range order {
+			if len(series[uid]) == 0 {
+				continue
+			}
+			if err := fn(uid, series[uid]); err != nil {
+				return err
+			}
+		}
+		return nil
+	}
+}
+
+func TestCalculateBulk_MatchesPerUserCalculation(t *testing.T) {
+	svc := &MetricsService{}
+	users := []string{"user_a", "user_b", "user_empty", "user_c"}
+	series := map[string][]*repository.Snapshot{}
+	for i, uid := range []string{"user_a", "user_b", "user_c"} {
+		snaps := seriesTestSnapshots()
+		for _, s := range snaps {
+			s.UserUID = uid
+			s.TotalEquity += float64(100 * i)
+		}
+		series[uid] = snaps
+	}
+	excluded := map[string]map[string]struct{}{"user_b": {"bybit": {}}}
+
+	got := map[string]UserMetrics{}
+	var order []string
+	err := svc.calculateBulk(context.Background(), users, bulkTestScan(series, users), "", excluded,
+		func(res UserMetrics) error {
+			if _, dup := got[res.UserUID]; dup {
+				t.Fatalf("%s emitted twice", res.UserUID)
+			}
+			got[res.UserUID] = res
+			order = append(order, res.UserUID)
+			return nil
+		})
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(got) != 4 || order[3] != "user_empty" {
+		t.Fatalf("emitted %v, want every user once with user_empty last", order)
+	}
+	if got["user_empty"].Err == nil {
+		t.Fatal("user without snapshots has metrics")
+	}
+
+	for _, uid := range []string{"user_a", "user_b", "user_c"} {
+		want, err := svc.calculateFromSnapshots(filterSnapshots(series[uid], "", excluded[uid]))
+		if err != nil {
+			t.Fatal(err)
+		}
+		res := got[uid]
+		if res.Err != nil {
+			t.Fatalf("%s: %v", uid, res.Err)
+		}
+		if *res.Metrics != *want {
+			t.Fatalf("%s: got %+v, want %+v", uid, res.Metrics, want)
+		}
+	}
+}
+
+func TestCalculateBulk_EmitErrorStops(t *testing.T) {
+	svc := &MetricsService{}
+	series := map[string][]*repository.Snapshot{}
+	var users []string
+	for i := 0; i < 64; i++ {
+		uid := string(rune('a'+i%26)) + string(rune('a'+i/26))
+		users = append(users, uid)
+		series[uid] = seriesTestSnapshots()
+	}
+
+	stop := errors.New("client went away")
+	emitted := 0
+	err := svc.calculateBulk(context.Background(), users, bulkTestScan(series, users), "", nil, func(UserMetrics) error {
+		emitted++
+		return stop
+	})
+	if !errors.Is(err, stop) {
+		t.Fatalf("err = %v, want the emit error", err)
+	}
+	if emitted != 1 {
+		t.Fatalf("emit called %d times after failing", emitted)
+	}
+}
@@ -26,6 +26,7 @@ type ReportService struct {
 	signer           *signing.ReportSigner
 	benchmarkSvc     *BenchmarkService
 	logger           *zap.Logger
+	reportCache      *reportCache // nil = disabled
 }
 
 // SetConnectionService configures optional exchange metadata enrichment.
@@ -121,18 +122,108 @@ type drawdownData struct {
 	periods             []*drawdownPeriod
 }
 
-// GenerateReport creates a signed performance report with full analytics
+// SetReportCache enables the in-process signed report cache with a memory
+// budget of maxBytes; entries older than ttl are regenerated (0 = no
+// expiry). The snapshot repository's writes invalidate it. Call before the
+// service or the repository is shared.
+func (s *ReportService) SetReportCache(maxBytes int64, ttl time.Duration) {
+	s.reportCache = newReportCache(maxBytes, ttl)
+	if s.snapshotRepo != nil {
+		s.snapshotRepo.OnSnapshotsWritten(s.reportCache.invalidate)
+	}
+}
+
+// ReportCacheStatistics returns the report cache counters; zero when the
+// cache is disabled or the service is nil.
+func (s *ReportService) ReportCacheStatistics() ReportCacheStats {
+	if s == nil || s.reportCache == nil {
+		return ReportCacheStats{}
+	}
+	return s.reportCache.stats()
+}
+
+// GenerateReport creates a signed performance report with full analytics.
+// The slices and sub-structs of the report may be shared with the report
+// cache; callers must not modify them.
 func (s *ReportService) GenerateReport(ctx context.Context, req *GenerateReportRequest) (*signing.SignedReport, error) {
-	// 0. Check cache (dedup by user + dates + benchmark)
-	if cached := s.checkReportCache(ctx, req); cached != nil {
-		// Apply display params (not signed) to cached report
-		cached.Manager = req.Manager
-		cached.Firm = req.Firm
-		return cached, nil
+	signed, _, err := s.signedReport(ctx, req)
+	if err != nil {
+		return nil, err
+	}
+	// Apply display params (not signed) to a copy of the cached report
+	report := *signed
+	report.Manager = req.Manager
+	report.Firm = req.Firm
+	return &report, nil
+}
+
+// GenerateReportJSON is GenerateReport returning the report serialized as
+// JSON. Cache hits are served from the stored bytes, without decoding or
+// encoding the report; the result must not be modified.
+func (s *ReportService) GenerateReportJSON(ctx context.Context, req *GenerateReportRequest) ([]byte, error) {
+	report, data, err := s.signedReport(ctx, req)
+	if err != nil {
+		return nil, err
+	}
+	if data == nil {
+		if data, err = json.Marshal(report); err != nil {
+			return nil, fmt.Errorf("marshal report: %w", err)
+		}
+	}
+	return withDisplayParams(data, req.Manager, req.Firm), nil
+}
+
+// signedReport returns the signed report for req without display params
+// and, when the report cache is enabled, its JSON. It looks in the
+// in-process cache, then in signed_reports, then generates the report.
+func (s *ReportService) signedReport(ctx context.Context, req *GenerateReportRequest) (*signing.SignedReport, []byte, error) {
+	c := s.reportCache
+	var key string
+	var load *reportLoad
+	if c != nil {
+		key = reportCacheKey(req)
+		if e, ok := c.get(key); ok {
+			return e.report, e.data, nil
+		}
+		load = c.beginLoad(reportPeriod{userUID: req.UserUID, start: req.StartDate, end: req.EndDate})
 	}
 
+	report := s.checkReportCache(ctx, req)
+	stored := report != nil
+	if !stored {
+		var err error
+		if report, err = s.buildReport(ctx, req); err != nil {
+			if c != nil {
+				c.endLoad(load, key, nil, nil)
+			}
+			return nil, nil, err
+		}
+	}
+
+	var data []byte
+	if c != nil {
+		var err error
+		if data, err = json.Marshal(report); err != nil && s.logger != nil {
+			s.logger.Warn("report cache marshal failed", zap.Error(err))
+		}
+	}
+	if !stored {
+		s.cacheReport(ctx, req, report, data)
+	}
+	if c != nil {
+		if data == nil {
+			c.endLoad(load, key, nil, nil)
+		} else {
+			c.endLoad(load, key, report, data)
+		}
+	}
+	return report, data, nil
+}
+
+// buildReport computes and signs the report for req.
+func (s *ReportService) buildReport(ctx context.Context, req *GenerateReportRequest) (*signing.SignedReport, error) {
 	// 1. Fetch snapshots
-	snapshots, err := s.snapshotRepo.GetByUserAndDateRange(ctx, req.UserUID, req.StartDate, req.EndDate)
+	snapshots, err := s.snapshotRepo.GetSeriesByUserAndDateRange(ctx, req.UserUID, req.StartDate, req.EndDate, repository.ProjectEquity)
 	if err != nil {
 		return nil, fmt.Errorf("fetch snapshots: %w", err)
 	}
@@ -149,7 +240,7 @@ func (s *ReportService) GenerateReport(ctx context.Context, req *GenerateReportR
 	})
 
 	// 2. Convert to daily returns (TWR with multi-exchange support)
-	dailyReturns := convertSnapshotsToDailyReturns(snapshots)
+	dailyReturns := s.metricsSvc.dailyReturns(ctx, req.UserUID, req.StartDate, req.EndDate, req.ExcludedExchanges, snapshots)
 
 	// 3. Calculate core metrics
 	metrics, err := s.metricsSvc.CalculateWithExcludedExchanges(ctx, req.UserUID, req.StartDate, req.EndDate, req.ExcludedExchanges)
@@ -251,24 +342,18 @@ func (s *ReportService) GenerateReport(ctx context.Context, req *GenerateReportR
 		return nil, err
 	}
 
-	// 11. Cache the signed report
-	s.cacheReport(ctx, req, report)
-
-	// 12. Apply display params (not signed)
-	report.Manager = req.Manager
-	report.Firm = req.Firm
-
 	return report, nil
 }
 
 const dateFormat = "2006-01-02"
 
-// checkReportCache looks for a cached report matching user + dates + benchmark.
+// checkReportCache looks for a stored report matching user + dates +
+// benchmark. The table key carries no exclusions, so filtered reports are
+// only cached in process.
 func (s *ReportService) checkReportCache(ctx context.Context, req *GenerateReportRequest) *signing.SignedReport {
 	if s.signedReportRepo == nil {
 		return nil
 	}
-	// Current cache key does not include exclusions; skip cache for filtered reports.
 	if len(req.ExcludedExchanges) > 0 {
 		return nil
 	}
@@ -280,6 +365,10 @@ func (s *ReportService) checkReportCache(ctx context.Context, req *GenerateRepor
 		}
 		return nil
 	}
+	period := reportPeriod{userUID: req.UserUID, start: req.StartDate, end: req.EndDate}
+	if s.reportCache != nil && !s.reportCache.storedReportCurrent(period, cached.CreatedAt) {
+		return nil
+	}
 
 	var report signing.SignedReport
 	if err := json.Unmarshal(cached.ReportData, &report); err != nil {
@@ -288,26 +377,52 @@ func (s *ReportService) checkReportCache(ctx context.Context, req *GenerateRepor
 		}
 		return nil
 	}
+	if !storedReportMatches(&report, req) {
+		return nil
+	}
 
 	return &report
 }
 
-// cacheReport stores a signed report for deduplication.
-func (s *ReportService) cacheReport(ctx context.Context, req *GenerateReportRequest, report *signing.SignedReport) {
+// storedReportMatches reports whether a report stored under req's table key
+// was generated with req's name, base currency and risk/drawdown flags,
+// which the key does not carry.
+func storedReportMatches(report *signing.SignedReport, req *GenerateReportRequest) bool {
+	currency := req.BaseCurrency
+	if currency == "" {
+		currency = "USD"
+	}
+	if report.BaseCurrency != currency {
+		return false
+	}
+	if req.ReportName == "" {
+		if !strings.HasPrefix(report.ReportName, "Performance Report ") {
+			return false
+		}
+	} else if report.ReportName != req.ReportName {
+		return false
+	}
+	return (report.RiskMetrics != nil) == req.IncludeRiskMetrics && (report.DrawdownData != nil) == req.IncludeDrawdown
+}
+
+// cacheReport stores a signed report for deduplication. reportData is the
+// report's JSON, or nil to have it encoded here.
+func (s *ReportService) cacheReport(ctx context.Context, req *GenerateReportRequest, report *signing.SignedReport, reportData []byte) {
 	if s.signedReportRepo == nil {
 		return
 	}
-	// Current cache key does not include exclusions; avoid storing filtered variants.
 	if len(req.ExcludedExchanges) > 0 {
 		return
 	}
 
-	reportData, err := json.Marshal(report)
-	if err != nil {
-		if s.logger != nil {
-			s.logger.Warn("report cache marshal failed", zap.Error(err))
+	if reportData == nil {
+		var err error
+		if reportData, err = json.Marshal(report); err != nil {
+			if s.logger != nil {
+				s.logger.Warn("report cache marshal failed", zap.Error(err))
+			}
+			return
 		}
-		return
 	}
 
 	record := &repository.SignedReportRecord{
@@ -332,122 +447,40 @@ func (s *ReportService) cacheReport(ctx context.Context, req *GenerateReportRequ
 // convertSnapshotsToDailyReturns implements TWR with multi-connection support.
 // Groups snapshots by date and connection key (exchange/label), handles virtual
 // deposits when new connections appear, and forward-fills missing connection data.
+// It runs over a twrMatrix, as does the stored return series (replaySeriesDays).
 func convertSnapshotsToDailyReturns(snapshots []*repository.Snapshot) []dailyReturn {
-	if len(snapshots) == 0 {
-		return nil
-	}
-
-	// Group snapshots by date -> exchange -> snapshot
-	type dateGroup struct {
-		date      string
-		timestamp time.Time
-		exchanges map[string]*repository.Snapshot
-	}
-
-	dateMap := make(map[string]*dateGroup)
-	var dateOrder []string
-
-	for _, snap := range snapshots {
-		dateStr := snap.Timestamp.Format("2006-01-02")
-		dg, exists := dateMap[dateStr]
-		if !exists {
-			dg = &dateGroup{
-				date:      dateStr,
-				timestamp: snap.Timestamp,
-				exchanges: make(map[string]*repository.Snapshot),
-			}
-			dateMap[dateStr] = dg
-			dateOrder = append(dateOrder, dateStr)
-		}
-		dg.exchanges[snapshotConnectionKey(snap.Exchange, snap.Label)] = snap
-	}
-
-	sort.Strings(dateOrder)
-
-	if len(dateOrder) < 2 {
+	m := newTWRMatrix(snapshots, nil)
+	if len(m.days) < 2 {
 		return nil
 	}
 
-	// Track known connection keys and their last known equity.
-	knownExchanges := make(map[string]float64) // connection key -> last equity
-	var returns []dailyReturn
-	cumulativeReturn := 0.0
-	nav := 1.0
-
-	for i, dateStr := range dateOrder {
-		dg := dateMap[dateStr]
-
-		if i == 0 {
-			// Initialize known exchanges with first day's data
-			for ex, snap := range dg.exchanges {
-				knownExchanges[ex] = snap.TotalEquity
-			}
-			continue
-		}
-
-		// Calculate total previous equity (forward-fill for missing exchanges)
-		totalPrevEquity := 0.0
-		for _, lastEq := range knownExchanges {
-			totalPrevEquity += lastEq
-		}
-
-		if totalPrevEquity == 0 {
-			// Update known exchanges
-			for ex, snap := range dg.exchanges {
-				knownExchanges[ex] = snap.TotalEquity
-			}
-			continue
-		}
-
-		// Calculate current total, handling new exchanges as virtual deposits
-		totalCurrentEquity := 0.0
-		virtualDeposits := 0.0
-
-		for ex, lastEq := range knownExchanges {
-			if snap, exists := dg.exchanges[ex]; exists {
-				// Exchange has data today
-				adjustedEquity := snap.TotalEquity - snap.Deposits + snap.Withdrawals
-				totalCurrentEquity += adjustedEquity
-				knownExchanges[ex] = snap.TotalEquity
-			} else {
-				// Forward-fill: use last known equity
-				totalCurrentEquity += lastEq
-			}
-		}
-
-		// Check for new connection keys appearing today.
-		for ex, snap := range dg.exchanges {
-			if _, known := knownExchanges[ex]; !known {
-				// New connection - treat as virtual deposit.
-				virtualDeposits += snap.TotalEquity
-				knownExchanges[ex] = snap.TotalEquity
-			}
-		}
-
-		// TWR: adjust denominator for virtual deposits
-		adjustedPrev := totalPrevEquity + virtualDeposits
-
-		var dayReturn float64
-		if adjustedPrev > 0 {
-			dayReturn = (totalCurrentEquity + virtualDeposits - adjustedPrev) / adjustedPrev
-		}
-
+	var (
+		returns          []dailyReturn
+		cumulativeReturn = 0.0
+		nav              = 1.0
+	)
+	m.returns(func(row int, dayReturn float64) {
 		cumulativeReturn = (1+cumulativeReturn)*(1+dayReturn) - 1
 		nav = nav * (1 + dayReturn)
 
 		returns = append(returns, dailyReturn{
-			date:             dateStr,
+			date:             m.date(row),
 			netReturn:        dayReturn,
 			benchmarkReturn:  0, // Benchmark data not available from exchange APIs
 			outperformance:   dayReturn,
 			cumulativeReturn: cumulativeReturn,
 			nav:              nav,
 		})
-	}
+	})
 
 	return returns
 }
 
+// snapshotDate is the date a snapshot is grouped under.
+func snapshotDate(t time.Time) string {
+	return t.Format("2006-01-02")
+}
+
 // aggregateToMonthlyReturns groups daily returns by month and compounds them
 func aggregateToMonthlyReturns(daily []dailyReturn, snapshots []*repository.Snapshot) []monthlyReturn {
 	if len(daily) == 0 {
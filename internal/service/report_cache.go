@@ -0,0 +1,321 @@
+package service
+
+import (
+	"encoding/json"
+	"sort"
+	"strconv"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/cache"
+	"github.com/trackrecord/enclave/internal/signing"
+)
+
+// maxReportWritesPerUser bounds the snapshot writes remembered per user;
+// beyond it the oldest two are merged into one wider, later write.
+const maxReportWritesPerUser = 16
+
+// PERF-021: in-process cache of signed reports, in front of the
+// signed_reports table. checkReportCache read the table and json.Unmarshal'ed
+// the stored JSONB on every request, and reports with excluded connections
+// bypassed it entirely, so each of them was recomputed and re-signed. Entries
+// are keyed by everything that shapes the signed report (reportCacheKey) and
+// hold it both decoded and serialized, so a hit neither decodes nor encodes.
+// The snapshot repository tells the cache about its writes; an entry whose
+// period a write lands in is dropped.
+//
+// The TTL bounds staleness for writes this process does not see (another
+// replica's sync) and for connection metadata, which is not tracked. It also
+// bounds how long a write is remembered to find stale signed_reports rows.
+type reportCache struct {
+	mu      sync.Mutex
+	reports *cache.LRU[string, *reportEntry]
+	byUser  map[string]map[string]reportPeriod // keys of reports, by user
+	loads   map[*reportLoad]struct{}
+	writes  map[string][]reportWrite // by user: recent snapshot writes, oldest first
+	pruned  time.Time                // last sweep of writes
+	ttl     time.Duration
+	now     func() time.Time
+
+	hits, misses, invalidations atomic.Int64
+}
+
+type reportEntry struct {
+	period reportPeriod
+	report *signing.SignedReport // without display params, read-only
+	data   []byte                // report as JSON, read-only
+}
+
+// reportPeriod is the snapshot range a report is computed from.
+type reportPeriod struct {
+	userUID    string
+	start, end time.Time
+}
+
+// reportLoad marks a report being generated; a write to its period
+// meanwhile makes the result stale, so it is returned but not cached.
+type reportLoad struct {
+	period reportPeriod
+	stale  bool
+}
+
+// reportWrite is a snapshot write seen for a user: the span of timestamps
+// written and when. A zero from and to cover the whole history.
+type reportWrite struct {
+	from, to time.Time
+	at       time.Time
+}
+
+// ReportCacheStats is a point-in-time view of the signed report cache.
+type ReportCacheStats struct {
+	Hits          int64
+	Misses        int64
+	Evictions     int64
+	Invalidations int64
+	Reports       int
+	Bytes         int64
+	MaxBytes      int64
+}
+
+func newReportCache(maxBytes int64, ttl time.Duration) *reportCache {
+	c := &reportCache{
+		byUser: make(map[string]map[string]reportPeriod),
+		loads:  make(map[*reportLoad]struct{}),
+		writes: make(map[string][]reportWrite),
+		ttl:    ttl,
+		now:    time.Now,
+	}
+	c.reports = cache.NewLRU(maxBytes, ttl, func() time.Time { return c.now() }, c.unindexLocked)
+	return c
+}
+
+// reportCacheKey normalizes a request into the cache key: user, period,
+// name, benchmark, base currency (empty is USD, as GenerateReport signs it),
+// the risk and drawdown flags and the sorted exclusion set. Display params
+// are not part of it. Fields are length-prefixed, so no value can run into
+// the next one.
+func reportCacheKey(req *GenerateReportRequest) string {
+	currency := req.BaseCurrency
+	if currency == "" {
+		currency = "USD"
+	}
+	excluded := make([]string, 0, len(req.ExcludedExchanges))
+	for k := range req.ExcludedExchanges {
+		excluded = append(excluded, k)
+	}
+	sort.Strings(excluded)
+
+	b := make([]byte, 0, 128)
+	field := func(s string) {
+		b = strconv.AppendInt(b, int64(len(s)), 10)
+		b = append(b, ':')
+		b = append(b, s...)
+	}
+	field(req.UserUID)
+	field(req.StartDate.UTC().Format(time.RFC3339))
+	field(req.EndDate.UTC().Format(time.RFC3339))
+	field(req.ReportName)
+	field(req.Benchmark)
+	field(currency)
+	b = strconv.AppendBool(b, req.IncludeRiskMetrics)
+	b = strconv.AppendBool(b, req.IncludeDrawdown)
+	for _, k := range excluded {
+		field(k)
+	}
+	return string(b)
+}
+
+// overlaps reports whether snapshots written for userUID within [from, to]
+// can change reports of p. The end day is covered whole.
+func (p reportPeriod) overlaps(userUID string, from, to time.Time) bool {
+	if userUID != p.userUID {
+		return false
+	}
+	if from.IsZero() && to.IsZero() {
+		return true
+	}
+	return !to.Before(p.start) && from.Before(p.end.Add(24*time.Hour))
+}
+
+func (c *reportCache) get(key string) (*reportEntry, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	e, ok := c.reports.Get(key)
+	if !ok {
+		c.misses.Add(1)
+		return nil, false
+	}
+	c.hits.Add(1)
+	return e, true
+}
+
+func (c *reportCache) beginLoad(period reportPeriod) *reportLoad {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	load := &reportLoad{period: period}
+	c.loads[load] = struct{}{}
+	return load
+}
+
+// endLoad caches the report a load produced under key; a nil report only
+// ends the load.
+func (c *reportCache) endLoad(load *reportLoad, key string, report *signing.SignedReport, data []byte) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	delete(c.loads, load)
+	if report == nil || load.stale {
+		return
+	}
+	// Decoded reports take about as much memory as their JSON.
+	size := int64(2*len(data) + len(key))
+	e := &reportEntry{period: load.period, report: report, data: data}
+	if !c.reports.Add(key, e, size) {
+		return
+	}
+	user := load.period.userUID
+	if c.byUser[user] == nil {
+		c.byUser[user] = make(map[string]reportPeriod)
+	}
+	c.byUser[user][key] = load.period
+}
+
+// invalidate drops the reports of userUID whose period snapshots written
+// within [from, to] fall in; a zero from and to drop all of them. It has the
+// signature of SnapshotRepo.OnSnapshotsWritten.
+func (c *reportCache) invalidate(userUID string, from, to time.Time) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	for key, period := range c.byUser[userUID] {
+		if period.overlaps(userUID, from, to) {
+			c.reports.Remove(key)
+		}
+	}
+	for load := range c.loads {
+		if load.period.overlaps(userUID, from, to) {
+			load.stale = true
+		}
+	}
+
+	now := c.now()
+	c.pruneWritesLocked(now)
+	writes := append(c.writes[userUID], reportWrite{from: from, to: to, at: now})
+	if len(writes) > maxReportWritesPerUser {
+		writes[1] = mergeReportWrites(writes[0], writes[1])
+		writes = append(writes[:0], writes[1:]...)
+	}
+	c.writes[userUID] = writes
+	c.invalidations.Add(1)
+}
+
+// storedReportCurrent reports whether a signed_reports row for period,
+// stored at createdAt, was generated after every snapshot write this cache
+// has seen inside the period within the TTL. Stale rows are regenerated,
+// which overwrites them. createdAt is the database clock, compared with this
+// process's.
+func (c *reportCache) storedReportCurrent(period reportPeriod, createdAt time.Time) bool {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	now := c.now()
+	for _, w := range c.writes[period.userUID] {
+		if c.writeExpired(w, now) || !createdAt.Before(w.at) {
+			continue
+		}
+		if period.overlaps(period.userUID, w.from, w.to) {
+			return false
+		}
+	}
+	return true
+}
+
+func (c *reportCache) writeExpired(w reportWrite, now time.Time) bool {
+	return c.ttl > 0 && now.Sub(w.at) > c.ttl
+}
+
+// pruneWritesLocked forgets the writes older than the TTL, sweeping every
+// user at most once per TTL.
+func (c *reportCache) pruneWritesLocked(now time.Time) {
+	if c.ttl <= 0 || now.Sub(c.pruned) <= c.ttl {
+		return
+	}
+	c.pruned = now
+	for user, writes := range c.writes {
+		i := 0
+		for i < len(writes) && c.writeExpired(writes[i], now) {
+			i++
+		}
+		switch {
+		case i == len(writes):
+			delete(c.writes, user)
+		case i > 0:
+			c.writes[user] = append(writes[:0], writes[i:]...)
+		}
+	}
+}
+
+// mergeReportWrites returns a write covering a and b, seen at the later of
+// the two, so that no row either makes stale is taken as current.
+func mergeReportWrites(a, b reportWrite) reportWrite {
+	w := b
+	switch {
+	case a.from.IsZero() && a.to.IsZero(), b.from.IsZero() && b.to.IsZero():
+		w.from, w.to = time.Time{}, time.Time{}
+	default:
+		if a.from.Before(w.from) {
+			w.from = a.from
+		}
+		if a.to.After(w.to) {
+			w.to = a.to
+		}
+	}
+	if a.at.After(w.at) {
+		w.at = a.at
+	}
+	return w
+}
+
+// unindexLocked drops a report leaving the LRU from the per-user index.
+func (c *reportCache) unindexLocked(key string, e *reportEntry) {
+	user := c.byUser[e.period.userUID]
+	delete(user, key)
+	if len(user) == 0 {
+		delete(c.byUser, e.period.userUID)
+	}
+}
+
+func (c *reportCache) stats() ReportCacheStats {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return ReportCacheStats{
+		Hits:          c.hits.Load(),
+		Misses:        c.misses.Load(),
+		Evictions:     c.reports.Evictions(),
+		Invalidations: c.invalidations.Load(),
+		Reports:       c.reports.Len(),
+		Bytes:         c.reports.Bytes(),
+		MaxBytes:      c.reports.MaxBytes(),
+	}
+}
+
+// withDisplayParams returns the serialized report data with the unsigned
+// display params added, as json.Marshal would encode them had they been set
+// on the report (placed last instead of in field order). data is returned as
+// is when both are empty.
+func withDisplayParams(data []byte, manager, firm string) []byte {
+	if manager == "" && firm == "" {
+		return data
+	}
+	out := make([]byte, 0, len(data)+len(manager)+len(firm)+24)
+	out = append(out, data[:len(data)-1]...) // without the closing brace
+	if manager != "" {
+		b, _ := json.Marshal(manager) // a string always encodes
+		out = append(out, `,"manager":`...)
+		out = append(out, b...)
+	}
+	if firm != "" {
+		b, _ := json.Marshal(firm)
+		out = append(out, `,"firm":`...)
+		out = append(out, b...)
+	}
+	return append(out, '}')
+}
@@ -0,0 +1,221 @@
+package service
+
+import (
+	"context"
+	"encoding/json"
+	"reflect"
+	"testing"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/signing"
+)
+
+func TestReportCacheKey_Normalization(t *testing.T) {
+	base := GenerateReportRequest{
+		UserUID:           "u1",
+		StartDate:         time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC),
+		EndDate:           time.Date(2025, 6, 30, 0, 0, 0, 0, time.UTC),
+		ExcludedExchanges: map[string]struct{}{"binance": {}, "ibkr/main": {}},
+	}
+	key := reportCacheKey(&base)
+
+	same := base
+	same.BaseCurrency = "USD"
+	same.Manager, same.Firm = "M", "F"
+	same.ExcludedExchanges = map[string]struct{}{"ibkr/main": {}, "binance": {}}
+	if reportCacheKey(&same) != key {
+		t.Fatal("default currency, display params or exclusion order changed the key")
+	}
+
+	for name, mutate := range map[string]func(r *GenerateReportRequest){
+		"currency":  func(r *GenerateReportRequest) { r.BaseCurrency = "EUR" },
+		"risk":      func(r *GenerateReportRequest) { r.IncludeRiskMetrics = true },
+		"drawdown":  func(r *GenerateReportRequest) { r.IncludeDrawdown = true },
+		"benchmark": func(r *GenerateReportRequest) { r.Benchmark = "spy" },
+		"name":      func(r *GenerateReportRequest) { r.ReportName = "Q2" },
+		"end":       func(r *GenerateReportRequest) { r.EndDate = r.EndDate.AddDate(0, 0, 1) },
+		"excluded":  func(r *GenerateReportRequest) { r.ExcludedExchanges = map[string]struct{}{"binance": {}} },
+		"none":      func(r *GenerateReportRequest) { r.ExcludedExchanges = nil },
+		// Field boundaries: "binance"+"ibkr/main" must not read as one key.
+		"joined": func(r *GenerateReportRequest) { r.ExcludedExchanges = map[string]struct{}{"binanceibkr/main": {}} },
+	} {
+		other := base
+		mutate(&other)
+		if reportCacheKey(&other) == key {
+			t.Fatalf("%s: distinct requests share a key", name)
+		}
+	}
+}
+
+func TestReportCache_InvalidationAndLRU(t *testing.T) {
+	clock := time.Date(2026, 1, 1, 0, 0, 0, 0, time.UTC)
+	c := newReportCache(1<<20, time.Hour)
+	c.now = func() time.Time { return clock }
+
+	jan := reportPeriod{userUID: "a", start: time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC), end: time.Date(2025, 1, 31, 0, 0, 0, 0, time.UTC)}
+	feb := reportPeriod{userUID: "a", start: time.Date(2025, 2, 1, 0, 0, 0, 0, time.UTC), end: time.Date(2025, 2, 28, 0, 0, 0, 0, time.UTC)}
+	store := func(key string, p reportPeriod) {
+		load := c.beginLoad(p)
+		c.endLoad(load, key, &signing.SignedReport{ReportID: key}, []byte(`{}`))
+	}
+	store("jan", jan)
+	store("feb", feb)
+
+	// Another user's write, and one after January's end day, keep it.
+	c.invalidate("b", time.Time{}, time.Time{})
+	c.invalidate("a", feb.start.Add(24*time.Hour), feb.start.Add(24*time.Hour))
+	if _, ok := c.get("jan"); !ok {
+		t.Fatal("write outside the period dropped the report")
+	}
+	if _, ok := c.get("feb"); ok {
+		t.Fatal("write inside the period kept the report")
+	}
+	// The end day is covered whole.
+	c.invalidate("a", jan.end.Add(12*time.Hour), jan.end.Add(12*time.Hour))
+	if _, ok := c.get("jan"); ok {
+		t.Fatal("write on the end day kept the report")
+	}
+
+	// A write lands while a report is generated: it is not cached.
+	load := c.beginLoad(jan)
+	c.invalidate("a", jan.start, jan.start)
+	c.endLoad(load, "jan", &signing.SignedReport{}, []byte(`{}`))
+	if _, ok := c.get("jan"); ok {
+		t.Fatal("report generated across a write was cached")
+	}
+
+	// signed_reports rows older than the last write in their period are
+	// stale; newer ones and other periods are not.
+	if c.storedReportCurrent(jan, clock.Add(-time.Minute)) {
+		t.Fatal("row stored before a write in its period is current")
+	}
+	if !c.storedReportCurrent(jan, clock.Add(time.Minute)) {
+		t.Fatal("row stored after the last write is stale")
+	}
+	later := reportPeriod{userUID: "a", start: time.Date(2025, 6, 1, 0, 0, 0, 0, time.UTC), end: time.Date(2025, 6, 30, 0, 0, 0, 0, time.UTC)}
+	if !c.storedReportCurrent(later, clock.Add(-time.Minute)) {
+		t.Fatal("row for a period without writes is stale")
+	}
+
+	store("jan", jan)
+	clock = clock.Add(2 * time.Hour)
+	if _, ok := c.get("jan"); ok {
+		t.Fatal("expired report served")
+	}
+	if st := c.stats(); st.Reports != 0 || st.Bytes != 0 || len(c.byUser) != 0 {
+		t.Fatalf("accounting: %+v, %d users indexed", st, len(c.byUser))
+	}
+
+	// Over budget: the least recently used report goes.
+	small := newReportCache(3*(2*2+1)-1, 0) // room for two reports
+	for _, key := range []string{"1", "2", "3"} {
+		load := small.beginLoad(jan)
+		small.endLoad(load, key, &signing.SignedReport{}, []byte(`{}`))
+		small.get("1")
+	}
+	if _, ok := small.get("2"); ok {
+		t.Fatal("least recently used report not evicted")
+	}
+	if _, ok := small.get("1"); !ok {
+		t.Fatal("recently used report evicted")
+	}
+}
+
+func TestReportCache_StoredReportsAgainstOverlappingWrites(t *testing.T) {
+	clock := time.Date(2026, 1, 1, 0, 0, 0, 0, time.UTC)
+	c := newReportCache(1<<20, time.Hour)
+	c.now = func() time.Time { return clock }
+
+	jan := reportPeriod{userUID: "a", start: time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC), end: time.Date(2025, 1, 31, 0, 0, 0, 0, time.UTC)}
+	c.invalidate("a", jan.start, jan.start)
+	stored := clock.Add(time.Minute)
+	clock = clock.Add(10 * time.Minute)
+	c.invalidate("a", time.Date(2025, 6, 1, 0, 0, 0, 0, time.UTC), time.Date(2025, 6, 1, 0, 0, 0, 0, time.UTC))
+
+	// Only the January write counts against a January row.
+	if !c.storedReportCurrent(jan, stored) {
+		t.Fatal("later write outside the period made the row stale")
+	}
+	if c.storedReportCurrent(jan, stored.Add(-2*time.Minute)) {
+		t.Fatal("row stored before a write in its period is current")
+	}
+
+	// Writes are kept per user up to a bound, merged conservatively.
+	for i := 0; i < 2*maxReportWritesPerUser; i++ {
+		c.invalidate("b", jan.start.AddDate(0, 0, i), jan.start.AddDate(0, 0, i))
+	}
+	if n := len(c.writes["b"]); n != maxReportWritesPerUser {
+		t.Fatalf("%d writes kept for a user, want %d", n, maxReportWritesPerUser)
+	}
+	if c.storedReportCurrent(reportPeriod{userUID: "b", start: jan.start, end: jan.start}, stored.Add(-2*time.Minute)) {
+		t.Fatal("merging writes lost the first one")
+	}
+
+	// Past the TTL writes are forgotten.
+	clock = clock.Add(2 * time.Hour)
+	c.invalidate("c", time.Time{}, time.Time{})
+	if len(c.writes) != 1 || len(c.writes["c"]) != 1 {
+		t.Fatalf("expired writes kept: %v", c.writes)
+	}
+}
+
+func TestGenerateReport_ServesCachedReport(t *testing.T) {
+	req := &GenerateReportRequest{
+		UserUID:   "u1",
+		StartDate: time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC),
+		EndDate:   time.Date(2025, 6, 30, 0, 0, 0, 0, time.UTC),
+		Manager:   `Jane "J" Doe`,
+		Firm:      "Acme & Co",
+	}
+	signer := signing.MustNewReportSignerGenerate()
+	cached, err := signer.Sign(&signing.ReportInput{
+		UserUID:     req.UserUID,
+		ReportName:  "Test",
+		PeriodStart: req.StartDate,
+		PeriodEnd:   req.EndDate,
+		TotalReturn: 0.1,
+		DataPoints:  100,
+	})
+	if err != nil {
+		t.Fatal(err)
+	}
+	data, err := json.Marshal(cached)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	// No snapshot repository: a cache miss would dereference it.
+	s := &ReportService{reportCache: newReportCache(1<<20, 0)}
+	load := s.reportCache.beginLoad(reportPeriod{userUID: req.UserUID, start: req.StartDate, end: req.EndDate})
+	s.reportCache.endLoad(load, reportCacheKey(req), cached, data)
+
+	report, err := s.GenerateReport(context.Background(), req)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if report == cached || report.Manager != req.Manager || report.Firm != req.Firm || cached.Manager != "" {
+		t.Fatal("display params not applied to a copy of the cached report")
+	}
+
+	body, err := s.GenerateReportJSON(context.Background(), req)
+	if err != nil {
+		t.Fatal(err)
+	}
+	want, err := json.Marshal(report)
+	if err != nil {
+		t.Fatal(err)
+	}
+	var got, exp map[string]any
+	if err := json.Unmarshal(body, &got); err != nil {
+		t.Fatalf("GenerateReportJSON body is not JSON: %v\n%s", err, body)
+	}
+	if err := json.Unmarshal(want, &exp); err != nil {
+		t.Fatal(err)
+	}
+	if !reflect.DeepEqual(got, exp) {
+		t.Fatalf("GenerateReportJSON = %s\nwant %s", body, want)
+	}
+	if st := s.ReportCacheStatistics(); st.Hits != 2 || st.Misses != 0 {
+		t.Fatalf("lookups: %+v", st)
+	}
+}
@@ -0,0 +1,355 @@
+package service
+
+import (
+	"math"
+	"math/bits"
+	"sort"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+// returnIndex answers performance statistics over any date window of one
+// daily return series (PERF-013). The dashboard asks for several
+// overlapping windows (1M/3M/YTD/1Y/All) of the same series; each used to
+// rescan its returns once per statistic (mean, stddev, downside deviation,
+// win/loss, drawdown). The index is built in one pass and then answers:
+//
+//   - moments, downside and win/loss sums from prefix sums, in O(1);
+//   - max drawdown and its duration in O(log n), by binary lifting over the
+//     chain of running-peak changes (see drawdown);
+//   - current drawdown from a sparse-table range maximum, in O(1).
+//
+// Prefix sums are compensated and taken around the series mean, so a
+// window's sums keep full precision however long the series and its
+// central moments do not cancel catastrophically; results match the
+// scanning functions to rounding (see TestReturnIndex_MatchesScans).
+type returnIndex struct {
+	days []repository.ReturnSeriesDay
+
+	// Day i's return, if any, is return number pos[i]-1: pos[i] counts the
+	// returns of days 0..i. Arrays over returns have one entry per return
+	// plus a leading zero (prefix sums) or the initial NAV (nav).
+	pos         []int
+	connections []int // prefix sum of Connections over days
+
+	shift        float64 // series mean the power sums are centred on
+	sum1, sum2   prefixSum
+	downSq       prefixSum // squares of negative returns
+	gain, loss   prefixSum // positive returns, |negative returns|
+	wins, losses []int
+
+	// nav[t] is the NAV after t returns, nav[0] = 1.
+	nav []float64
+	// peakMax is a sparse table of range maxima of nav.
+	peakMax [][]float64
+	// troughMin is a sparse table of range minima of nav, as indices; ties
+	// resolve to the earliest index.
+	troughMin [][]int32
+	// next[t] is the first index after t with a NAV strictly above nav[t]
+	// (len(nav) if none): where a scan starting at t moves its peak.
+	// jump[k][t] is next applied 2^k times, and best[k][t] the deepest
+	// drawdown over the 2^k peak segments starting at t.
+	jump [][]int32
+	best [][]drawdownSpan
+}
+
+// drawdownSpan is the deepest drawdown of a span: depth (peak - nav) / peak
+// and the distance in returns from the peak to the trough. Zero depth means
+// the span never fell below its peak.
+type drawdownSpan struct {
+	depth    float64
+	duration int
+}
+
+// deeper keeps the earlier of two spans unless the later one is strictly
+// deeper, as analyzeDrawdownNAV does.
+func deeper(earlier, later drawdownSpan) drawdownSpan {
+	if later.depth > earlier.depth {
+		return later
+	}
+	return earlier
+}
+
+// newReturnIndex indexes days in date order, as stored in return_series or
+// built by replaySeriesDays.
+func newReturnIndex(days []repository.ReturnSeriesDay) *returnIndex {
+	x := &returnIndex{
+		days:        days,
+		pos:         make([]int, len(days)),
+		connections: make([]int, len(days)+1),
+	}
+
+	var returns []float64
+	for i, d := range days {
+		if d.HasReturn {
+			returns = append(returns, d.NetReturn)
+		}
+		x.pos[i] = len(returns)
+		x.connections[i+1] = x.connections[i] + d.Connections
+	}
+	x.shift = mean(returns)
+
+	n := len(returns)
+	for _, p := range []*prefixSum{&x.sum1, &x.sum2, &x.downSq, &x.gain, &x.loss} {
+		p.init(n)
+	}
+	x.wins, x.losses = make([]int, n+1), make([]int, n+1)
+	x.nav = make([]float64, n+1)
+	x.nav[0] = 1
+	for t, r := range returns {
+		d := r - x.shift
+		x.sum1.add(t, d)
+		x.sum2.add(t, d*d)
+		var gain, loss, downSq float64
+		x.wins[t+1], x.losses[t+1] = x.wins[t], x.losses[t]
+		switch {
+		case r > 0:
+			x.wins[t+1]++
+			gain = r
+		case r < 0:
+			x.losses[t+1]++
+			loss = math.Abs(r)
+			downSq = r * r
+		}
+		x.gain.add(t, gain)
+		x.loss.add(t, loss)
+		x.downSq.add(t, downSq)
+		x.nav[t+1] = x.nav[t] * (1 + r)
+	}
+
+	x.buildDrawdownTables()
+	return x
+}
+
+func (x *returnIndex) buildDrawdownTables() {
+	m := len(x.nav)
+	levels := bits.Len(uint(m))
+
+	x.peakMax = make([][]float64, levels)
+	x.troughMin = make([][]int32, levels)
+	x.peakMax[0] = append([]float64(nil), x.nav...)
+	x.troughMin[0] = make([]int32, m)
+	for i := range x.troughMin[0] {
+		x.troughMin[0][i] = int32(i)
+	}
+	for k := 1; k < levels; k++ {
+		half := 1 << (k - 1)
+		size := m - 1<<k + 1
+		x.peakMax[k] = make([]float64, size)
+		x.troughMin[k] = make([]int32, size)
+		for i := 0; i < size; i++ {
+			x.peakMax[k][i] = math.Max(x.peakMax[k-1][i], x.peakMax[k-1][i+half])
+			x.troughMin[k][i] = x.lowerIndex(x.troughMin[k-1][i], x.troughMin[k-1][i+half])
+		}
+	}
+
+	// Next strictly greater NAV, by a monotonic stack.
+	next := make([]int32, m)
+	stack := make([]int32, 0, m)
+	for i := m - 1; i >= 0; i-- {
+		for len(stack) > 0 && x.nav[stack[len(stack)-1]] <= x.nav[i] {
+			stack = stack[:len(stack)-1]
+		}
+		next[i] = int32(m)
+		if len(stack) > 0 {
+			next[i] = stack[len(stack)-1]
+		}
+		stack = append(stack, int32(i))
+	}
+
+	// Level 0: a scan starting at t keeps nav[t] as its peak until next[t];
+	// the segment's deepest point is its earliest minimum. Index m is a
+	// sentinel that jumps to itself.
+	x.jump = make([][]int32, levels)
+	x.best = make([][]drawdownSpan, levels)
+	x.jump[0] = append(next, int32(m))
+	x.best[0] = make([]drawdownSpan, m+1)
+	for t := 0; t < m; t++ {
+		x.best[0][t] = x.segmentDrawdown(t, int(next[t]))
+	}
+	for k := 1; k < levels; k++ {
+		x.jump[k] = make([]int32, m+1)
+		x.best[k] = make([]drawdownSpan, m+1)
+		for t := 0; t <= m; t++ {
+			mid := x.jump[k-1][t]
+			x.jump[k][t] = x.jump[k-1][mid]
+			x.best[k][t] = deeper(x.best[k-1][t], x.best[k-1][mid])
+		}
+	}
+}
+
+// lowerIndex returns the index of the lower NAV, the earlier one on a tie.
+func (x *returnIndex) lowerIndex(a, b int32) int32 {
+	if x.nav[b] < x.nav[a] || (x.nav[b] == x.nav[a] && b < a) {
+		return b
+	}
+	return a
+}
+
+// rangeMax returns the highest NAV in [lo, hi].
+func (x *returnIndex) rangeMax(lo, hi int) float64 {
+	k := bits.Len(uint(hi-lo+1)) - 1
+	return math.Max(x.peakMax[k][lo], x.peakMax[k][hi-1<<k+1])
+}
+
+// rangeMin returns the index of the earliest lowest NAV in [lo, hi].
+func (x *returnIndex) rangeMin(lo, hi int) int {
+	k := bits.Len(uint(hi-lo+1)) - 1
+	return int(x.lowerIndex(x.troughMin[k][lo], x.troughMin[k][hi-1<<k+1]))
+}
+
+// segmentDrawdown is the drawdown from the peak nav[t] to the lowest NAV in
+// [t, end).
+func (x *returnIndex) segmentDrawdown(t, end int) drawdownSpan {
+	peak := x.nav[t]
+	trough := x.rangeMin(t, end-1)
+	dd := (peak - x.nav[trough]) / peak
+	if dd <= 0 {
+		return drawdownSpan{}
+	}
+	return drawdownSpan{depth: dd, duration: trough - t}
+}
+
+// drawdown returns what analyzeDrawdownNAV reports for nav[lo..hi]: the
+// deepest drawdown, its duration and the drawdown at hi. A scan over the
+// window moves its peak exactly along the chain lo, next[lo], ... so the
+// window splits into whole peak segments, combined through jump/best, and a
+// last segment cut at hi.
+func (x *returnIndex) drawdown(lo, hi int) (maxDD float64, duration int, currentDD float64) {
+	var acc drawdownSpan
+	t := lo
+	for k := len(x.jump) - 1; k >= 0; k-- {
+		if int(x.jump[k][t]) <= hi {
+			acc = deeper(acc, x.best[k][t])
+			t = int(x.jump[k][t])
+		}
+	}
+	acc = deeper(acc, x.segmentDrawdown(t, hi+1))
+
+	peak := x.rangeMax(lo, hi)
+	currentDD = (peak - x.nav[hi]) / peak
+	if currentDD < 0 {
+		currentDD = 0
+	}
+	return acc.depth, acc.duration, currentDD
+}
+
+// windowStats are the statistics of one window's daily returns, as
+// calculateFromSeries derives them by scanning.
+type windowStats struct {
+	returns     int
+	mean        float64
+	stddev      float64 // sample standard deviation
+	downside    float64 // downside deviation below 0
+	totalReturn float64
+
+	maxDD, currentDD float64
+	maxDDDuration    int
+
+	winRate, profitFactor, avgWin, avgLoss float64
+
+	periodStart, periodEnd time.Time
+	dataPoints             int
+	snapshots              int
+}
+
+// window returns the statistics of [start, end]. ok is false when the
+// indexed series cannot answer the window exactly, under the same rules as
+// rangeFromSeries: a date straddles a bound, or a connection seen before
+// the window's first date is missing on it.
+func (x *returnIndex) window(start, end time.Time) (ws windowStats, ok bool) {
+	a := sort.Search(len(x.days), func(i int) bool { return !x.days[i].LastTS.Before(start) })
+	b := sort.Search(len(x.days), func(i int) bool { return x.days[i].FirstTS.After(end) }) - 1
+	if a > b {
+		return windowStats{}, true
+	}
+	first, last := x.days[a], x.days[b]
+	if first.FirstTS.Before(start) || last.LastTS.After(end) || first.Known != first.Connections {
+		return windowStats{}, false
+	}
+
+	ws.periodStart, ws.periodEnd = first.FirstTS, last.LastTS
+	ws.dataPoints = b - a + 1
+	ws.snapshots = x.connections[b+1] - x.connections[a]
+
+	// The window's returns are those of days a+1..b: numbers lo..hi-1.
+	lo, hi := x.pos[a], x.pos[b]
+	n := hi - lo
+	ws.returns = n
+	if n == 0 {
+		return ws, true
+	}
+	fn := float64(n)
+
+	s1 := x.sum1.over(lo, hi)
+	ws.mean = x.shift + s1/fn
+	if n > 1 {
+		ws.stddev = math.Sqrt(centredSquares(x.sum2.over(lo, hi), s1, fn) / (fn - 1))
+	}
+	if losses := x.losses[hi] - x.losses[lo]; losses > 0 {
+		ws.downside = math.Sqrt(x.downSq.over(lo, hi) / float64(losses))
+	}
+
+	wins, losses := x.wins[hi]-x.wins[lo], x.losses[hi]-x.losses[lo]
+	gain, loss := x.gain.over(lo, hi), x.loss.over(lo, hi)
+	if wins+losses > 0 {
+		ws.winRate = float64(wins) / float64(wins+losses)
+	}
+	if loss > 0 {
+		ws.profitFactor = gain / loss
+	}
+	if wins > 0 {
+		ws.avgWin = gain / float64(wins)
+	}
+	if losses > 0 {
+		ws.avgLoss = loss / float64(losses)
+	}
+
+	ws.totalReturn = x.nav[hi]/x.nav[lo] - 1
+	ws.maxDD, ws.maxDDDuration, ws.currentDD = x.drawdown(lo, hi)
+	return ws, true
+}
+
+// centredSquares returns the sum of squared deviations from the mean of n
+// values, given their sum s1 and sum of squares s2 around any centre. A
+// result within rounding of zero is zero: the values are all equal.
+func centredSquares(s2, s1, n float64) float64 {
+	ss := s2 - s1*s1/n
+	if ss <= 8*epsilon*s2 {
+		return 0
+	}
+	return ss
+}
+
+// epsilon is the float64 machine epsilon.
+const epsilon = 0x1p-52
+
+// prefixSum is a compensated prefix sum: the prefix of the first t values
+// is hi[t] + lo[t], where lo accumulates the rounding error of each
+// addition to hi (Neumaier). The sum over a range then carries the rounding
+// of the range alone, not of the whole prefix before it.
+type prefixSum struct {
+	hi, lo []float64
+}
+
+func (p *prefixSum) init(n int) {
+	p.hi, p.lo = make([]float64, n+1), make([]float64, n+1)
+}
+
+// add sets prefix t+1 to prefix t plus v.
+func (p *prefixSum) add(t int, v float64) {
+	sum := p.hi[t] + v
+	var err float64
+	if math.Abs(p.hi[t]) >= math.Abs(v) {
+		err = (p.hi[t] - sum) + v
+	} else {
+		err = (v - sum) + p.hi[t]
+	}
+	p.hi[t+1], p.lo[t+1] = sum, p.lo[t]+err
+}
+
+// over returns the sum of values lo..hi-1.
+func (p *prefixSum) over(lo, hi int) float64 {
+	return (p.hi[hi] - p.hi[lo]) + (p.lo[hi] - p.lo[lo])
+}
@@ -0,0 +1,127 @@
+package service
+
+import (
+	"math"
+	"math/rand"
+	"testing"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+// indexTestDays returns n days of one connection with random returns. Some
+// days have no return and a fifth return exactly zero, so NAVs repeat and
+// drawdown ties are exercised.
+func indexTestDays(rng *rand.Rand, n int) []repository.ReturnSeriesDay {
+	day0 := time.Date(2020, 1, 1, 0, 0, 0, 0, time.UTC)
+	days := make([]repository.ReturnSeriesDay, n)
+	for i := range days {
+		ts := day0.AddDate(0, 0, i)
+		d := repository.ReturnSeriesDay{
+			Date: snapshotDate(ts), FirstTS: ts, LastTS: ts, Connections: 1, Known: 1,
+		}
+		switch p := rng.Float64(); {
+		case i == 0 || p < 0.05:
+		case p < 0.25:
+			d.HasReturn = true
+		default:
+			d.HasReturn = true
+			d.NetReturn = 0.0005 + rng.NormFloat64()*0.02
+		}
+		days[i] = d
+	}
+	return days
+}
+
+// scanWindow is the series the existing path computes for days a..b.
+func scanWindow(days []repository.ReturnSeriesDay, a, b int) *dailySeries {
+	ds := &dailySeries{
+		periodStart: days[a].FirstTS,
+		periodEnd:   days[b].LastTS,
+		dataPoints:  b - a + 1,
+		snapshots:   b - a + 1,
+	}
+	cumulativeReturn, nav := 0.0, 1.0
+	for _, d := range days[a+1 : b+1] {
+		if !d.HasReturn {
+			continue
+		}
+		cumulativeReturn = (1+cumulativeReturn)*(1+d.NetReturn) - 1
+		nav = nav * (1 + d.NetReturn)
+		ds.returns = append(ds.returns, dailyReturn{date: d.Date, netReturn: d.NetReturn, cumulativeReturn: cumulativeReturn, nav: nav})
+	}
+	return ds
+}
+
+func closeTo(got, want float64) bool {
+	return math.Abs(got-want) <= 1e-9*math.Max(1, math.Abs(want))
+}
+
+func TestReturnIndex_MatchesScans(t *testing.T) {
+	rng := rand.New(rand.NewSource(7))
+	svc := &MetricsService{}
+
+	for iter := 0; iter < 20; iter++ {
+		days := indexTestDays(rng, 50+rng.Intn(1500))
+		index := newReturnIndex(days)
+
+		for q := 0; q < 200; q++ {
+			a := rng.Intn(len(days))
+			b := a + rng.Intn(len(days)-a)
+			ws, ok := index.window(days[a].FirstTS, days[b].LastTS)
+			if !ok {
+				t.Fatalf("window %d..%d not served", a, b)
+			}
+			ds := scanWindow(days, a, b)
+
+			got, gotErr := svc.calculateFromWindow(&ws)
+			want, wantErr := svc.calculateFromSeries(ds)
+			if (gotErr == nil) != (wantErr == nil) {
+				t.Fatalf("window %d..%d: err = %v, want %v", a, b, gotErr, wantErr)
+			}
+			if wantErr != nil {
+				continue
+			}
+
+			for name, pair := range map[string][2]float64{
+				"sharpe":        {got.SharpeRatio, want.SharpeRatio},
+				"sortino":       {got.SortinoRatio, want.SortinoRatio},
+				"calmar":        {got.CalmarRatio, want.CalmarRatio},
+				"volatility":    {got.Volatility, want.Volatility},
+				"downside":      {got.DownsideDeviation, want.DownsideDeviation},
+				"max_dd":        {got.MaxDrawdown, want.MaxDrawdown},
+				"current_dd":    {got.CurrentDrawdown, want.CurrentDrawdown},
+				"win_rate":      {got.WinRate, want.WinRate},
+				"profit_factor": {got.ProfitFactor, want.ProfitFactor},
+				"avg_win":       {got.AvgWin, want.AvgWin},
+				"avg_loss":      {got.AvgLoss, want.AvgLoss},
+				"total_return":  {got.TotalReturn, want.TotalReturn},
+				"annualized":    {got.AnnualizedReturn, want.AnnualizedReturn},
+			} {
+				if !closeTo(pair[0], pair[1]) {
+					t.Fatalf("window %d..%d: %s = %.17g, want %.17g", a, b, name, pair[0], pair[1])
+				}
+			}
+			if got.MaxDrawdownDuration != want.MaxDrawdownDuration || got.DataPoints != want.DataPoints ||
+				!got.PeriodStart.Equal(want.PeriodStart) || !got.PeriodEnd.Equal(want.PeriodEnd) {
+				t.Fatalf("window %d..%d: got %+v, want %+v", a, b, got, want)
+			}
+		}
+	}
+}
+
+func TestReturnIndex_WindowFallsBackWhereReplayDiffers(t *testing.T) {
+	days := indexTestDays(rand.New(rand.NewSource(1)), 30)
+	days[10].Known = 2 // a second connection seen earlier is missing on day 10
+	index := newReturnIndex(days)
+
+	if _, ok := index.window(days[10].FirstTS, days[20].LastTS); ok {
+		t.Fatal("window starting on a day with a missing connection was served")
+	}
+	if _, ok := index.window(days[11].FirstTS, days[20].LastTS); !ok {
+		t.Fatal("window starting on a complete day was not served")
+	}
+	if _, ok := index.window(days[11].FirstTS.Add(time.Hour), days[20].LastTS); !ok {
+		t.Fatal("window starting within a gap between days was not served")
+	}
+}
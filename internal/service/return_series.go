@@ -0,0 +1,349 @@
+package service
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+	"go.uber.org/zap"
+)
+
+// defaultMaxSeriesProfiles bounds how many filtered series are materialized
+// per user; other filters are computed from the snapshots on every request.
+const defaultMaxSeriesProfiles = 8
+
+// defaultSeriesMaxAge is how long a series is read without being rebuilt,
+// like the snapshot series cache TTL.
+const defaultSeriesMaxAge = 15 * time.Minute
+
+// seriesBuildTimeout bounds a background series build.
+const seriesBuildTimeout = 5 * time.Minute
+
+// seriesEnd is the open upper bound of a series rebuild.
+var seriesEnd = time.Date(9999, 12, 31, 0, 0, 0, 0, time.UTC)
+
+// ReturnSeriesService maintains the derived daily TWR series of each user
+// (PERF-012). Every metrics or report request used to replay
+// convertSnapshotsToDailyReturns over the user's raw snapshots, at a cost of
+// history length × connections, repeating identical work across requests.
+// The series is stored per snapshot filter ("profile") in return_series:
+// the sync extends it from the days it writes, a backfill recomputes it from
+// its earliest changed day, and a ranged read costs O(days in range).
+//
+// A series is built the first time its filter is requested, and rebuilt
+// when it was last built or refreshed more than maxAge ago: the sync
+// refreshes it, but snapshot writes that bypass SyncService (admin tools,
+// backfills) would otherwise leave it stale until the user's next sync.
+// Builds replay the user's whole history under the per-user series lock, so
+// they run in the background; until one commits, reads of its filter replay
+// the snapshots.
+//
+// Ranged reads are exact: a range is served from the series only where the
+// TWR of the range alone equals the full-history TWR restricted to it (see
+// rangeFromSeries); otherwise the caller replays the snapshots as before.
+type ReturnSeriesService struct {
+	snapshotRepo *repository.SnapshotRepo
+	seriesRepo   *repository.ReturnSeriesRepo
+	logger       *zap.Logger
+	maxProfiles  int
+	maxAge       time.Duration
+
+	buildMu  sync.Mutex
+	building map[string]struct{} // user and profile of background builds
+}
+
+// NewReturnSeriesService creates a new return series service
+func NewReturnSeriesService(snapshotRepo *repository.SnapshotRepo, seriesRepo *repository.ReturnSeriesRepo, logger *zap.Logger) *ReturnSeriesService {
+	return &ReturnSeriesService{
+		snapshotRepo: snapshotRepo,
+		seriesRepo:   seriesRepo,
+		logger:       logger,
+		maxProfiles:  defaultMaxSeriesProfiles,
+		maxAge:       defaultSeriesMaxAge,
+		building:     make(map[string]struct{}),
+	}
+}
+
+// SetMaxProfiles bounds the filtered series materialized per user.
+func (s *ReturnSeriesService) SetMaxProfiles(n int) {
+	s.maxProfiles = n
+}
+
+// SetMaxAge sets the age after which a series is rebuilt from the
+// snapshots before it is read (0 = only the sync refreshes it).
+func (s *ReturnSeriesService) SetMaxAge(d time.Duration) {
+	s.maxAge = d
+}
+
+// seriesFilter is the snapshot filter a series is computed over, as passed
+// to filterSnapshots.
+type seriesFilter struct {
+	Exchange string   `json:"exchange,omitempty"`
+	Excluded []string `json:"excluded,omitempty"`
+}
+
+// seriesProfile returns the canonical profile key of a filter: empty for
+// every connection, JSON otherwise (labels are free text).
+func seriesProfile(exchange string, excluded map[string]struct{}) string {
+	f := seriesFilter{Exchange: strings.ToLower(exchange)}
+	if f.Exchange == "" && len(excluded) == 0 {
+		return ""
+	}
+	for key := range excluded {
+		f.Excluded = append(f.Excluded, key)
+	}
+	sort.Strings(f.Excluded)
+	b, _ := json.Marshal(f)
+	return string(b)
+}
+
+func parseSeriesProfile(profile string) (exchange string, excluded map[string]struct{}, err error) {
+	if profile == "" {
+		return "", nil, nil
+	}
+	var f seriesFilter
+	if err := json.Unmarshal([]byte(profile), &f); err != nil {
+		return "", nil, fmt.Errorf("parse series profile %q: %w", profile, err)
+	}
+	excluded = make(map[string]struct{}, len(f.Excluded))
+	for _, key := range f.Excluded {
+		excluded[key] = struct{}{}
+	}
+	return f.Exchange, excluded, nil
+}
+
+// dailySeries is the daily TWR series of a date range and the period the
+// range's snapshots cover, as calculateFromSeries takes them.
+type dailySeries struct {
+	returns     []dailyReturn
+	periodStart time.Time
+	periodEnd   time.Time
+	dataPoints  int // dates with snapshots
+	snapshots   int
+}
+
+// dailySeriesFromSnapshots converts time-sorted snapshots.
+func dailySeriesFromSnapshots(snapshots []*repository.Snapshot) *dailySeries {
+	ds := &dailySeries{returns: convertSnapshotsToDailyReturns(snapshots), snapshots: len(snapshots)}
+	ds.periodStart, ds.periodEnd, ds.dataPoints = summarizePeriod(snapshots)
+	return ds
+}
+
+// Range returns the daily series of [start, end] for a filter. ok is false
+// when the stored series cannot serve the range exactly or could not be
+// read; the caller then replays the snapshots.
+func (s *ReturnSeriesService) Range(ctx context.Context, userUID string, start, end time.Time, exchange string, excluded map[string]struct{}) (*dailySeries, bool) {
+	days, ok := s.Days(ctx, userUID, start, end, exchange, excluded)
+	if !ok {
+		return nil, false
+	}
+	return rangeFromSeries(days, start, end)
+}
+
+// Days returns the stored days of a filter's series that overlap
+// [start, end]. ok is false when the series is not built yet or older than
+// maxAge (a build is then started in the background), is not materialized
+// (profile limit) or could not be read.
+func (s *ReturnSeriesService) Days(ctx context.Context, userUID string, start, end time.Time, exchange string, excluded map[string]struct{}) ([]repository.ReturnSeriesDay, bool) {
+	days, ok, err := s.days(ctx, userUID, seriesProfile(exchange, excluded), start, end)
+	if err != nil {
+		s.logger.Warn("return series read failed, replaying snapshots",
+			zap.String("user_uid", userUID),
+			zap.Error(err),
+		)
+		return nil, false
+	}
+	return days, ok
+}
+
+func (s *ReturnSeriesService) days(ctx context.Context, userUID, profile string, start, end time.Time) ([]repository.ReturnSeriesDay, bool, error) {
+	profiles, err := s.seriesRepo.Profiles(ctx, userUID, s.maxAge)
+	if err != nil {
+		return nil, false, err
+	}
+	built, fresh := findSeriesProfile(profiles, profile)
+	if !built && len(profiles) >= s.maxProfiles {
+		return nil, false, nil
+	}
+	if !fresh {
+		s.buildInBackground(ctx, userUID, profile)
+		return nil, false, nil
+	}
+
+	days, err := s.seriesRepo.Range(ctx, userUID, profile, start, end)
+	if err != nil {
+		return nil, false, err
+	}
+	return days, true, nil
+}
+
+// rangeFromSeries derives the series of [start, end] from the stored days
+// overlapping it. The TWR of a range starts from the connections present
+// on its first date; the stored series carries every connection seen since
+// the first snapshot, forward-filled. The two agree from the first date on
+// exactly when every connection seen so far is present on it, and when no
+// date straddles a range bound. Otherwise ok is false.
+func rangeFromSeries(days []repository.ReturnSeriesDay, start, end time.Time) (*dailySeries, bool) {
+	if len(days) == 0 {
+		return &dailySeries{}, true
+	}
+	first, last := days[0], days[len(days)-1]
+	if first.FirstTS.Before(start) || last.LastTS.After(end) || first.Known != first.Connections {
+		return nil, false
+	}
+
+	ds := &dailySeries{
+		periodStart: first.FirstTS,
+		periodEnd:   last.LastTS,
+		dataPoints:  len(days),
+	}
+	for _, d := range days {
+		ds.snapshots += d.Connections
+	}
+	if len(days) < 2 {
+		return ds, true
+	}
+
+	cumulativeReturn, nav := 0.0, 1.0
+	for _, d := range days[1:] {
+		if !d.HasReturn {
+			continue
+		}
+		cumulativeReturn = (1+cumulativeReturn)*(1+d.NetReturn) - 1
+		nav = nav * (1 + d.NetReturn)
+		ds.returns = append(ds.returns, dailyReturn{
+			date:             d.Date,
+			netReturn:        d.NetReturn,
+			outperformance:   d.NetReturn,
+			cumulativeReturn: cumulativeReturn,
+			nav:              nav,
+		})
+	}
+	return ds, true
+}
+
+// Refresh brings every built series of a user up to date after snapshots
+// from the date of from onward were written: each is recomputed from that
+// date, continuing from the stored state of the day before. Dates are taken
+// in the local zone, as on snapshots read back from the database.
+func (s *ReturnSeriesService) Refresh(ctx context.Context, userUID string, from time.Time) error {
+	return s.seriesRepo.RebuildAll(ctx, userUID, snapshotDate(from.Local()), func(profile string, prev *repository.ReturnSeriesDay) ([]repository.ReturnSeriesDay, error) {
+		return s.computeSeries(ctx, userUID, profile, prev)
+	})
+}
+
+// Invalidate drops every series of a user, for when Refresh failed: reads
+// replay the snapshots until the next request rebuilds the series.
+func (s *ReturnSeriesService) Invalidate(ctx context.Context, userUID string) error {
+	return s.seriesRepo.DropUser(ctx, userUID)
+}
+
+// buildInBackground rebuilds a series from the start, detached from the
+// request, unless this process is already building it.
+func (s *ReturnSeriesService) buildInBackground(ctx context.Context, userUID, profile string) {
+	key := userUID + "\x00" + profile
+	s.buildMu.Lock()
+	if _, ok := s.building[key]; ok {
+		s.buildMu.Unlock()
+		return
+	}
+	s.building[key] = struct{}{}
+	s.buildMu.Unlock()
+
+	go func() {
+		defer func() {
+			s.buildMu.Lock()
+			delete(s.building, key)
+			s.buildMu.Unlock()
+		}()
+		buildCtx, cancel := context.WithTimeout(context.WithoutCancel(ctx), seriesBuildTimeout)
+		defer cancel()
+		if err := s.rebuild(buildCtx, userUID, profile, ""); err != nil {
+			s.logger.Warn("return series build failed",
+				zap.String("user_uid", userUID),
+				zap.Error(err),
+			)
+		}
+	}()
+}
+
+// rebuild recomputes a series from the date from ("" = from the start).
+func (s *ReturnSeriesService) rebuild(ctx context.Context, userUID, profile, from string) error {
+	return s.seriesRepo.Rebuild(ctx, userUID, profile, from, func(prev *repository.ReturnSeriesDay) ([]repository.ReturnSeriesDay, error) {
+		return s.computeSeries(ctx, userUID, profile, prev)
+	})
+}
+
+// computeSeries replays a profile's snapshots after prev (all of them when
+// prev is nil), continuing from its state. It runs under the series lock and
+// reads the database, not the snapshot series cache, so the series covers
+// every snapshot committed before the lock was taken, whichever replica
+// wrote it.
+func (s *ReturnSeriesService) computeSeries(ctx context.Context, userUID, profile string, prev *repository.ReturnSeriesDay) ([]repository.ReturnSeriesDay, error) {
+	exchange, excluded, err := parseSeriesProfile(profile)
+	if err != nil {
+		return nil, err
+	}
+	var (
+		prior map[string]float64
+		after time.Time
+	)
+	if prev != nil {
+		prior = prev.State
+		after = prev.LastTS.Add(time.Nanosecond)
+	}
+	snapshots, err := s.snapshotRepo.GetSeriesByUserAndDateRangeUncached(ctx, userUID, after, seriesEnd, repository.ProjectEquity)
+	if err != nil {
+		return nil, fmt.Errorf("load snapshots: %w", err)
+	}
+	return replaySeriesDays(filterSnapshots(snapshots, exchange, excluded), prior), nil
+}
+
+// replaySeriesDays sweeps snapshots, continuing from prior (the State of the
+// day before them, nil at the start of the history), and returns the stored
+// form of each date.
+func replaySeriesDays(snapshots []*repository.Snapshot, prior map[string]float64) []repository.ReturnSeriesDay {
+	m := newTWRMatrix(snapshots, prior)
+	out := make([]repository.ReturnSeriesDay, len(m.days))
+	m.sweep(func(r int, ret float64, ok bool, last []float64, known []bool) {
+		connections := 0
+		for _, has := range m.present[r*m.connections : (r+1)*m.connections] {
+			if has {
+				connections++
+			}
+		}
+		state := make(map[string]float64, len(known))
+		for c, seen := range known {
+			if seen {
+				state[m.keys[c]] = last[c]
+			}
+		}
+		out[r] = repository.ReturnSeriesDay{
+			Date:        m.date(r),
+			FirstTS:     m.first[r],
+			LastTS:      m.last[r],
+			NetReturn:   ret,
+			HasReturn:   ok,
+			Connections: connections,
+			Known:       len(state),
+			State:       state,
+		}
+	})
+	return out
+}
+
+// findSeriesProfile reports whether profile is among the built profiles,
+// and whether it is fresh.
+func findSeriesProfile(profiles []repository.ReturnSeriesProfile, profile string) (built, fresh bool) {
+	for _, p := range profiles {
+		if p.Profile == profile {
+			return true, p.Fresh
+		}
+	}
+	return false, false
+}
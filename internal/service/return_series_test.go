@@ -0,0 +1,142 @@
+package service
+
+import (
+	"math"
+	"reflect"
+	"testing"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+// seriesTestSnapshots returns 60 days of three connections: "bybit" joins on
+// day 20 and "binance/alt" skips every seventh day. Equities are integers so
+// TWR sums are exact whatever the map iteration order.
+func seriesTestSnapshots() []*repository.Snapshot {
+	day0 := time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC)
+	var out []*repository.Snapshot
+	for i := 0; i < 60; i++ {
+		ts := day0.AddDate(0, 0, i)
+		out = append(out, &repository.Snapshot{
+			Timestamp: ts, Exchange: "binance", Label: "main",
+			TotalEquity: float64(1000 + 3*i + i%5), Deposits: float64(i % 11 / 10 * 50),
+		})
+		if i%7 != 3 {
+			out = append(out, &repository.Snapshot{
+				Timestamp: ts, Exchange: "binance", Label: "alt", TotalEquity: float64(500 - i),
+			})
+		}
+		if i >= 20 {
+			out = append(out, &repository.Snapshot{
+				Timestamp: ts, Exchange: "bybit", TotalEquity: float64(2000 + 7*i%13),
+			})
+		}
+	}
+	return out
+}
+
+// seriesDaysInRange selects stored days as ReturnSeriesRepo.Range does.
+func seriesDaysInRange(days []repository.ReturnSeriesDay, start, end time.Time) []repository.ReturnSeriesDay {
+	var out []repository.ReturnSeriesDay
+	for _, d := range days {
+		if !d.LastTS.Before(start) && !d.FirstTS.After(end) {
+			out = append(out, d)
+		}
+	}
+	return out
+}
+
+func TestReplaySeriesDays_IncrementalMatchesFullReplay(t *testing.T) {
+	snapshots := seriesTestSnapshots()
+	want := replaySeriesDays(snapshots, nil)
+
+	// Extend a series built up to day 30 from its stored state, as Refresh
+	// does after the sync writes day 31 onward.
+	split := snapshots[0].Timestamp.AddDate(0, 0, 31)
+	var head, tail []*repository.Snapshot
+	for _, s := range snapshots {
+		if s.Timestamp.Before(split) {
+			head = append(head, s)
+		} else {
+			tail = append(tail, s)
+		}
+	}
+	got := replaySeriesDays(head, nil)
+	got = append(got, replaySeriesDays(tail, got[30].State)...)
+
+	if !reflect.DeepEqual(got, want) {
+		t.Fatal("incrementally extended series differs from a full replay")
+	}
+}
+
+func TestRangeFromSeries_MatchesSnapshotReplay(t *testing.T) {
+	snapshots := seriesTestSnapshots()
+	stored := replaySeriesDays(snapshots, nil)
+	day0 := snapshots[0].Timestamp
+
+	for _, tc := range []struct {
+		name       string
+		start, end int
+		served     bool
+	}{
+		{"whole history", 0, 59, true},
+		{"after bybit joined", 21, 50, true},
+		{"single day", 40, 40, true},
+		{"starts on a day alt is missing", 24, 50, false},
+		{"starts before bybit joined", 5, 30, true},
+	} {
+		t.Run(tc.name, func(t *testing.T) {
+			start, end := day0.AddDate(0, 0, tc.start), day0.AddDate(0, 0, tc.end)
+			ds, ok := rangeFromSeries(seriesDaysInRange(stored, start, end), start, end)
+			if ok != tc.served {
+				t.Fatalf("served = %v, want %v", ok, tc.served)
+			}
+			if !ok {
+				return
+			}
+
+			var inRange []*repository.Snapshot
+			for _, s := range snapshots {
+				if !s.Timestamp.Before(start) && !s.Timestamp.After(end) {
+					inRange = append(inRange, s)
+				}
+			}
+			want := dailySeriesFromSnapshots(inRange)
+
+			if ds.snapshots != want.snapshots || ds.dataPoints != want.dataPoints ||
+				!ds.periodStart.Equal(want.periodStart) || !ds.periodEnd.Equal(want.periodEnd) {
+				t.Fatalf("period = %+v, want %+v", ds, want)
+			}
+			if len(ds.returns) != len(want.returns) {
+				t.Fatalf("%d returns, want %d", len(ds.returns), len(want.returns))
+			}
+			for i := range ds.returns {
+				g, w := ds.returns[i], want.returns[i]
+				if g.date != w.date || g.netReturn != w.netReturn ||
+					math.Abs(g.nav-w.nav) > 1e-12 || math.Abs(g.cumulativeReturn-w.cumulativeReturn) > 1e-12 {
+					t.Fatalf("day %d: got %+v, want %+v", i, g, w)
+				}
+			}
+		})
+	}
+}
+
+func TestSeriesProfile_RoundTrip(t *testing.T) {
+	if p := seriesProfile("", nil); p != "" {
+		t.Fatalf("unfiltered profile = %q, want empty", p)
+	}
+
+	excluded := map[string]struct{}{"bybit": {}, "binance/a,b": {}}
+	p := seriesProfile("Binance", excluded)
+	if p != seriesProfile("binance", map[string]struct{}{"binance/a,b": {}, "bybit": {}}) {
+		t.Fatal("profile depends on exchange case or key order")
+	}
+
+	exchange, gotExcluded, err := parseSeriesProfile(p)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if exchange != "binance" || !reflect.DeepEqual(gotExcluded, excluded) {
+		t.Fatalf("parsed (%q, %v), want (binance, %v)", exchange, gotExcluded, excluded)
+	}
+}
@@ -8,6 +8,7 @@ import (
 	"time"
 
 	"github.com/trackrecord/enclave/internal/cache"
+	"github.com/trackrecord/enclave/internal/concurrency"
 	"github.com/trackrecord/enclave/internal/connector"
 	"github.com/trackrecord/enclave/internal/repository"
 	"go.uber.org/zap"
@@ -28,6 +29,12 @@ type SyncService struct {
 	factory      *connector.Factory
 	connCache    *cache.ConnectorCache
 	logger       *zap.Logger
+	returnSeries *ReturnSeriesService // nil = no derived series to maintain
+
+	// connLimiter bounds the per-user connection fan-out of the scheduled
+	// atomic sync: each user gets its own Scope, the limit itself is learned
+	// across all users (AIMD, see internal/concurrency).
+	connLimiter *concurrency.Limiter
 }
 
 // NewSyncService creates a new sync service
@@ -43,14 +50,32 @@ func NewSyncService(
 		factory:      connector.NewFactory(),
 		connCache:    connCache,
 		logger:       logger,
+		connLimiter: concurrency.New(concurrency.Config{
+			Name:    "user_connections",
+			Initial: 4,
+			Min:     1,
+			Max:     16,
+		}),
 	}
 }
 
+// ConnectionLimiter exposes the adaptive per-user connection limit for
+// metrics and adjustment logging.
+func (s *SyncService) ConnectionLimiter() *concurrency.Limiter {
+	return s.connLimiter
+}
+
 // SetSyncStatusRepo configures optional sync-status tracking.
 func (s *SyncService) SetSyncStatusRepo(repo *repository.SyncStatusRepo) {
 	s.syncStatus = repo
 }
 
+// SetReturnSeries makes the sync keep the derived daily return series up
+// to date with the snapshots it writes.
+func (s *SyncService) SetReturnSeries(series *ReturnSeriesService) {
+	s.returnSeries = series
+}
+
 // SetFactory replaces the connector factory. Used to inject a proxy-aware
 // factory after construction (e.g. when EXCHANGE_HTTP_PROXY is configured).
 func (s *SyncService) SetFactory(f *connector.Factory) {
@@ -290,6 +315,31 @@ func (s *SyncService) isManualSyncAllowed(ctx context.Context, userUID, exchange
 	return !exists, nil
 }
 
+// refreshReturnSeries recomputes the user's derived return series from the
+// date of from, after snapshots from that date onward were committed. A
+// series that cannot be refreshed is dropped, so reads replay the snapshots
+// until it is rebuilt instead of serving stale returns.
+func (s *SyncService) refreshReturnSeries(ctx context.Context, userUID string, from time.Time) {
+	if s.returnSeries == nil {
+		return
+	}
+	err := s.returnSeries.Refresh(ctx, userUID, from)
+	if err == nil {
+		return
+	}
+	s.logger.Warn("return series refresh failed, dropping series",
+		zap.String("user_uid", userUID),
+		zap.Time("from", from),
+		zap.Error(err),
+	)
+	if err := s.returnSeries.Invalidate(context.WithoutCancel(ctx), userUID); err != nil {
+		s.logger.Error("return series drop failed, series may be stale",
+			zap.String("user_uid", userUID),
+			zap.Error(err),
+		)
+	}
+}
+
 func (s *SyncService) getConnectionsByExchange(ctx context.Context, userUID, exchange string) ([]*repository.ExchangeConnection, error) {
 	connections, err := s.connSvc.GetActiveConnections(ctx, userUID)
 	if err != nil {
@@ -343,8 +393,17 @@ func (s *SyncService) syncConnection(ctx context.Context, connMeta *repository.E
 		s.syncIbkrFromFlex(ctx, connMeta, conn)
 	}
 
-	// 3. Get balance
-	balance, err := conn.GetBalance(ctx)
+	// 3. Fetch balance, trades, funding, earn, cashflows and per-market
+	// balances for the 24h window ending at the snapshot boundary.
+	// startOfDay is the snapshot timestamp (today 00:00 UTC). The sync runs
+	// at that moment, so we need to look BACK one day to attribute the last
+	// 24h of trades/cashflows to this snapshot — otherwise GetTrades runs
+	// with a zero-length window and returns nothing.
+	now := time.Now().UTC()
+	startOfDay := time.Date(now.Year(), now.Month(), now.Day(), 0, 0, 0, 0, time.UTC)
+	activityStart := startOfDay.Add(-24 * time.Hour)
+
+	fetched, err := s.fetchConnectionData(ctx, conn, activityStart, now)
 	if err != nil {
 		result.Error = fmt.Sprintf("get balance: %v", err)
 		s.logger.Error("sync failed: get balance",
@@ -355,140 +414,14 @@ func (s *SyncService) syncConnection(ctx context.Context, connMeta *repository.E
 		)
 		return result
 	}
+	s.logFetchTimings(connMeta, fetched)
 
-	// 4. Get trades for the 24h window ending at the snapshot boundary.
-	// startOfDay is the snapshot timestamp (today 00:00 UTC). The sync runs
-	// at that moment, so we need to look BACK one day to attribute the last
-	// 24h of trades/cashflows to this snapshot — otherwise GetTrades runs
-	// with a zero-length window and returns nothing.
-	now := time.Now().UTC()
-	startOfDay := time.Date(now.Year(), now.Month(), now.Day(), 0, 0, 0, 0, time.UTC)
-	activityStart := startOfDay.Add(-24 * time.Hour)
-
-	// 4a. Per-market trade fetching if supported; otherwise fallback to flat GetTrades
-	var trades []*connector.Trade
-	var swapSymbols []string
-	if pmFetcher, ok := conn.(connector.PerMarketTradeFetcher); ok {
-		if detector, ok2 := conn.(connector.MarketTypeDetector); ok2 {
-			if marketTypes, err := detector.DetectMarketTypes(ctx); err == nil {
-				for _, mt := range marketTypes {
-					mtTrades, err := pmFetcher.GetTradesByMarket(ctx, mt, activityStart)
-					if err != nil {
-						continue
-					}
-					for _, t := range mtTrades {
-						if t.MarketType == "" {
-							t.MarketType = mt
-						}
-						trades = append(trades, t)
-						if mt == connector.MarketSwap {
-							swapSymbols = appendUnique(swapSymbols, t.Symbol)
-						}
-					}
-				}
-			}
-		}
-	}
-	if len(trades) == 0 {
-		trades, _ = conn.GetTrades(ctx, activityStart, now)
-		// Collect swap symbols from fallback trades for funding fee fetch
-		for _, t := range trades {
-			if t.MarketType == connector.MarketSwap {
-				swapSymbols = appendUnique(swapSymbols, t.Symbol)
-			}
-		}
-	}
-
-	// 5. Aggregate trades by market type
-	breakdown := s.aggregateTrades(trades)
-
-	// 5a. Fetch funding fees for swap positions (always if supported — funding
-	// applies to all open positions, not just those traded today)
-	if ffFetcher, ok := conn.(connector.FundingFeesFetcher); ok {
-		if fees, err := ffFetcher.GetFundingFees(ctx, swapSymbols, activityStart); err == nil {
-			totalFunding := 0.0
-			for _, f := range fees {
-				totalFunding += f.Amount
-			}
-			breakdown.swap.fundingFees = totalFunding
-		}
-	}
-
-	// 5b. Fetch earn/staking balance if supported
-	if earnFetcher, ok := conn.(connector.EarnBalanceFetcher); ok {
-		if earnEquity, err := earnFetcher.GetEarnBalance(ctx); err == nil && earnEquity > 0 {
-			breakdown.earn.equity = earnEquity
-			balance.Equity += earnEquity // Add to global equity
-		}
-	}
-
-	// 6. Fetch deposits/withdrawals for the same 24h window as trades.
-	var deposits, withdrawals float64
-	if cfFetcher, ok := conn.(connector.CashflowFetcher); ok {
-		cashflows, err := cfFetcher.GetCashflows(ctx, activityStart)
-		if err == nil {
-			for _, cf := range cashflows {
-				if cf.Amount > 0 {
-					deposits += cf.Amount
-				} else {
-					withdrawals += -cf.Amount
-				}
-			}
-		} else {
-			s.logger.Debug("cashflow fetch failed (non-critical)",
-				zap.String("exchange", connMeta.Exchange),
-				zap.Error(err),
-			)
-		}
-	}
-
-	// 7. Enrich breakdown with per-market equity if connector supports it
-	if bmFetcher, ok := conn.(connector.BalanceByMarketFetcher); ok {
-		if marketBalances, err := bmFetcher.GetBalanceByMarket(ctx); err == nil {
-			s.enrichBreakdownWithBalances(breakdown, marketBalances)
-		} else {
-			s.logger.Debug("balance by market fetch failed (non-critical)",
-				zap.String("exchange", connMeta.Exchange),
-				zap.Error(err),
-			)
-		}
-	}
-
-	// 7b. TS parity: breakdown_by_market must always carry equity so the
-	// gRPC mapper can build a non-nil global aggregate. Connectors that
-	// implement BalanceByMarketFetcher already populated equity via
-	// enrichBreakdownWithBalances; for all others, assign total equity to
-	// the exchange's primary market type.
-	if !breakdown.hasAnyEquity() {
-		m := breakdown.getOrCreateMarket(primaryMarketType(connMeta.Exchange))
-		m.equity = balance.Equity
-		m.availableMargin = balance.Available
-	}
-
-	// 8. Create snapshot
-	// TS parity: realizedBalance = equity - unrealizedPnL (preserves the
-	// invariant equity == realized + unrealized). Using balance.Available
-	// (cash) diverges on margin accounts — cash can be deeply negative when
-	// positions are bought on margin, even though equity is positive.
-	snapshot := &repository.Snapshot{
-		UserUID:         connMeta.UserUID,
-		Exchange:        connMeta.Exchange,
-		Label:           connMeta.Label,
-		Timestamp:       startOfDay,
-		TotalEquity:     balance.Equity,
-		RealizedBalance: balance.Equity - balance.UnrealizedPnL,
-		UnrealizedPnL:   balance.UnrealizedPnL,
-		Deposits:        deposits,
-		Withdrawals:     withdrawals,
-		TotalTrades:     len(trades),
-		TotalVolume:     breakdown.totalVolume(),
-		TotalFees:       breakdown.totalFees(),
-		Breakdown:       breakdown.toRepo(balance.Equity, balance.Available, len(trades)),
-	}
+	// 4. Aggregate into the day's snapshot
+	snapshot := s.buildSnapshot(connMeta, fetched, startOfDay)
 
 	result.snapshot = snapshot
-	result.TradeCount = len(trades)
-	result.SnapshotEquity = balance.Equity
+	result.TradeCount = snapshot.TotalTrades
+	result.SnapshotEquity = snapshot.TotalEquity
 	result.SnapshotTimestamp = startOfDay
 
 	// Save snapshot individually (non-atomic path, used by manual sync)
@@ -503,6 +436,8 @@ func (s *SyncService) syncConnection(ctx context.Context, connMeta *repository.E
 		return result
 	}
 
+	s.refreshReturnSeries(ctx, connMeta.UserUID, snapshot.Timestamp)
+
 	// Success - trades are now garbage collected (never persisted)
 	result.Success = true
 
@@ -510,8 +445,8 @@ func (s *SyncService) syncConnection(ctx context.Context, connMeta *repository.E
 		zap.String("user_uid", connMeta.UserUID),
 		zap.String("exchange", connMeta.Exchange),
 		zap.String("label", connMeta.Label),
-		zap.Int("trades", len(trades)),
-		zap.Float64("equity", balance.Equity),
+		zap.Int("trades", snapshot.TotalTrades),
+		zap.Float64("equity", snapshot.TotalEquity),
 	)
 
 	return result
@@ -530,8 +465,8 @@ func (s *SyncService) SyncUserScheduledDueAtomic(ctx context.Context, userUID st
 		return nil, fmt.Errorf(errFmtNoActiveConnections, userUID)
 	}
 
-	// Phase 1: Build snapshots with limited concurrency (max 2 per user).
-	// CCXT connectors load markets (~40MB each), so 10 in parallel = OOM on small VMs.
+	// Phase 1: Build snapshots with limited concurrency (adaptive per-user
+	// limit, see connLimiter).
 	var (
 		results []*SyncResult
 		mu      sync.Mutex
@@ -542,12 +477,14 @@ func (s *SyncService) SyncUserScheduledDueAtomic(ctx context.Context, userUID st
 	// (struct + http.Client + JSON parsing). The previous "sequential per
 	// user" comment referenced CCXT (Python wrapper, ~150 MB/LoadMarkets)
 	// which the Go enclave doesn't use — every connector under
-	// internal/connector/ is native Go. Going from 1 → 4 turns a 19×Δ
-	// per-connector worst case into roughly ⌈19/4⌉×Δ.
-	connSem := make(chan struct{}, 4)
+	// internal/connector/ is native Go. 4 is now only the starting point:
+	// connLimiter widens it on large VMs while connectors stay fast and
+	// healthy, and narrows it on live-heap pressure, 429s or error spikes
+	// (small SEV-SNP guests).
 	// 5min matches the IBKR Flex poll budget (~4min for 30-day/YTD reports) with
 	// a safety margin; other connectors are sub-second so the ceiling never hits.
 	const connTimeout = 5 * time.Minute
+	connSem := s.connLimiter.Scope()
 
 	for _, conn := range connections {
 		if !s.isConnectionDue(ctx, conn, now) {
@@ -557,15 +494,25 @@ func (s *SyncService) SyncUserScheduledDueAtomic(ctx context.Context, userUID st
 		wg.Add(1)
 		go func(c *repository.ExchangeConnection) {
 			defer wg.Done()
-			connSem <- struct{}{}
-			defer func() {
-				<-connSem
-			}()
+			if err := connSem.Acquire(ctx); err != nil {
+				mu.Lock()
+				results = append(results, &SyncResult{
+					UserUID:  c.UserUID,
+					Exchange: c.Exchange,
+					Label:    c.Label,
+					Error:    fmt.Sprintf("waiting for sync slot: %v", err),
+				})
+				mu.Unlock()
+				return
+			}
 
 			connCtx, cancel := context.WithTimeout(ctx, connTimeout)
 			defer cancel()
 
+			started := time.Now()
 			result := s.buildConnectionSnapshot(connCtx, c)
+			connSem.Release(time.Since(started), concurrency.ClassifyError(result.Error))
+
 			mu.Lock()
 			results = append(results, result)
 			mu.Unlock()
@@ -613,6 +560,13 @@ func (s *SyncService) SyncUserScheduledDueAtomic(ctx context.Context, userUID st
 					r.Success = true
 				}
 			}
+			from := snapshots[0].Timestamp
+			for _, snap := range snapshots[1:] {
+				if snap.Timestamp.Before(from) {
+					from = snap.Timestamp
+				}
+			}
+			s.refreshReturnSeries(ctx, userUID, from)
 			s.logger.Info("atomic snapshot save completed",
 				zap.String("user_uid", userUID),
 				zap.Int("snapshots_saved", len(snapshots)),
@@ -669,14 +623,6 @@ func (s *SyncService) buildConnectionSnapshot(ctx context.Context, connMeta *rep
 		s.syncIbkrFromFlex(ctx, connMeta, conn)
 	}
 
-	balance, err := conn.GetBalance(ctx)
-	if err != nil {
-		result.Error = fmt.Sprintf("get balance: %v", err)
-		s.logger.Error(errMsgSnapshotBuildFailed, zap.String("exchange", connMeta.Exchange), zap.String("label", connMeta.Label), zap.String("step", "get_balance"), zap.Duration("elapsed", time.Since(start)), zap.Error(err))
-		return result
-	}
-	s.logger.Info("balance fetched", zap.String("exchange", connMeta.Exchange), zap.String("label", connMeta.Label), zap.Duration("elapsed", time.Since(start)))
-
 	// Same 24h-window semantics as syncConnection above: the snapshot lands
 	// at startOfDay (today 00:00 UTC), so we pull trades/cashflows from the
 	// preceding 24h window.
@@ -684,109 +630,17 @@ func (s *SyncService) buildConnectionSnapshot(ctx context.Context, connMeta *rep
 	startOfDay := time.Date(now.Year(), now.Month(), now.Day(), 0, 0, 0, 0, time.UTC)
 	activityStart := startOfDay.Add(-24 * time.Hour)
 
-	var trades []*connector.Trade
-	var swapSymbols []string
-	if pmFetcher, ok := conn.(connector.PerMarketTradeFetcher); ok {
-		if detector, ok2 := conn.(connector.MarketTypeDetector); ok2 {
-			if marketTypes, err := detector.DetectMarketTypes(ctx); err == nil {
-				for _, mt := range marketTypes {
-					mtTrades, err := pmFetcher.GetTradesByMarket(ctx, mt, activityStart)
-					if err != nil {
-						continue
-					}
-					for _, t := range mtTrades {
-						if t.MarketType == "" {
-							t.MarketType = mt
-						}
-						trades = append(trades, t)
-						if mt == connector.MarketSwap {
-							swapSymbols = appendUnique(swapSymbols, t.Symbol)
-						}
-					}
-				}
-			}
-		}
-	}
-	if len(trades) == 0 {
-		trades, _ = conn.GetTrades(ctx, activityStart, now)
-		// Collect swap symbols from fallback trades for funding fee fetch
-		for _, t := range trades {
-			if t.MarketType == connector.MarketSwap {
-				swapSymbols = appendUnique(swapSymbols, t.Symbol)
-			}
-		}
-	}
-
-	breakdown := s.aggregateTrades(trades)
-
-	if ffFetcher, ok := conn.(connector.FundingFeesFetcher); ok {
-		if fees, err := ffFetcher.GetFundingFees(ctx, swapSymbols, activityStart); err == nil {
-			total := 0.0
-			for _, f := range fees {
-				total += f.Amount
-			}
-			breakdown.swap.fundingFees = total
-		}
-	}
-
-	if earnFetcher, ok := conn.(connector.EarnBalanceFetcher); ok {
-		if earnEquity, err := earnFetcher.GetEarnBalance(ctx); err == nil && earnEquity > 0 {
-			breakdown.earn.equity = earnEquity
-			balance.Equity += earnEquity
-		}
-	}
-
-	var deposits, withdrawals float64
-	if cfFetcher, ok := conn.(connector.CashflowFetcher); ok {
-		if cashflows, err := cfFetcher.GetCashflows(ctx, activityStart); err == nil {
-			for _, cf := range cashflows {
-				if cf.Amount > 0 {
-					deposits += cf.Amount
-				} else {
-					withdrawals += -cf.Amount
-				}
-			}
-		}
-	}
-
-	if bmFetcher, ok := conn.(connector.BalanceByMarketFetcher); ok {
-		if marketBalances, err := bmFetcher.GetBalanceByMarket(ctx); err == nil {
-			s.enrichBreakdownWithBalances(breakdown, marketBalances)
-		} else {
-			s.logger.Debug("balance by market fetch failed (non-critical)",
-				zap.String("exchange", connMeta.Exchange),
-				zap.Error(err),
-			)
-		}
+	fetched, err := s.fetchConnectionData(ctx, conn, activityStart, now)
+	if err != nil {
+		result.Error = fmt.Sprintf("get balance: %v", err)
+		s.logger.Error(errMsgSnapshotBuildFailed, zap.String("exchange", connMeta.Exchange), zap.String("label", connMeta.Label), zap.String("step", "get_balance"), zap.Duration("elapsed", time.Since(start)), zap.Error(err))
+		return result
 	}
+	s.logFetchTimings(connMeta, fetched)
 
-	// TS parity: breakdown_by_market must always carry equity (same as
-	// syncConnection step 7b above).
-	if !breakdown.hasAnyEquity() {
-		m := breakdown.getOrCreateMarket(primaryMarketType(connMeta.Exchange))
-		m.equity = balance.Equity
-		m.availableMargin = balance.Available
-	}
-
-	// TS parity: realizedBalance = equity - unrealizedPnL. See the non-atomic
-	// path above for the full rationale.
-	result.snapshot = &repository.Snapshot{
-		UserUID:         connMeta.UserUID,
-		Exchange:        connMeta.Exchange,
-		Label:           connMeta.Label,
-		Timestamp:       startOfDay,
-		TotalEquity:     balance.Equity,
-		RealizedBalance: balance.Equity - balance.UnrealizedPnL,
-		UnrealizedPnL:   balance.UnrealizedPnL,
-		Deposits:        deposits,
-		Withdrawals:     withdrawals,
-		TotalTrades:     len(trades),
-		TotalVolume:     breakdown.totalVolume(),
-		TotalFees:       breakdown.totalFees(),
-		Breakdown:       breakdown.toRepo(balance.Equity, balance.Available, len(trades)),
-	}
-	result.TradeCount = len(trades)
-	result.SnapshotEquity = balance.Equity
+	result.snapshot = s.buildSnapshot(connMeta, fetched, startOfDay)
+	result.TradeCount = result.snapshot.TotalTrades
+	result.SnapshotEquity = result.snapshot.TotalEquity
 	result.SnapshotTimestamp = startOfDay
 
 	return result
@@ -927,7 +781,7 @@ func (s *SyncService) syncIbkrFromFlex(ctx context.Context, connMeta *repository
 		return
 	}
 
-	processed := 0
+	snapshots := make([]*repository.Snapshot, 0, len(historicalSnapshots))
 	for _, hs := range historicalSnapshots {
 		breakdown := &repository.MarketBreakdown{}
 		var totalAvailMargin float64
@@ -970,19 +824,30 @@ func (s *SyncService) syncIbkrFromFlex(ctx context.Context, connMeta *repository
 			Breakdown:       breakdown,
 		}
 
-		if err := s.snapshotRepo.Upsert(ctx, snapshot); err != nil {
-			s.logger.Warn("IBKR Flex: failed to upsert snapshot",
-				zap.String("date", hs.Date.Format("2006-01-02")),
-				zap.Error(err),
-			)
-			continue
-		}
-		processed++
+		snapshots = append(snapshots, snapshot)
+	}
+
+	// Flex re-sends the whole query window on every sync, but usually only
+	// the last few days differ from what is stored: write just those, in
+	// one batch.
+	res, err := s.snapshotRepo.UpsertChanged(ctx, snapshots)
+	if err != nil {
+		s.logger.Warn("IBKR Flex: failed to upsert snapshots",
+			zap.String("user_uid", connMeta.UserUID),
+			zap.Int("total_days", len(historicalSnapshots)),
+			zap.Error(err),
+		)
+		return
+	}
+
+	if res.Written > 0 {
+		s.refreshReturnSeries(ctx, connMeta.UserUID, res.FirstWritten)
 	}
 
 	s.logger.Info("IBKR Flex sync completed",
 		zap.String("user_uid", connMeta.UserUID),
-		zap.Int("snapshots_upserted", processed),
+		zap.Int("snapshots_written", res.Written),
+		zap.Int("snapshots_unchanged", res.Skipped),
 		zap.Int("total_days", len(historicalSnapshots)),
 	)
 }
@@ -1016,30 +881,36 @@ type marketAgg struct {
 
 func (s *SyncService) aggregateTrades(trades []*connector.Trade) *aggregatedBreakdown {
 	agg := &aggregatedBreakdown{}
+	agg.addTrades(trades)
+	return agg
+}
 
+// addTrades folds trades into the per-market counters. Streaming callers
+// feed it one batch at a time, so no full-day trade slice is ever needed.
+func (a *aggregatedBreakdown) addTrades(trades []*connector.Trade) {
 	for _, t := range trades {
 		volume := t.Price * t.Quantity
-		ma := &agg.spot
+		ma := &a.spot
 
 		switch t.MarketType {
 		case connector.MarketStocks:
-			ma = &agg.stocks
+			ma = &a.stocks
 		case connector.MarketSwap:
-			ma = &agg.swap
+			ma = &a.swap
 		case connector.MarketFutures:
-			ma = &agg.futures
+			ma = &a.futures
 		case connector.MarketOptions:
-			ma = &agg.options
+			ma = &a.options
 		case connector.MarketMargin:
-			ma = &agg.margin
+			ma = &a.margin
 		case connector.MarketEarn:
-			ma = &agg.earn
+			ma = &a.earn
 		case connector.MarketCFD:
-			ma = &agg.cfd
+			ma = &a.cfd
 		case connector.MarketForex:
-			ma = &agg.forex
+			ma = &a.forex
 		case connector.MarketCommodities:
-			ma = &agg.commodities
+			ma = &a.commodities
 		}
 
 		ma.volume += volume
@@ -1054,8 +925,6 @@ func (s *SyncService) aggregateTrades(trades []*connector.Trade) *aggregatedBrea
 			ma.shortVolume += volume
 		}
 	}
-
-	return agg
 }
 
 func (m *marketAgg) toRepoMetrics() *repository.MarketMetrics {
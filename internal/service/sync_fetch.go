@@ -0,0 +1,315 @@
+package service
+
+import (
+	"context"
+	"sync"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/connector"
+	"github.com/trackrecord/enclave/internal/repository"
+	"go.uber.org/zap"
+	"golang.org/x/sync/errgroup"
+)
+
+// Fetch phases, as reported in the "connection fetch timings" log line.
+const (
+	phaseBalance         = "balance"
+	phaseTrades          = "trades"
+	phaseFunding         = "funding"
+	phaseEarn            = "earn"
+	phaseCashflows       = "cashflows"
+	phaseBalanceByMarket = "balance_by_market"
+)
+
+// connectionFetch is the raw exchange data a snapshot is built from.
+// Everything except balance is best-effort: a failed non-critical fetch
+// leaves its zero value, exactly as the sequential pipeline did.
+type connectionFetch struct {
+	balance        *connector.Balance
+	breakdown      *aggregatedBreakdown // trades of the window, already folded
+	tradeCount     int
+	swapSymbols    []string
+	fundingFees    float64
+	hasFunding     bool
+	earnEquity     float64
+	deposits       float64
+	withdrawals    float64
+	marketBalances []*connector.MarketBalance
+
+	timingsMu sync.Mutex
+	timings   map[string]time.Duration
+	wall      time.Duration
+}
+
+func (f *connectionFetch) record(phase string, started time.Time) {
+	f.timingsMu.Lock()
+	f.timings[phase] = time.Since(started)
+	f.timingsMu.Unlock()
+}
+
+// fetchConnectionData runs the per-connection REST fetches concurrently
+// (PERF-007). They used to run one after another, so a connection cost the
+// sum of 6–10 round trips; now it costs roughly the longest chain:
+//
+//	balance ──────────────► balance_by_market
+//	trades ──► funding (needs the swap symbols traded in the window)
+//	earn
+//	cashflows
+//
+// balance_by_market waits for balance because MEXC and IBKR serve it from
+// state cached by GetBalance. GetBalance is the only critical fetch: its
+// error is returned as-is and cancels the others.
+func (s *SyncService) fetchConnectionData(ctx context.Context, conn connector.Connector, activityStart, now time.Time) (*connectionFetch, error) {
+	f := &connectionFetch{timings: make(map[string]time.Duration, 6)}
+	start := time.Now()
+	g, gctx := errgroup.WithContext(ctx)
+	balanceDone := make(chan struct{})
+
+	g.Go(func() error {
+		started := time.Now()
+		balance, err := conn.GetBalance(gctx)
+		f.record(phaseBalance, started)
+		if err != nil {
+			return err
+		}
+		f.balance = balance
+		close(balanceDone)
+		return nil
+	})
+
+	g.Go(func() error {
+		started := time.Now()
+		f.breakdown, f.tradeCount, f.swapSymbols = s.fetchTrades(gctx, conn, activityStart, now)
+		f.record(phaseTrades, started)
+
+		// Funding applies to all open positions, not just those traded
+		// today, so it is fetched whenever supported.
+		if ffFetcher, ok := conn.(connector.FundingFeesFetcher); ok {
+			started = time.Now()
+			if fees, err := ffFetcher.GetFundingFees(gctx, f.swapSymbols, activityStart); err == nil {
+				for _, fee := range fees {
+					f.fundingFees += fee.Amount
+				}
+				f.hasFunding = true
+			}
+			f.record(phaseFunding, started)
+		}
+		return nil
+	})
+
+	if earnFetcher, ok := conn.(connector.EarnBalanceFetcher); ok {
+		g.Go(func() error {
+			started := time.Now()
+			if earnEquity, err := earnFetcher.GetEarnBalance(gctx); err == nil && earnEquity > 0 {
+				f.earnEquity = earnEquity
+			}
+			f.record(phaseEarn, started)
+			return nil
+		})
+	}
+
+	if cfFetcher, ok := conn.(connector.CashflowFetcher); ok {
+		g.Go(func() error {
+			started := time.Now()
+			cashflows, err := cfFetcher.GetCashflows(gctx, activityStart)
+			f.record(phaseCashflows, started)
+			if err != nil {
+				s.logger.Debug("cashflow fetch failed (non-critical)",
+					zap.String("exchange", conn.Exchange()),
+					zap.Error(err),
+				)
+				return nil
+			}
+			for _, cf := range cashflows {
+				if cf.Amount > 0 {
+					f.deposits += cf.Amount
+				} else {
+					f.withdrawals += -cf.Amount
+				}
+			}
+			return nil
+		})
+	}
+
+	if bmFetcher, ok := conn.(connector.BalanceByMarketFetcher); ok {
+		g.Go(func() error {
+			select {
+			case <-balanceDone:
+			case <-gctx.Done():
+				return nil
+			}
+			started := time.Now()
+			marketBalances, err := bmFetcher.GetBalanceByMarket(gctx)
+			f.record(phaseBalanceByMarket, started)
+			if err != nil {
+				s.logger.Debug("balance by market fetch failed (non-critical)",
+					zap.String("exchange", conn.Exchange()),
+					zap.Error(err),
+				)
+				return nil
+			}
+			f.marketBalances = marketBalances
+			return nil
+		})
+	}
+
+	err := g.Wait()
+	f.wall = time.Since(start)
+	return f, err
+}
+
+// marketFetchConcurrency bounds the per-market trade fetches in flight for
+// one connection. Each request is still paced by the connector package's
+// per-exchange governor, so this only caps the fan-out, not the rate.
+const marketFetchConcurrency = 3
+
+// fetchTrades aggregates the trades of the activity window and returns
+// their count and the swap symbols among them: per market when the
+// connector supports it, otherwise (or when that yields nothing) through
+// connector.StreamTrades. Streaming connectors are folded one page at a
+// time, so peak memory no longer grows with the day's trade count; the
+// others go through the single-batch GetTrades adapter.
+func (s *SyncService) fetchTrades(ctx context.Context, conn connector.Connector, activityStart, now time.Time) (*aggregatedBreakdown, int, []string) {
+	agg := &aggregatedBreakdown{}
+	var swapSymbols []string
+	if pmFetcher, ok := conn.(connector.PerMarketTradeFetcher); ok {
+		if detector, ok2 := conn.(connector.MarketTypeDetector); ok2 {
+			if marketTypes, err := detector.DetectMarketTypes(ctx); err == nil {
+				var trades []*connector.Trade
+				trades, swapSymbols = fetchTradesByMarket(ctx, pmFetcher, marketTypes, activityStart)
+				if len(trades) > 0 {
+					agg.addTrades(trades)
+					return agg, len(trades), swapSymbols
+				}
+			}
+		}
+	}
+
+	count := 0
+	_ = connector.StreamTrades(ctx, conn, activityStart, now, func(batch []*connector.Trade) error {
+		agg.addTrades(batch)
+		count += len(batch)
+		// Collect swap symbols for the funding fee fetch
+		for _, t := range batch {
+			if t.MarketType == connector.MarketSwap {
+				swapSymbols = appendUnique(swapSymbols, t.Symbol)
+			}
+		}
+		return nil
+	})
+	return agg, count, swapSymbols
+}
+
+// fetchTradesByMarket fetches each market type's trades with at most
+// marketFetchConcurrency requests in flight. Results are merged in
+// marketTypes order whatever order the fetches finish in, so the trade
+// slice and swap symbols are the same as the old sequential loop produced.
+// A market whose fetch fails is skipped, as before.
+func fetchTradesByMarket(ctx context.Context, pmFetcher connector.PerMarketTradeFetcher, marketTypes []string, since time.Time) ([]*connector.Trade, []string) {
+	perMarket := make([][]*connector.Trade, len(marketTypes))
+	var g errgroup.Group
+	g.SetLimit(marketFetchConcurrency)
+	for i, mt := range marketTypes {
+		i, mt := i, mt
+		g.Go(func() error {
+			mtTrades, err := pmFetcher.GetTradesByMarket(ctx, mt, since)
+			if err != nil {
+				return nil
+			}
+			for _, t := range mtTrades {
+				if t.MarketType == "" {
+					t.MarketType = mt
+				}
+			}
+			perMarket[i] = mtTrades
+			return nil
+		})
+	}
+	_ = g.Wait()
+
+	total := 0
+	for _, mtTrades := range perMarket {
+		total += len(mtTrades)
+	}
+	trades := make([]*connector.Trade, 0, total)
+	var swapSymbols []string
+	for i, mtTrades := range perMarket {
+		trades = append(trades, mtTrades...)
+		if marketTypes[i] == connector.MarketSwap {
+			for _, t := range mtTrades {
+				swapSymbols = appendUnique(swapSymbols, t.Symbol)
+			}
+		}
+	}
+	return trades, swapSymbols
+}
+
+// logFetchTimings reports each phase next to the wall time of the stage;
+// "sequential" is what the old one-call-at-a-time pipeline would have cost.
+func (s *SyncService) logFetchTimings(connMeta *repository.ExchangeConnection, f *connectionFetch) {
+	fields := []zap.Field{
+		zap.String("user_uid", connMeta.UserUID),
+		zap.String("exchange", connMeta.Exchange),
+		zap.String("label", connMeta.Label),
+		zap.Duration("wall", f.wall),
+	}
+	var sequential time.Duration
+	for _, phase := range []string{phaseBalance, phaseTrades, phaseFunding, phaseEarn, phaseCashflows, phaseBalanceByMarket} {
+		if d, ok := f.timings[phase]; ok {
+			fields = append(fields, zap.Duration(phase, d))
+			sequential += d
+		}
+	}
+	fields = append(fields, zap.Duration("sequential", sequential))
+	s.logger.Info("connection fetch timings", fields...)
+}
+
+// buildSnapshot turns fetched data into the day's snapshot for connMeta.
+func (s *SyncService) buildSnapshot(connMeta *repository.ExchangeConnection, f *connectionFetch, startOfDay time.Time) *repository.Snapshot {
+	balance := f.balance
+	breakdown := f.breakdown
+	if breakdown == nil {
+		breakdown = &aggregatedBreakdown{}
+	}
+	if f.hasFunding {
+		breakdown.swap.fundingFees = f.fundingFees
+	}
+	if f.earnEquity > 0 {
+		breakdown.earn.equity = f.earnEquity
+		balance.Equity += f.earnEquity // Add to global equity
+	}
+	if f.marketBalances != nil {
+		s.enrichBreakdownWithBalances(breakdown, f.marketBalances)
+	}
+
+	// TS parity: breakdown_by_market must always carry equity so the gRPC
+	// mapper can build a non-nil global aggregate. Connectors that implement
+	// BalanceByMarketFetcher already populated equity via
+	// enrichBreakdownWithBalances; for all others, assign total equity to
+	// the exchange's primary market type.
+	if !breakdown.hasAnyEquity() {
+		m := breakdown.getOrCreateMarket(primaryMarketType(connMeta.Exchange))
+		m.equity = balance.Equity
+		m.availableMargin = balance.Available
+	}
+
+	// TS parity: realizedBalance = equity - unrealizedPnL (preserves the
+	// invariant equity == realized + unrealized). Using balance.Available
+	// (cash) diverges on margin accounts — cash can be deeply negative when
+	// positions are bought on margin, even though equity is positive.
+	return &repository.Snapshot{
+		UserUID:         connMeta.UserUID,
+		Exchange:        connMeta.Exchange,
+		Label:           connMeta.Label,
+		Timestamp:       startOfDay,
+		TotalEquity:     balance.Equity,
+		RealizedBalance: balance.Equity - balance.UnrealizedPnL,
+		UnrealizedPnL:   balance.UnrealizedPnL,
+		Deposits:        f.deposits,
+		Withdrawals:     f.withdrawals,
+		TotalTrades:     f.tradeCount,
+		TotalVolume:     breakdown.totalVolume(),
+		TotalFees:       breakdown.totalFees(),
+		Breakdown:       breakdown.toRepo(balance.Equity, balance.Available, f.tradeCount),
+	}
+}
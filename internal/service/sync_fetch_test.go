@@ -0,0 +1,240 @@
+package service
+
+import (
+	"context"
+	"errors"
+	"strings"
+	"sync/atomic"
+	"testing"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/connector"
+	"github.com/trackrecord/enclave/internal/repository"
+	"go.uber.org/zap"
+)
+
+// slowConnector implements every optional fetcher with a fixed latency so
+// the fetch stage's concurrency shows up in wall time.
+type slowConnector struct {
+	*connector.MockConnector
+	latency    time.Duration
+	balanceErr error
+
+	fundingSymbols []string
+	balanceSeen    bool
+}
+
+func (c *slowConnector) wait(ctx context.Context) error {
+	select {
+	case <-ctx.Done():
+		return ctx.Err()
+	case <-time.After(c.latency):
+		return nil
+	}
+}
+
+func (c *slowConnector) GetBalance(ctx context.Context) (*connector.Balance, error) {
+	if err := c.wait(ctx); err != nil {
+		return nil, err
+	}
+	if c.balanceErr != nil {
+		return nil, c.balanceErr
+	}
+	c.balanceSeen = true
+	return &connector.Balance{Equity: 1000, Available: 800}, nil
+}
+
+func (c *slowConnector) GetTrades(ctx context.Context, start, end time.Time) ([]*connector.Trade, error) {
+	if err := c.wait(ctx); err != nil {
+		return nil, err
+	}
+	return []*connector.Trade{{Symbol: "BTCUSDT", Side: "buy", Price: 100, Quantity: 1, MarketType: connector.MarketSwap}}, nil
+}
+
+func (c *slowConnector) GetFundingFees(ctx context.Context, symbols []string, since time.Time) ([]*connector.FundingFee, error) {
+	c.fundingSymbols = symbols
+	if err := c.wait(ctx); err != nil {
+		return nil, err
+	}
+	return []*connector.FundingFee{{Amount: -2}, {Amount: -3}}, nil
+}
+
+func (c *slowConnector) GetEarnBalance(ctx context.Context) (float64, error) {
+	if err := c.wait(ctx); err != nil {
+		return 0, err
+	}
+	return 50, nil
+}
+
+func (c *slowConnector) GetCashflows(ctx context.Context, since time.Time) ([]*connector.Cashflow, error) {
+	if err := c.wait(ctx); err != nil {
+		return nil, err
+	}
+	return []*connector.Cashflow{{Amount: 200}, {Amount: -75}}, nil
+}
+
+func (c *slowConnector) GetBalanceByMarket(ctx context.Context) ([]*connector.MarketBalance, error) {
+	if !c.balanceSeen {
+		return nil, errors.New("GetBalanceByMarket called before GetBalance")
+	}
+	if err := c.wait(ctx); err != nil {
+		return nil, err
+	}
+	return []*connector.MarketBalance{{MarketType: connector.MarketSwap, Equity: 1000}}, nil
+}
+
+func TestFetchConnectionData_RunsIndependentFetchesConcurrently(t *testing.T) {
+	s := &SyncService{logger: zap.NewNop()}
+	conn := &slowConnector{MockConnector: connector.NewMock(), latency: 40 * time.Millisecond}
+	now := time.Date(2026, 3, 2, 0, 0, 0, 0, time.UTC)
+
+	f, err := s.fetchConnectionData(context.Background(), conn, now.Add(-24*time.Hour), now)
+	if err != nil {
+		t.Fatalf("fetch: %v", err)
+	}
+	// Longest chains are balance→balance_by_market and trades→funding: two
+	// round trips, where the sequential pipeline needed six.
+	if f.wall >= 5*conn.latency {
+		t.Fatalf("wall %v, want well under the sequential %v", f.wall, 6*conn.latency)
+	}
+	if len(f.timings) != 6 {
+		t.Fatalf("timings = %v, want all six phases", f.timings)
+	}
+	if len(conn.fundingSymbols) != 1 || conn.fundingSymbols[0] != "BTCUSDT" {
+		t.Fatalf("funding fetched for %v, want the swap symbols from trades", conn.fundingSymbols)
+	}
+
+	snap := s.buildSnapshot(&repository.ExchangeConnection{UserUID: "u", Exchange: "bybit"}, f, now)
+	if snap.TotalEquity != 1050 || snap.Deposits != 200 || snap.Withdrawals != 75 || snap.TotalTrades != 1 {
+		t.Fatalf("unexpected snapshot: %+v", snap)
+	}
+	if got := snap.Breakdown.Swap.FundingFees; got != -5 {
+		t.Fatalf("funding fees = %v, want -5", got)
+	}
+}
+
+func TestFetchConnectionData_BalanceErrorIsCritical(t *testing.T) {
+	s := &SyncService{logger: zap.NewNop()}
+	boom := errors.New("HTTP 401: invalid key")
+	conn := &slowConnector{MockConnector: connector.NewMock(), latency: 5 * time.Millisecond, balanceErr: boom}
+	now := time.Date(2026, 3, 2, 0, 0, 0, 0, time.UTC)
+
+	if _, err := s.fetchConnectionData(context.Background(), conn, now.Add(-24*time.Hour), now); !errors.Is(err, boom) {
+		t.Fatalf("err = %v, want the GetBalance error", err)
+	}
+}
+
+// marketFetcher serves per-market trades, finishing the first market last.
+type marketFetcher struct {
+	latency  map[string]time.Duration
+	failing  string
+	inFlight int32
+	peak     int32
+}
+
+func (m *marketFetcher) GetTradesByMarket(ctx context.Context, marketType string, since time.Time) ([]*connector.Trade, error) {
+	n := atomic.AddInt32(&m.inFlight, 1)
+	defer atomic.AddInt32(&m.inFlight, -1)
+	for {
+		p := atomic.LoadInt32(&m.peak)
+		if n <= p || atomic.CompareAndSwapInt32(&m.peak, p, n) {
+			break
+		}
+	}
+	time.Sleep(m.latency[marketType])
+	if marketType == m.failing {
+		return nil, errors.New("HTTP 500")
+	}
+	return []*connector.Trade{
+		{Symbol: marketType + "-A"},
+		{Symbol: marketType + "-B", MarketType: connector.MarketMargin},
+	}, nil
+}
+
+func TestFetchTradesByMarket_BoundedAndDeterministic(t *testing.T) {
+	markets := []string{connector.MarketSpot, connector.MarketSwap, connector.MarketFutures, connector.MarketOptions, connector.MarketMargin}
+	f := &marketFetcher{
+		latency: map[string]time.Duration{
+			connector.MarketSpot:    60 * time.Millisecond,
+			connector.MarketSwap:    10 * time.Millisecond,
+			connector.MarketFutures: 10 * time.Millisecond,
+			connector.MarketOptions: 10 * time.Millisecond,
+			connector.MarketMargin:  10 * time.Millisecond,
+		},
+		failing: connector.MarketOptions,
+	}
+
+	trades, swapSymbols := fetchTradesByMarket(context.Background(), f, markets, time.Time{})
+
+	if peak := atomic.LoadInt32(&f.peak); peak < 2 || peak > marketFetchConcurrency {
+		t.Fatalf("peak concurrency %d, want 2..%d", peak, marketFetchConcurrency)
+	}
+	var got []string
+	for _, tr := range trades {
+		got = append(got, tr.Symbol+"/"+tr.MarketType)
+	}
+	want := []string{
+		"spot-A/spot", "spot-B/margin",
+		"swap-A/swap", "swap-B/margin",
+		"futures-A/futures", "futures-B/margin",
+		"margin-A/margin", "margin-B/margin",
+	}
+	if strings.Join(got, ",") != strings.Join(want, ",") {
+		t.Fatalf("trades = %v\nwant     %v", got, want)
+	}
+	if strings.Join(swapSymbols, ",") != "swap-A,swap-B" {
+		t.Fatalf("swap symbols = %v", swapSymbols)
+	}
+}
+
+// pagedConnector streams trades in pages and fails the test if the sync
+// falls back to materialising them through GetTrades.
+type pagedConnector struct {
+	*connector.MockConnector
+	t     *testing.T
+	pages [][]*connector.Trade
+}
+
+func (c *pagedConnector) GetTrades(ctx context.Context, start, end time.Time) ([]*connector.Trade, error) {
+	c.t.Fatal("GetTrades called on a TradeStreamer")
+	return nil, nil
+}
+
+func (c *pagedConnector) StreamTrades(ctx context.Context, start, end time.Time, fn func([]*connector.Trade) error) error {
+	for _, page := range c.pages {
+		if err := fn(page); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+func TestFetchTrades_FoldsStreamedPages(t *testing.T) {
+	s := &SyncService{logger: zap.NewNop()}
+	conn := &pagedConnector{MockConnector: connector.NewMock(), t: t, pages: [][]*connector.Trade{
+		{
+			{Symbol: "BTCUSDT", Side: "buy", Price: 100, Quantity: 2, Fee: 0.1, MarketType: connector.MarketSwap},
+			{Symbol: "ETHUSDT", Side: "sell", Price: 10, Quantity: 1, MarketType: connector.MarketSpot},
+		},
+		{
+			{Symbol: "BTCUSDT", Side: "sell", Price: 100, Quantity: 1, Fee: 0.2, MarketType: connector.MarketSwap},
+			{Symbol: "SOLUSDT", Side: "buy", Price: 5, Quantity: 4, MarketType: connector.MarketSwap},
+		},
+	}}
+
+	agg, count, swapSymbols := s.fetchTrades(context.Background(), conn, time.Time{}, time.Now())
+
+	var flat []*connector.Trade
+	for _, p := range conn.pages {
+		flat = append(flat, p...)
+	}
+	if count != len(flat) {
+		t.Fatalf("count = %d, want %d", count, len(flat))
+	}
+	if want := s.aggregateTrades(flat); *agg != *want {
+		t.Fatalf("streamed aggregate differs from slice aggregate:\n got %+v\nwant %+v", *agg, *want)
+	}
+	if strings.Join(swapSymbols, ",") != "BTCUSDT,SOLUSDT" {
+		t.Fatalf("swap symbols = %v", swapSymbols)
+	}
+}
@@ -0,0 +1,98 @@
+package service
+
+import (
+	"context"
+	"strings"
+	"sync"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/connector"
+	"go.uber.org/zap"
+	"golang.org/x/sync/errgroup"
+)
+
+// flexPrefetchLookups bounds the connection lookups and credential
+// decryptions done while assembling the Flex batch.
+const flexPrefetchLookups = 8
+
+// PrefetchFlexReports starts the batched IBKR Flex pipeline
+// (connector.FlexBatch) for every due IBKR connection of userUIDs and
+// returns without waiting for it. The result maps each user with at least
+// one such connection to a channel closed once all of that user's reports
+// are cached or have failed; the scheduler starts those users only then, so
+// the minutes IBKR spends generating reports overlap the other users' syncs
+// instead of holding sync slots. The reports stay cached for as long as
+// ctx runs, however long their users wait for a slot; call the returned
+// release once those syncs are done to hand them back to the cache's TTL.
+//
+// A connection whose lookup fails is left out of the batch: its sync fetches
+// the report itself, as before.
+func (s *SyncService) PrefetchFlexReports(ctx context.Context, userUIDs []string, now time.Time, pollers int) (ready map[string]<-chan struct{}, release func()) {
+	batch := connector.NewFlexBatch(pollers)
+
+	var (
+		mu      sync.Mutex
+		perUser = make(map[string][]<-chan struct{})
+		g       errgroup.Group
+	)
+	g.SetLimit(flexPrefetchLookups)
+	for _, uid := range userUIDs {
+		uid := uid
+		g.Go(func() error {
+			connections, err := s.connSvc.GetActiveConnections(ctx, uid)
+			if err != nil {
+				return nil
+			}
+			for _, c := range connections {
+				if strings.ToLower(c.Exchange) != "ibkr" || !s.isConnectionDue(ctx, c, now) {
+					continue
+				}
+				creds, err := s.connSvc.GetDecryptedCredentialsByLabel(ctx, c.UserUID, c.Exchange, c.Label)
+				if err != nil {
+					continue
+				}
+				conn, err := s.getOrCreateConnector(c.Exchange, c.UserUID, creds)
+				if err != nil {
+					continue
+				}
+				if done, ok := batch.Add(conn); ok {
+					mu.Lock()
+					perUser[uid] = append(perUser[uid], done)
+					mu.Unlock()
+				}
+			}
+			return nil
+		})
+	}
+	_ = g.Wait()
+
+	ready = make(map[string]<-chan struct{}, len(perUser))
+	for uid, chans := range perUser {
+		userReady := make(chan struct{})
+		ready[uid] = userReady
+		go func(chans []<-chan struct{}) {
+			for _, ch := range chans {
+				<-ch
+			}
+			close(userReady)
+		}(chans)
+	}
+
+	if batch.Len() == 0 {
+		return ready, func() {}
+	}
+	s.logger.Info("IBKR Flex batch started",
+		zap.Int("reports", batch.Len()),
+		zap.Int("users", len(ready)),
+		zap.Int("pollers", pollers),
+	)
+	go func() {
+		stats := batch.Run(ctx)
+		s.logger.Info("IBKR Flex batch completed",
+			zap.Int("reports", stats.Reports),
+			zap.Int("failed", stats.Failed),
+			zap.Duration("duration", stats.Duration),
+		)
+	}()
+	return ready, batch.Release
+}
@@ -0,0 +1,220 @@
+package service
+
+import (
+	"math"
+	"sort"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+// twrMatrix is a snapshot history laid out for the TWR sweep: one row per
+// date that has snapshots, in date order, and one column per connection key,
+// in order of first appearance. Cell (r, c) holds the last snapshot of
+// connection c on row r's date, if any. It is the only implementation of the
+// TWR rules: the report and metric paths and the stored return series all
+// go through sweep.
+type twrMatrix struct {
+	days        []int64     // row -> day number, see dayNumberer
+	first, last []time.Time // row -> earliest and latest snapshot timestamp
+	keys        []string    // column -> connection key
+	connections int         // number of columns
+	present     []bool      // rows × connections
+	equity      []float64   // rows × connections: TotalEquity
+	flowAdj     []float64   // rows × connections: TotalEquity - Deposits + Withdrawals
+
+	prior []float64 // first columns -> last equity before the first row
+}
+
+// dayNumberer numbers the dates snapshotDate formats as days since
+// 1970-01-01, so rows sort like the date strings snapshotDate formats. It
+// reuses the UTC offset while timestamps stay within one zone period instead
+// of resolving the zone for each one.
+type dayNumberer struct {
+	loc        *time.Location
+	offset     int64 // seconds east of UTC
+	start, end int64 // Unix seconds the offset holds for: [start, end)
+}
+
+func (z *dayNumberer) day(t time.Time) int64 {
+	sec := t.Unix()
+	if loc := t.Location(); loc != z.loc || sec < z.start || sec >= z.end {
+		_, offset := t.Zone()
+		start, end := t.ZoneBounds()
+		z.loc, z.offset, z.start, z.end = loc, int64(offset), math.MinInt64, math.MaxInt64
+		if !start.IsZero() {
+			z.start = start.Unix()
+		}
+		if !end.IsZero() {
+			z.end = end.Unix()
+		}
+	}
+	local := sec + z.offset
+	if local < 0 {
+		return (local+1)/86400 - 1
+	}
+	return local / 86400
+}
+
+// newTWRMatrix lays out snapshots. A connection with several snapshots on
+// one date keeps the last one. prior is the last known equity by connection
+// key of the days before the snapshots (see ReturnSeriesDay.State), or nil
+// when the snapshots start the history; its connections take the first
+// columns, in key order.
+func newTWRMatrix(snapshots []*repository.Snapshot, prior map[string]float64) *twrMatrix {
+	if len(snapshots) == 0 {
+		return &twrMatrix{}
+	}
+
+	// Column per connection key. Raw (exchange, label) pairs are cached so
+	// the key is only normalized once per distinct pair.
+	type rawKey struct{ exchange, label string }
+	rawColumn := make(map[rawKey]int32)
+	keyColumn := make(map[string]int32, len(prior))
+	var keys []string
+	for key := range prior {
+		keys = append(keys, key)
+	}
+	sort.Strings(keys)
+	for i, key := range keys {
+		keyColumn[key] = int32(i)
+	}
+	columns := make([]int32, len(snapshots))
+	dayNums := make([]int64, len(snapshots))
+	var days dayNumberer
+	minDay, maxDay := days.day(snapshots[0].Timestamp), days.day(snapshots[0].Timestamp)
+	for i, snap := range snapshots {
+		raw := rawKey{snap.Exchange, snap.Label}
+		col, ok := rawColumn[raw]
+		if !ok {
+			key := snapshotConnectionKey(snap.Exchange, snap.Label)
+			if col, ok = keyColumn[key]; !ok {
+				col = int32(len(keyColumn))
+				keyColumn[key] = col
+				keys = append(keys, key)
+			}
+			rawColumn[raw] = col
+		}
+		columns[i] = col
+		day := days.day(snap.Timestamp)
+		dayNums[i] = day
+		minDay, maxDay = min(minDay, day), max(maxDay, day)
+	}
+
+	// Rows: the dates with snapshots, numbered through a dense day index.
+	rowOf := make([]int32, maxDay-minDay+1)
+	for _, day := range dayNums {
+		rowOf[day-minDay] = 1
+	}
+	m := &twrMatrix{keys: keys, connections: len(keys)}
+	for i, has := range rowOf {
+		if has == 0 {
+			continue
+		}
+		rowOf[i] = int32(len(m.days))
+		m.days = append(m.days, minDay+int64(i))
+	}
+
+	cells := len(m.days) * m.connections
+	m.first = make([]time.Time, len(m.days))
+	m.last = make([]time.Time, len(m.days))
+	m.present = make([]bool, cells)
+	m.equity = make([]float64, cells)
+	m.flowAdj = make([]float64, cells)
+	for i, snap := range snapshots {
+		row := int(rowOf[dayNums[i]-minDay])
+		if ts := snap.Timestamp; m.first[row].IsZero() {
+			m.first[row], m.last[row] = ts, ts
+		} else if ts.Before(m.first[row]) {
+			m.first[row] = ts
+		} else if ts.After(m.last[row]) {
+			m.last[row] = ts
+		}
+		cell := row*m.connections + int(columns[i])
+		m.present[cell] = true
+		m.equity[cell] = snap.TotalEquity
+		m.flowAdj[cell] = snap.TotalEquity - snap.Deposits + snap.Withdrawals
+	}
+	if len(prior) > 0 {
+		m.prior = make([]float64, len(prior))
+		for key, equity := range prior {
+			m.prior[keyColumn[key]] = equity
+		}
+	}
+	return m
+}
+
+// date formats row r's date as snapshotDate does.
+func (m *twrMatrix) date(r int) string {
+	return time.Unix(m.days[r]*86400, 0).UTC().Format("2006-01-02")
+}
+
+// returns calls fn with every row that has a return, in date order.
+func (m *twrMatrix) returns(fn func(row int, dayReturn float64)) {
+	m.sweep(func(row int, dayReturn float64, ok bool, _ []float64, _ []bool) {
+		if ok {
+			fn(row, dayReturn)
+		}
+	})
+}
+
+// sweep applies the TWR rules to the rows in date order: missing
+// connections are forward-filled with their last equity, a connection
+// appearing on a day with prior equity is a virtual deposit, and a day whose
+// previous total equity is zero (the first day among them) has no return and
+// only records equities. fn gets every row, its return, whether it has one,
+// and then the last equity of every column and which columns have been
+// seen; it must not keep the slices.
+func (m *twrMatrix) sweep(fn func(row int, dayReturn float64, ok bool, last []float64, known []bool)) {
+	var (
+		n     = m.connections
+		last  = make([]float64, n) // last equity; 0 for connections not seen yet
+		known = make([]bool, n)
+	)
+	copy(last, m.prior)
+	for c := range m.prior {
+		known[c] = true
+	}
+	for r := range m.days {
+		present := m.present[r*n : (r+1)*n]
+		equity := m.equity[r*n : (r+1)*n]
+		flowAdj := m.flowAdj[r*n : (r+1)*n]
+
+		totalPrevEquity := 0.0
+		for _, eq := range last {
+			totalPrevEquity += eq
+		}
+
+		if totalPrevEquity == 0 {
+			for c, has := range present {
+				if has {
+					last[c] = equity[c]
+					known[c] = true
+				}
+			}
+			fn(r, 0, false, last, known)
+			continue
+		}
+
+		totalCurrentEquity, virtualDeposits := 0.0, 0.0
+		for c, has := range present {
+			switch {
+			case !has:
+				totalCurrentEquity += last[c]
+			case known[c]:
+				totalCurrentEquity += flowAdj[c]
+				last[c] = equity[c]
+			default:
+				virtualDeposits += equity[c]
+				last[c] = equity[c]
+				known[c] = true
+			}
+		}
+
+		dayReturn := 0.0
+		if adjustedPrev := totalPrevEquity + virtualDeposits; adjustedPrev > 0 {
+			dayReturn = (totalCurrentEquity + virtualDeposits - adjustedPrev) / adjustedPrev
+		}
+		fn(r, dayReturn, true, last, known)
+	}
+}
@@ -0,0 +1,123 @@
+package service
+
+import (
+	"fmt"
+	"math"
+	"math/rand"
+	"reflect"
+	"sort"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/repository"
+)
+
+// twrTestSnapshots returns days of daily snapshots of connections
+// connections in shuffled order. Connections join late, skip days and
+// report flows; some dates get a second, superseding snapshot (placed last)
+// and keys vary in case. Equities are integers so TWR sums are exact in any order.
+func twrTestSnapshots(seed int64, days, connections int) []*repository.Snapshot {
+	rng := rand.New(rand.NewSource(seed))
+	day0 := time.Date(2020, 3, 1, 22, 0, 0, 0, time.FixedZone("UTC+3", 3*3600))
+	var out, superseding []*repository.Snapshot
+	for c := 0; c < connections; c++ {
+		join := rng.Intn(days / 2)
+		exchange := fmt.Sprintf("Exchange%d", c%5)
+		label := fmt.Sprintf("acct%d", c/5)
+		for d := join; d < days; d++ {
+			if rng.Intn(10) == 0 {
+				continue
+			}
+			snap := &repository.Snapshot{
+				Timestamp: day0.AddDate(0, 0, d).Add(time.Duration(rng.Intn(60)) * time.Minute),
+				Exchange:  exchange, Label: label,
+				TotalEquity: float64(1000 + rng.Intn(500)),
+			}
+			if rng.Intn(20) == 0 {
+				snap.Deposits = float64(rng.Intn(100))
+			}
+			if rng.Intn(30) == 0 {
+				snap.Withdrawals = float64(rng.Intn(100))
+			}
+			if d%2 == 0 {
+				snap.Exchange = strings.ToUpper(exchange)
+			}
+			out = append(out, snap)
+			if rng.Intn(15) == 0 {
+				again := *snap
+				again.TotalEquity++
+				superseding = append(superseding, &again)
+			}
+		}
+	}
+	rng.Shuffle(len(out), func(i, j int) { out[i], out[j] = out[j], out[i] })
+	return append(out, superseding...)
+}
+
+func TestConvertSnapshotsToDailyReturns_Rules(t *testing.T) {
+	day := func(d int) time.Time { return time.Date(2024, 1, d, 12, 0, 0, 0, time.UTC) }
+	snaps := []*repository.Snapshot{
+		{Timestamp: day(1), Exchange: "a", TotalEquity: 100},
+		{Timestamp: day(2), Exchange: "a", TotalEquity: 110},
+		// a deposits 11 and b joins: flows and the new connection are not returns.
+		{Timestamp: day(3), Exchange: "a", TotalEquity: 121, Deposits: 11},
+		{Timestamp: day(3), Exchange: "b", TotalEquity: 50},
+		// a is missing and forward-filled at 121.
+		{Timestamp: day(4), Exchange: "b", TotalEquity: 55},
+	}
+	want := []float64{0.10, 0, 5.0 / 171}
+
+	got := convertSnapshotsToDailyReturns(snaps)
+	if len(got) != len(want) {
+		t.Fatalf("%d returns, want %d: %+v", len(got), len(want), got)
+	}
+	for i, r := range got {
+		if math.Abs(r.netReturn-want[i]) > 1e-12 {
+			t.Errorf("%s: return %v, want %v", r.date, r.netReturn, want[i])
+		}
+	}
+
+	// Days whose previous total equity is zero have no return.
+	zero := []*repository.Snapshot{
+		{Timestamp: day(1), Exchange: "a", TotalEquity: 0},
+		{Timestamp: day(2), Exchange: "a", TotalEquity: 0},
+		{Timestamp: day(9), Exchange: "b", TotalEquity: 50},
+		{Timestamp: day(10), Exchange: "a", TotalEquity: 10},
+	}
+	got = convertSnapshotsToDailyReturns(zero)
+	if len(got) != 1 || got[0].date != "2024-01-10" || math.Abs(got[0].netReturn-0.2) > 1e-12 {
+		t.Fatalf("zero equity: got %+v, want one return of 0.2 on 2024-01-10", got)
+	}
+}
+
+func TestConvertSnapshotsToDailyReturns_OrderIndependent(t *testing.T) {
+	for _, seed := range []int64{1, 2} {
+		shuffled := twrTestSnapshots(seed, 200, 12)
+		sorted := append([]*repository.Snapshot(nil), shuffled...)
+		sort.SliceStable(sorted, func(i, j int) bool { return sorted[i].Timestamp.Before(sorted[j].Timestamp) })
+
+		got, want := convertSnapshotsToDailyReturns(shuffled), convertSnapshotsToDailyReturns(sorted)
+		if len(want) == 0 || !reflect.DeepEqual(got, want) {
+			t.Fatalf("seed %d: shuffled input gives %d returns, sorted %d", seed, len(got), len(want))
+		}
+	}
+}
+
+func TestDayNumberer_MatchesSnapshotDate(t *testing.T) {
+	locs := []*time.Location{time.UTC, time.FixedZone("UTC-9:30", -(9*3600 + 1800))}
+	if paris, err := time.LoadLocation("Europe/Paris"); err == nil {
+		locs = append(locs, paris) // DST switches
+	}
+	for _, loc := range locs {
+		var days dayNumberer
+		for ts := time.Date(1969, 3, 1, 0, 0, 0, 0, loc); ts.Year() < 1971; ts = ts.Add(37 * time.Minute) {
+			for _, tt := range []time.Time{ts, ts.AddDate(55, 0, 0)} {
+				got := time.Unix(days.day(tt)*86400, 0).UTC().Format("2006-01-02")
+				if want := snapshotDate(tt); got != want {
+					t.Fatalf("%s: day %s, want %s", tt, got, want)
+				}
+			}
+		}
+	}
+}
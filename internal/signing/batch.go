@@ -0,0 +1,188 @@
+package signing
+
+import (
+	"crypto/ecdsa"
+	"crypto/rand"
+	"crypto/sha256"
+	"encoding/base64"
+	"encoding/hex"
+	"fmt"
+)
+
+// BatchSignatureAlgorithm marks reports signed by SignBatch: the signature
+// covers the Merkle root of a batch of report hashes and the report carries
+// its InclusionProof.
+const BatchSignatureAlgorithm = "ECDSA-P256-SHA256-MERKLE"
+
+// batchRootDomain prefixes the signed batch root, so a batch signature can
+// never be mistaken for a single-report signature over a report hash.
+const batchRootDomain = "report-batch-v1:"
+
+// InclusionProof proves that a report hash is leaf LeafIndex of the LeafCount
+// leaves of the Merkle tree whose root a batch signature covers.
+//
+// The tree hashes leaves and nodes with distinct prefixes:
+//
+//	leaf = SHA-256(0x00 || reportHash)        reportHash as its 32 raw bytes
+//	node = SHA-256(0x01 || left || right)
+//
+// A level with an odd number of nodes promotes its last node unchanged to the
+// next level; that node has no sibling there. The batch signature is the
+// ECDSA-P256 signature of SHA-256("report-batch-v1:" || hex(root)).
+type InclusionProof struct {
+	Root      string   `json:"root"` // hex
+	LeafIndex int      `json:"leaf_index"`
+	LeafCount int      `json:"leaf_count"`
+	Siblings  []string `json:"siblings"` // hex, from the leaf level up
+}
+
+// SignBatch signs inputs with a single ECDSA signature: it hashes each
+// report's canonical payload as Sign does, builds a Merkle tree over the
+// hashes and signs its root. Every returned report shares that signature and
+// carries its own InclusionProof; VerifyReport checks either kind of report.
+// The payloads are exactly those Sign would produce.
+func (s *ReportSigner) SignBatch(inputs []*ReportInput) ([]*SignedReport, error) {
+	if len(inputs) == 0 {
+		return nil, nil
+	}
+
+	att := s.Attestation()
+	reports := make([]*SignedReport, len(inputs))
+	leaves := make([][sha256.Size]byte, len(inputs))
+	for i, input := range inputs {
+		report := s.newReport(input, att, BatchSignatureAlgorithm)
+		hash, err := canonicalPayloadHash(report)
+		if err != nil {
+			return nil, fmt.Errorf("serialize financial payload of report %d: %w", i, err)
+		}
+		report.ReportHash = hex.EncodeToString(hash[:])
+		reports[i] = report
+		leaves[i] = merkleLeaf(hash)
+	}
+
+	levels := merkleLevels(leaves)
+	root := hex.EncodeToString(levels[len(levels)-1][0][:])
+	digest := batchRootDigest(root)
+	signatureDER, err := ecdsa.SignASN1(rand.Reader, s.privateKey, digest[:])
+	if err != nil {
+		return nil, fmt.Errorf("sign batch root: %w", err)
+	}
+	signature := base64.StdEncoding.EncodeToString(signatureDER)
+
+	for i, report := range reports {
+		report.Signature = signature
+		report.InclusionProof = &InclusionProof{
+			Root:      root,
+			LeafIndex: i,
+			LeafCount: len(reports),
+			Siblings:  merkleSiblings(levels, i),
+		}
+	}
+	return reports, nil
+}
+
+// verifyBatchSignature checks that proof leads from reportHash to its root
+// and that signature signs that root. key, when set, is publicKey already
+// parsed.
+func verifyBatchSignature(reportHash [sha256.Size]byte, proof *InclusionProof, signatureB64, publicKey string, key *ecdsa.PublicKey) (bool, error) {
+	if proof == nil {
+		return false, fmt.Errorf("%w: missing", ErrInvalidInclusionProof)
+	}
+	root, err := merkleRootFromProof(merkleLeaf(reportHash), proof)
+	if err != nil {
+		return false, err
+	}
+	if hex.EncodeToString(root[:]) != proof.Root {
+		return false, nil
+	}
+	digest := batchRootDigest(proof.Root)
+	if key != nil {
+		return verifyECDSAKey(digest[:], signatureB64, key)
+	}
+	return verifyECDSADigest(digest[:], signatureB64, publicKey)
+}
+
+func batchRootDigest(rootHex string) [sha256.Size]byte {
+	return sha256.Sum256([]byte(batchRootDomain + rootHex))
+}
+
+func merkleLeaf(reportHash [sha256.Size]byte) [sha256.Size]byte {
+	var buf [1 + sha256.Size]byte
+	buf[0] = 0x00
+	copy(buf[1:], reportHash[:])
+	return sha256.Sum256(buf[:])
+}
+
+func merkleNode(left, right [sha256.Size]byte) [sha256.Size]byte {
+	var buf [1 + 2*sha256.Size]byte
+	buf[0] = 0x01
+	copy(buf[1:], left[:])
+	copy(buf[1+sha256.Size:], right[:])
+	return sha256.Sum256(buf[:])
+}
+
+// merkleLevels returns every level of the tree over leaves, from the leaves
+// to the one-node root level.
+func merkleLevels(leaves [][sha256.Size]byte) [][][sha256.Size]byte {
+	levels := [][][sha256.Size]byte{leaves}
+	for level := leaves; len(level) > 1; {
+		next := make([][sha256.Size]byte, (len(level)+1)/2)
+		for i := range next {
+			if 2*i+1 < len(level) {
+				next[i] = merkleNode(level[2*i], level[2*i+1])
+			} else {
+				next[i] = level[2*i] // odd node out: promoted
+			}
+		}
+		levels = append(levels, next)
+		level = next
+	}
+	return levels
+}
+
+// merkleSiblings returns the hex sibling path of leaf index.
+func merkleSiblings(levels [][][sha256.Size]byte, index int) []string {
+	siblings := []string{}
+	for _, level := range levels[:len(levels)-1] {
+		if sibling := index ^ 1; sibling < len(level) {
+			siblings = append(siblings, hex.EncodeToString(level[sibling][:]))
+		}
+		index /= 2
+	}
+	return siblings
+}
+
+// merkleRootFromProof folds proof's siblings into leaf. The proof must use
+// exactly the siblings its index and leaf count call for.
+func merkleRootFromProof(leaf [sha256.Size]byte, proof *InclusionProof) ([sha256.Size]byte, error) {
+	index, count := proof.LeafIndex, proof.LeafCount
+	if count < 1 || index < 0 || index >= count {
+		return leaf, fmt.Errorf("%w: leaf %d of %d", ErrInvalidInclusionProof, index, count)
+	}
+	node, used := leaf, 0
+	for ; count > 1; index, count = index/2, (count+1)/2 {
+		sibling := index ^ 1
+		if sibling >= count {
+			continue // promoted
+		}
+		if used == len(proof.Siblings) {
+			return leaf, fmt.Errorf("%w: too few siblings", ErrInvalidInclusionProof)
+		}
+		b, err := hex.DecodeString(proof.Siblings[used])
+		if err != nil || len(b) != sha256.Size {
+			return leaf, fmt.Errorf("%w: sibling %d is not a hex SHA-256", ErrInvalidInclusionProof, used)
+		}
+		var hash [sha256.Size]byte
+		copy(hash[:], b)
+		used++
+		if index%2 == 0 {
+			node = merkleNode(node, hash)
+		} else {
+			node = merkleNode(hash, node)
+		}
+	}
+	if used != len(proof.Siblings) {
+		return leaf, fmt.Errorf("%w: too many siblings", ErrInvalidInclusionProof)
+	}
+	return node, nil
+}
@@ -0,0 +1,121 @@
+package signing
+
+import (
+	"errors"
+	"fmt"
+	"testing"
+	"time"
+)
+
+func batchTestInputs(n int) []*ReportInput {
+	inputs := make([]*ReportInput, n)
+	for i := range inputs {
+		inputs[i] = &ReportInput{
+			UserUID:     fmt.Sprintf("user_%03d", i),
+			ReportName:  "Month end",
+			PeriodStart: time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC),
+			PeriodEnd:   time.Date(2025, 1, 31, 0, 0, 0, 0, time.UTC),
+			TotalReturn: 0.01 * float64(i),
+			DataPoints:  31,
+		}
+	}
+	return inputs
+}
+
+func TestSignBatch_EveryReportVerifies(t *testing.T) {
+	signer := MustNewReportSignerGenerate()
+	for _, n := range []int{1, 2, 3, 5, 8, 13} {
+		reports, err := signer.SignBatch(batchTestInputs(n))
+		if err != nil {
+			t.Fatalf("n=%d: SignBatch: %v", n, err)
+		}
+		for i, report := range reports {
+			if report.SignatureAlgorithm != BatchSignatureAlgorithm || report.Signature != reports[0].Signature {
+				t.Fatalf("n=%d report %d: algorithm %q, shared signature %v", n, i, report.SignatureAlgorithm, report.Signature == reports[0].Signature)
+			}
+			if p := report.InclusionProof; p.LeafIndex != i || p.LeafCount != n || p.Root != reports[0].InclusionProof.Root {
+				t.Fatalf("n=%d report %d: proof %+v", n, i, p)
+			}
+			ok, err := VerifyReport(report)
+			if err != nil || !ok {
+				t.Fatalf("n=%d report %d: VerifyReport = %v, %v", n, i, ok, err)
+			}
+			if ok, err := VerifyReportStrict(report, signer.PublicKey(), false); err != nil || !ok {
+				t.Fatalf("n=%d report %d: VerifyReportStrict = %v, %v", n, i, ok, err)
+			}
+		}
+	}
+}
+
+func TestSignBatch_RejectsTampering(t *testing.T) {
+	signer := MustNewReportSignerGenerate()
+	reports, err := signer.SignBatch(batchTestInputs(5))
+	if err != nil {
+		t.Fatal(err)
+	}
+	other := MustNewReportSignerGenerate()
+	foreign, err := other.SignBatch(batchTestInputs(5))
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	clone := func(r *SignedReport) *SignedReport {
+		c := *r
+		p := *r.InclusionProof
+		p.Siblings = append([]string(nil), p.Siblings...)
+		c.InclusionProof = &p
+		return &c
+	}
+	cases := map[string]func() *SignedReport{
+		"payload": func() *SignedReport {
+			r := clone(reports[2])
+			r.TotalReturn = 9
+			return r
+		},
+		"sibling": func() *SignedReport {
+			r := clone(reports[2])
+			r.InclusionProof.Siblings[0] = r.InclusionProof.Siblings[1]
+			return r
+		},
+		"other leaf's proof": func() *SignedReport {
+			r := clone(reports[2])
+			r.InclusionProof = clone(reports[3]).InclusionProof
+			return r
+		},
+		"index": func() *SignedReport {
+			r := clone(reports[2])
+			r.InclusionProof.LeafIndex = 3
+			return r
+		},
+		"root and signature of another batch": func() *SignedReport {
+			r := clone(reports[2])
+			r.InclusionProof.Root = foreign[2].InclusionProof.Root
+			r.Signature = foreign[2].Signature
+			return r
+		},
+		"proof dropped": func() *SignedReport {
+			r := clone(reports[2])
+			r.InclusionProof = nil
+			return r
+		},
+		"downgraded to single signature": func() *SignedReport {
+			r := clone(reports[2])
+			r.SignatureAlgorithm = SignatureAlgorithm
+			return r
+		},
+		"extra sibling": func() *SignedReport {
+			r := clone(reports[4])
+			r.InclusionProof.Siblings = append(r.InclusionProof.Siblings, r.InclusionProof.Root)
+			return r
+		},
+	}
+	for name, tamper := range cases {
+		if ok, err := VerifyReport(tamper()); ok {
+			t.Errorf("%s: tampered report verified (err=%v)", name, err)
+		}
+	}
+
+	if _, err := Verify(reports[0].ReportHash, reports[0].Signature, reports[0].PublicKey, BatchSignatureAlgorithm); !errors.Is(err, ErrInvalidInclusionProof) {
+		t.Fatalf("Verify without proof: err = %v, want ErrInvalidInclusionProof", err)
+	}
+}
@@ -76,6 +76,24 @@ func BenchmarkMarshalSortedJSON_365Days(b *testing.B) {
 	}
 }
 
+// PERF-018: the typed encoder Sign and VerifyReport use in place of
+// marshalSortedJSON(buildFinancialPayload(report)).
+func BenchmarkCanonicalPayload_365Days(b *testing.B) {
+	signer := MustNewReportSignerGenerate()
+	report, err := signer.Sign(makeInputForBench())
+	if err != nil {
+		b.Fatal(err)
+	}
+
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		if _, err := canonicalPayloadHash(report); err != nil {
+			b.Fatal(err)
+		}
+	}
+}
+
 func BenchmarkVerifyReport_365Days(b *testing.B) {
 	signer := MustNewReportSignerGenerate()
 	in := makeInputForBench()
@@ -92,3 +110,28 @@ func BenchmarkVerifyReport_365Days(b *testing.B) {
 		}
 	}
 }
+
+// PERF-019: certifying 1000 reports with one ECDSA signature over their
+// Merkle root, next to one Sign per report.
+func BenchmarkSignBatch_1000Reports(b *testing.B) {
+	signer := MustNewReportSignerGenerate()
+	inputs := batchTestInputs(1000)
+	b.Run("SignEach", func(b *testing.B) {
+		b.ReportAllocs()
+		for i := 0; i < b.N; i++ {
+			for _, in := range inputs {
+				if _, err := signer.Sign(in); err != nil {
+					b.Fatal(err)
+				}
+			}
+		}
+	})
+	b.Run("SignBatch", func(b *testing.B) {
+		b.ReportAllocs()
+		for i := 0; i < b.N; i++ {
+			if _, err := signer.SignBatch(inputs); err != nil {
+				b.Fatal(err)
+			}
+		}
+	})
+}
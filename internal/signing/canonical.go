@@ -0,0 +1,306 @@
+package signing
+
+import (
+	"crypto/sha256"
+	"encoding/json"
+	"math"
+	"strconv"
+	"sync"
+)
+
+// PERF-018: the canonical payload of a SignedReport, encoded straight from
+// its fields. buildFinancialPayload + marshalSortedJSON build a map tree,
+// sort the keys of every map and hand every leaf to encoding/json; this
+// encoder writes the same bytes with the keys in their sorted order spelled
+// out below, into a pooled buffer. TestCanonicalPayloadMatchesReference pins
+// it against the reference encoding, so any change to buildFinancialPayload
+// must be mirrored here.
+
+// canonicalBufPool holds the buffers canonicalPayloadHash encodes into.
+var canonicalBufPool = sync.Pool{
+	New: func() any {
+		b := make([]byte, 0, 32<<10)
+		return &b
+	},
+}
+
+// canonicalPayloadHash returns the SHA-256 of the canonical payload of
+// report, i.e. of marshalSortedJSON(buildFinancialPayload(report)).
+func canonicalPayloadHash(report *SignedReport) ([32]byte, error) {
+	bp := canonicalBufPool.Get().(*[]byte)
+	defer canonicalBufPool.Put(bp)
+
+	buf, err := appendCanonicalPayload((*bp)[:0], report)
+	*bp = buf[:0]
+	if err != nil {
+		return [32]byte{}, err
+	}
+	return sha256.Sum256(buf), nil
+}
+
+// appendCanonicalPayload appends the canonical payload of report to dst.
+func appendCanonicalPayload(dst []byte, report *SignedReport) ([]byte, error) {
+	e := canonicalEncoder{buf: dst}
+	e.open()
+	e.key("baseCurrency")
+	e.str(report.BaseCurrency)
+	if report.Benchmark != "" {
+		e.key("benchmark")
+		e.str(report.Benchmark)
+	}
+	e.key("dailyReturns")
+	e.buf = append(e.buf, '[')
+	for i := range report.DailyReturns {
+		dr := &report.DailyReturns[i]
+		e.elem(i)
+		e.open()
+		e.key("benchmarkReturn")
+		e.float(dr.BenchmarkReturn)
+		e.key("cumulativeReturn")
+		e.float(dr.CumulativeReturn)
+		e.key("date")
+		e.str(dr.Date)
+		e.key("nav")
+		e.float(dr.NAV)
+		e.key("netReturn")
+		e.float(dr.NetReturn)
+		e.key("outperformance")
+		e.float(dr.Outperformance)
+		e.close()
+	}
+	e.buf = append(e.buf, ']')
+	e.key("dataPoints")
+	e.integer(report.DataPoints)
+	if att := report.EnclaveAttestation; att != nil {
+		e.key("enclaveAttestation")
+		e.open()
+		e.key("attested")
+		e.boolean(att.Attested)
+		e.key("measurement")
+		e.str(att.Measurement)
+		e.key("platform")
+		e.str(att.Platform)
+		e.key("reportData")
+		e.str(att.ReportData)
+		e.key("reportDataBoundToRequest")
+		e.boolean(att.ReportDataBoundToRequest)
+		e.key("vcekVerified")
+		e.boolean(att.VcekVerified)
+		e.close()
+	}
+	if len(report.ExchangeDetails) > 0 {
+		e.key("exchangeDetails")
+		e.buf = append(e.buf, '[')
+		for i, ex := range report.ExchangeDetails {
+			e.elem(i)
+			e.open()
+			e.key("isPaper")
+			e.boolean(ex.IsPaper)
+			e.key("kycLevel")
+			e.str(ex.KYCLevel)
+			e.key("name")
+			e.str(ex.Name)
+			e.close()
+		}
+		e.buf = append(e.buf, ']')
+	}
+	e.key("exchanges")
+	if report.Exchanges == nil {
+		e.buf = append(e.buf, "null"...)
+	} else {
+		e.buf = append(e.buf, '[')
+		for i, ex := range report.Exchanges {
+			e.elem(i)
+			e.str(ex)
+		}
+		e.buf = append(e.buf, ']')
+	}
+	e.key("generatedAt")
+	e.str(report.GeneratedAt)
+	e.key("metrics")
+	e.metrics(report)
+	e.key("monthlyReturns")
+	e.buf = append(e.buf, '[')
+	for i := range report.MonthlyReturns {
+		mr := &report.MonthlyReturns[i]
+		e.elem(i)
+		e.open()
+		e.key("aum")
+		e.float(mr.AUM)
+		e.key("benchmarkReturn")
+		e.float(mr.BenchmarkReturn)
+		e.key("date")
+		e.str(mr.Date)
+		e.key("netReturn")
+		e.float(mr.NetReturn)
+		e.key("outperformance")
+		e.float(mr.Outperformance)
+		e.close()
+	}
+	e.buf = append(e.buf, ']')
+	e.key("payloadVersion")
+	e.str(report.PayloadVersion)
+	e.key("periodEnd")
+	e.str(report.PeriodEnd)
+	e.key("periodStart")
+	e.str(report.PeriodStart)
+	e.key("reportId")
+	e.str(report.ReportID)
+	e.key("userUid")
+	e.str(report.UserUID)
+	e.close()
+	return e.buf, e.err
+}
+
+// metrics encodes the "metrics" object of the payload.
+func (e *canonicalEncoder) metrics(report *SignedReport) {
+	e.open()
+	e.key("annualizedReturn")
+	e.float(report.AnnualizedReturn)
+	if bm := report.BenchmarkMetrics; bm != nil {
+		e.key("benchmarkMetrics")
+		e.open()
+		e.key("alpha")
+		e.float(bm.Alpha)
+		e.key("beta")
+		e.float(bm.Beta)
+		e.key("correlation")
+		e.float(bm.Correlation)
+		e.key("informationRatio")
+		e.float(bm.InformationRatio)
+		e.key("trackingError")
+		e.float(bm.TrackingError)
+		e.close()
+	}
+	e.key("calmarRatio")
+	e.float(report.CalmarRatio)
+	if dd := report.DrawdownData; dd != nil {
+		e.key("drawdownData")
+		e.open()
+		e.key("currentDrawdown")
+		e.float(dd.CurrentDrawdown)
+		e.key("drawdownPeriods")
+		e.buf = append(e.buf, '[')
+		for i, p := range dd.Periods {
+			e.elem(i)
+			e.open()
+			e.key("depth")
+			e.float(p.Depth)
+			e.key("duration")
+			e.integer(p.Duration)
+			e.key("endDate")
+			e.str(p.EndDate)
+			e.key("recovered")
+			e.boolean(p.Recovered)
+			e.key("startDate")
+			e.str(p.StartDate)
+			e.close()
+		}
+		e.buf = append(e.buf, ']')
+		e.key("maxDrawdownDuration")
+		e.integer(dd.MaxDrawdownDuration)
+		e.close()
+	}
+	e.key("maxDrawdown")
+	e.float(report.MaxDrawdown)
+	if rm := report.RiskMetrics; rm != nil {
+		e.key("riskMetrics")
+		e.open()
+		e.key("expectedShortfall")
+		e.float(rm.ExpectedShortfall)
+		e.key("kurtosis")
+		e.float(rm.Kurtosis)
+		e.key("skewness")
+		e.float(rm.Skewness)
+		e.key("var95")
+		e.float(rm.VaR95)
+		e.key("var99")
+		e.float(rm.VaR99)
+		e.close()
+	}
+	e.key("sharpeRatio")
+	e.float(report.SharpeRatio)
+	e.key("sortinoRatio")
+	e.float(report.SortinoRatio)
+	e.key("totalReturn")
+	e.float(report.TotalReturn)
+	e.key("volatility")
+	e.float(report.Volatility)
+	e.close()
+}
+
+// canonicalEncoder appends JSON tokens formatted as encoding/json formats
+// them. The first error sticks; later writes still append but the result is
+// discarded by the caller.
+type canonicalEncoder struct {
+	buf []byte
+	err error
+}
+
+func (e *canonicalEncoder) open()  { e.buf = append(e.buf, '{') }
+func (e *canonicalEncoder) close() { e.buf = append(e.buf, '}') }
+
+// key writes an object key, preceded by a comma unless it is the first of
+// its object. Keys are the constant, plain-ASCII names above.
+func (e *canonicalEncoder) key(name string) {
+	if e.buf[len(e.buf)-1] != '{' {
+		e.buf = append(e.buf, ',')
+	}
+	e.buf = append(e.buf, '"')
+	e.buf = append(e.buf, name...)
+	e.buf = append(e.buf, '"', ':')
+}
+
+// elem writes the separator before array element i.
+func (e *canonicalEncoder) elem(i int) {
+	if i > 0 {
+		e.buf = append(e.buf, ',')
+	}
+}
+
+func (e *canonicalEncoder) boolean(v bool) { e.buf = strconv.AppendBool(e.buf, v) }
+
+func (e *canonicalEncoder) integer(v int) { e.buf = strconv.AppendInt(e.buf, int64(v), 10) }
+
+// float formats v as encoding/json does: shortest representation, in
+// exponent form below 1e-6 and from 1e21, with a one-digit negative
+// exponent written without padding.
+func (e *canonicalEncoder) float(v float64) {
+	if math.IsNaN(v) || math.IsInf(v, 0) {
+		if e.err == nil {
+			e.err = &json.UnsupportedValueError{Str: strconv.FormatFloat(v, 'g', -1, 64)}
+		}
+		e.buf = append(e.buf, "null"...)
+		return
+	}
+	format := byte('f')
+	if abs := math.Abs(v); abs != 0 && (abs < 1e-6 || abs >= 1e21) {
+		format = 'e'
+	}
+	e.buf = strconv.AppendFloat(e.buf, v, format, -1, 64)
+	if format == 'e' {
+		// e-09 -> e-9
+		n := len(e.buf)
+		if n >= 4 && e.buf[n-4] == 'e' && e.buf[n-3] == '-' && e.buf[n-2] == '0' {
+			e.buf[n-2] = e.buf[n-1]
+			e.buf = e.buf[:n-1]
+		}
+	}
+}
+
+// str writes s as a JSON string. Printable ASCII without characters that
+// encoding/json escapes is copied as is; anything else (control and HTML
+// characters, non-ASCII, invalid UTF-8) goes through json.Marshal so the
+// escaping stays exactly the standard library's.
+func (e *canonicalEncoder) str(s string) {
+	for i := 0; i < len(s); i++ {
+		if c := s[i]; c < 0x20 || c >= 0x7f || c == '"' || c == '\\' || c == '<' || c == '>' || c == '&' {
+			b, _ := json.Marshal(s) // a string always encodes
+			e.buf = append(e.buf, b...)
+			return
+		}
+	}
+	e.buf = append(e.buf, '"')
+	e.buf = append(e.buf, s...)
+	e.buf = append(e.buf, '"')
+}
@@ -2,6 +2,8 @@ package signing
 
 import (
 	"bytes"
+	"crypto/sha256"
+	"math"
 	"testing"
 	"time"
 )
@@ -180,3 +182,97 @@ func TestMarshalSortedJSONMatchesReference(t *testing.T) {
 		})
 	}
 }
+
+// TestCanonicalPayloadMatchesReference pins appendCanonicalPayload (PERF-018)
+// to marshalSortedJSON(buildFinancialPayload(report)) and the reference
+// encoding: the bytes must be identical for every field shape, or report
+// hashes change.
+func TestCanonicalPayloadMatchesReference(t *testing.T) {
+	full := &SignedReport{
+		ReportID: "2b0c3c64-6a41-4c38-9c59-5f4b9f3c9a10", UserUID: "user_abc", ReportName: "Q1",
+		GeneratedAt: "2025-04-01T00:00:00.000Z", PeriodStart: "2025-01-01T00:00:00.000Z", PeriodEnd: "2025-03-31T00:00:00.000Z",
+		TotalReturn: 0.42, AnnualizedReturn: 1e21, SharpeRatio: 1.5, SortinoRatio: -2.1e-7, CalmarRatio: 0.9,
+		MaxDrawdown: -0.18, Volatility: 123456789.125, DataPoints: 90, BaseCurrency: "USD", Benchmark: "SPY",
+		Exchanges: []string{"binance", "ibkr"},
+		ExchangeDetails: []ExchangeInfo{
+			{Name: "binance", KYCLevel: "basic"},
+			{Name: "kraken", IsPaper: true},
+		},
+		DailyReturns: []DailyReturn{
+			{Date: "2025-01-02", NetReturn: 0.001, BenchmarkReturn: 1e-9, Outperformance: math.Copysign(0, -1), CumulativeReturn: 0.05, NAV: 1.05},
+			{Date: "2025-01-03", NetReturn: -0.0123456789012345, NAV: 1.0375},
+		},
+		MonthlyReturns: []MonthlyReturn{{Date: "2025-01", NetReturn: 0.03, AUM: 1_000_000.5}},
+		RiskMetrics:    &RiskMetrics{VaR95: -0.02, VaR99: -0.04, ExpectedShortfall: -0.05, Skewness: -0.3, Kurtosis: 3.5},
+		DrawdownData: &DrawdownData{CurrentDrawdown: -0.05, MaxDrawdownDuration: 12, Periods: []*DrawdownPeriod{
+			{StartDate: "2025-02-10", EndDate: "2025-02-22", Depth: -0.18, Duration: 12, Recovered: true},
+			{StartDate: "2025-03-01", Depth: -0.01, Duration: 3},
+		}},
+		BenchmarkMetrics: &BenchmarkMetrics{Alpha: 0.05, Beta: 1.1, InformationRatio: 0.8, TrackingError: 0.04, Correlation: 0.9},
+		EnclaveAttestation: &EnclaveAttestation{
+			Measurement: "abcd", ReportData: "deadbeef", Platform: "sev-snp",
+			Attested: true, ReportDataBoundToRequest: true, VcekVerified: true,
+		},
+		PayloadVersion: PayloadVersion,
+	}
+	escapes := *full
+	escapes.UserUID = "u\"1\\<script>&\u2028\x01"
+	escapes.Benchmark = "Jürgen — 🚀"
+	escapes.Exchanges = []string{"tab\there", "\u007f"}
+	escapes.ExchangeDetails = []ExchangeInfo{}
+	escapes.DrawdownData = &DrawdownData{}
+	escapes.EnclaveAttestation = &EnclaveAttestation{Platform: "unattested-dev"}
+
+	// Invalid UTF-8 is the one shape where marshalSortedJSON, which Sign
+	// used since PERF-001, already differed from the reference: it writes
+	// \ufffd escapes where the reference round trip writes U+FFFD itself.
+	// Hashes of existing reports follow marshalSortedJSON.
+	invalid := *full
+	invalid.Exchanges = []string{"\xff\xfe"}
+
+	cases := []struct {
+		name      string
+		report    *SignedReport
+		reference bool // also compare with marshalSortedJSONReference
+	}{
+		{"empty", &SignedReport{}, true},
+		{"minimal", &SignedReport{ReportID: "r", UserUID: "u1", BaseCurrency: "USD", DataPoints: 30, PayloadVersion: PayloadVersion, Exchanges: []string{}}, true},
+		{"full", full, true},
+		{"escapes", &escapes, true},
+		{"invalid_utf8", &invalid, false},
+	}
+	for _, tc := range cases {
+		t.Run(tc.name, func(t *testing.T) {
+			payload := buildFinancialPayload(tc.report)
+			want, err := marshalSortedJSON(payload)
+			if err != nil {
+				t.Fatalf("marshalSortedJSON: %v", err)
+			}
+			if tc.reference {
+				ref, err := marshalSortedJSONReference(payload)
+				if err != nil {
+					t.Fatalf("reference: %v", err)
+				}
+				if !bytes.Equal(want, ref) {
+					t.Fatalf("marshalSortedJSON differs from the reference\nfast: %s\n ref: %s", want, ref)
+				}
+			}
+			got, err := appendCanonicalPayload(nil, tc.report)
+			if err != nil {
+				t.Fatalf("appendCanonicalPayload: %v", err)
+			}
+			if !bytes.Equal(got, want) {
+				t.Fatalf("output mismatch\n got: %s\nwant: %s", got, want)
+			}
+			if hash, _ := canonicalPayloadHash(tc.report); hash != sha256.Sum256(want) {
+				t.Fatal("canonicalPayloadHash differs from the hash of the encoding")
+			}
+		})
+	}
+
+	nan := *full
+	nan.Volatility = math.NaN()
+	if _, err := appendCanonicalPayload(nil, &nan); err == nil {
+		t.Fatal("NaN encoded without error")
+	}
+}
@@ -0,0 +1,36 @@
+package signing
+
+import (
+	"crypto/ecdsa"
+	"fmt"
+)
+
+// PinnedKey is an expected signing public key parsed once, for callers that
+// check many reports against the same enclave key (see VerifyReportStrict).
+type PinnedKey struct {
+	encoded string
+	key     *ecdsa.PublicKey
+}
+
+// ParsePinnedKey parses publicKey, a base64 DER (SPKI) ECDSA public key as
+// published at /api/v1/attestation.
+func ParsePinnedKey(publicKey string) (*PinnedKey, error) {
+	if publicKey == "" {
+		return nil, fmt.Errorf("expectedPubKey is required")
+	}
+	key, err := parseECDSAPublicKey(publicKey)
+	if err != nil {
+		return nil, err
+	}
+	return &PinnedKey{encoded: publicKey, key: key}, nil
+}
+
+// String returns the key as it was given to ParsePinnedKey.
+func (k *PinnedKey) String() string { return k.encoded }
+
+// VerifyReportStrict is VerifyReportStrict(report, k.String(), expectSevSnp)
+// without parsing the key again for every report. It is safe for concurrent
+// use.
+func (k *PinnedKey) VerifyReportStrict(report *SignedReport, expectSevSnp bool) (bool, error) {
+	return verifyReportStrict(report, k.encoded, k.key, expectSevSnp)
+}
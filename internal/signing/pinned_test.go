@@ -0,0 +1,49 @@
+package signing
+
+import (
+	"testing"
+)
+
+// TestPinnedKey_MatchesVerifyReportStrict checks that the parse-once path
+// gives VerifyReportStrict's verdict on single, batch, forged and tampered
+// reports.
+func TestPinnedKey_MatchesVerifyReportStrict(t *testing.T) {
+	enclaveSigner := MustNewReportSignerGenerate()
+	attackerSigner := MustNewReportSignerGenerate()
+	inputs := batchTestInputs(5)
+
+	single, _ := enclaveSigner.Sign(inputs[0])
+	forged, _ := attackerSigner.Sign(inputs[0])
+	tampered, _ := enclaveSigner.Sign(inputs[1])
+	tampered.TotalReturn += 0.01
+	batch, err := enclaveSigner.SignBatch(inputs)
+	if err != nil {
+		t.Fatalf("SignBatch: %v", err)
+	}
+	badProof, _ := enclaveSigner.SignBatch(inputs)
+	badProof[2].InclusionProof.Siblings = badProof[2].InclusionProof.Siblings[1:]
+
+	pinned, err := ParsePinnedKey(enclaveSigner.PublicKey())
+	if err != nil {
+		t.Fatalf("ParsePinnedKey: %v", err)
+	}
+	if pinned.String() != enclaveSigner.PublicKey() {
+		t.Fatal("PinnedKey.String does not return the parsed key")
+	}
+
+	reports := append([]*SignedReport{single, forged, tampered, badProof[2]}, batch...)
+	for i, report := range reports {
+		wantOK, wantErr := VerifyReportStrict(report, enclaveSigner.PublicKey(), false)
+		gotOK, gotErr := pinned.VerifyReportStrict(report, false)
+		if gotOK != wantOK || (gotErr == nil) != (wantErr == nil) || (gotErr != nil && gotErr.Error() != wantErr.Error()) {
+			t.Fatalf("report %d: pinned = (%v, %v), VerifyReportStrict = (%v, %v)", i, gotOK, gotErr, wantOK, wantErr)
+		}
+	}
+	if ok, _ := pinned.VerifyReportStrict(single, false); !ok {
+		t.Fatal("pinned key should accept a legit report")
+	}
+
+	if _, err := ParsePinnedKey("not-base64!"); err == nil {
+		t.Fatal("ParsePinnedKey should reject a malformed key")
+	}
+}
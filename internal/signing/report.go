@@ -289,16 +289,40 @@ type SignedReport struct {
 	ReportHash         string `json:"report_hash"`
 	EnclaveVersion     string `json:"enclave_version"`
 	PayloadVersion     string `json:"payload_version"`
+
+	// InclusionProof ties ReportHash to the batch root Signature covers;
+	// set only with BatchSignatureAlgorithm.
+	InclusionProof *InclusionProof `json:"inclusion_proof,omitempty"`
 }
 
 // Sign creates a signed report from input.
 // TS parity:
 // 1. Build financial data
-// 2. Deterministically serialize with sorted keys
+// 2. Deterministically serialize with sorted keys (appendCanonicalPayload)
 // 3. reportHash = SHA-256(financialDataJSON) hex
 // 4. signature = ECDSA-SHA256 sign(reportHash string)
 func (s *ReportSigner) Sign(input *ReportInput) (*SignedReport, error) {
-	report := &SignedReport{
+	report := s.newReport(input, s.Attestation(), SignatureAlgorithm)
+
+	hash, err := canonicalPayloadHash(report)
+	if err != nil {
+		return nil, fmt.Errorf("serialize financial payload: %w", err)
+	}
+	report.ReportHash = hex.EncodeToString(hash[:])
+
+	reportHashDigest := sha256.Sum256([]byte(report.ReportHash))
+	signatureDER, err := ecdsa.SignASN1(rand.Reader, s.privateKey, reportHashDigest[:])
+	if err != nil {
+		return nil, fmt.Errorf("sign report hash: %w", err)
+	}
+	report.Signature = base64.StdEncoding.EncodeToString(signatureDER)
+
+	return report, nil
+}
+
+// newReport fills the unsigned fields of a report for input.
+func (s *ReportSigner) newReport(input *ReportInput, att *EnclaveAttestation, algorithm string) *SignedReport {
+	return &SignedReport{
 		ReportID:           uuid.New().String(),
 		UserUID:            input.UserUID,
 		ReportName:         input.ReportName,
@@ -324,30 +348,12 @@ func (s *ReportSigner) Sign(input *ReportInput) (*SignedReport, error) {
 		RiskMetrics:        input.RiskMetrics,
 		DrawdownData:       input.DrawdownData,
 		BenchmarkMetrics:   input.BenchmarkMetrics,
-		EnclaveAttestation: s.Attestation(),
+		EnclaveAttestation: att,
 		PublicKey:          s.PublicKey(),
-		SignatureAlgorithm: SignatureAlgorithm,
+		SignatureAlgorithm: algorithm,
 		EnclaveVersion:     EnclaveVersion,
 		PayloadVersion:     PayloadVersion,
 	}
-
-	financialPayload := buildFinancialPayload(report)
-	financialJSON, err := marshalSortedJSON(financialPayload)
-	if err != nil {
-		return nil, fmt.Errorf("serialize financial payload: %w", err)
-	}
-
-	hash := sha256.Sum256(financialJSON)
-	report.ReportHash = hex.EncodeToString(hash[:])
-
-	reportHashDigest := sha256.Sum256([]byte(report.ReportHash))
-	signatureDER, err := ecdsa.SignASN1(rand.Reader, s.privateKey, reportHashDigest[:])
-	if err != nil {
-		return nil, fmt.Errorf("sign report hash: %w", err)
-	}
-	report.Signature = base64.StdEncoding.EncodeToString(signatureDER)
-
-	return report, nil
 }
 
 func formatISO8601(t time.Time) string {
@@ -487,11 +493,13 @@ func toDrawdownPeriodsPayload(in []*DrawdownPeriod) []map[string]any {
 }
 
 // marshalSortedJSON produces a deterministic JSON encoding of v, with map
-// keys emitted in lexicographic order at every level. The result is what
-// the report hash is computed over, so its byte layout is part of the
-// signing contract — see TestMarshalSortedJSONMatchesReference for the
-// non-regression test that pins the output against the legacy reference
-// implementation.
+// keys emitted in lexicographic order at every level. Over
+// buildFinancialPayload it defines the bytes the report hash is computed
+// over, so its byte layout is part of the signing contract — see
+// TestMarshalSortedJSONMatchesReference for the non-regression test that
+// pins the output against the legacy reference implementation. Sign and
+// VerifyReport produce the same bytes with appendCanonicalPayload
+// (PERF-018).
 //
 // PERF-001: the previous implementation did Marshal → Unmarshal-into-`any`
 // → re-Marshal-recursive, which cost ~22 k allocs / 700 KB per call on a
@@ -656,18 +664,31 @@ func VerifyReport(report *SignedReport) (bool, error) {
 	if report == nil {
 		return false, fmt.Errorf("nil report")
 	}
+	return verifyReport(report, nil)
+}
 
-	payload := buildFinancialPayload(report)
-	canonical, err := marshalSortedJSON(payload)
+// verifyReport is VerifyReport for a non-nil report. key, when set, is
+// report.PublicKey already parsed (see PinnedKey) and is used for the ECDSA
+// algorithms instead of parsing the key again.
+func verifyReport(report *SignedReport, key *ecdsa.PublicKey) (bool, error) {
+	recomputed, err := canonicalPayloadHash(report)
 	if err != nil {
 		return false, fmt.Errorf("rebuild canonical payload: %w", err)
 	}
-
-	recomputed := sha256.Sum256(canonical)
 	if hex.EncodeToString(recomputed[:]) != report.ReportHash {
 		return false, nil
 	}
 
+	if report.SignatureAlgorithm == BatchSignatureAlgorithm {
+		return verifyBatchSignature(recomputed, report.InclusionProof, report.Signature, report.PublicKey, key)
+	}
+	if report.InclusionProof != nil {
+		return false, fmt.Errorf("%w: proof on a %q report", ErrInvalidInclusionProof, report.SignatureAlgorithm)
+	}
+	if key != nil && (report.SignatureAlgorithm == "" || report.SignatureAlgorithm == SignatureAlgorithm) {
+		digest := sha256.Sum256([]byte(report.ReportHash))
+		return verifyECDSAKey(digest[:], report.Signature, key)
+	}
 	return Verify(report.ReportHash, report.Signature, report.PublicKey, report.SignatureAlgorithm)
 }
 
@@ -676,6 +697,9 @@ var (
 	ErrUnknownAlgorithm    = fmt.Errorf("unknown signature algorithm")
 	ErrPublicKeyMismatch   = fmt.Errorf("signing public key does not match expected key")
 	ErrAttestationNotBound = fmt.Errorf("sev-snp report_data is not bound to the enclave keys")
+	// ErrInvalidInclusionProof reports a missing or malformed batch
+	// inclusion proof (BatchSignatureAlgorithm).
+	ErrInvalidInclusionProof = fmt.Errorf("invalid batch inclusion proof")
 )
 
 // Verify checks a signature against a report hash, dispatching on algorithm.
@@ -695,30 +719,57 @@ func Verify(reportHash, signatureB64, publicKey, algorithm string) (bool, error)
 		return verifyECDSA(reportHash, signatureB64, publicKey)
 	case "Ed25519":
 		return verifyEd25519Legacy(reportHash, signatureB64, publicKey)
+	case BatchSignatureAlgorithm:
+		// The signature covers a batch root, not reportHash.
+		return false, fmt.Errorf("%w: %s needs the inclusion proof, use VerifyReport", ErrInvalidInclusionProof, algorithm)
 	default:
 		return false, fmt.Errorf("%w: %q", ErrUnknownAlgorithm, algorithm)
 	}
 }
 
 func verifyECDSA(reportHash, signatureB64, publicKey string) (bool, error) {
+	reportHashDigest := sha256.Sum256([]byte(reportHash))
+	return verifyECDSADigest(reportHashDigest[:], signatureB64, publicKey)
+}
+
+// verifyECDSADigest checks an ASN.1 ECDSA signature (base64) of digest
+// against a base64 DER public key.
+func verifyECDSADigest(digest []byte, signatureB64, publicKey string) (bool, error) {
 	signatureDER, err := base64.StdEncoding.DecodeString(signatureB64)
 	if err != nil {
 		return false, fmt.Errorf("decode ecdsa signature: %w", err)
 	}
+	ecdsaKey, err := parseECDSAPublicKey(publicKey)
+	if err != nil {
+		return false, err
+	}
+	return ecdsa.VerifyASN1(ecdsaKey, digest, signatureDER), nil
+}
+
+// verifyECDSAKey is verifyECDSADigest with an already parsed public key.
+func verifyECDSAKey(digest []byte, signatureB64 string, key *ecdsa.PublicKey) (bool, error) {
+	signatureDER, err := base64.StdEncoding.DecodeString(signatureB64)
+	if err != nil {
+		return false, fmt.Errorf("decode ecdsa signature: %w", err)
+	}
+	return ecdsa.VerifyASN1(key, digest, signatureDER), nil
+}
+
+// parseECDSAPublicKey parses a base64 DER (SPKI) ECDSA public key.
+func parseECDSAPublicKey(publicKey string) (*ecdsa.PublicKey, error) {
 	publicKeyDER, err := base64.StdEncoding.DecodeString(publicKey)
 	if err != nil {
-		return false, fmt.Errorf("decode ecdsa public key (base64): %w", err)
+		return nil, fmt.Errorf("decode ecdsa public key (base64): %w", err)
 	}
 	parsed, err := x509.ParsePKIXPublicKey(publicKeyDER)
 	if err != nil {
-		return false, fmt.Errorf("parse ecdsa public key: %w", err)
+		return nil, fmt.Errorf("parse ecdsa public key: %w", err)
 	}
 	ecdsaKey, ok := parsed.(*ecdsa.PublicKey)
 	if !ok {
-		return false, fmt.Errorf("public key is not ECDSA")
+		return nil, fmt.Errorf("public key is not ECDSA")
 	}
-	reportHashDigest := sha256.Sum256([]byte(reportHash))
-	return ecdsa.VerifyASN1(ecdsaKey, reportHashDigest[:], signatureDER), nil
+	return ecdsaKey, nil
 }
 
 func verifyEd25519Legacy(reportHash, signatureB64, publicKey string) (bool, error) {
@@ -756,6 +807,12 @@ func verifyEd25519Legacy(reportHash, signatureB64, publicKey string) (bool, erro
 // specific sentinel error so callers can log it rather than treating it as a
 // generic verification failure.
 func VerifyReportStrict(report *SignedReport, expectedPubKey string, expectSevSnp bool) (bool, error) {
+	return verifyReportStrict(report, expectedPubKey, nil, expectSevSnp)
+}
+
+// verifyReportStrict implements VerifyReportStrict; key, when set, is
+// expectedPubKey already parsed.
+func verifyReportStrict(report *SignedReport, expectedPubKey string, key *ecdsa.PublicKey, expectSevSnp bool) (bool, error) {
 	if report == nil {
 		return false, fmt.Errorf("nil report")
 	}
@@ -770,7 +827,7 @@ func VerifyReportStrict(report *SignedReport, expectedPubKey string, expectSevSn
 	}
 
 	// Step 2 + 3: hash + signature
-	ok, err := VerifyReport(report)
+	ok, err := verifyReport(report, key)
 	if err != nil {
 		return false, err
 	}
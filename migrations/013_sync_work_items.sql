@@ -0,0 +1,19 @@
+-- Migration 013: Durable work queue for the sharded daily sync.
+-- One row per (run_date, user_uid). Enclave replicas claim rows with
+-- SELECT ... FOR UPDATE SKIP LOCKED and hold them under a lease; a row whose
+-- lease expired (replica crashed mid-sync) becomes claimable again.
+CREATE TABLE IF NOT EXISTS sync_work_items (
+    run_date DATE NOT NULL,
+    user_uid VARCHAR(255) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending, claimed, done, failed
+    claimed_by VARCHAR(255),
+    lease_expires_at TIMESTAMPTZ,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (run_date, user_uid)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_work_items_claimable
+    ON sync_work_items(run_date, status, lease_expires_at);
@@ -0,0 +1,23 @@
+-- Migration 014: Derived daily TWR series per user and snapshot filter.
+-- Maintained by the enclave from snapshot_data: the sync appends the days it
+-- writes, and a backfill recomputes from its earliest changed day. A profile
+-- row marks a series as fully built; series without one are never read.
+CREATE TABLE IF NOT EXISTS return_series_profiles (
+    user_uid VARCHAR(255) NOT NULL,
+    profile TEXT NOT NULL,               -- '' = every connection, else the filter as JSON
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_uid, profile)
+);
+
+CREATE TABLE IF NOT EXISTS return_series (
+    user_uid VARCHAR(255) NOT NULL,
+    profile TEXT NOT NULL,
+    day DATE NOT NULL,
+    first_ts TIMESTAMPTZ NOT NULL,       -- earliest snapshot of the day
+    last_ts TIMESTAMPTZ NOT NULL,        -- latest snapshot of the day
+    net_return DOUBLE PRECISION,         -- NULL: no return (first day, zero prior equity)
+    connections INTEGER NOT NULL,        -- connections with a snapshot that day
+    known INTEGER NOT NULL,              -- connections seen up to that day
+    state JSONB NOT NULL,                -- connection key -> last known equity
+    PRIMARY KEY (user_uid, profile, day)
+);
@@ -0,0 +1,7 @@
+-- Migration 015: Covering index for the latest snapshot of each connection.
+-- SnapshotRepo.GetLatestByConnections probes it once per connection
+-- (ORDER BY timestamp DESC LIMIT 1); the INCLUDE columns are the totals the
+-- aggregated metrics read, so each probe is an index-only scan.
+CREATE INDEX IF NOT EXISTS idx_snapshot_data_connection_latest
+    ON snapshot_data(user_uid, exchange, label, timestamp DESC)
+    INCLUDE (total_equity, realized_balance, unrealized_pnl, total_trades, total_fees);
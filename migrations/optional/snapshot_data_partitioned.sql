@@ -0,0 +1,98 @@
+-- Optional: convert snapshot_data to monthly range partitions on timestamp.
+--
+-- Not applied by ApplyMigrations or the Postgres entrypoint, which only read
+-- migrations/*.sql. Run it once, in a maintenance window (it rewrites the
+-- table under an exclusive lock), after the numbered migrations:
+--
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/optional/snapshot_data_partitioned.sql
+--
+-- Works on the Go schema (user_uid, …) and on the TS Prisma schema
+-- ("userUid", …). Partitions are named snapshot_data_YYYY_MM and cover
+-- [first day of the month, first day of the next) in UTC; rows outside every
+-- partition land in snapshot_data_default. Once snapshot_data is partitioned
+-- the enclave creates the partitions of the coming months itself
+-- (SnapshotRepo.EnsurePartitions) and moves any rows that reached the default
+-- partition into them.
+--
+-- Indexes, created on the parent so every partition gets its own:
+--   - the upsert key (user, exchange, label, timestamp), unique;
+--   - (user, timestamp) for per-user range reads;
+--   - the latest-per-connection covering index of migration 015 (Go schema);
+--   - a BRIN index on timestamp in place of the btree, for time scans: rows
+--     arrive in timestamp order, so block ranges summarize tightly and the
+--     index stays a few pages per partition.
+--
+-- The old table is kept as snapshot_data_unpartitioned for rollback; drop it
+-- once the enclave runs fine on the new one.
+BEGIN;
+
+-- Month boundaries below are UTC midnights, for timestamptz (Go) and
+-- timestamp (TS) columns alike.
+SET LOCAL TimeZone = 'UTC';
+
+ALTER TABLE snapshot_data RENAME TO snapshot_data_unpartitioned;
+
+-- Free the index names for the partitioned table.
+DO $$
+DECLARE
+    idx record;
+BEGIN
+    FOR idx IN
+        SELECT i.relname
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = 'public.snapshot_data_unpartitioned'::regclass
+    LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', idx.relname, left(idx.relname, 50) || '_unpartitioned');
+    END LOOP;
+END $$;
+
+CREATE TABLE snapshot_data (
+    LIKE snapshot_data_unpartitioned INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE
+) PARTITION BY RANGE (timestamp);
+
+DO $$
+DECLARE
+    ts_schema boolean := EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'snapshot_data' AND column_name = 'userUid');
+    user_col text := CASE WHEN ts_schema THEN '"userUid"' ELSE 'user_uid' END;
+    first_month timestamp;
+    last_month timestamp;
+    m timestamp;
+BEGIN
+    -- One partition per month from the first snapshot to three months ahead.
+    SELECT date_trunc('month', min(timestamp)::timestamp),
+           date_trunc('month', max(timestamp)::timestamp)
+    INTO first_month, last_month
+    FROM snapshot_data_unpartitioned;
+    first_month := coalesce(first_month, date_trunc('month', localtimestamp));
+    last_month := greatest(last_month, date_trunc('month', localtimestamp) + interval '3 months');
+
+    m := first_month;
+    WHILE m <= last_month LOOP
+        EXECUTE format('CREATE TABLE %I PARTITION OF snapshot_data FOR VALUES FROM (%L) TO (%L)',
+            'snapshot_data_' || to_char(m, 'YYYY_MM'),
+            to_char(m, 'YYYY-MM-DD') || ' 00:00:00+00',
+            to_char(m + interval '1 month', 'YYYY-MM-DD') || ' 00:00:00+00');
+        m := m + interval '1 month';
+    END LOOP;
+    CREATE TABLE snapshot_data_default PARTITION OF snapshot_data DEFAULT;
+
+    -- The partition key must be part of every unique constraint.
+    ALTER TABLE snapshot_data ADD PRIMARY KEY (id, timestamp);
+    EXECUTE format('CREATE UNIQUE INDEX idx_snapshot_data_user_exchange_label_time ON snapshot_data (%s, exchange, label, timestamp)', user_col);
+    EXECUTE format('CREATE INDEX idx_snapshot_data_user_time ON snapshot_data (%s, timestamp)', user_col);
+    IF NOT ts_schema THEN
+        CREATE INDEX idx_snapshot_data_connection_latest
+            ON snapshot_data (user_uid, exchange, label, timestamp DESC)
+            INCLUDE (total_equity, realized_balance, unrealized_pnl, total_trades, total_fees);
+    END IF;
+    CREATE INDEX idx_snapshot_data_timestamp_brin ON snapshot_data USING brin (timestamp) WITH (pages_per_range = 32);
+END $$;
+
+INSERT INTO snapshot_data SELECT * FROM snapshot_data_unpartitioned ORDER BY timestamp;
+
+COMMIT;
+
+ANALYZE snapshot_data;
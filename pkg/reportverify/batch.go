@@ -0,0 +1,120 @@
+package reportverify
+
+import (
+	"context"
+	"runtime"
+	"sync"
+	"sync/atomic"
+
+	"github.com/trackrecord/enclave/internal/signing"
+)
+
+// Result is the outcome of verifying one report of a batch or stream.
+type Result struct {
+	// Index is the position of Report in the VerifyBatch slice, or in the
+	// order VerifyStream received it.
+	Index  int
+	Report *signing.SignedReport
+
+	// Err is nil when Report can be trusted; otherwise it is what Verify
+	// returns for it, so the sentinel errors work with errors.Is.
+	Err error
+}
+
+// VerifyBatch verifies reports with the checks of Verify, spread over
+// v.Workers goroutines. The expected signing key is parsed and the
+// measurement allowlist and expected report_data are computed once for the
+// whole batch. results[i] is the outcome for reports[i].
+func (v *Verifier) VerifyBatch(reports []*signing.SignedReport) []Result {
+	e := v.expectations()
+	results := make([]Result, len(reports))
+	verify := func(i int) {
+		results[i] = Result{Index: i, Report: reports[i], Err: e.verify(reports[i])}
+	}
+
+	workers := min(v.workers(), len(reports))
+	if workers <= 1 {
+		for i := range reports {
+			verify(i)
+		}
+		return results
+	}
+
+	var next atomic.Int64
+	var wg sync.WaitGroup
+	wg.Add(workers)
+	for w := 0; w < workers; w++ {
+		go func() {
+			defer wg.Done()
+			for i := int(next.Add(1) - 1); i < len(reports); i = int(next.Add(1) - 1) {
+				verify(i)
+			}
+		}()
+	}
+	wg.Wait()
+	return results
+}
+
+// VerifyStream verifies the reports received from reports, like VerifyBatch,
+// for archives too large to hold in memory. Results are sent as they
+// complete, not in input order; Result.Index gives the input position. The
+// returned channel is closed once reports is closed and drained, or once ctx
+// is done, in which case the reports still in flight are dropped.
+func (v *Verifier) VerifyStream(ctx context.Context, reports <-chan *signing.SignedReport) <-chan Result {
+	e := v.expectations()
+	workers := v.workers()
+
+	type job struct {
+		index  int
+		report *signing.SignedReport
+	}
+	jobs := make(chan job, workers)
+	out := make(chan Result, workers)
+
+	go func() {
+		defer close(jobs)
+		for i := 0; ; i++ {
+			select {
+			case report, ok := <-reports:
+				if !ok {
+					return
+				}
+				select {
+				case jobs <- job{i, report}:
+				case <-ctx.Done():
+					return
+				}
+			case <-ctx.Done():
+				return
+			}
+		}
+	}()
+
+	var wg sync.WaitGroup
+	wg.Add(workers)
+	for w := 0; w < workers; w++ {
+		go func() {
+			defer wg.Done()
+			for j := range jobs {
+				r := Result{Index: j.index, Report: j.report, Err: e.verify(j.report)}
+				select {
+				case out <- r:
+				case <-ctx.Done():
+					return
+				}
+			}
+		}()
+	}
+	go func() {
+		wg.Wait()
+		close(out)
+	}()
+	return out
+}
+
+func (v *Verifier) workers() int {
+	if v.Workers > 0 {
+		return v.Workers
+	}
+	return runtime.GOMAXPROCS(0)
+}
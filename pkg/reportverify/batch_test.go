@@ -0,0 +1,102 @@
+package reportverify
+
+import (
+	"context"
+	"errors"
+	"testing"
+
+	"github.com/trackrecord/enclave/internal/signing"
+)
+
+// batchFixture returns a verifier and a mix of reports it accepts and
+// rejects, with the error Verify returns for each.
+func batchFixture(t *testing.T) (*Verifier, []*signing.SignedReport, []error) {
+	t.Helper()
+	signer := signing.MustNewReportSignerGenerate()
+	forger := signing.MustNewReportSignerGenerate()
+	tlsFP, e2ePK, measurement := "aa", "pem", "CAFE"
+
+	good := buildSignedReport(t, signer, tlsFP, e2ePK, measurement, nil, true, true, true)
+	forged := buildSignedReport(t, forger, tlsFP, e2ePK, measurement, nil, true, true, true)
+	unbound := buildSignedReport(t, signer, tlsFP, e2ePK, measurement, nil, true, false, true)
+	outside := buildSignedReport(t, signer, tlsFP, e2ePK, "beef", nil, true, true, true)
+	tampered := buildSignedReport(t, signer, tlsFP, e2ePK, measurement, nil, true, true, true)
+	tampered.TotalReturn = 0.5
+
+	v := &Verifier{
+		ExpectedSigningPublicKey: signer.PublicKey(),
+		AllowedMeasurements:      []string{"cafe"},
+		ExpectedTLSFingerprint:   tlsFP,
+		ExpectedE2EPublicKey:     e2ePK,
+		RequireSevSnp:            true,
+		Workers:                  3,
+	}
+	reports := []*signing.SignedReport{good, forged, nil, unbound, outside, tampered, good, good}
+	want := make([]error, len(reports))
+	for i, report := range reports {
+		want[i] = v.Verify(report)
+	}
+	return v, reports, want
+}
+
+func TestVerifyBatch_MatchesVerify(t *testing.T) {
+	v, reports, want := batchFixture(t)
+	sentinels := []error{nil, ErrPublicKeyMismatch, ErrNilReport, ErrReportDataNotBound, ErrMeasurementNotAllowed, ErrSignatureInvalid, nil, nil}
+	for i, err := range want {
+		if !errors.Is(err, sentinels[i]) || (err == nil) != (sentinels[i] == nil) {
+			t.Fatalf("fixture report %d: Verify = %v, want %v", i, err, sentinels[i])
+		}
+	}
+
+	results := v.VerifyBatch(reports)
+	if len(results) != len(reports) {
+		t.Fatalf("got %d results for %d reports", len(results), len(reports))
+	}
+	for i, r := range results {
+		if r.Index != i || r.Report != reports[i] || r.Err != want[i] {
+			t.Fatalf("result %d = {%d, %v}, want {%d, %v}", i, r.Index, r.Err, i, want[i])
+		}
+	}
+
+	if got := v.VerifyBatch(nil); len(got) != 0 {
+		t.Fatalf("empty batch returned %d results", len(got))
+	}
+}
+
+func TestVerifyStream_MatchesVerify(t *testing.T) {
+	v, reports, want := batchFixture(t)
+
+	in := make(chan *signing.SignedReport)
+	go func() {
+		defer close(in)
+		for _, report := range reports {
+			in <- report
+		}
+	}()
+
+	seen := make([]bool, len(reports))
+	for r := range v.VerifyStream(context.Background(), in) {
+		if seen[r.Index] {
+			t.Fatalf("report %d reported twice", r.Index)
+		}
+		seen[r.Index] = true
+		if r.Report != reports[r.Index] || r.Err != want[r.Index] {
+			t.Fatalf("result %d: err %v, want %v", r.Index, r.Err, want[r.Index])
+		}
+	}
+	for i, ok := range seen {
+		if !ok {
+			t.Fatalf("no result for report %d", i)
+		}
+	}
+}
+
+func TestVerifyStream_StopsOnCancel(t *testing.T) {
+	v, _, _ := batchFixture(t)
+	ctx, cancel := context.WithCancel(context.Background())
+	in := make(chan *signing.SignedReport) // never closed
+	out := v.VerifyStream(ctx, in)
+	cancel()
+	for range out {
+	}
+}
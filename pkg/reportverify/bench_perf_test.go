@@ -0,0 +1,96 @@
+package reportverify
+
+import (
+	"testing"
+	"time"
+
+	"github.com/trackrecord/enclave/internal/signing"
+)
+
+// PERF-020: re-verifying an archive of 10k signed 365-day reports, one
+// Verify call at a time vs. VerifyBatch. The report shape is the one of
+// makeInputForBench in internal/signing/bench_perf_test.go.
+func BenchmarkVerifyBatch_10kReports_365Days(b *testing.B) {
+	const n = 10000
+	signer := signing.MustNewReportSignerGenerate()
+	tlsFP, e2ePK, measurement := "aa", "pem", "cafe"
+	signer.SetAttestation(&signing.EnclaveAttestation{
+		Measurement:              measurement,
+		ReportData:               expectedReportData(tlsFP, e2ePK, signer.PublicKey(), nil),
+		Platform:                 "sev-snp",
+		Attested:                 true,
+		ReportDataBoundToRequest: true,
+		VcekVerified:             true,
+	})
+	input := benchInput365Days()
+	reports := make([]*signing.SignedReport, n)
+	for i := range reports {
+		report, err := signer.Sign(input)
+		if err != nil {
+			b.Fatal(err)
+		}
+		reports[i] = report
+	}
+	v := &Verifier{
+		ExpectedSigningPublicKey: signer.PublicKey(),
+		AllowedMeasurements:      []string{measurement},
+		ExpectedTLSFingerprint:   tlsFP,
+		ExpectedE2EPublicKey:     e2ePK,
+		RequireSevSnp:            true,
+	}
+
+	b.Run("VerifyEach", func(b *testing.B) {
+		b.ReportAllocs()
+		for i := 0; i < b.N; i++ {
+			for _, report := range reports {
+				if err := v.Verify(report); err != nil {
+					b.Fatal(err)
+				}
+			}
+		}
+	})
+	b.Run("VerifyBatch", func(b *testing.B) {
+		b.ReportAllocs()
+		for i := 0; i < b.N; i++ {
+			for _, r := range v.VerifyBatch(reports) {
+				if r.Err != nil {
+					b.Fatal(r.Err)
+				}
+			}
+		}
+	})
+}
+
+func benchInput365Days() *signing.ReportInput {
+	dailyReturns := make([]signing.DailyReturn, 365)
+	for i := range dailyReturns {
+		dailyReturns[i] = signing.DailyReturn{
+			Date:             time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC).AddDate(0, 0, i).Format("2006-01-02"),
+			NetReturn:        0.001 * float64(i%30),
+			BenchmarkReturn:  0.0008 * float64(i%30),
+			Outperformance:   0.0002 * float64(i%30),
+			CumulativeReturn: 0.05 + 0.001*float64(i),
+			NAV:              1.0 + 0.001*float64(i),
+		}
+	}
+	return &signing.ReportInput{
+		UserUID:          "u_perf",
+		ReportName:       "perf",
+		PeriodStart:      time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC),
+		PeriodEnd:        time.Date(2025, 12, 31, 0, 0, 0, 0, time.UTC),
+		TotalReturn:      0.42,
+		AnnualizedReturn: 0.31,
+		SharpeRatio:      1.5,
+		SortinoRatio:     2.1,
+		CalmarRatio:      0.9,
+		MaxDrawdown:      -0.18,
+		Volatility:       0.22,
+		WinRate:          0.6,
+		ProfitFactor:     1.8,
+		DataPoints:       len(dailyReturns),
+		BaseCurrency:     "USD",
+		BenchmarkUsed:    "spy",
+		Exchanges:        []string{"binance", "ibkr", "kraken"},
+		DailyReturns:     dailyReturns,
+	}
+}
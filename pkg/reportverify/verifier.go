@@ -21,6 +21,10 @@
 //	    // report MUST NOT be trusted
 //	}
 //
+// To re-verify an archive, VerifyBatch (a slice) and VerifyStream (a channel)
+// run the same checks on every report across all cores and return one Result
+// per report.
+//
 // Designed so that a typo on any field fails closed, not open.
 package reportverify
 
@@ -39,6 +43,7 @@ import (
 var (
 	ErrNilReport             = errors.New("reportverify: nil report")
 	ErrSignatureInvalid      = errors.New("reportverify: signature or hash did not validate")
+	ErrInclusionProofInvalid = errors.New("reportverify: batch inclusion proof is missing or malformed")
 	ErrPublicKeyMismatch     = errors.New("reportverify: report public key does not match expected")
 	ErrNoAttestation         = errors.New("reportverify: report has no enclaveAttestation block")
 	ErrNotAttested           = errors.New("reportverify: attestation.attested != true or platform != sev-snp")
@@ -95,12 +100,61 @@ type Verifier struct {
 
 	// VCEK is an optional out-of-band VCEK chain validator. When nil, the
 	// Verifier reads the vcekVerified flag embedded in the signed payload.
+	// VerifyBatch and VerifyStream call it from several goroutines at once.
 	VCEK VCEKChecker
+
+	// Workers bounds the goroutines VerifyBatch and VerifyStream verify
+	// reports on. 0 means runtime.GOMAXPROCS(0). Not used by Verify.
+	Workers int
 }
 
 // Verify performs all six end-to-end checks. Returns nil only when the
 // report can be trusted.
 func (v *Verifier) Verify(report *signing.SignedReport) error {
+	return v.expectations().verify(report)
+}
+
+// expectations is what Verify derives from a Verifier before looking at a
+// report. VerifyBatch and VerifyStream compute it once for all their reports.
+type expectations struct {
+	v Verifier
+
+	// key is ExpectedSigningPublicKey parsed; nil when it is empty or not an
+	// ECDSA key, in which case signing.VerifyReportStrict reports the error.
+	key *signing.PinnedKey
+
+	// measurements is AllowedMeasurements, lowercased.
+	measurements map[string]struct{}
+
+	// reportData is the expected report_data, set once both
+	// ExpectedTLSFingerprint and ExpectedE2EPublicKey are.
+	reportData string
+}
+
+func (v *Verifier) expectations() *expectations {
+	e := &expectations{v: *v}
+	if v.ExpectedSigningPublicKey != "" {
+		e.key, _ = signing.ParsePinnedKey(v.ExpectedSigningPublicKey)
+	}
+	if v.RequireSevSnp {
+		e.measurements = make(map[string]struct{}, len(v.AllowedMeasurements))
+		for _, allowed := range v.AllowedMeasurements {
+			e.measurements[lowerHex(allowed)] = struct{}{}
+		}
+		if v.ExpectedTLSFingerprint != "" && v.ExpectedE2EPublicKey != "" {
+			e.reportData = expectedReportData(
+				v.ExpectedTLSFingerprint,
+				v.ExpectedE2EPublicKey,
+				v.ExpectedSigningPublicKey,
+				v.Nonce,
+			)
+		}
+	}
+	return e
+}
+
+func (e *expectations) verify(report *signing.SignedReport) error {
+	v := &e.v
 	if report == nil {
 		return ErrNilReport
 	}
@@ -110,13 +164,23 @@ func (v *Verifier) Verify(report *signing.SignedReport) error {
 
 	// Steps 1-3: pin the signing key, recompute hash, verify ECDSA signature.
 	// VerifyReportStrict uses constant-time comparison for the pubkey check.
-	ok, err := signing.VerifyReportStrict(report, v.ExpectedSigningPublicKey, v.RequireSevSnp)
+	// For batch-signed reports (signing.BatchSignatureAlgorithm) step 3 also
+	// walks the inclusion proof up to the signed Merkle root.
+	var ok bool
+	var err error
+	if e.key != nil {
+		ok, err = e.key.VerifyReportStrict(report, v.RequireSevSnp)
+	} else {
+		ok, err = signing.VerifyReportStrict(report, v.ExpectedSigningPublicKey, v.RequireSevSnp)
+	}
 	if err != nil {
 		switch {
 		case errors.Is(err, signing.ErrPublicKeyMismatch):
 			return ErrPublicKeyMismatch
 		case errors.Is(err, signing.ErrAttestationNotBound):
 			return ErrReportDataNotBound
+		case errors.Is(err, signing.ErrInvalidInclusionProof):
+			return ErrInclusionProofInvalid
 		default:
 			return fmt.Errorf("reportverify: %w", err)
 		}
@@ -142,8 +206,11 @@ func (v *Verifier) Verify(report *signing.SignedReport) error {
 	}
 
 	// Step 4: measurement allowlist.
-	if err := v.checkMeasurement(att.Measurement); err != nil {
-		return err
+	if len(e.measurements) == 0 {
+		return fmt.Errorf("%w: AllowedMeasurements", ErrMissingExpectedInput)
+	}
+	if _, ok := e.measurements[lowerHex(att.Measurement)]; !ok {
+		return ErrMeasurementNotAllowed
 	}
 
 	// Step 5: report_data binding. Recompute SHA256 and compare byte-for-byte.
@@ -153,13 +220,7 @@ func (v *Verifier) Verify(report *signing.SignedReport) error {
 	if v.ExpectedE2EPublicKey == "" {
 		return fmt.Errorf("%w: ExpectedE2EPublicKey", ErrMissingExpectedInput)
 	}
-	expected := expectedReportData(
-		v.ExpectedTLSFingerprint,
-		v.ExpectedE2EPublicKey,
-		v.ExpectedSigningPublicKey,
-		v.Nonce,
-	)
-	if !constantTimeHexEqual(att.ReportData, expected) {
+	if !constantTimeHexEqual(att.ReportData, e.reportData) {
 		return ErrReportDataMismatch
 	}
 
@@ -175,19 +236,6 @@ func (v *Verifier) Verify(report *signing.SignedReport) error {
 	return nil
 }
 
-func (v *Verifier) checkMeasurement(got string) error {
-	if len(v.AllowedMeasurements) == 0 {
-		return fmt.Errorf("%w: AllowedMeasurements", ErrMissingExpectedInput)
-	}
-	got = lowerHex(got)
-	for _, allowed := range v.AllowedMeasurements {
-		if lowerHex(allowed) == got {
-			return nil
-		}
-	}
-	return ErrMeasurementNotAllowed
-}
-
 // ExpectedReportData exposes the canonical SHA-256 of
 // (tlsFingerprint || e2ePublicKey || signingPublicKey [|| nonce])
 // for callers that want to compute it without pulling in the crypto directly.
@@ -223,3 +223,57 @@ func TestVerifier_NoSevSnp_OnlyChecksSignature(t *testing.T) {
 		t.Fatalf("no-sev-snp path should accept, got: %v", err)
 	}
 }
+
+func TestVerifier_BatchSignedReports(t *testing.T) {
+	signer := signing.MustNewReportSignerGenerate()
+	tlsFP := "aa"
+	e2ePK := "pem"
+	measurement := "cafe"
+	signer.SetAttestation(&signing.EnclaveAttestation{
+		Measurement:              measurement,
+		ReportData:               expectedReportData(tlsFP, e2ePK, signer.PublicKey(), nil),
+		Platform:                 "sev-snp",
+		Attested:                 true,
+		ReportDataBoundToRequest: true,
+		VcekVerified:             true,
+	})
+	inputs := make([]*signing.ReportInput, 3)
+	for i := range inputs {
+		inputs[i] = &signing.ReportInput{
+			UserUID:     "user_abc1234567890",
+			ReportName:  "Month end",
+			PeriodStart: time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC),
+			PeriodEnd:   time.Date(2025, 1, 31, 0, 0, 0, 0, time.UTC),
+			TotalReturn: 0.01 * float64(i),
+			DataPoints:  31,
+		}
+	}
+	reports, err := signer.SignBatch(inputs)
+	if err != nil {
+		t.Fatalf("sign batch: %v", err)
+	}
+
+	v := &Verifier{
+		ExpectedSigningPublicKey: signer.PublicKey(),
+		AllowedMeasurements:      []string{measurement},
+		ExpectedTLSFingerprint:   tlsFP,
+		ExpectedE2EPublicKey:     e2ePK,
+		RequireSevSnp:            true,
+	}
+	for i, report := range reports {
+		if err := v.Verify(report); err != nil {
+			t.Fatalf("report %d: %v", i, err)
+		}
+	}
+
+	swapped := *reports[1]
+	swapped.InclusionProof = reports[0].InclusionProof
+	if err := v.Verify(&swapped); !errors.Is(err, ErrSignatureInvalid) {
+		t.Fatalf("proof of another report: expected ErrSignatureInvalid, got: %v", err)
+	}
+	stripped := *reports[1]
+	stripped.InclusionProof = nil
+	if err := v.Verify(&stripped); !errors.Is(err, ErrInclusionProofInvalid) {
+		t.Fatalf("missing proof: expected ErrInclusionProofInvalid, got: %v", err)
+	}
+}